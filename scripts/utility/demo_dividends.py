@@ -64,7 +64,6 @@ def main():
         start_date=date(2024, 1, 1),
         end_date=date(2024, 12, 31),
         algo_obj=None,
-        transactions=transactions1,
     )
 
     print(f"Total return: {summary1_mapped['total_return'] * 100:.2f}%")
@@ -94,7 +93,6 @@ def main():
         start_date=date(2024, 1, 1),
         end_date=date(2024, 12, 31),
         algo_obj=None,
-        transactions=transactions2,
     )
 
     print(f"Total return: {summary2_mapped['total_return'] * 100:.2f}%")
@@ -69,7 +69,6 @@ ath_summary = _map_portfolio_to_single_ticker_summary(
     start_date=df.index[0],
     end_date=df.index[-1],
     algo_obj=None,
-    transactions=ath_txns,
 )
 
 enhanced_summary = _map_portfolio_to_single_ticker_summary(
@@ -79,7 +78,6 @@ enhanced_summary = _map_portfolio_to_single_ticker_summary(
     start_date=df.index[0],
     end_date=df.index[-1],
     algo_obj=None,
-    transactions=enhanced_txns,
 )
 
 print("ATH transactions:")
@@ -3,12 +3,13 @@
 import math
 from abc import ABC, abstractmethod
 from datetime import date
-from typing import Any, Dict, List, Optional
-
-import pandas as pd
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 # Import Transaction and WithdrawalResult from types module
-from src.models.model_types import Transaction, WithdrawalResult
+from src.models.model_types import Bar, Transaction, WithdrawalResult
+
+if TYPE_CHECKING:
+    from src.models.market_data import AlignedPriceData, PriceHistory
 
 
 class AlgorithmBase(ABC):
@@ -18,8 +19,25 @@ class AlgorithmBase(ABC):
     - on_new_holdings: Called after initial purchase
     - on_day: Called each trading day, returns Transaction or None
     - on_end_holding: Called at end of backtest period
+
+    Subclasses that never read the history argument of on_day should set
+    needs_history = False; the engine then skips building it and passes None.
+
+    Subclasses whose on_day is idle on most days can override next_active_day
+    and skip_idle_days; the fast engine then jumps over idle days instead of
+    calling on_day for each of them.
+
+    Subclasses whose orders never depend on the bank argument should set
+    reads_bank = False; their trades are then the same under any withdrawal
+    or interest policy, which lets CashFlowReplay reuse one run for many.
     """
 
+    # Whether on_day reads its history argument (engine skips building it if False)
+    needs_history: bool = True
+
+    # Whether on_day's orders depend on its bank argument
+    reads_bank: bool = True
+
     def __init__(self, params: Optional[Dict[str, Any]] = None) -> None:
         """Initialize with optional parameters dict."""
         self.params: Dict[str, Any] = params or {}
@@ -35,7 +53,12 @@ class AlgorithmBase(ABC):
 
     @abstractmethod
     def on_day(
-        self, date_: date, price_row: pd.Series, holdings: float, bank: float, history: pd.DataFrame
+        self,
+        date_: date,
+        price_row: Bar,
+        holdings: float,
+        bank: float,
+        history: Optional["PriceHistory"],
     ) -> List[Transaction]:
         """Process one trading day, return list of transactions executed.
 
@@ -44,10 +67,12 @@ class AlgorithmBase(ABC):
 
         Args:
             date_: Current date
-            price_row: OHLC prices for current day
+            price_row: OHLC prices for current day (a Bar; also supports
+                       Series-style price_row["Close"] and price_row.get("High"))
             holdings: Current share count (changed from int to float for fractional shares)
             bank: Current cash balance (may be negative)
-            history: All price data up to previous day
+            history: All price data up to previous day (a lazy PriceHistory view
+                     that behaves like a DataFrame), or None if needs_history is False
 
         Returns:
             List of transactions executed on this day (may be empty if no triggers)
@@ -57,6 +82,30 @@ class AlgorithmBase(ABC):
     def on_end_holding(self) -> None:
         """Cleanup/reporting after backtest completes."""
 
+    def next_active_day(self, data: "AlignedPriceData", ticker: str, start: int) -> int:
+        """Return the first day position >= start on which on_day may act.
+
+        A day is idle if on_day would return no transactions and change no
+        state other than what skip_idle_days applies. The default assumes
+        every day may act, so the engine calls on_day daily.
+
+        Args:
+            data: Aligned price data for the run
+            ticker: Ticker this algorithm trades
+            start: First day position to consider
+
+        Returns:
+            Day position in [start, len(data)]; len(data) if no day can act
+        """
+        return start
+
+    def skip_idle_days(self, data: "AlignedPriceData", ticker: str, start: int, stop: int) -> None:
+        """Apply the state changes of on_day over idle days [start, stop).
+
+        Called by the fast engine in place of on_day for days before
+        next_active_day(). The default has nothing to apply.
+        """
+
     def on_withdrawal(
         self,
         date_: date,
@@ -1,17 +1,21 @@
 """Buy-and-hold algorithm: passive investment strategy."""
 
 from datetime import date
-from typing import Any, Dict, List, Optional
-
-import pandas as pd
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 from src.algorithms.base import AlgorithmBase
-from src.models.model_types import Transaction
+from src.models.model_types import Bar, Transaction
+
+if TYPE_CHECKING:
+    from src.models.market_data import AlignedPriceData, PriceHistory
 
 
 class BuyAndHoldAlgorithm(AlgorithmBase):
     """Passive buy-and-hold strategy: no trades after initial purchase."""
 
+    needs_history = False
+    reads_bank = False
+
     def __init__(
         self,
         rebalance_size_pct: float = 0.0,
@@ -25,10 +29,19 @@ class BuyAndHoldAlgorithm(AlgorithmBase):
         """No-op: no initialization needed."""
 
     def on_day(
-        self, date_: date, price_row: pd.Series, holdings: float, bank: float, history: pd.DataFrame
+        self,
+        date_: date,
+        price_row: Bar,
+        holdings: float,
+        bank: float,
+        history: Optional["PriceHistory"],
     ) -> List[Transaction]:
         """Always returns empty list: hold position."""
         return []
 
+    def next_active_day(self, data: "AlignedPriceData", ticker: str, start: int) -> int:
+        """Never acts: holdings stay constant after the initial purchase."""
+        return len(data)
+
     def on_end_holding(self) -> None:
         """No-op: no cleanup needed."""
@@ -1,13 +1,14 @@
 """Adapter that runs per-asset algorithms in portfolio context."""
 
 from datetime import date
-from typing import Dict, List
-
-import pandas as pd
+from typing import TYPE_CHECKING, Dict, List
 
 from src.algorithms.base import AlgorithmBase
 from src.algorithms.portfolio_base import PortfolioAlgorithmBase
-from src.models.model_types import AssetState, Transaction
+from src.models.model_types import AssetState, Bar, Transaction
+
+if TYPE_CHECKING:
+    from src.models.market_data import AlignedPriceData, PriceHistory
 
 
 class PerAssetPortfolioAlgorithm(PortfolioAlgorithmBase):
@@ -34,13 +35,23 @@ class PerAssetPortfolioAlgorithm(PortfolioAlgorithmBase):
         """
         self.strategies = strategies
 
+    @property
+    def needs_history(self) -> bool:  # type: ignore[override]
+        """History is needed if any per-asset algorithm reads it."""
+        return any(getattr(algo, "needs_history", True) for algo in self.strategies.values())
+
+    @property
+    def reads_bank(self) -> bool:  # type: ignore[override]
+        """Orders depend on the bank if any per-asset algorithm's do."""
+        return any(getattr(algo, "reads_bank", True) for algo in self.strategies.values())
+
     def on_portfolio_day(
         self,
         date_: date,
         assets: Dict[str, AssetState],
         bank: float,
-        prices: Dict[str, pd.Series],
-        history: Dict[str, pd.DataFrame],
+        prices: Dict[str, Bar],
+        history: Dict[str, "PriceHistory"],
     ) -> Dict[str, List[Transaction]]:
         """Run each asset's algorithm independently with shared bank view.
 
@@ -57,8 +68,22 @@ class PerAssetPortfolioAlgorithm(PortfolioAlgorithmBase):
                 price_row=prices[ticker],
                 holdings=assets[ticker].holdings,
                 bank=bank,  # Shared bank - algorithm sees current balance
-                history=history[ticker],
+                history=history.get(ticker),
             )
             transactions[ticker] = txns
 
         return transactions
+
+    def next_active_day(self, data: "AlignedPriceData", start: int) -> int:
+        """First day on which any per-asset algorithm may act."""
+        next_day = len(data)
+        for ticker, algo in self.strategies.items():
+            next_day = min(next_day, algo.next_active_day(data, ticker, start))
+            if next_day == start:
+                break
+        return next_day
+
+    def skip_idle_days(self, data: "AlignedPriceData", start: int, stop: int) -> None:
+        """Let each per-asset algorithm apply its idle-day state changes."""
+        for ticker, algo in self.strategies.items():
+            algo.skip_idle_days(data, ticker, start, stop)
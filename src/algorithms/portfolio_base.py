@@ -2,11 +2,12 @@
 
 from abc import ABC, abstractmethod
 from datetime import date
-from typing import Dict, List
+from typing import TYPE_CHECKING, Dict, List
 
-import pandas as pd
+from src.models.model_types import AssetState, Bar, Transaction
 
-from src.models.model_types import AssetState, Transaction
+if TYPE_CHECKING:
+    from src.models.market_data import AlignedPriceData, PriceHistory
 
 
 class PortfolioAlgorithmBase(ABC):
@@ -17,16 +18,31 @@ class PortfolioAlgorithmBase(ABC):
 
     Subclasses must implement one method:
     - on_portfolio_day: Called each trading day with full portfolio state
+
+    Subclasses that never read the history argument should set
+    needs_history = False; the engine then passes an empty dict instead.
+
+    Subclasses that are idle on most days can override next_active_day and
+    skip_idle_days so the fast engine jumps over idle days.
+
+    Subclasses whose orders never depend on the bank argument should set
+    reads_bank = False (see src.models.cash_overlay).
     """
 
+    # Whether on_portfolio_day reads its history argument
+    needs_history: bool = True
+
+    # Whether on_portfolio_day's orders depend on its bank argument
+    reads_bank: bool = True
+
     @abstractmethod
     def on_portfolio_day(
         self,
         date_: date,
         assets: Dict[str, AssetState],
         bank: float,
-        prices: Dict[str, pd.Series],
-        history: Dict[str, pd.DataFrame],
+        prices: Dict[str, Bar],
+        history: Dict[str, "PriceHistory"],
     ) -> Dict[str, List[Transaction]]:
         """Process one trading day at portfolio level, return transactions by ticker.
 
@@ -34,10 +50,29 @@ class PortfolioAlgorithmBase(ABC):
             date_: Current date
             assets: Dict of ticker → AssetState (current position per asset)
             bank: Shared cash pool balance (may be negative if allow_margin=True)
-            prices: Dict of ticker → OHLC prices for current day
-            history: Dict of ticker → all price data up to previous day
+            prices: Dict of ticker → OHLC prices for current day (Bar)
+            history: Dict of ticker → all price data up to previous day (lazy
+                     PriceHistory views), or empty if needs_history is False
 
         Returns:
             Dict of ticker → list of transactions for that asset
             Empty dict or empty lists if no transactions
         """
+
+    def next_active_day(self, data: "AlignedPriceData", start: int) -> int:
+        """Return the first day position >= start on which on_portfolio_day may act.
+
+        The default assumes every day may act, so the engine calls
+        on_portfolio_day daily.
+
+        Args:
+            data: Aligned price data for the run
+            start: First day position to consider
+
+        Returns:
+            Day position in [start, len(data)]; len(data) if no day can act
+        """
+        return start
+
+    def skip_idle_days(self, data: "AlignedPriceData", start: int, stop: int) -> None:
+        """Apply the state changes of on_portfolio_day over idle days [start, stop)."""
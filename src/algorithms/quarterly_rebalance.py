@@ -1,12 +1,15 @@
 """Traditional quarterly portfolio rebalancing algorithm."""
 
 from datetime import date
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional
 
-import pandas as pd
+import numpy as np
 
 from src.algorithms.portfolio_base import PortfolioAlgorithmBase
-from src.models.model_types import AssetState, Transaction
+from src.models.model_types import AssetState, Bar, Transaction
+
+if TYPE_CHECKING:
+    from src.models.market_data import AlignedPriceData, PriceHistory
 
 
 class QuarterlyRebalanceAlgorithm(PortfolioAlgorithmBase):
@@ -24,6 +27,12 @@ class QuarterlyRebalanceAlgorithm(PortfolioAlgorithmBase):
         ... )
     """
 
+    # Rebalancing uses only current positions and prices
+    needs_history = False
+
+    # Minimum days between rebalances (prevents repeats within a quarter)
+    MIN_DAYS_BETWEEN_REBALANCES = 80
+
     def __init__(
         self,
         target_allocations: Dict[str, float],
@@ -52,8 +61,8 @@ class QuarterlyRebalanceAlgorithm(PortfolioAlgorithmBase):
         date_: date,
         assets: Dict[str, AssetState],
         bank: float,
-        prices: Dict[str, pd.Series],
-        history: Dict[str, pd.DataFrame],
+        prices: Dict[str, Bar],
+        history: Dict[str, "PriceHistory"],
     ) -> Dict[str, List[Transaction]]:
         """Rebalance portfolio to target allocations if due."""
         # Check if rebalance is due
@@ -63,7 +72,7 @@ class QuarterlyRebalanceAlgorithm(PortfolioAlgorithmBase):
         # Prevent multiple rebalances in same quarter
         if self.last_rebalance is not None:
             days_since_last = (date_ - self.last_rebalance).days
-            if days_since_last < 80:  # ~3 months
+            if days_since_last < self.MIN_DAYS_BETWEEN_REBALANCES:  # ~3 months
                 return {}
 
         # Calculate total portfolio value
@@ -105,3 +114,24 @@ class QuarterlyRebalanceAlgorithm(PortfolioAlgorithmBase):
             self.last_rebalance = date_
 
         return transactions
+
+    def next_active_day(self, data: "AlignedPriceData", start: int) -> int:
+        """Find the next day on which a rebalance is due.
+
+        A rebalance can only happen in a rebalance month, at least
+        MIN_DAYS_BETWEEN_REBALANCES after the last one; holdings are
+        constant on every other day.
+
+        Args:
+            data: Aligned price data for the run
+            start: First day position to consider
+
+        Returns:
+            Day position of the next rebalance check, or len(data) if none
+        """
+        due = np.isin(data.months[start:], self.rebalance_months)
+        if self.last_rebalance is not None:
+            days_since_last = data.ordinals[start:] - self.last_rebalance.toordinal()
+            due &= days_since_last >= self.MIN_DAYS_BETWEEN_REBALANCES
+        hits = np.flatnonzero(due)
+        return start + int(hits[0]) if hits.size else len(data)
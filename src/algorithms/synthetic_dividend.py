@@ -1,14 +1,17 @@
 """Synthetic dividend algorithm: volatility harvesting strategy."""
 
 from datetime import date
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
-import pandas as pd
+import numpy as np
 
 from src.algorithms.base import AlgorithmBase
 from src.models.backtest_utils import calculate_synthetic_dividend_orders
-from src.models.market import Market, Order, OrderAction, OrderType
-from src.models.model_types import Transaction
+from src.models.market import BracketLadder, Market, Order, OrderAction, OrderType
+from src.models.model_types import Bar, Transaction
+
+if TYPE_CHECKING:
+    from src.models.market_data import AlignedPriceData, PriceHistory
 
 
 class SyntheticDividendAlgorithm(AlgorithmBase):
@@ -249,10 +252,10 @@ class SyntheticDividendAlgorithm(AlgorithmBase):
     - experiments/volatility-alpha-validation/ - Empirical validation data
     """
 
-    # Maximum iterations for multi-bracket gap handling per day
-    # In extreme volatility (e.g., 20% gap = ~2 brackets), we need multiple iterations
-    # to create separate stack entries for exact symmetry. Limit prevents infinite loops.
-    MAX_ITERATIONS_PER_DAY = 20
+    # Orders depend only on the current day's OHLC, never on price history
+    needs_history = False
+    # ...nor on the bank: with margin allowed, every buy executes
+    reads_bank = False
 
     def __init__(
         self,
@@ -312,22 +315,6 @@ class SyntheticDividendAlgorithm(AlgorithmBase):
         # Transaction price anchor: updated after each fill for symmetric order placement
         self.last_transaction_price: float = 0.0
 
-    @staticmethod
-    def _extract_fill_price(transaction: Transaction) -> float:
-        """Extract fill price from transaction notes.
-
-        Transaction notes format: "...filled=$XX.XX..."
-        This parsing maintains separation between transaction data and execution details.
-
-        Args:
-            transaction: Transaction with notes containing fill price
-
-        Returns:
-            Fill price as float
-        """
-        fill_price_str = transaction.notes.split("filled=$")[1].split()[0]
-        return float(fill_price_str)
-
     def _calculate_volatility_alpha(self, holdings: float, price: float, quantity: float) -> float:
         """Calculate volatility alpha from a buy transaction.
 
@@ -374,9 +361,6 @@ class SyntheticDividendAlgorithm(AlgorithmBase):
             holdings: Current share count
             current_price: Price anchor for order calculation
         """
-        # Clear stale orders - all previous orders are invalidated after a fill
-        self.market.clear_orders()
-
         # Update anchor point for symmetric bracket placement
         self.last_transaction_price = current_price
 
@@ -389,6 +373,13 @@ class SyntheticDividendAlgorithm(AlgorithmBase):
             bracket_seed=self.bracket_seed,
         )
 
+        # Rungs beyond the first follow the same formulas with updated holdings:
+        # H grows by r × s × H per buy and shrinks by r × s × H / (1 + r) per sell
+        r, s = self.rebalance_size, self.profit_sharing
+        buy_ladder = BracketLadder(r, 1 + r * s, self.bracket_seed)
+        sell_ladder = BracketLadder(r, 1 - r * s / (1 + r), self.bracket_seed)
+
+        new_orders: List[Order] = []
         if self.buyback_enabled:
             # Full mode: place both buy and sell orders for volatility harvesting
             if orders["next_buy_qty"] > 0:
@@ -398,13 +389,16 @@ class SyntheticDividendAlgorithm(AlgorithmBase):
                     order_type=OrderType.LIMIT,
                     limit_price=orders["next_buy_price"],
                     notes="Buying back",
+                    ladder=buy_ladder,
                 )
-                self.market.place_order(buy_order)
+                new_orders.append(buy_order)
 
             if orders["next_sell_qty"] > 0:
                 # ATH-sell variant: only sell if price exceeds all-time high
                 if self.sell_at_new_ath:
-                    # Only place sell order if current price exceeds all-time high
+                    # Only place sell order if current price exceeds all-time high.
+                    # No ladder: a sell fills at or below the day's high, which is
+                    # then the all-time high, so no further sell is placed that day
                     if current_price > self.all_time_high:
                         sell_order = Order(
                             action=OrderAction.SELL,
@@ -413,7 +407,7 @@ class SyntheticDividendAlgorithm(AlgorithmBase):
                             limit_price=orders["next_sell_price"],
                             notes=f"ATH-sell at new ATH ${self.all_time_high:.2f}",
                         )
-                        self.market.place_order(sell_order)
+                        new_orders.append(sell_order)
                 else:
                     # Standard sell logic
                     sell_order = Order(
@@ -422,8 +416,9 @@ class SyntheticDividendAlgorithm(AlgorithmBase):
                         order_type=OrderType.LIMIT,
                         limit_price=orders["next_sell_price"],
                         notes="Taking profits",
+                        ladder=sell_ladder,
                     )
-                    self.market.place_order(sell_order)
+                    new_orders.append(sell_order)
         else:
             # ATH-only mode: only sell at new highs (no buybacks)
             if orders["next_sell_qty"] > 0:
@@ -433,8 +428,12 @@ class SyntheticDividendAlgorithm(AlgorithmBase):
                     order_type=OrderType.LIMIT,
                     limit_price=orders["next_sell_price"],
                     notes=f"ATH-only sell, ATH=${self.ath_price:.2f}",
+                    ladder=sell_ladder,
                 )
-                self.market.place_order(sell_order)
+                new_orders.append(sell_order)
+
+        # Stale orders are invalidated after a fill: swap the whole book at once
+        self.market.replace_orders(new_orders)
 
     def on_new_holdings(self, holdings: float, current_price: float) -> None:
         """Initialize algorithm state after initial purchase.
@@ -457,7 +456,12 @@ class SyntheticDividendAlgorithm(AlgorithmBase):
         self.place_orders(holdings, current_price)
 
     def on_day(
-        self, date_: date, price_row: pd.Series, holdings: float, bank: float, history: pd.DataFrame
+        self,
+        date_: date,
+        price_row: Bar,
+        holdings: float,
+        bank: float,
+        history: Optional["PriceHistory"],
     ) -> List[Transaction]:
         """Evaluate day's price action and execute triggered orders.
 
@@ -465,16 +469,17 @@ class SyntheticDividendAlgorithm(AlgorithmBase):
         1. Checks for order triggers against OHLC data
         2. Executes fills and updates internal state
         3. Places new orders based on updated position
-        4. Iterates to handle multi-bracket gaps
+        4. Fills every bracket crossed by multi-bracket gaps
 
         Multi-bracket Gap Handling:
-            When price gaps 2+ brackets, we iterate to create separate stack
-            entries for exact geometric symmetry. Each iteration represents one
-            bracket crossing, ensuring accurate lot tracking.
+            When price gaps 2+ brackets, each order's BracketLadder lets the
+            market fill one transaction per bracket crossed, computed in closed
+            form, so each crossing is a separate stack entry for exact
+            geometric symmetry and accurate lot tracking.
 
         Example (gap down 2 brackets):
-            Iteration 1: Buy at $91.62 → add stack entry → place new orders
-            Iteration 2: Buy at $83.94 → add stack entry → place new orders
+            Rung 1: Buy at $91.62 → add stack entry
+            Rung 2: Buy at $83.94 → add stack entry
             Result: Two separate lots for symmetric unwinding
 
         Args:
@@ -489,32 +494,26 @@ class SyntheticDividendAlgorithm(AlgorithmBase):
         """
         transactions: List[Transaction] = []
 
+        bar = Bar.from_row(price_row)
+
         # ATH tracking for sell conditions (used by ATH-sell variant)
-        high = price_row.get("High")
-        if high is not None:
-            high_val = high.item() if hasattr(high, "item") else float(high)
-            if high_val > self.all_time_high:
-                self.all_time_high = high_val
+        # NaN (no High data) never compares greater
+        if bar.high > self.all_time_high:
+            self.all_time_high = bar.high
 
         # ATH-only mode: track all-time high for baseline comparison
-        if not self.buyback_enabled:
-            high = price_row.get("High")
-            if high is not None:
-                high_val = high.item() if hasattr(high, "item") else float(high)
-                if high_val > self.ath_price:
-                    self.ath_price = high_val
+        if not self.buyback_enabled and bar.high > self.ath_price:
+            self.ath_price = bar.high
 
         # Evaluate all orders against this day's price action
-        # The market handles cascading triggers (multi-bracket gaps) internally
-        executed = self.market.evaluate_day(
-            date_, price_row, max_iterations=self.MAX_ITERATIONS_PER_DAY
-        )
+        # The market fills every ladder rung a gap crosses (multi-bracket gaps)
+        executed = self.market.evaluate_day(date_, bar)
 
-        # Process all executed transactions
+        # Process all fills (full-precision prices from the execution records)
         for txn in executed:
-            price = self._extract_fill_price(txn)
+            price = txn.price
 
-            if txn.action == "BUY":
+            if txn.side == OrderAction.BUY:
                 if self.buyback_enabled:
                     # Add to buyback stack count for symmetry tracking
                     self.buyback_stack_count += txn.qty
@@ -527,7 +526,7 @@ class SyntheticDividendAlgorithm(AlgorithmBase):
                 # Update position
                 holdings += txn.qty
 
-            elif txn.action == "SELL":
+            else:
                 if self.buyback_enabled:
                     # Track buyback stack unwinding and realize alpha
                     # Can only unwind shares that are actually in the stack
@@ -546,16 +545,56 @@ class SyntheticDividendAlgorithm(AlgorithmBase):
                 # Update position
                 holdings -= txn.qty
 
+            # Rungs are anchored at the fill price, as re-placed orders are
+            self.last_transaction_price = price
+
         # Place fresh orders based on final position and last fill price
         if executed:
-            last_price = self._extract_fill_price(executed[-1])
-            self.place_orders(holdings, last_price)
+            self.place_orders(holdings, executed[-1].price)
 
         # All transactions for this day
         transactions.extend(executed)
 
         return transactions
 
+    def next_active_day(self, data: "AlignedPriceData", ticker: str, start: int) -> int:
+        """Find the next day on which a pending limit order fills.
+
+        Between fills the only state change is ATH tracking, so every day
+        before the first Low <= buy limit or High >= sell limit is idle.
+
+        Args:
+            data: Aligned price data for the run
+            ticker: Ticker this algorithm trades
+            start: First day position to consider
+
+        Returns:
+            Day position of the next fill, or len(data) if none occurs
+        """
+        # Market.evaluate_day never fills without a Low/High range
+        if not (data.has_field(ticker, "Low") and data.has_field(ticker, "High")):
+            return len(data)
+        row = data.row(ticker)
+        return self.market.next_trigger_index(data.low[row], data.high[row], start)
+
+    def skip_idle_days(self, data: "AlignedPriceData", ticker: str, start: int, stop: int) -> None:
+        """Update ATH tracking over idle days [start, stop) in one reduction.
+
+        Args:
+            data: Aligned price data for the run
+            ticker: Ticker this algorithm trades
+            start: First idle day position
+            stop: Day position after the last idle day
+        """
+        if stop <= start or not data.has_field(ticker, "High"):
+            return
+        # fmax ignores NaN highs, as the day-by-day comparison does
+        peak = float(np.fmax.reduce(data.high[data.row(ticker), start:stop], initial=-np.inf))
+        if peak > self.all_time_high:
+            self.all_time_high = peak
+        if not self.buyback_enabled and peak > self.ath_price:
+            self.ath_price = peak
+
     def on_end_holding(self) -> None:
         """Print summary statistics after backtest completes.
 
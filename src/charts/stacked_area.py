@@ -390,67 +390,33 @@ def create_portfolio_horn_chart(
     """Create horn chart from actual portfolio backtest results.
 
     Args:
-        portfolio_summary: Summary dict from run_portfolio_backtest
+        portfolio_summary: Summary dict from run_portfolio_backtest (detail "daily" or "full")
         output: Output file path (default: auto-generated)
         resample: Resampling frequency ('D'=daily, 'W'=weekly, 'M' or 'ME'=monthly, None=daily)
 
     Returns:
         Path to saved chart file
     """
-    from datetime import date  # noqa: F401
-
-    import pandas as pd
-
-    # Extract daily data
-    daily_values = portfolio_summary["daily_values"]
-    daily_bank = portfolio_summary["daily_bank_values"]
-    daily_asset_values = portfolio_summary.get("daily_asset_values", {})
-    daily_withdrawals_dict = portfolio_summary.get("daily_withdrawals", {})
-    allocations = portfolio_summary["allocations"]
-
-    # Build dates list
-    dates = sorted(daily_values.keys())
-
-    # Extract per-asset values
-    cash_values = [daily_bank[d] for d in dates]
-
-    # Build per-asset series data
-    asset_series_data = {}
-    for ticker in allocations.keys():
-        if ticker in daily_asset_values:
-            asset_series_data[ticker] = [daily_asset_values[ticker].get(d, 0) for d in dates]
+    # Daily series as a frame: bank, withdrawal, and one column per asset
+    daily = portfolio_summary["daily"]
+    frame = daily.to_frame()
+    frame["withdrawn"] = frame["withdrawal"].fillna(0.0).cumsum()
 
     # Handle resampling if requested
     if resample and resample != "D":
-        df_data = {"date": dates, "cash": cash_values}
-        # Add per-asset columns
-        for ticker, values in asset_series_data.items():
-            df_data[ticker] = values
-
-        df = pd.DataFrame(df_data)
-        df["date"] = pd.to_datetime(df["date"])
-        df = df.set_index("date")
-
         # Convert deprecated 'M' to 'ME' (month end)
         resample_freq = "ME" if resample == "M" else resample
 
-        # Resample (use mean for values)
-        df_resampled = df.resample(resample_freq).mean()
-
-        dates = [d.date() for d in df_resampled.index]
-        cash_values = df_resampled["cash"].tolist()
-
-        # Update asset series data with resampled values
-        for ticker in asset_series_data.keys():
-            asset_series_data[ticker] = df_resampled[ticker].tolist()
+        # Resample (mean for values, period-end level for cumulative withdrawals)
+        resampled = frame.resample(resample_freq)
+        withdrawn = resampled["withdrawn"].last()
+        frame = resampled.mean()
+        frame["withdrawn"] = withdrawn
 
-    # Build cumulative withdrawals from daily withdrawal events
-    cumulative_withdrawals = []
-    cumulative = 0.0
-    for d in dates:
-        if d in daily_withdrawals_dict:
-            cumulative += daily_withdrawals_dict[d]
-        cumulative_withdrawals.append(cumulative)
+    dates = [d.date() for d in frame.index]
+    cash_values = frame["bank"].tolist()
+    asset_series_data = {ticker: frame[ticker].tolist() for ticker in daily.tickers}
+    cumulative_withdrawals = frame["withdrawn"].tolist()
 
     # Define asset volatility order (least to most volatile for stacking)
     # Common ordering: Cash < Bonds (BIL/TLT) < Stocks (VOO/SPY) < Crypto (BTC)
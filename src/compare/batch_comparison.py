@@ -15,10 +15,21 @@ Example:
 import csv
 import sys
 from datetime import date, datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, cast
+
+import pandas as pd
 
 from src.data.fetcher import HistoryFetcher
 from src.models.backtest import run_portfolio_backtest  # noqa: E402
+from src.models.market_data import AlignedPriceData
+from src.models.parallel_runner import (
+    BacktestJob,
+    ParallelBacktestRunner,
+    portfolio_algo_name,
+)
+from src.models.parameter_grid import GridConfig, simulate_synthetic_dividend_grid
+from src.models.result_cache import ResultCache
+from src.models.simulation import close_to_close_returns, fetch_dividend_series
 
 
 def parse_date(s: str) -> date:
@@ -41,6 +52,80 @@ def parse_date(s: str) -> date:
     raise ValueError(f"Unrecognized date format: {s}")
 
 
+def _trading_range(
+    ticker: str, df: pd.DataFrame, start_date: date, end_date: date
+) -> Tuple[pd.DataFrame, date, date]:
+    """Index prices by date and find the trading days bounding a date range.
+
+    Args:
+        ticker: Stock symbol (for error messages)
+        df: Historical OHLC price data
+        start_date: Requested start date
+        end_date: Requested end date
+
+    Returns:
+        Tuple of (date-indexed copy of df, first trading day on or after
+        start_date, last trading day on or before end_date)
+
+    Raises:
+        ValueError: If no trading day falls on either side of the range
+    """
+    df_indexed = df.copy()
+    df_indexed.index = pd.to_datetime(df_indexed.index).date
+
+    # Find the actual start date (first available date >= requested start_date)
+    available_dates = sorted([d for d in df_indexed.index if d >= start_date])
+    if not available_dates:
+        raise ValueError(f"No data available for {ticker} starting from {start_date}")
+
+    # Find the actual end date (last available date <= requested end_date)
+    available_end_dates = sorted([d for d in df_indexed.index if d <= end_date])
+    if not available_end_dates:
+        raise ValueError(f"No data available for {ticker} ending at {end_date}")
+
+    return df_indexed, available_dates[0], available_end_dates[-1]
+
+
+def _build_row(
+    algo_name: str,
+    summary: Dict[str, Any],
+    ticker: str,
+    start_price: float,
+    end_price: float,
+    initial_qty: float,
+    initial_investment: float,
+    bank_stats: Dict[str, Any],
+    transaction_count: int,
+) -> Dict[str, Any]:
+    """CSV row for one configuration from its portfolio summary."""
+    asset_results = summary["assets"][ticker]
+
+    return {
+        "algorithm": algo_name,
+        "start_date": summary["start_date"].isoformat(),
+        "end_date": summary["end_date"].isoformat(),
+        "start_price": start_price,
+        "end_price": end_price,
+        "initial_qty": initial_qty,
+        "final_shares": asset_results["final_holdings"],
+        "final_value": asset_results["final_value"],
+        "bank": summary.get("final_bank", 0.0),
+        "bank_min": bank_stats["bank_min"],
+        "bank_max": bank_stats["bank_max"],
+        "bank_avg": bank_stats["bank_avg"],
+        "bank_negative_count": bank_stats["bank_negative_count"],
+        "bank_positive_count": bank_stats["bank_positive_count"],
+        "opportunity_cost": summary.get("opportunity_cost", 0.0),
+        "risk_free_gains": summary.get("cash_interest_earned", 0.0),
+        "total": summary.get("total_final_value", asset_results["final_value"]),
+        "total_return_pct": summary["total_return"],
+        "annualized_return_pct": summary["annualized_return"],
+        "years": summary["trading_days"] / 365.25,
+        "num_transactions": transaction_count,
+        "start_value": initial_investment,
+    }
+
+
 def run_single_backtest(
     ticker: str,
     start_date: date,
@@ -68,13 +153,7 @@ def run_single_backtest(
         # Convert single-ticker to portfolio format
         allocations = {ticker: 1.0}
 
-        # Convert algorithm name to portfolio format
-        if algo_name == "buy-and-hold":
-            portfolio_algo = "per-asset:buy-and-hold"
-        elif algo_name.startswith("sd-"):
-            portfolio_algo = f"per-asset:{algo_name}"
-        else:
-            portfolio_algo = algo_name
+        portfolio_algo = portfolio_algo_name(algo_name)
 
         # Calculate initial investment from initial_qty and start price
         # We'll need to fetch the start price first
@@ -83,25 +162,14 @@ def run_single_backtest(
         if df is None or df.empty:
             raise ValueError(f"No price data available for {ticker}")
 
-        # Get start price
-        df_indexed = df.copy()
-        df_indexed.index = df_indexed.index.date
-
-        # Find the actual start date (first available date >= requested start_date)
-        available_dates = sorted([d for d in df_indexed.index if d >= start_date])
-        if not available_dates:
-            raise ValueError(f"No data available for {ticker} starting from {start_date}")
-        actual_start_date = available_dates[0]
+        df_indexed, actual_start_date, actual_end_date = _trading_range(
+            ticker, df, start_date, end_date
+        )
 
-        start_price = float(df_indexed.loc[actual_start_date, "Close"])
+        # Get start price
+        start_price = float(cast(float, df_indexed.at[actual_start_date, "Close"]))
         initial_investment = initial_qty * start_price
 
-        # Find the actual end date (last available date <= requested end_date)
-        available_end_dates = sorted([d for d in df_indexed.index if d <= end_date])
-        if not available_end_dates:
-            raise ValueError(f"No data available for {ticker} ending at {end_date}")
-        actual_end_date = available_end_dates[-1]
-
         transactions, summary = run_portfolio_backtest(
             allocations=allocations,
             start_date=actual_start_date,
@@ -110,52 +178,20 @@ def run_single_backtest(
             initial_investment=initial_investment,
             reference_rate_ticker=reference_rate_ticker if reference_rate_ticker else None,
             risk_free_rate_ticker=risk_free_rate_ticker if risk_free_rate_ticker else None,
+            detail="summary",
         )
 
-        # Extract key metrics from portfolio summary
-        asset_results = summary["assets"][ticker]
-
-        return {
-            "algorithm": algo_name,
-            "start_date": summary["start_date"].isoformat(),
-            "end_date": summary["end_date"].isoformat(),
-            "start_price": start_price,
-            "end_price": float(df_indexed.loc[actual_end_date, "Close"]),
-            "initial_qty": initial_qty,
-            "final_shares": asset_results["final_holdings"],
-            "final_value": asset_results["final_value"],
-            "bank": summary.get("final_bank", 0.0),
-            "bank_min": (
-                min(summary.get("daily_bank_values", {}).values())
-                if summary.get("daily_bank_values")
-                else summary.get("final_bank", 0.0)
-            ),
-            "bank_max": (
-                max(summary.get("daily_bank_values", {}).values())
-                if summary.get("daily_bank_values")
-                else summary.get("final_bank", 0.0)
-            ),
-            "bank_avg": (
-                sum(summary.get("daily_bank_values", {}).values())
-                / len(summary.get("daily_bank_values", {}))
-                if summary.get("daily_bank_values")
-                else summary.get("final_bank", 0.0)
-            ),
-            "bank_negative_count": sum(
-                1 for b in summary.get("daily_bank_values", {}).values() if b < 0
-            ),
-            "bank_positive_count": sum(
-                1 for b in summary.get("daily_bank_values", {}).values() if b > 0
-            ),
-            "opportunity_cost": summary.get("opportunity_cost", 0.0),
-            "risk_free_gains": summary.get("cash_interest_earned", 0.0),
-            "total": summary.get("total_final_value", asset_results["final_value"]),
-            "total_return_pct": summary["total_return"],
-            "annualized_return_pct": summary["annualized_return"],
-            "years": summary["trading_days"] / 365.25,
-            "num_transactions": summary.get("transaction_count", len(transactions)),
-            "start_value": initial_investment,
-        }
+        return _build_row(
+            algo_name,
+            summary,
+            ticker,
+            start_price=start_price,
+            end_price=float(cast(float, df_indexed.at[actual_end_date, "Close"])),
+            initial_qty=initial_qty,
+            initial_investment=initial_investment,
+            bank_stats=summary["daily_bank_stats"],
+            transaction_count=summary.get("transaction_count", len(transactions)),
+        )
     except Exception as e:
         # Return error row if backtest fails
         return {
@@ -166,6 +202,107 @@ def run_single_backtest(
         }
 
 
+def _run_grid_configs(
+    ticker: str,
+    start_date: date,
+    end_date: date,
+    configs: List[str],
+    initial_qty: float,
+    reference_rate_ticker: str,
+    risk_free_rate_ticker: str,
+) -> Dict[str, Dict[str, Any]]:
+    """Backtest every grid-capable config in one parameter-grid pass.
+
+    Produces the same rows as run_single_backtest() for synthetic dividend
+    and buy-and-hold configs, fetching prices, benchmarks, and dividends once
+    instead of once per config.
+
+    Returns:
+        Dict mapping algo_name → result row; configs the grid cannot run
+        (e.g., portfolio rebalancing algorithms) are omitted
+    """
+    grid_configs: Dict[str, GridConfig] = {}
+    for algo_name in configs:
+        try:
+            grid_configs[algo_name] = GridConfig.coerce(algo_name)
+        except (TypeError, ValueError):
+            continue
+    if not grid_configs:
+        return {}
+
+    names = list(grid_configs)
+    try:
+        fetcher = HistoryFetcher()
+        df = fetcher.get_history(ticker, start_date, end_date)
+        if df is None or df.empty:
+            raise ValueError(f"No price data available for {ticker}")
+
+        df_indexed, actual_start_date, actual_end_date = _trading_range(
+            ticker, df, start_date, end_date
+        )
+        start_price = float(cast(float, df_indexed.at[actual_start_date, "Close"]))
+        end_price = float(cast(float, df_indexed.at[actual_end_date, "Close"]))
+        initial_investment = initial_qty * start_price
+
+        reference_returns: Dict[date, float] = {}
+        if reference_rate_ticker:
+            ref_df = fetcher.get_history(reference_rate_ticker, actual_start_date, actual_end_date)
+            if ref_df is not None and not ref_df.empty:
+                reference_returns = close_to_close_returns(ref_df)
+
+        risk_free_returns: Dict[date, float] = {}
+        if risk_free_rate_ticker:
+            rf_df = fetcher.get_history(risk_free_rate_ticker, actual_start_date, actual_end_date)
+            if rf_df is not None and not rf_df.empty:
+                risk_free_returns = close_to_close_returns(rf_df)
+
+        try:
+            dividend_series = fetch_dividend_series(ticker, actual_start_date, actual_end_date)
+        except Exception as e:
+            print(f"WARN: Could not fetch dividends for {ticker}: {e}")
+            dividend_series = None
+
+        market_data = AlignedPriceData.from_frames(
+            {ticker: df_indexed}, actual_start_date, actual_end_date
+        )
+        summaries, _ = simulate_synthetic_dividend_grid(
+            market_data,
+            ticker,
+            [grid_configs[name] for name in names],
+            initial_investment=initial_investment,
+            dividend_series=dividend_series,
+            reference_returns=reference_returns,
+            risk_free_returns=risk_free_returns,
+            reference_rate_ticker=reference_rate_ticker or None,
+        )
+    except Exception as e:
+        # Every grid config fails together when the shared data cannot be loaded
+        return {
+            name: {
+                "algorithm": name,
+                "error": str(e),
+                "start_date": start_date.isoformat(),
+                "end_date": end_date.isoformat(),
+            }
+            for name in names
+        }
+
+    return {
+        name: _build_row(
+            name,
+            summary,
+            ticker,
+            start_price=start_price,
+            end_price=end_price,
+            initial_qty=initial_qty,
+            initial_investment=initial_investment,
+            bank_stats=summary["daily_bank_stats"],
+            transaction_count=summary["transaction_count"],
+        )
+        for name, summary in zip(names, summaries)
+    }
+
+
 def generate_algorithm_configs() -> List[str]:
     """Generate list of algorithm configurations to test.
 
@@ -228,21 +365,29 @@ def run_batch_comparison(
 
     print(f"\nRunning {len(configs)} configurations...\n")
 
+    # Synthetic dividend and buy-and-hold configs share one grid pass
+    grid_results = _run_grid_configs(
+        ticker, start_date, end_date, configs, initial_qty, reference_asset, risk_free_asset
+    )
+
     results: List[Dict[str, Any]] = []
 
     # Run each configuration
     for i, algo_name in enumerate(configs, 1):
         print(f"[{i}/{len(configs)}] {algo_name}...", end=" ", flush=True)
 
-        result = run_single_backtest(
-            ticker=ticker,
-            start_date=start_date,
-            end_date=end_date,
-            algo_name=algo_name,
-            initial_qty=initial_qty,
-            reference_rate_ticker=reference_asset,
-            risk_free_rate_ticker=risk_free_asset,
-        )
+        if algo_name in grid_results:
+            result = dict(grid_results[algo_name])
+        else:
+            result = run_single_backtest(
+                ticker=ticker,
+                start_date=start_date,
+                end_date=end_date,
+                algo_name=algo_name,
+                initial_qty=initial_qty,
+                reference_rate_ticker=reference_asset,
+                risk_free_rate_ticker=risk_free_asset,
+            )
 
         # Add ticker for reference
         result["ticker"] = ticker
@@ -257,6 +402,90 @@ def run_batch_comparison(
     return results
 
 
+def run_parallel_batch(
+    tickers: List[str],
+    start_date: date,
+    end_date: date,
+    configs: List[str],
+    initial_qty: float = 10000,
+    reference_asset: str = "VOO",
+    risk_free_asset: str = "BIL",
+    workers: Optional[int] = None,
+    cache: Optional[ResultCache] = None,
+) -> List[Dict[str, Any]]:
+    """Run every (ticker, configuration) pair over a process pool.
+
+    Produces run_single_backtest() rows for all pairs, run as jobs of a
+    ParallelBacktestRunner; each ticker's data is loaded once and shared
+    with the workers. Rows are printed as they finish. With a cache, pairs
+    already computed on the same data are not rerun.
+
+    Args:
+        tickers: Stock symbols
+        start_date: Backtest start date
+        end_date: Backtest end date
+        configs: Algorithm configs (e.g., ["buy-and-hold", "sd8", "sd16"])
+        initial_qty: Initial share quantity
+        reference_asset: Ticker for reference asset
+        risk_free_asset: Ticker for risk-free asset
+        workers: Worker processes (default: all cores)
+        cache: Result cache to read and update (default: none)
+
+    Returns:
+        List of result dicts with a "ticker" column, in (ticker, config) order
+    """
+    jobs = [
+        BacktestJob(
+            {ticker: 1.0},
+            portfolio_algo_name(algo_name),
+            start_date,
+            end_date,
+            initial_qty=initial_qty,
+            reference_rate_ticker=reference_asset or None,
+            risk_free_rate_ticker=risk_free_asset or None,
+            tag=(ticker, algo_name),
+        )
+        for ticker in tickers
+        for algo_name in configs
+    ]
+    print(f"\nRunning {len(jobs)} backtests...\n")
+
+    rows: List[Dict[str, Any]] = [{} for _ in jobs]
+    runner = ParallelBacktestRunner(workers, cache=cache)
+    for done, result in enumerate(runner.run(jobs), 1):
+        ticker, algo_name = result.job.tag
+        summary = result.summary
+        if summary is None:
+            row = {
+                "algorithm": algo_name,
+                "error": result.error,
+                "start_date": start_date.isoformat(),
+                "end_date": end_date.isoformat(),
+            }
+            print(f"[{done}/{len(jobs)}] {ticker} {algo_name}... ERROR: {result.error}")
+        else:
+            initial_investment = summary["initial_investment"]
+            row = _build_row(
+                algo_name,
+                summary,
+                ticker,
+                start_price=initial_investment / initial_qty,
+                end_price=summary["assets"][ticker]["final_price"],
+                initial_qty=initial_qty,
+                initial_investment=initial_investment,
+                bank_stats=summary["daily_bank_stats"],
+                transaction_count=summary["transaction_count"],
+            )
+            print(
+                f"[{done}/{len(jobs)}] {ticker} {algo_name}... "
+                f"OK Return: {row['total_return_pct']:.2f}%"
+                + (" (cached)" if result.cached else "")
+            )
+        row["ticker"] = ticker
+        rows[result.position] = row
+    return rows
+
+
 def calculate_deltas(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Calculate differences from buy-and-hold baseline.
 
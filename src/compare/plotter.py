@@ -4,46 +4,22 @@ This module provides functions to create matplotlib charts showing
 historical price data overlaid with buy/sell transaction points.
 """
 
-import re
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Optional
 
 import matplotlib.pyplot as plt
 import pandas as pd
 
-
-def _parse_transaction_line(line: str):
-    """Return dict with date (str), action (BUY/SELL), price (float) if parseable."""
-    if not line or not line.strip():
-        return None
-
-    # Attempt to find an ISO date anywhere in the line
-    date_match = re.search(r"(\d{4}-\d{2}-\d{2})", line)
-    date = date_match.group(1) if date_match else None
-
-    # Find action token (BUY or SELL)
-    action_match = re.search(r"\b(BUY|SELL)\b", line, flags=re.IGNORECASE)
-    action = action_match.group(1).upper() if action_match else None
-
-    # Find price after '@' optionally preceded by $ and/or followed by '=' (e.g. '@ $123.45' or '@ 123.45 = 12345.00')
-    m = re.search(r"@\s*\$?([0-9,]+(?:\.[0-9]+)?)", line)
-    price = None
-    if m:
-        try:
-            price = float(m.group(1).replace(",", ""))
-        except Exception:
-            price = None
-
-    return {"date": date, "action": action, "price": price}
+from src.models.ledger import TransactionLedger
 
 
 def plot_price_with_trades(
     df: pd.DataFrame,
-    transactions: List[str],
+    ledger: TransactionLedger,
     ticker: str,
     out_png: str,
     summary: Optional[Dict[str, Any]] = None,
 ):
-    """Plot price series and overlay buy/sell markers parsed from transactions.
+    """Plot price series and overlay buy/sell markers from the transaction ledger.
 
     Buys = red dots, Sells = green dots. Saves PNG to out_png.
     """
@@ -63,39 +39,18 @@ def plot_price_with_trades(
         # fallback to first numeric column
         price_series = df_plot.select_dtypes(include=["number"]).iloc[:, 0]
 
-    buys_x = []
-    buys_y = []
-    sells_x = []
-    sells_y = []
-
-    for line in transactions:
-        parsed = _parse_transaction_line(line)
-        if not parsed or not parsed.get("date"):
-            continue
-        try:
-            dt = pd.to_datetime(parsed["date"])
-        except Exception:
-            continue
-        price = parsed.get("price")
-        # if price missing, try to lookup close price for that date
-        if price is None:
-            try:
-                price = float(price_series.loc[dt])
-            except Exception:
-                price = None
-        if parsed.get("action") == "BUY":
-            buys_x.append(dt)
-            buys_y.append(price)
-        elif parsed.get("action") == "SELL":
-            sells_x.append(dt)
-            sells_y.append(price)
+    # Markers at the fill price of each executed trade
+    buys = ledger.mask(action="BUY")
+    sells = ledger.mask(action="SELL")
+    buys_x, buys_y = ledger.dates[buys], ledger.price[buys]
+    sells_x, sells_y = ledger.dates[sells], ledger.price[sells]
 
     fig, ax = plt.subplots(figsize=(12, 6))
     ax.plot(price_series.index, price_series.values, label=f"{ticker} Close", color="blue")
 
-    if buys_x:
+    if len(buys_x):
         ax.scatter(buys_x, buys_y, color="red", marker="o", s=50, zorder=5, label="BUYS")
-    if sells_x:
+    if len(sells_x):
         ax.scatter(sells_x, sells_y, color="green", marker="o", s=50, zorder=5, label="SELLS")
 
     ax.set_title(f"{ticker} price with trade markers")
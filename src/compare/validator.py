@@ -14,6 +14,7 @@ import pandas as pd
 from src.algorithms.factory import build_algo_from_name
 from src.data.asset import Asset
 from src.models.backtest import run_algorithm_backtest  # noqa: E402
+from src.models.ledger import TransactionLedger
 
 
 def parse_date(s: str) -> date:
@@ -26,30 +27,12 @@ def parse_date(s: str) -> date:
     raise ValueError(f"Unrecognized date format: {s}")
 
 
-def extract_holdings_from_transactions(transactions: List[str]) -> List[Tuple[date, int]]:
-    """Extract (date, holdings) tuples from transaction strings."""
-    holdings_timeline = []
-    for tx in transactions:
-        # Parse transaction format: "YYYY-MM-DD ACTION qty TICKER @ price = value, holdings = X, bank = Y  # notes"
-        parts = tx.split()
-        if len(parts) < 10:
-            continue
-
-        date_str = parts[0]
-        tx_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-
-        # Find "holdings = X" in the string
-        try:
-            holdings_idx = parts.index("holdings")
-            if holdings_idx + 2 < len(parts):
-                # Next token should be "=" and then the holdings count (may have trailing comma)
-                holdings_str = parts[holdings_idx + 2].rstrip(",")
-                holdings = int(holdings_str)
-                holdings_timeline.append((tx_date, holdings))
-        except (ValueError, IndexError):
-            pass
-
-    return holdings_timeline
+def extract_holdings_from_transactions(
+    ledger: TransactionLedger, ticker: str
+) -> List[Tuple[date, float]]:
+    """Extract (date, holdings) tuples after each executed trade of a ticker."""
+    dates, holdings = ledger.holdings_after(ticker)
+    return list(zip(dates.astype(object), holdings.tolist()))
 
 
 def find_ath_dates(df: pd.DataFrame, start_date: date, end_date: date) -> List[Tuple[date, float]]:
@@ -143,8 +126,12 @@ def compare_algorithms(
     print(f"  Total return: {ath_summary['total_return']*100:.2f}%")
 
     # Extract holdings timelines
-    full_holdings = extract_holdings_from_transactions([tx.to_string() for tx in full_tx])
-    ath_holdings = extract_holdings_from_transactions([tx.to_string() for tx in ath_tx])
+    full_holdings = extract_holdings_from_transactions(
+        TransactionLedger.from_transactions(full_tx), ticker
+    )
+    ath_holdings = extract_holdings_from_transactions(
+        TransactionLedger.from_transactions(ath_tx), ticker
+    )
 
     # Find ATH dates
     ath_dates = find_ath_dates(df, start_date, end_date)
@@ -192,18 +179,12 @@ def compare_algorithms(
     resell_count = 0
 
     for tx in full_tx[1:]:
-        tx_str = tx.to_string()
-        if " BUY " in tx_str and "Buying back" in tx_str:
+        if tx.action == "BUY" and "Buying back" in tx.notes:
             buyback_count += 1
-        elif " SELL " in tx_str and "Taking profits" in tx_str:
-            parts = tx_str.split()
-            if len(parts) >= 3:
-                # qty_str = parts[2]  # Unused - kept for reference
-                # Check if this is a buyback resell (not an ATH sell)
-                # ATH sells would have higher holdings in ATH-only at same date
-                # For now, count all non-ATH sells
-                if "ATH-only" not in tx_str:
-                    resell_count += 1
+        elif tx.action == "SELL" and "Taking profits" in tx.notes:
+            # For now, count all non-ATH sells
+            if "ATH-only" not in tx.notes:
+                resell_count += 1
 
     print("\nFull algorithm buyback/resell analysis:")
     print(f"  Buyback transactions: {buyback_count}")
@@ -8,13 +8,28 @@ __all__ = [
     "account",
     "backtest",
     "backtest_utils",
+    "cash_overlay",
+    "daily_series",
     "holding",
+    "ledger",
     "lot_selector",
     "market",
+    "market_bundle",
+    "market_data",
     "model_types",
+    "monte_carlo",
+    "online_metrics",
+    "parallel_runner",
+    "parameter_grid",
     "portfolio",
     "portfolio_simulator",
+    "price_paths",
+    "rate_search",
+    "result_cache",
+    "results_store",
     "retirement_backtest",
     "return_adjustments",
+    "stop_conditions",
+    "sweep",
     "synthetic_portfolio",
 ]
@@ -6,7 +6,7 @@ for backtesting against historical OHLC price data.
 
 import warnings
 from datetime import date
-from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Union
 
 import pandas as pd
 
@@ -22,7 +22,10 @@ from src.models.backtest_utils import (  # noqa: F401; (re-exported for backward
 )
 
 # Import common types
+from src.models.market_bundle import MarketDataBundle
 from src.models.model_types import Transaction
+from src.models.online_metrics import MetricFactory
+from src.models.stop_conditions import StopPredicate
 
 # Import utility functions
 
@@ -131,7 +134,6 @@ def _map_portfolio_to_single_ticker_summary(
     start_date: date,
     end_date: date,
     algo_obj: Optional[AlgorithmBase],
-    transactions: Optional[List[Transaction]] = None,
 ) -> Dict[str, Any]:
     """Map portfolio backtest summary to single-ticker format.
 
@@ -160,14 +162,14 @@ def _map_portfolio_to_single_ticker_summary(
     days = (last_date - first_date).days
     years = days / 365.25 if days > 0 else 0.0
 
-    # Calculate bank balance statistics from daily_bank_values
-    daily_bank_balances = list(portfolio_summary.get("daily_bank_values", {}).values())
-    if daily_bank_balances:
-        bank_min = min(daily_bank_balances)
-        bank_max = max(daily_bank_balances)
-        bank_avg = sum(daily_bank_balances) / len(daily_bank_balances)
-        bank_negative_count = sum(1 for b in daily_bank_balances if b < 0)
-        bank_positive_count = sum(1 for b in daily_bank_balances if b > 0)
+    # Bank balance statistics over the daily bank values
+    daily_bank_stats = portfolio_summary.get("daily_bank_stats")
+    if daily_bank_stats:
+        bank_min = daily_bank_stats["bank_min"]
+        bank_max = daily_bank_stats["bank_max"]
+        bank_avg = daily_bank_stats["bank_avg"]
+        bank_negative_count = daily_bank_stats["bank_negative_count"]
+        bank_positive_count = daily_bank_stats["bank_positive_count"]
     else:
         # Fallback if no daily values (shouldn't happen)
         bank_min = portfolio_summary["final_bank"]
@@ -187,12 +189,17 @@ def _map_portfolio_to_single_ticker_summary(
         "end_value": asset_results["final_value"],
         "holdings": asset_results["final_holdings"],
         "bank": portfolio_summary["final_bank"],
-        # Bank statistics - now calculated from daily_bank_values
+        # Bank statistics over the daily bank values
         "bank_min": bank_min,
         "bank_max": bank_max,
         "bank_avg": bank_avg,
         "bank_negative_count": bank_negative_count,
         "bank_positive_count": bank_positive_count,
+        # Online risk metrics (max_drawdown, sharpe_ratio, ...), absent for grid runs
+        "metrics": portfolio_summary.get("metrics", {}),
+        # Early exit (None unless a stop_when predicate ended the run)
+        "stop_reason": portfolio_summary.get("stop_reason"),
+        "stop_date": portfolio_summary.get("stop_date"),
         # Costs/Gains - now supported in portfolio backtest
         "opportunity_cost": portfolio_summary.get("opportunity_cost", 0.0),
         "risk_free_gains": portfolio_summary.get("cash_interest_earned", 0.0),
@@ -204,15 +211,7 @@ def _map_portfolio_to_single_ticker_summary(
         # Withdrawals
         "total_withdrawn": portfolio_summary["total_withdrawn"],
         "withdrawal_count": portfolio_summary["withdrawal_count"],
-        "shares_sold_for_withdrawals": (
-            sum(
-                tx.qty
-                for tx in transactions
-                if tx.action == "SELL" and "withdrawal" in tx.notes.lower()
-            )
-            if transactions
-            else 0
-        ),
+        "shares_sold_for_withdrawals": portfolio_summary["shares_sold_for_withdrawals"],
         "withdrawal_rate_pct": portfolio_summary["withdrawal_rate_pct"],
         # Dividends - now supported in portfolio backtest
         "total_dividends": portfolio_summary.get("total_dividends", 0.0),
@@ -221,15 +220,7 @@ def _map_portfolio_to_single_ticker_summary(
         ),
         # Strict mode
         "skipped_buys": portfolio_summary["skipped_count"],
-        "skipped_buy_value": (
-            sum(
-                tx.price * tx.qty
-                for tx in transactions
-                if tx.action == "SKIP BUY" and "insufficient cash" in tx.notes.lower()
-            )
-            if transactions
-            else 0.0
-        ),
+        "skipped_buy_value": portfolio_summary["skipped_buy_value"],
         "allow_margin": True,  # TODO: Get from params
         # Capital deployment - not tracked in portfolio
         "avg_deployed_capital": 0.0,
@@ -331,7 +322,11 @@ def run_algorithm_backtest(
     allow_margin: bool = True,
     # Investment amount (alternative to initial_qty)
     initial_investment: Optional[float] = None,
-    # Test/development parameters
+    # Simulation engine ("simpy" reference or "fast" plain loop)
+    engine: str = "simpy",
+    # Early-exit predicates (see src.models.stop_conditions)
+    stop_when: Optional[Sequence[StopPredicate]] = None,
+    # Unused: prices are passed to the simulation in memory (kept for callers)
     cache_dir: str = "cache",
     **kwargs: Any,
 ) -> Tuple[List[Transaction], Dict[str, Any]]:
@@ -411,6 +406,11 @@ def run_algorithm_backtest(
                            Default: $1,000,000 (psychologically meaningful amount)
                            Either initial_qty OR initial_investment must be provided
                            If both provided, initial_qty takes precedence
+        engine: Simulation engine, "simpy" (default, reference) or "fast"
+                (plain day loop with identical results, cheaper for sweeps)
+        stop_when: Stop predicates (see src.models.stop_conditions); the run
+                   ends on the first day one holds, and the summary reports
+                   stop_reason and stop_date
 
     Returns:
         Tuple of (transaction_strings, summary_dict)
@@ -491,6 +491,8 @@ def run_algorithm_backtest(
             withdrawal_frequency_days=withdrawal_frequency_days,
             reference_rate_ticker=reference_rate_ticker,
             risk_free_rate_ticker=risk_free_rate_ticker,
+            engine=engine,
+            stop_when=stop_when,
         )
 
     # ========================================================================
@@ -520,6 +522,8 @@ def run_algorithm_backtest(
             "simple_mode",
             "allow_margin",
             "initial_investment",
+            "engine",
+            "stop_when",
             "reference_asset_df",
             "risk_free_asset_df",  # Backwards-compatible aliases
             "reference_asset_ticker",
@@ -546,14 +550,6 @@ def run_algorithm_backtest(
     if end_date is None:
         end_date = max(df_indexed.index)
 
-    # Ensure the data is cached so run_portfolio_backtest can fetch it
-    from src.data.asset import Asset
-
-    asset = Asset(ticker, cache_dir=cache_dir)
-    asset._save_price_cache(df_indexed)
-    # Force use of cache by disabling provider
-    asset._provider = None
-
     # Convert algorithm to portfolio algorithm
     portfolio_algo = _create_portfolio_algorithm_from_single_ticker(
         algo=algo,
@@ -578,32 +574,34 @@ def run_algorithm_backtest(
     # Convert dividend_series to dividend_data format for portfolio backtest
     dividend_data = {ticker: dividend_series} if dividend_series is not None else None
 
-    # Mock the fetcher to return cached data for single-ticker mode
-    from unittest.mock import patch
-
-    import src.data.fetcher as fetcher_module
-
-    def mock_get_history(self, ticker_arg, start_date_arg, end_date_arg):
-        if ticker_arg == ticker:
-            return df_indexed
-        return None
+    # The caller's frame is the only price data: benchmark, risk-free and
+    # inflation tickers have none in single-ticker mode
+    price_frames: Dict[str, Optional[pd.DataFrame]] = {
+        other: None
+        for other in (reference_rate_ticker, risk_free_rate_ticker, inflation_rate_ticker)
+        if other
+    }
+    price_frames[ticker] = df_indexed
 
-    with patch.object(fetcher_module.HistoryFetcher, "get_history", mock_get_history):
-        # Call portfolio backtest
-        transactions, portfolio_summary = run_portfolio_backtest(
-            allocations=allocations,
-            start_date=start_date,
-            end_date=end_date,
-            portfolio_algo=portfolio_algo,
-            initial_investment=investment,
-            allow_margin=allow_margin,
-            withdrawal_rate_pct=withdrawal_rate_pct,
-            withdrawal_frequency_days=withdrawal_frequency_days,
-            reference_rate_ticker=reference_rate_ticker,
-            risk_free_rate_ticker=risk_free_rate_ticker,
-            inflation_rate_ticker=inflation_rate_ticker,
-            dividend_data=dividend_data,
-        )
+    # Call portfolio backtest
+    transactions, portfolio_summary = run_portfolio_backtest(
+        allocations=allocations,
+        start_date=start_date,
+        end_date=end_date,
+        portfolio_algo=portfolio_algo,
+        initial_investment=investment,
+        allow_margin=allow_margin,
+        withdrawal_rate_pct=withdrawal_rate_pct,
+        withdrawal_frequency_days=withdrawal_frequency_days,
+        reference_rate_ticker=reference_rate_ticker,
+        risk_free_rate_ticker=risk_free_rate_ticker,
+        inflation_rate_ticker=inflation_rate_ticker,
+        dividend_data=dividend_data,
+        engine=engine,
+        detail="summary",
+        stop_when=stop_when,
+        price_frames=price_frames,
+    )
 
     # Map portfolio results to single-ticker format
     summary = _map_portfolio_to_single_ticker_summary(
@@ -615,7 +613,6 @@ def run_algorithm_backtest(
         algo_obj=(
             portfolio_algo.strategies[ticker] if hasattr(portfolio_algo, "strategies") else None
         ),
-        transactions=transactions,
     )
 
     # Update allow_margin in summary
@@ -694,6 +691,12 @@ def run_portfolio_backtest(
     reference_rate_ticker: Optional[str] = None,
     risk_free_rate_ticker: Optional[str] = None,
     inflation_rate_ticker: Optional[str] = None,
+    engine: str = "simpy",
+    detail: str = "full",
+    metrics: Optional[Sequence[MetricFactory]] = None,
+    stop_when: Optional[Sequence[StopPredicate]] = None,
+    price_frames: Optional[Mapping[str, Optional[pd.DataFrame]]] = None,
+    market_bundle: Optional[MarketDataBundle] = None,
     # Legacy compatibility parameters (deprecated, ignored with warnings)
     algo: Optional[Union[AlgorithmBase, Callable, str]] = None,
     simple_mode: bool = False,
@@ -736,6 +739,29 @@ def run_portfolio_backtest(
             Used to calculate inflation-adjusted (real) returns
             Tracks cumulative inflation adjustment from start date
             Adds real_return and inflation_adjusted metrics to summary
+        engine: Simulation engine:
+            - "simpy" - Discrete-event reference implementation (default)
+            - "fast" - Plain day loop with identical semantics and results,
+              without per-day generator/event overhead (use for sweeps)
+        detail: Results kept in the summary:
+            - "summary" - Scalars and aggregates such as daily_bank_stats only
+              (use for sweeps that hold many results in memory)
+            - "daily" - Adds the daily value series ("daily" as a DailySeries,
+              plus date-keyed "daily_values", "daily_bank_values", ... views)
+            - "full" - Adds the columnar transaction ledger ("ledger") (default)
+        metrics: Online metric factories updated each day, reported under
+            "metrics" at every detail level (max_drawdown, sharpe_ratio, ...)
+            Default: DEFAULT_METRICS from src.models.online_metrics
+        stop_when: Stop predicates evaluated on each day (see
+            src.models.stop_conditions), e.g. [PortfolioBelow(0.0)] to end a
+            withdrawal run once it is depleted. The summary then covers the
+            simulated days only, with "stop_reason" and "stop_date" set
+        price_frames: Preloaded price history by ticker, used instead of
+            fetching (None for a ticker means no data), e.g. frames loaded
+            once for a sweep. Tickers not in it are fetched as usual
+        market_bundle: Market data from MarketDataBundle.load for these
+            tickers, sliced to start_date/end_date, so runs over the same
+            tickers (e.g., rolling windows) skip fetching and alignment
         algo: DEPRECATED - Use portfolio_algo instead
         simple_mode: DEPRECATED - No longer used
         **kwargs: DEPRECATED - Ignored legacy parameters
@@ -762,6 +788,12 @@ def run_portfolio_backtest(
         reference_rate_ticker=reference_rate_ticker,
         risk_free_rate_ticker=risk_free_rate_ticker,
         inflation_rate_ticker=inflation_rate_ticker,
+        engine=engine,
+        detail=detail,
+        metrics=metrics,
+        stop_when=stop_when,
+        price_frames=price_frames,
+        market_bundle=market_bundle,
         algo=algo,
         simple_mode=simple_mode,
         **kwargs,
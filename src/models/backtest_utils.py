@@ -1,5 +1,6 @@
 """Utility functions for backtesting algorithms."""
 
+import bisect
 import math
 from datetime import date
 from typing import Any, Dict, List, Optional, Tuple
@@ -64,6 +65,108 @@ def calculate_time_weighted_average_holdings(
     return total_share_days / total_days if total_days > 0 else 0.0
 
 
+class ShareDayAccumulator:
+    """Cumulative share-days of a level that changes over time (e.g., holdings).
+
+    Prefix-sum form of calculate_time_weighted_average_holdings(): levels are
+    recorded in date order, and each change stores the share-days accumulated
+    up to it, so the average over any window is two binary searches instead
+    of a walk over the whole history. Works for any level, e.g. a bank
+    balance in dollar-days.
+
+    The level on a calendar day is the last one recorded on or before it;
+    days before the first record count as zero.
+
+    Example:
+        >>> history = ShareDayAccumulator()
+        >>> history.record(date(2024, 1, 1), 100)
+        >>> history.record(date(2024, 3, 1), 150)
+        >>> round(history.average(date(2024, 1, 1), date(2024, 3, 31)), 2)
+        117.03
+    """
+
+    __slots__ = ("_ordinals", "_levels", "_cumulative")
+
+    def __init__(self) -> None:
+        """Initialize with no recorded levels."""
+        # Day ordinal where each level starts, the level, and share-days before it
+        self._ordinals: List[int] = []
+        self._levels: List[float] = []
+        self._cumulative: List[float] = []
+
+    def record(self, date_: date, level: float) -> None:
+        """Record the level from date_ onward (a later record on the same day wins).
+
+        Args:
+            date_: Date of the change (not earlier than the last record)
+            level: New level
+        """
+        ordinal = date_.toordinal()
+        if self._ordinals:
+            last = self._ordinals[-1]
+            if ordinal == last:
+                self._levels[-1] = level
+                return
+            if level == self._levels[-1]:
+                return
+            self._cumulative.append(self._cumulative[-1] + self._levels[-1] * (ordinal - last))
+        else:
+            self._cumulative.append(0.0)
+        self._ordinals.append(ordinal)
+        self._levels.append(level)
+
+    def share_days(self, period_start: date, period_end: date) -> float:
+        """Sum of the daily level over [period_start, period_end] (inclusive)."""
+        ordinals = self._ordinals
+        if not ordinals:
+            return 0.0
+        start = max(period_start.toordinal(), ordinals[0])
+        stop = period_end.toordinal() + 1
+        if stop <= start:
+            return 0.0
+
+        first = bisect.bisect_right(ordinals, start) - 1
+        last = bisect.bisect_right(ordinals, stop - 1) - 1
+        if first == last:
+            return self._levels[first] * (stop - start)
+        return (
+            self._levels[first] * (ordinals[first + 1] - start)
+            + (self._cumulative[last] - self._cumulative[first + 1])
+            + self._levels[last] * (stop - ordinals[last])
+        )
+
+    def average(self, period_start: date, period_end: date) -> float:
+        """Time-weighted average level over [period_start, period_end] (inclusive).
+
+        Same result as calculate_time_weighted_average_holdings() over the
+        recorded (date, level) history.
+        """
+        total_days = (period_end - period_start).days + 1
+        if total_days <= 0:
+            return 0.0
+        return self.share_days(period_start, period_end) / total_days
+
+
+def bracket_anchor(
+    price: float, rebalance_size: float, bracket_seed: Optional[float] = None
+) -> float:
+    """Move a price onto the nearest rung of the bracket_seed ladder.
+
+    Without a seed (or with a non-positive spacing) the price is the anchor.
+
+    Args:
+        price: Last transaction price
+        rebalance_size: Bracket spacing as decimal (e.g., 0.0905 for 9.05%)
+        bracket_seed: Optional seed price the ladder passes through (e.g., 100.0)
+    """
+    if bracket_seed is None or bracket_seed <= 0 or rebalance_size <= 0:
+        return price
+    # Calculate which bracket the price is on relative to bracket_seed
+    bracket_n = math.log(price / bracket_seed) / math.log(1 + rebalance_size)
+    # Normalize to the exact bracket position on the bracket_seed ladder
+    return bracket_seed * math.pow(1 + rebalance_size, round(bracket_n))
+
+
 def calculate_synthetic_dividend_orders(
     holdings: float,
     last_transaction_price: float,
@@ -98,13 +201,7 @@ def calculate_synthetic_dividend_orders(
         Dict with keys: next_buy_price, next_buy_qty, next_sell_price, next_sell_qty
     """
     # If bracket_seed is provided, normalize last_transaction_price to bracket ladder
-    anchor_price = last_transaction_price
-    if bracket_seed is not None and bracket_seed > 0 and rebalance_size > 0:
-        # Calculate which bracket the current price is on relative to bracket_seed
-        bracket_n = math.log(last_transaction_price / bracket_seed) / math.log(1 + rebalance_size)
-        bracket_rounded = round(bracket_n)
-        # Normalize to the exact bracket position on the bracket_seed ladder
-        anchor_price = bracket_seed * math.pow(1 + rebalance_size, bracket_rounded)
+    anchor_price = bracket_anchor(last_transaction_price, rebalance_size, bracket_seed)
 
     # Buy at r% below anchor price
     next_buy_price: float = anchor_price / (1 + rebalance_size)
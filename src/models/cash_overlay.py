@@ -0,0 +1,495 @@
+"""Replay of withdrawal and interest variants over one trading simulation.
+
+With allow_margin=True, algorithms whose orders never depend on the bank
+(reads_bank = False: buy-and-hold, synthetic dividend) make the same trades
+whatever the withdrawal rate, cash interest or opportunity cost; only the
+bank balance differs between those runs. CashFlowReplay runs the trading
+simulation once, without withdrawals or interest, and keeps its bank flows
+(trades and dividends, by day) and asset value path. Each CashFlowOverlay
+is then evaluated by rolling the bank forward over those flows, for all
+overlays at once on arrays of shape (n_overlays,); when no overlay accrues
+interest the bank paths are a single cumulative sum. Online metrics and the
+reference baseline are recomputed from each overlay's bank and portfolio
+paths.
+
+The replay is exact only while the trades cannot change, so it refuses:
+    - algorithms that read the bank (ReplayNotSupported when recording)
+    - CASH allocations, whose sweep interest depends on the bank balance
+    - overlays under which a withdrawal exceeds the bank and would force a
+      sale; these evaluate to None, to be run in full by the caller
+
+Example:
+    >>> replay = CashFlowReplay.record(
+    ...     allocations={"VOO": 1.0}, start_date=start, end_date=end,
+    ...     portfolio_algo="per-asset:sd8",
+    ... )
+    >>> summaries = replay.evaluate([CashFlowOverlay(withdrawal_rate_pct=r) for r in (2, 4, 6)])
+"""
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from src.algorithms.base import AlgorithmBase
+from src.algorithms.portfolio_base import PortfolioAlgorithmBase
+from src.models.daily_series import DailyValues, daily_bank_stats
+from src.models.market_bundle import MarketDataBundle
+from src.models.online_metrics import MetricFactory, MetricSet
+from src.models.simulation import (
+    annualized_return_pct,
+    close_to_close_returns,
+    reference_baseline,
+    run_portfolio_simulation,
+    withdrawal_schedule,
+)
+
+# Daily opportunity-cost rate used when a reference ticker has no return for a day
+REFERENCE_RATE_FALLBACK = 0.00027
+
+# Summary entries that depend on the cash account, recomputed for each overlay;
+# the daily series and ledger of the recording run are dropped
+CASH_KEYS = frozenset(
+    {
+        "total_final_value",
+        "final_bank",
+        "total_return",
+        "annualized_return",
+        "total_withdrawn",
+        "withdrawal_count",
+        "withdrawal_rate_pct",
+        "cash_interest_earned",
+        "opportunity_cost",
+        "cash_interest_rate_pct",
+        "risk_free_rate_ticker",
+        "bank_min",
+        "bank_max",
+        "daily_bank_stats",
+        "metrics",
+        "daily",
+        "ledger",
+        "daily_values",
+        "daily_bank_values",
+        "daily_withdrawals",
+        "real_final_value",
+        "real_total_return",
+        "real_annualized_return",
+        "baseline",
+        "volatility_alpha",
+        "alpha_pct",
+    }
+)
+
+
+class ReplayNotSupported(ValueError):
+    """The trades of a run may depend on its cash, so it cannot be replayed."""
+
+
+@dataclass(frozen=True)
+class CashFlowOverlay:
+    """Withdrawal and interest policy applied to a recorded run.
+
+    Fields mirror the run_portfolio_backtest parameters of the same names.
+    """
+
+    withdrawal_rate_pct: float = 0.0
+    withdrawal_frequency_days: int = 30
+    cash_interest_rate_pct: float = 0.0
+    reference_rate_ticker: Optional[str] = None
+    risk_free_rate_ticker: Optional[str] = None
+    simple_mode: bool = False
+
+
+class CashFlowReplay:
+    """Bank flows and asset values of one run, for replaying cash policies."""
+
+    def __init__(
+        self,
+        summary: Dict[str, Any],
+        price_frames: Optional[Mapping[str, Optional[pd.DataFrame]]] = None,
+        market_bundle: Optional[MarketDataBundle] = None,
+        metrics: Optional[Sequence[MetricFactory]] = None,
+    ) -> None:
+        """Take the bank flows of a run without withdrawals or interest.
+
+        Use record() to run the simulation as well. Between two recorded
+        days the bank changes only by trades and dividends, so the change in
+        the recorded bank is each day's flow; the dividends paid after the
+        last day's recording are the gap to final_bank.
+
+        Args:
+            summary: Summary of the run, at detail "daily" or "full"
+            price_frames: Preloaded price history by ticker, for overlay
+                reference and risk-free tickers (others are fetched)
+            market_bundle: Market data of the run, whose reference and
+                risk-free prices serve overlays naming those tickers
+            metrics: Online metric factories of the run (default:
+                DEFAULT_METRICS), recomputed for each overlay
+
+        Raises:
+            ValueError: If the run withdrew, accrued interest, stopped early or
+                has no daily series
+        """
+        if "daily" not in summary:
+            raise ValueError("CashFlowReplay needs a run recorded at detail 'daily' or 'full'")
+        if summary["total_withdrawn"] or summary["cash_interest_earned"]:
+            raise ValueError("CashFlowReplay needs a run without withdrawals or interest")
+        if summary["opportunity_cost"] or summary.get("stop_date") is not None:
+            raise ValueError("CashFlowReplay needs a full run without opportunity cost")
+
+        daily = summary["daily"]
+        self.summary = summary
+        self.dates: Sequence[date] = daily.dates
+        self.asset_value: np.ndarray = daily.asset_values.sum(axis=0)
+        self.initial_investment: float = summary["initial_investment"]
+        self.bank_flows: np.ndarray = np.diff(daily.bank, prepend=0.0)
+        self.final_flow: float = summary["final_bank"] - float(daily.bank[-1])
+        self.price_frames = price_frames
+        self.market_bundle = market_bundle
+        self.metrics = metrics
+        self._frames: Dict[str, Optional[pd.DataFrame]] = {}
+        self._returns: Dict[str, Dict[date, float]] = {}
+
+    @classmethod
+    def record(
+        cls,
+        allocations: Dict[str, float],
+        start_date: date,
+        end_date: date,
+        portfolio_algo: Union[PortfolioAlgorithmBase, str],
+        initial_investment: float = 1_000_000.0,
+        dividend_data: Optional[Dict[str, pd.Series]] = None,
+        inflation_rate_ticker: Optional[str] = None,
+        engine: str = "fast",
+        price_frames: Optional[Mapping[str, Optional[pd.DataFrame]]] = None,
+        market_bundle: Optional[MarketDataBundle] = None,
+        metrics: Optional[Sequence[MetricFactory]] = None,
+    ) -> "CashFlowReplay":
+        """Run the trading simulation once, with margin and no cash flows.
+
+        Args:
+            allocations: Dict mapping ticker → target allocation
+            start_date: Backtest start date
+            end_date: Backtest end date
+            portfolio_algo: Portfolio algorithm or name (must not read the bank)
+            initial_investment: Total starting capital
+            dividend_data: Dividend series by ticker (None = auto-fetch)
+            inflation_rate_ticker: Optional inflation ticker, for real returns
+            engine: Simulation engine for the recording run
+            price_frames: Preloaded price history by ticker (see
+                run_portfolio_simulation)
+            market_bundle: Market data loaded once for these tickers (see
+                run_portfolio_simulation)
+            metrics: Online metric factories (see run_portfolio_simulation)
+
+        Raises:
+            ReplayNotSupported: If the algorithm reads the bank or the
+                portfolio holds CASH
+        """
+        if isinstance(portfolio_algo, str):
+            from src.algorithms.portfolio_factory import build_portfolio_algo_from_name
+
+            portfolio_algo = build_portfolio_algo_from_name(portfolio_algo, allocations)
+        check_replayable(portfolio_algo, allocations)
+
+        _, summary = run_portfolio_simulation(
+            allocations=allocations,
+            start_date=start_date,
+            end_date=end_date,
+            portfolio_algo=portfolio_algo,
+            initial_investment=initial_investment,
+            allow_margin=True,
+            dividend_data=dividend_data,
+            inflation_rate_ticker=inflation_rate_ticker,
+            engine=engine,
+            detail="daily",
+            price_frames=price_frames,
+            market_bundle=market_bundle,
+            metrics=metrics,
+        )
+        if market_bundle is not None:
+            market_bundle = market_bundle.between(start_date, end_date)
+        return cls(summary, price_frames, market_bundle, metrics)
+
+    @classmethod
+    def record_single_ticker(
+        cls,
+        df: pd.DataFrame,
+        ticker: str,
+        initial_qty: float,
+        start_date: date,
+        end_date: date,
+        algo: AlgorithmBase,
+        dividend_series: Optional[pd.Series] = None,
+        inflation_rate_ticker: Optional[str] = None,
+    ) -> "CashFlowReplay":
+        """Record a single-ticker run over a caller's price frame.
+
+        The run_algorithm_backtest counterpart of record().
+
+        Args:
+            df: Price history DataFrame
+            ticker: Asset ticker symbol
+            initial_qty: Initial shares owned (sets the investment)
+            start_date: Backtest start date
+            end_date: Backtest end date
+            algo: Trading algorithm instance (must not read the bank)
+            dividend_series: Dividends per share (None = auto-fetch)
+            inflation_rate_ticker: Optional inflation ticker, for real returns
+        """
+        from src.models.backtest import _create_portfolio_algorithm_from_single_ticker
+
+        df_indexed = df.copy()
+        df_indexed.index = pd.to_datetime(df_indexed.index).date
+        first_idx = min(d for d in df_indexed.index if d >= start_date)
+        investment = initial_qty * float(df_indexed.loc[first_idx, "Close"])
+
+        portfolio_algo = _create_portfolio_algorithm_from_single_ticker(
+            algo=algo, algo_params=None, ticker=ticker
+        )
+        # As in run_algorithm_backtest, the caller's frame is the only price data
+        price_frames: Dict[str, Optional[pd.DataFrame]] = {}
+        if inflation_rate_ticker:
+            price_frames[inflation_rate_ticker] = None
+        price_frames[ticker] = df_indexed
+        return cls.record(
+            allocations={ticker: 1.0},
+            start_date=start_date,
+            end_date=end_date,
+            portfolio_algo=portfolio_algo,
+            initial_investment=investment,
+            dividend_data={ticker: dividend_series} if dividend_series is not None else None,
+            inflation_rate_ticker=inflation_rate_ticker,
+            price_frames=price_frames,
+        )
+
+    def _price_frame(self, ticker: str) -> Optional[pd.DataFrame]:
+        """Date-indexed price history of an overlay ticker (None if it has none)."""
+        if ticker not in self._frames:
+            bundle = self.market_bundle
+            df: Optional[pd.DataFrame]
+            if bundle is not None and ticker == bundle.reference_rate_ticker:
+                df = bundle.reference_data
+            elif bundle is not None and ticker == bundle.risk_free_rate_ticker:
+                df = bundle.risk_free_data
+            elif self.price_frames is not None and ticker in self.price_frames:
+                df = self.price_frames[ticker]
+            else:
+                from src.data.fetcher import HistoryFetcher
+
+                df = HistoryFetcher().get_history(ticker, self.dates[0], self.dates[-1])
+            if df is not None and not df.empty:
+                df = df.copy()
+                df.index = pd.to_datetime(df.index).date
+                self._frames[ticker] = df
+            else:
+                self._frames[ticker] = None
+        return self._frames[ticker]
+
+    def _daily_returns(self, ticker: str, fallback: float) -> np.ndarray:
+        """Close-to-close returns of a ticker over the calendar (fallback where missing)."""
+        if ticker not in self._returns:
+            df = self._price_frame(ticker)
+            self._returns[ticker] = close_to_close_returns(df) if df is not None else {}
+        returns = self._returns[ticker]
+        return np.array([returns.get(d, fallback) for d in self.dates])
+
+    def evaluate(self, overlays: Sequence[CashFlowOverlay]) -> List[Optional[Dict[str, Any]]]:
+        """Summaries of the recorded run under each overlay.
+
+        Args:
+            overlays: Cash-flow policies to apply
+
+        Returns:
+            One summary per overlay, with the run_portfolio_backtest keys
+            that depend on cash (total_final_value, final_bank,
+            total_withdrawn, cash_interest_earned, daily_bank_stats,
+            daily_bank_values, metrics, baseline, ...), or None where a
+            withdrawal would have forced a sale and the overlay must be
+            simulated in full
+        """
+        n_overlays, n_days = len(overlays), len(self.dates)
+
+        # Withdrawal amount per overlay and day
+        withdrawals = np.zeros((n_overlays, n_days))
+        schedules: Dict[int, List[int]] = {}
+        for k, overlay in enumerate(overlays):
+            if overlay.withdrawal_rate_pct > 0:
+                frequency = overlay.withdrawal_frequency_days
+                if frequency not in schedules:
+                    schedules[frequency] = withdrawal_schedule(self.dates, frequency)
+                annual = self.initial_investment * (overlay.withdrawal_rate_pct / 100.0)
+                withdrawals[k, schedules[frequency]] = annual * (frequency / 365.25)
+
+        # Daily rate earned on a positive bank, and opportunity cost of a negative one
+        interest_rates = np.zeros((n_overlays, n_days))
+        reference_rates = np.zeros((n_overlays, n_days))
+        for k, overlay in enumerate(overlays):
+            cash_rate = overlay.cash_interest_rate_pct / 100.0 / 365.25
+            interest_rates[k] = cash_rate
+            if overlay.risk_free_rate_ticker:
+                risk_free = self._daily_returns(overlay.risk_free_rate_ticker, np.nan)
+                if not np.isnan(risk_free).all():
+                    interest_rates[k] = np.where(np.isnan(risk_free), cash_rate, risk_free)
+            if overlay.reference_rate_ticker and not overlay.simple_mode:
+                reference_rates[k] = self._daily_returns(
+                    overlay.reference_rate_ticker, REFERENCE_RATE_FALLBACK
+                )
+
+        interest = np.zeros(n_overlays)
+        opportunity_cost = np.zeros(n_overlays)
+        # Net interest credited per overlay and day (negative for opportunity cost)
+        daily_interest = np.zeros((n_overlays, n_days))
+        if not interest_rates.any() and not reference_rates.any():
+            # No interest: the bank is the recorded one less cumulative withdrawals
+            bank_paths = np.cumsum(self.bank_flows - withdrawals, axis=1)
+            forced_sale = (bank_paths < 0) & (withdrawals > 0)
+        else:
+            bank_paths = np.empty((n_overlays, n_days))
+            forced_sale = np.zeros((n_overlays, n_days), dtype=bool)
+            bank = np.zeros(n_overlays)
+            for day in range(n_days):
+                bank += self.bank_flows[day]
+                due = withdrawals[:, day]
+                forced_sale[:, day] = (due > 0) & (bank < due)
+                bank -= due
+                cost = np.where(bank < 0, -bank * reference_rates[:, day], 0.0)
+                bank -= cost
+                opportunity_cost += cost
+                credit = np.where(bank > 0, bank * interest_rates[:, day], 0.0)
+                credit = np.maximum(credit, 0.0)
+                bank += credit
+                interest += credit
+                daily_interest[:, day] = credit - cost
+                bank_paths[:, day] = bank
+
+        return [
+            (
+                None
+                if forced_sale[k].any()
+                else self._summary(
+                    overlays[k],
+                    bank_paths[k],
+                    withdrawals[k],
+                    daily_interest[k],
+                    float(interest[k]),
+                    float(opportunity_cost[k]),
+                )
+            )
+            for k in range(n_overlays)
+        ]
+
+    def _summary(
+        self,
+        overlay: CashFlowOverlay,
+        bank_path: np.ndarray,
+        withdrawals: np.ndarray,
+        daily_interest: np.ndarray,
+        interest: float,
+        opportunity_cost: float,
+    ) -> Dict[str, Any]:
+        """Summary of one overlay: the recorded run's, with its cash entries replaced."""
+        summary = {key: value for key, value in self.summary.items() if key not in CASH_KEYS}
+        final_bank = float(bank_path[-1]) + self.final_flow
+        final_total_value = final_bank + summary["final_asset_value"]
+        portfolio = bank_path + self.asset_value
+        years = (self.dates[-1] - self.dates[0]).days / 365.25
+        summary.update(
+            {
+                "total_final_value": final_total_value,
+                "final_bank": final_bank,
+                "total_return": (
+                    (final_total_value - self.initial_investment) / self.initial_investment
+                )
+                * 100,
+                "annualized_return": annualized_return_pct(
+                    final_total_value, self.initial_investment, years
+                ),
+                "total_withdrawn": float(withdrawals.sum()),
+                "withdrawal_count": int(np.count_nonzero(withdrawals)),
+                "withdrawal_rate_pct": overlay.withdrawal_rate_pct,
+                "cash_interest_earned": interest,
+                "opportunity_cost": opportunity_cost,
+                "cash_interest_rate_pct": overlay.cash_interest_rate_pct,
+                "risk_free_rate_ticker": overlay.risk_free_rate_ticker,
+                "bank_min": min(self.initial_investment, float(bank_path.min())),
+                "bank_max": max(self.initial_investment, float(bank_path.max())),
+                "daily_bank_stats": daily_bank_stats(bank_path),
+                "daily_values": DailyValues(self.dates, portfolio),
+                "daily_bank_values": DailyValues(self.dates, bank_path),
+                "daily_withdrawals": DailyValues(
+                    self.dates, np.where(withdrawals > 0, withdrawals, np.nan), sparse=True
+                ),
+                "metrics": self._metrics(portfolio, bank_path, withdrawals, daily_interest),
+                "baseline": None,
+                "volatility_alpha": None,
+            }
+        )
+
+        # Buy-and-hold benchmark of the overlay's reference ticker, as the engine reports it
+        if overlay.reference_rate_ticker:
+            reference_data = self._price_frame(overlay.reference_rate_ticker)
+            if reference_data is not None:
+                summary.update(
+                    reference_baseline(
+                        reference_data,
+                        overlay.reference_rate_ticker,
+                        self.dates[0],
+                        self.dates[-1],
+                        self.initial_investment,
+                        final_total_value,
+                        years,
+                    )
+                )
+
+        # Real returns against the recorded run's inflation
+        if summary.get("cumulative_inflation") is not None:
+            real_final_value = final_total_value / (1.0 + summary["cumulative_inflation"] / 100.0)
+            summary["real_final_value"] = real_final_value
+            summary["real_total_return"] = (
+                (real_final_value - self.initial_investment) / self.initial_investment * 100.0
+            )
+            summary["real_annualized_return"] = annualized_return_pct(
+                real_final_value, self.initial_investment, years
+            )
+        return summary
+
+    def _metrics(
+        self,
+        portfolio: np.ndarray,
+        bank_path: np.ndarray,
+        withdrawals: np.ndarray,
+        daily_interest: np.ndarray,
+    ) -> Dict[str, float]:
+        """Online metrics of one overlay's daily paths, updated as the engine does.
+
+        Between withdrawal days the cumulative withdrawal is constant, so each
+        such span is folded in with one update_span() call.
+        """
+        metrics = MetricSet(self.metrics)
+        withdrawn = np.cumsum(withdrawals)
+        bounds = [0, *np.flatnonzero(withdrawals[1:] > 0) + 1, len(portfolio)]
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            metrics.update_span(
+                portfolio[start:stop],
+                bank_path[start:stop],
+                daily_interest[start:stop],
+                float(withdrawn[start]),
+            )
+        return metrics.result()
+
+
+def check_replayable(portfolio_algo: PortfolioAlgorithmBase, allocations: Dict[str, float]) -> None:
+    """Refuse runs whose trades may depend on their cash.
+
+    Raises:
+        ReplayNotSupported: If the algorithm reads the bank or the portfolio holds CASH
+    """
+    if getattr(portfolio_algo, "reads_bank", True):
+        raise ReplayNotSupported(
+            f"{type(portfolio_algo).__name__} reads the bank; its trades depend on cash flows"
+        )
+    if "CASH" in allocations:
+        raise ReplayNotSupported("CASH sweep interest depends on the bank balance")
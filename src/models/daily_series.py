@@ -0,0 +1,225 @@
+"""Columnar daily result series of a portfolio simulation.
+
+The engine values the portfolio once per trading day. Those values are kept
+in preallocated float64 arrays over the run's trading calendar, written by
+integer day position, rather than in dicts keyed by date. Consumers read the
+arrays directly or through to_frame(); DailyValues provides the legacy
+date → value mapping over one column without copying it.
+
+Layout:
+    portfolio/bank/withdrawals: 1-D arrays of shape (n_days,)
+    asset_values: 2-D array of shape (n_tickers, n_days), row i is tickers[i]
+    withdrawals is NaN on days without a withdrawal
+
+How much of a run's results are kept is selected with a detail level:
+    "summary": scalars and aggregates (e.g., daily_bank_stats) only
+    "daily":   adds the DailySeries and its date-keyed views
+    "full":    adds the transaction ledger as well
+"""
+
+import copy
+from datetime import date
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+DETAIL_LEVELS = ("summary", "daily", "full")
+
+
+def validate_detail(detail: str) -> str:
+    """Check a result detail level.
+
+    Args:
+        detail: One of DETAIL_LEVELS
+
+    Returns:
+        The detail level
+
+    Raises:
+        ValueError: If detail is not a known level
+    """
+    if detail not in DETAIL_LEVELS:
+        raise ValueError(f"Unknown detail level {detail!r}; expected one of {DETAIL_LEVELS}")
+    return detail
+
+
+def daily_bank_stats(bank: np.ndarray) -> Dict[str, float]:
+    """Bank min/max/avg and sign counts over a daily bank balance path.
+
+    The average divides a sequential running total (not NumPy's pairwise
+    sum), so it is bit-for-bit what sum() over the daily values returns.
+
+    Args:
+        bank: Daily bank balances (non-empty)
+
+    Returns:
+        Dict with bank_min, bank_max, bank_avg, bank_negative_count and
+        bank_positive_count
+    """
+    bank_sum = float(np.cumsum(bank)[-1])
+    return {
+        "bank_min": float(bank.min()),
+        "bank_max": float(bank.max()),
+        "bank_avg": bank_sum / len(bank),
+        "bank_negative_count": int((bank < 0).sum()),
+        "bank_positive_count": int((bank > 0).sum()),
+    }
+
+
+class DailyValues(Mapping[date, float]):
+    """Read-only date → value view over one daily column.
+
+    Days where the column is NaN are absent when the view is sparse (used
+    for withdrawals, which only exist on some days).
+    """
+
+    __slots__ = ("_dates", "_values", "_positions", "_lookup")
+
+    def __init__(self, dates: Sequence[date], values: np.ndarray, sparse: bool = False) -> None:
+        self._dates = dates
+        self._values = values
+        self._positions: Optional[np.ndarray] = (
+            np.flatnonzero(~np.isnan(values)) if sparse else None
+        )
+        self._lookup: Optional[Dict[date, int]] = None
+
+    def _index(self) -> Dict[date, int]:
+        """Date → position, built on first lookup."""
+        if self._lookup is None:
+            if self._positions is None:
+                self._lookup = {d: i for i, d in enumerate(self._dates)}
+            else:
+                self._lookup = {self._dates[i]: int(i) for i in self._positions}
+        return self._lookup
+
+    def __len__(self) -> int:
+        return len(self._dates) if self._positions is None else len(self._positions)
+
+    def __iter__(self) -> Iterator[date]:
+        if self._positions is None:
+            return iter(self._dates)
+        return (self._dates[i] for i in self._positions)
+
+    def __getitem__(self, key: date) -> float:
+        position = self._index().get(key)
+        if position is None:
+            raise KeyError(key)
+        return float(self._values[position])
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._index()
+
+    def values(self) -> List[float]:  # type: ignore[override]
+        """Values in date order, as a list."""
+        values = self._values if self._positions is None else self._values[self._positions]
+        result: List[float] = values.tolist()
+        return result
+
+
+class DailySeries:
+    """Daily portfolio, bank, per-asset and withdrawal values over a calendar.
+
+    Every day is written exactly once by the engine, either one at a time
+    (record) or as a span of idle days (record_span).
+
+    Example:
+        >>> daily = summary["daily"]
+        >>> daily.bank.min()                     # Narrowest cash balance
+        >>> daily.to_frame().resample("ME").last()
+    """
+
+    def __init__(self, dates: Sequence[date], tickers: Sequence[str]) -> None:
+        """Allocate the columns for a calendar and a set of tickers.
+
+        Args:
+            dates: Trading dates of the run, sorted ascending
+            tickers: Tickers with asset value columns (real assets, no CASH)
+        """
+        n_days = len(dates)
+        self.dates: Sequence[date] = dates
+        self.tickers: List[str] = list(tickers)
+        self.portfolio = np.zeros(n_days)
+        self.bank = np.zeros(n_days)
+        self.asset_values = np.zeros((len(self.tickers), n_days))
+        self.withdrawals = np.full(n_days, np.nan)
+
+    def __len__(self) -> int:
+        """Number of days."""
+        return len(self.dates)
+
+    def record(
+        self, day_index: int, bank: float, asset_values: Sequence[float], portfolio: float
+    ) -> None:
+        """Record one day's values.
+
+        Args:
+            day_index: Day position
+            bank: Bank balance at the end of the day
+            asset_values: Value of each ticker's holdings, in tickers order
+            portfolio: Total portfolio value (bank + assets)
+        """
+        self.bank[day_index] = bank
+        self.asset_values[:, day_index] = asset_values
+        self.portfolio[day_index] = portfolio
+
+    def record_span(
+        self, start: int, bank: np.ndarray, asset_values: np.ndarray, portfolio: np.ndarray
+    ) -> None:
+        """Record consecutive days starting at a day position.
+
+        Args:
+            start: First day position
+            bank: Bank balances, one per day
+            asset_values: Asset values, shape (n_tickers, n_span_days)
+            portfolio: Total portfolio values, one per day
+        """
+        stop = start + len(bank)
+        self.bank[start:stop] = bank
+        self.asset_values[:, start:stop] = asset_values
+        self.portfolio[start:stop] = portfolio
+
+    def record_withdrawal(self, day_index: int, amount: float) -> None:
+        """Record the amount withdrawn on a day."""
+        self.withdrawals[day_index] = amount
+
+    def head(self, n_days: int) -> "DailySeries":
+        """The first n_days of the series, as views over the same columns."""
+        head = copy.copy(self)
+        head.dates = self.dates[:n_days]
+        head.portfolio = self.portfolio[:n_days]
+        head.bank = self.bank[:n_days]
+        head.asset_values = self.asset_values[:, :n_days]
+        head.withdrawals = self.withdrawals[:n_days]
+        return head
+
+    def asset(self, ticker: str) -> np.ndarray:
+        """Daily value of a ticker's holdings."""
+        column: np.ndarray = self.asset_values[self.tickers.index(ticker)]
+        return column
+
+    def bank_stats(self) -> Dict[str, float]:
+        """Bank statistics over the run (see daily_bank_stats())."""
+        return daily_bank_stats(self.bank)
+
+    def to_frame(self) -> pd.DataFrame:
+        """The series as a DataFrame indexed by date.
+
+        Columns are portfolio, bank, withdrawal (NaN on days without one)
+        and one column per ticker.
+        """
+        columns = {"portfolio": self.portfolio, "bank": self.bank, "withdrawal": self.withdrawals}
+        columns.update(zip(self.tickers, self.asset_values))
+        return pd.DataFrame(columns, index=pd.DatetimeIndex(list(self.dates), name="date"))
+
+    def views(self) -> Dict[str, object]:
+        """Legacy date-keyed summary entries, as views over the columns."""
+        return {
+            "daily_values": DailyValues(self.dates, self.portfolio),
+            "daily_bank_values": DailyValues(self.dates, self.bank),
+            "daily_asset_values": {
+                ticker: DailyValues(self.dates, column)
+                for ticker, column in zip(self.tickers, self.asset_values)
+            },
+            "daily_withdrawals": DailyValues(self.dates, self.withdrawals, sparse=True),
+        }
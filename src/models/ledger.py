@@ -0,0 +1,264 @@
+"""Columnar transaction ledger.
+
+The engine records each transaction as a Transaction object, which is what
+algorithms and the text log work with. Analysis tools need columns instead:
+cash flow by year, trade markers on a chart, holdings at each date. This
+module stores a run's transactions as parallel NumPy arrays so those
+questions are vectorized masks and group-bys rather than string parsing.
+
+Layout (one entry per transaction, in execution order):
+    dates: datetime64[D] (NaT if the transaction has no date)
+    ticker_codes / action_codes: integer codes into tickers / actions
+    qty, price, limit_price, bank_after: float64 (NaN when not recorded)
+"""
+
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from src.models.model_types import Transaction
+
+# Action codes shared by every ledger; other actions get codes after these
+ACTIONS: Tuple[str, ...] = (
+    "BUY",
+    "SELL",
+    "SKIP BUY",
+    "SKIP SELL",
+    "DIVIDEND",
+    "INTEREST",
+    "WITHDRAWAL",
+)
+BUY, SELL = 0, 1
+
+
+class LedgerLines:
+    """Lazy sequence of transaction log lines (Transaction.to_string()).
+
+    Lines are rendered only when accessed, so a ledger of tens of thousands
+    of transactions costs nothing until it is printed or written.
+    """
+
+    __slots__ = ("_transactions",)
+
+    def __init__(self, transactions: Sequence[Transaction]) -> None:
+        self._transactions = transactions
+
+    def __len__(self) -> int:
+        return len(self._transactions)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[str, List[str]]:
+        if isinstance(index, slice):
+            return [tx.to_string() for tx in self._transactions[index]]
+        return self._transactions[index].to_string()
+
+    def __iter__(self) -> Iterator[str]:
+        return (tx.to_string() for tx in self._transactions)
+
+
+class TransactionLedger:
+    """A run's transactions as parallel columns.
+
+    Example:
+        >>> ledger = TransactionLedger.from_transactions(transactions)
+        >>> trades = ledger.mask(action="SELL", ticker="NVDA")
+        >>> ledger.value[trades].sum()              # Total sale proceeds
+        >>> ledger.sum_by_year(ledger.cash_flow())  # Net trading cash per year
+    """
+
+    def __init__(
+        self,
+        transactions: Sequence[Transaction],
+        dates: np.ndarray,
+        tickers: List[str],
+        ticker_codes: np.ndarray,
+        actions: List[str],
+        action_codes: np.ndarray,
+        qty: np.ndarray,
+        price: np.ndarray,
+        limit_price: np.ndarray,
+        bank_after: np.ndarray,
+    ) -> None:
+        """Initialize from pre-built columns (see from_transactions()).
+
+        Args:
+            transactions: Source transactions, kept for notes and log lines
+            dates: Transaction dates, datetime64[D]
+            tickers: Ticker for each ticker code
+            ticker_codes: Index into tickers per transaction
+            actions: Action for each action code (starts with ACTIONS)
+            action_codes: Index into actions per transaction
+            qty: Quantities
+            price: Execution prices
+            limit_price: Limit prices (NaN for non-limit transactions)
+            bank_after: Bank balance after the transaction (NaN if not recorded)
+        """
+        self.transactions = transactions
+        self.dates = dates
+        self.tickers = tickers
+        self.ticker_codes = ticker_codes
+        self.actions = actions
+        self.action_codes = action_codes
+        self.qty = qty
+        self.price = price
+        self.limit_price = limit_price
+        self.bank_after = bank_after
+
+    @classmethod
+    def from_transactions(cls, transactions: Sequence[Transaction]) -> "TransactionLedger":
+        """Build the columns from Transaction objects in one pass.
+
+        Args:
+            transactions: Transactions in execution order
+
+        Returns:
+            TransactionLedger over the transactions
+        """
+        n = len(transactions)
+        tickers: List[str] = []
+        ticker_index: Dict[str, int] = {}
+        actions = list(ACTIONS)
+        action_index = {action: code for code, action in enumerate(actions)}
+
+        dates = np.full(n, np.datetime64("NaT"), dtype="datetime64[D]")
+        ticker_codes = np.empty(n, dtype=np.int32)
+        action_codes = np.empty(n, dtype=np.int16)
+        qty = np.empty(n, dtype=np.float64)
+        price = np.empty(n, dtype=np.float64)
+        limit_price = np.full(n, np.nan, dtype=np.float64)
+        bank_after = np.full(n, np.nan, dtype=np.float64)
+
+        for i, tx in enumerate(transactions):
+            if tx.transaction_date is not None:
+                dates[i] = tx.transaction_date
+            code = ticker_index.get(tx.ticker)
+            if code is None:
+                code = ticker_index[tx.ticker] = len(tickers)
+                tickers.append(tx.ticker)
+            ticker_codes[i] = code
+            code = action_index.get(tx.action)
+            if code is None:
+                code = action_index[tx.action] = len(actions)
+                actions.append(tx.action)
+            action_codes[i] = code
+            qty[i] = tx.qty
+            price[i] = tx.price
+            if tx.limit_price is not None:
+                limit_price[i] = tx.limit_price
+            if tx.bank_after is not None:
+                bank_after[i] = tx.bank_after
+
+        return cls(
+            transactions,
+            dates,
+            tickers,
+            ticker_codes,
+            actions,
+            action_codes,
+            qty,
+            price,
+            limit_price,
+            bank_after,
+        )
+
+    def __len__(self) -> int:
+        """Number of transactions."""
+        return len(self.qty)
+
+    @property
+    def value(self) -> np.ndarray:
+        """Cash amount of each transaction (qty × price)."""
+        value: np.ndarray = self.qty * self.price
+        return value
+
+    @property
+    def years(self) -> np.ndarray:
+        """Calendar year of each transaction."""
+        years: np.ndarray = self.dates.astype("datetime64[Y]").astype(np.int64) + 1970
+        return years
+
+    def mask(
+        self, action: Optional[Union[str, Iterable[str]]] = None, ticker: Optional[str] = None
+    ) -> np.ndarray:
+        """Boolean mask of transactions matching an action (or actions) and ticker.
+
+        Args:
+            action: Action name (e.g., "BUY") or several names; None matches all
+            ticker: Ticker symbol; None matches all
+
+        Returns:
+            Boolean array of length len(self)
+        """
+        selected = np.ones(len(self), dtype=bool)
+        if action is not None:
+            names = [action] if isinstance(action, str) else list(action)
+            codes = [self.actions.index(name) for name in names if name in self.actions]
+            selected &= np.isin(self.action_codes, codes)
+        if ticker is not None:
+            if ticker not in self.tickers:
+                return np.zeros(len(self), dtype=bool)
+            selected &= self.ticker_codes == self.tickers.index(ticker)
+        return selected
+
+    def cash_flow(self) -> np.ndarray:
+        """Trading cash flow per transaction: +value for sells, -value for buys, else 0."""
+        sign = (self.action_codes == SELL).astype(np.float64) - (self.action_codes == BUY)
+        flow: np.ndarray = sign * self.value
+        return flow
+
+    def sum_by_year(
+        self, values: np.ndarray, selected: Optional[np.ndarray] = None
+    ) -> Dict[int, float]:
+        """Sum per-transaction values by calendar year.
+
+        Args:
+            values: One value per transaction (e.g., cash_flow())
+            selected: Optional boolean mask of transactions to include
+
+        Returns:
+            Dict mapping year → sum, for years with at least one transaction
+        """
+        years = self.years
+        if selected is not None:
+            years, values = years[selected], values[selected]
+        if len(years) == 0:
+            return {}
+        unique_years, positions = np.unique(years, return_inverse=True)
+        sums = np.bincount(positions, weights=values)
+        return dict(zip(unique_years.tolist(), sums.tolist()))
+
+    def holdings_after(self, ticker: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Share count after each executed BUY/SELL of a ticker.
+
+        Args:
+            ticker: Ticker symbol
+
+        Returns:
+            Tuple of (dates, holdings) arrays, one entry per BUY/SELL
+        """
+        selected = self.mask(action=("BUY", "SELL"), ticker=ticker)
+        signed = np.where(self.action_codes[selected] == BUY, 1.0, -1.0) * self.qty[selected]
+        return self.dates[selected], np.cumsum(signed)
+
+    @property
+    def lines(self) -> LedgerLines:
+        """Lazy view of the transaction log lines."""
+        return LedgerLines(self.transactions)
+
+    def to_string(self) -> str:
+        """The transaction log as text, one line per transaction."""
+        return "\n".join(self.lines)
+
+    def to_frame(self) -> pd.DataFrame:
+        """The ledger as a DataFrame indexed by transaction date."""
+        return pd.DataFrame(
+            {
+                "ticker": pd.Categorical.from_codes(self.ticker_codes, pd.Index(self.tickers)),
+                "action": pd.Categorical.from_codes(self.action_codes, pd.Index(self.actions)),
+                "qty": self.qty,
+                "price": self.price,
+                "limit_price": self.limit_price,
+                "bank_after": self.bank_after,
+            },
+            index=pd.DatetimeIndex(self.dates, name="date"),
+        )
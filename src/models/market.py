@@ -5,14 +5,18 @@ trigger detection, and execution mechanics. Algorithms place orders,
 the Market executes them based on price action.
 """
 
+import bisect
+import math
 from dataclasses import dataclass
 from datetime import date
 from enum import Enum
-from typing import List, Optional
+from typing import Iterable, List, Optional, Tuple, Union
 
+import numpy as np
 import pandas as pd
 
-from src.models.model_types import Transaction
+from src.models.backtest_utils import bracket_anchor
+from src.models.model_types import Bar, Transaction
 
 
 class OrderType(Enum):
@@ -29,12 +33,90 @@ class OrderAction(Enum):
     SELL = "SELL"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
+class BracketLadder:
+    """Geometric bracket ladder a limit order continues along after it fills.
+
+    After a fill at price P, the next rung sits one bracket beyond P: at
+    P / (1 + r) for buys or P * (1 + r) for sells (P first moved onto the
+    bracket_seed ladder, if any), with the previous rung's quantity times
+    quantity_growth. These are the orders the placing algorithm re-places
+    after a fill, anchored at the fill price (up to float rounding), so
+    Market.evaluate_day can fill every rung the day's range crosses without
+    calling back into it.
+
+    Attributes:
+        rebalance_size: Bracket spacing r as a decimal (e.g., 0.0905)
+        quantity_growth: Ratio of each rung's quantity to the previous rung's
+        bracket_seed: Seed price of the bracket ladder, if orders are aligned to one
+    """
+
+    rebalance_size: float
+    quantity_growth: float
+    bracket_seed: Optional[float] = None
+
+    def rungs(
+        self, action: OrderAction, quantity: float, fill_price: float, low: float, high: float
+    ) -> List[Tuple[float, float]]:
+        """Further rungs reached by the day's range after the first rung fills.
+
+        The count comes from the log of the range extreme's ratio to the
+        anchor, in units of log(1 + r), so a range of any size costs one pass.
+        Every further rung lies beyond the first fill, so none is gapped
+        through: each fills at its limit.
+
+        Args:
+            action: Side of the ladder
+            quantity: Quantity of the first rung
+            fill_price: Price the first rung filled at (its limit, or the open
+                        if the day gapped through it)
+            low: Day's low price
+            high: Day's high price
+
+        Returns:
+            List of (quantity, limit_price) for rungs 2, 3, ... in fill order
+        """
+        step = 1 + self.rebalance_size
+        if step <= 1:
+            return []
+        anchor = bracket_anchor(fill_price, self.rebalance_size, self.bracket_seed)
+
+        if action == OrderAction.BUY:
+            if not low > 0:
+                return []
+            count = max(math.floor(math.log(anchor / low) / math.log(step)), 0)
+            # Settle floating-point rounding at an exact rung boundary
+            while count > 0 and anchor / step**count < low:
+                count -= 1
+            while anchor / step ** (count + 1) >= low:
+                count += 1
+            limits = [anchor / step**k for k in range(1, count + 1)]
+        else:
+            if not high > 0:
+                return []
+            count = max(math.floor(math.log(high / anchor) / math.log(step)), 0)
+            while count > 0 and anchor * step**count > high:
+                count -= 1
+            while anchor * step ** (count + 1) <= high:
+                count += 1
+            limits = [anchor * step**k for k in range(1, count + 1)]
+
+        rungs: List[Tuple[float, float]] = []
+        for limit in limits:
+            quantity *= self.quantity_growth
+            if quantity <= 0:
+                break
+            rungs.append((quantity, limit))
+        return rungs
+
+
+@dataclass(slots=True)
 class Order:
     """Represents a pending order to buy or sell shares.
 
     Limit orders trigger when price crosses threshold.
     Market orders execute immediately at current price.
+    Limit orders with a ladder also fill every further rung a gap crosses.
     """
 
     action: OrderAction
@@ -42,6 +124,7 @@ class Order:
     order_type: OrderType = OrderType.LIMIT
     limit_price: Optional[float] = None
     notes: str = ""
+    ladder: Optional[BracketLadder] = None
 
     def __post_init__(self):
         """Validate order parameters."""
@@ -124,20 +207,87 @@ class Order:
                 return self.limit_price
 
 
+class Fill(Transaction):
+    """Execution record for one filled order (or one rung of its ladder).
+
+    A Transaction whose execution details are typed fields: the order side,
+    the full-precision fill price, the limit price (None for market orders),
+    and the ladder rung (1 = the order's own limit). The notes string is
+    rendered from these fields only when read, so consumers that need the
+    fill price never format or parse it.
+
+    Example:
+        >>> fill = Fill(OrderAction.SELL, 10, price=120.0, limit_price=109.05, rung=1,
+        ...             order_notes="Taking profits")
+        >>> fill.notes
+        'Taking profits #1: limit=$109.05, filled=$120.00'
+    """
+
+    def __init__(
+        self,
+        side: OrderAction,
+        qty: float,
+        price: float,
+        limit_price: Optional[float],
+        rung: int = 1,
+        order_notes: str = "",
+    ) -> None:
+        """Record a fill (date and ticker are set by the engine on execution)."""
+        super().__init__(action=side.value, qty=qty, price=price, limit_price=limit_price)
+        self.side = side
+        self.rung = rung
+        self.order_notes = order_notes
+        # Set after Transaction.__init__, whose notes="" goes through the setter
+        self._notes: Optional[str] = None
+
+    @property
+    def notes(self) -> str:
+        """Human-readable execution notes, rendered on first access."""
+        if self._notes is None:
+            if self.limit_price is not None:
+                detail = f"limit=${self.limit_price:.2f}, filled=${self.price:.2f}"
+            else:
+                detail = f"market fill=${self.price:.2f}"
+            self._notes = f"{self.order_notes} #{self.rung}: {detail}".strip()
+        return self._notes
+
+    @notes.setter
+    def notes(self, value: str) -> None:
+        self._notes = value
+
+
 class Market:
     """Market execution engine that processes pending orders.
 
     Algorithms place orders with the market, which evaluates them
     against price action and executes fills. Handles:
-    - Order book management
+    - Order book management (price-indexed limit ladders)
     - Trigger detection (limit orders)
-    - Multi-bracket gap handling (iterative execution)
+    - Multi-bracket gap handling (closed-form ladder fills)
     - Transaction creation
+
+    The book keeps buy limits sorted best (highest) first and sell limits
+    best (lowest) first, so a day with no fills costs two comparisons
+    against the best bid and ask. Triggered orders still fill in the order
+    they were placed.
     """
 
     def __init__(self):
         """Initialize empty order book."""
-        self.pending_orders: List[Order] = []
+        # Entries are (sort key, placement sequence, order); bids are keyed by
+        # -limit so both ladders sort best-first
+        self._bids: List[Tuple[float, int, Order]] = []
+        self._asks: List[Tuple[float, int, Order]] = []
+        self._market_orders: List[Tuple[int, Order]] = []
+        self._sequence = 0
+
+    @property
+    def pending_orders(self) -> List[Order]:
+        """Pending orders in placement order."""
+        entries = [(seq, order) for _, seq, order in self._bids]
+        entries += [(seq, order) for _, seq, order in self._asks]
+        entries += self._market_orders
+        return [order for _, order in sorted(entries, key=lambda entry: entry[0])]
 
     def place_order(self, order: Order) -> None:
         """Add an order to the pending order book.
@@ -145,88 +295,136 @@ class Market:
         Args:
             order: Order to place
         """
-        self.pending_orders.append(order)
+        self._sequence += 1
+        if order.order_type == OrderType.MARKET:
+            self._market_orders.append((self._sequence, order))
+            return
+
+        assert order.limit_price is not None, "Limit price should be set for LIMIT orders"
+        if order.action == OrderAction.BUY:
+            bisect.insort(self._bids, (-order.limit_price, self._sequence, order))
+        else:
+            bisect.insort(self._asks, (order.limit_price, self._sequence, order))
+
+    def replace_orders(self, orders: Iterable[Order]) -> None:
+        """Replace the whole book with new orders (bulk clear-then-place).
+
+        Args:
+            orders: Orders to place, in placement order
+        """
+        self._bids = []
+        self._asks = []
+        self._market_orders = []
+        for order in orders:
+            self.place_order(order)
 
     def clear_orders(self) -> None:
         """Remove all pending orders from the book."""
-        self.pending_orders = []
+        self._bids = []
+        self._asks = []
+        self._market_orders = []
 
-    def evaluate_day(
-        self, date_: date, price_row: pd.Series, max_iterations: int = 20
-    ) -> List[Transaction]:
+    def evaluate_day(self, date_: date, price_row: Union[Bar, pd.Series]) -> List["Fill"]:
         """Evaluate pending orders against day's price action.
 
-        Iterates to handle multi-bracket gaps: if executing an order
-        places a new order that's also triggered, execute it too.
+        Each triggered order fills once. When a single order triggers and it
+        carries a BracketLadder, every further rung the day's range crosses
+        fills in the same pass (multi-bracket gaps) as rung 2, 3, ... If both a
+        buy and a sell trigger, the intraday path is unknown, so each fills
+        only its first rung.
 
         Args:
             date_: Current date
-            price_row: OHLC price data for the day
-            max_iterations: Safety limit to prevent infinite loops
+            price_row: OHLC prices for the day (a Bar, or a pandas Series row)
 
         Returns:
-            List of executed transactions
+            List of fills (Transactions with typed execution details), in order
         """
-        transactions: List[Transaction] = []
-
-        # Extract OHLC prices (use .get() for safe access)
-        open_price = price_row.get("Open")
-        high = price_row.get("High")
-        low = price_row.get("Low")
+        fills: List[Fill] = []
 
-        # Convert to scalars if they are Series
-        if open_price is not None and hasattr(open_price, "item"):
-            open_price = open_price.item()
-        if high is not None and hasattr(high, "item"):
-            high = high.item()
-        if low is not None and hasattr(low, "item"):
-            low = low.item()
+        bar = Bar.from_row(price_row)
+        low = bar.low
+        high = bar.high
+        open_price: Optional[float] = None if math.isnan(bar.open) else bar.open
 
         # Need high/low to evaluate orders
-        if low is None or high is None:
-            return transactions
-
-        # Iterate to handle cascading triggers (multi-bracket gaps)
-        for iteration in range(1, max_iterations + 1):
-            executed_this_round = False
-
-            # Check each pending order
-            orders_to_remove = []
-            for i, order in enumerate(self.pending_orders):
-                if order.is_triggered(low, high):
-                    # Execute the order with realistic market fills
-                    actual_price = order.get_execution_price(open_price, low, high)
-
-                    # Build transaction notes
-                    if order.order_type == OrderType.LIMIT:
-                        notes = f"{order.notes} #{iteration}: limit=${order.limit_price:.2f}, filled=${actual_price:.2f}"
-                        limit_price = order.limit_price
-                    else:
-                        notes = f"{order.notes} #{iteration}: market fill=${actual_price:.2f}"
-                        limit_price = None
-
-                    transaction = Transaction(
-                        action=order.action.value,
-                        qty=order.quantity,
-                        price=actual_price,
-                        notes=notes.strip(),
-                        limit_price=limit_price,
+        if math.isnan(low) or math.isnan(high):
+            return fills
+
+        # Triggered limits are a best-first prefix of each ladder (NaN never triggers)
+        bids = self._bids
+        asks = self._asks
+        n_bids = 0
+        while n_bids < len(bids) and -bids[n_bids][0] >= low:
+            n_bids += 1
+        n_asks = 0
+        while n_asks < len(asks) and asks[n_asks][0] <= high:
+            n_asks += 1
+        if not (n_bids or n_asks or self._market_orders):
+            return fills
+
+        triggered = [(seq, order) for _, seq, order in bids[:n_bids]]
+        triggered += [(seq, order) for _, seq, order in asks[:n_asks]]
+        triggered += self._market_orders
+        triggered.sort(key=lambda entry: entry[0])
+
+        # Remove executed orders
+        self._bids = bids[n_bids:]
+        self._asks = asks[n_asks:]
+        self._market_orders = []
+
+        for _, order in triggered:
+            # Execute the order with realistic market fills
+            actual_price = order.get_execution_price(open_price, low, high)
+            fills.append(
+                Fill(
+                    side=order.action,
+                    qty=order.quantity,
+                    price=actual_price,
+                    limit_price=order.limit_price if order.order_type == OrderType.LIMIT else None,
+                    order_notes=order.notes,
+                )
+            )
+
+            # Further rungs of a multi-bracket move, one bracket apart from the
+            # fill price on: each fills at its limit
+            if order.ladder is not None and order.limit_price is not None and len(triggered) == 1:
+                rungs = order.ladder.rungs(order.action, order.quantity, actual_price, low, high)
+                for rung, (quantity, rung_limit) in enumerate(rungs, start=2):
+                    fills.append(
+                        Fill(
+                            side=order.action,
+                            qty=quantity,
+                            price=rung_limit,
+                            limit_price=rung_limit,
+                            rung=rung,
+                            order_notes=order.notes,
+                        )
                     )
-                    transactions.append(transaction)
 
-                    # Mark order for removal
-                    orders_to_remove.append(i)
-                    executed_this_round = True
+        return fills
 
-            # Remove executed orders (reverse order to preserve indices)
-            for i in reversed(orders_to_remove):
-                self.pending_orders.pop(i)
+    def next_trigger_index(self, low: np.ndarray, high: np.ndarray, start: int = 0) -> int:
+        """Find the first day position >= start on which any pending order triggers.
 
-            # If no orders executed this iteration, we're done
-            if not executed_this_round:
-                break
+        Vectorized search over the Low/High arrays. A BUY limit triggers when
+        Low <= limit and a SELL limit when High >= limit, so only the highest
+        buy limit and the lowest sell limit matter. NaN prices never trigger,
+        matching is_triggered().
 
-        return transactions
+        Args:
+            low: Low prices by day position
+            high: High prices by day position
+            start: First day position to consider
+
+        Returns:
+            Day position of the first trigger, or len(low) if no order triggers
+        """
+        if self._market_orders:
+            return start  # Market orders fill on the next evaluated day
+        buy_limit = -self._bids[0][0] if self._bids else None
+        sell_limit = self._asks[0][0] if self._asks else None
+        return first_limit_trigger(low, high, buy_limit, sell_limit, start)
 
     def has_pending_orders(self) -> bool:
         """Check if there are any pending orders.
@@ -234,7 +432,7 @@ class Market:
         Returns:
             True if order book is not empty
         """
-        return len(self.pending_orders) > 0
+        return bool(self._bids or self._asks or self._market_orders)
 
     def get_pending_order_count(self) -> int:
         """Get number of pending orders.
@@ -242,4 +440,47 @@ class Market:
         Returns:
             Count of orders in book
         """
-        return len(self.pending_orders)
+        return len(self._bids) + len(self._asks) + len(self._market_orders)
+
+
+def first_limit_trigger(
+    low: np.ndarray,
+    high: np.ndarray,
+    buy_limit: Optional[float],
+    sell_limit: Optional[float],
+    start: int = 0,
+) -> int:
+    """Find the first day position >= start on which Low <= buy_limit or High >= sell_limit.
+
+    The arrays are scanned in growing chunks so a nearby trigger does not
+    cost a scan of the whole remaining series. NaN prices never trigger.
+
+    Args:
+        low: Low prices by day position
+        high: High prices by day position
+        buy_limit: Highest pending buy limit (None if no buy order)
+        sell_limit: Lowest pending sell limit (None if no sell order)
+        start: First day position to consider
+
+    Returns:
+        Day position of the first trigger, or len(low) if none occurs
+    """
+    n = len(low)
+    if buy_limit is None and sell_limit is None:
+        return n
+
+    position = start
+    chunk = 32
+    while position < n:
+        stop = min(n, position + chunk)
+        triggered = np.zeros(stop - position, dtype=bool)
+        if buy_limit is not None:
+            triggered |= low[position:stop] <= buy_limit
+        if sell_limit is not None:
+            triggered |= high[position:stop] >= sell_limit
+        hits = np.flatnonzero(triggered)
+        if hits.size:
+            return position + int(hits[0])
+        position = stop
+        chunk *= 2
+    return n
@@ -0,0 +1,405 @@
+"""Market data for a ticker set and date range, loaded once and shared by runs.
+
+run_portfolio_simulation fetches each ticker's prices, its dividends, BIL for
+a CASH allocation and the reference, risk-free and inflation series, then
+aligns them on the common trading dates. A MarketDataBundle holds the result
+of that work so any number of runs can reuse it:
+
+    >>> bundle = MarketDataBundle.load({"VOO": 0.6, "BND": 0.4}, start, end)
+    >>> for algo in ("per-asset:sd4", "per-asset:sd8", "quarterly-rebalance"):
+    ...     run_portfolio_simulation(allocations, start, end, algo, market_bundle=bundle)
+
+Bundles are immutable and picklable, and between() slices one to a
+sub-range, so rolling windows load the full span once and slice per window.
+fingerprint() hashes a bundle's contents, so cached results can be keyed by
+the data they were computed from (see src.models.result_cache).
+"""
+
+import bisect
+import hashlib
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.models.market_data import AlignedPriceData
+
+
+def _date_indexed(df: Optional[pd.DataFrame]) -> Optional[pd.DataFrame]:
+    """Copy of a price frame indexed by date, or None if it holds no data."""
+    if df is None or df.empty:
+        return None
+    indexed = df.copy()
+    indexed.index = pd.to_datetime(indexed.index).date
+    return indexed
+
+
+def _within(df: Optional[pd.DataFrame], start_date: date, end_date: date) -> Optional[pd.DataFrame]:
+    """Rows of a date-indexed frame between two dates (inclusive)."""
+    if df is None:
+        return None
+    window = df[[start_date <= d <= end_date for d in df.index]]
+    return window if not window.empty else None
+
+
+def cumulative_inflation_from(infl_data: pd.DataFrame, first_date: date) -> Dict[date, float]:
+    """Cumulative inflation factor since first_date, keyed by date.
+
+    Args:
+        infl_data: Date-indexed CPI history with a "Close" or "Value" column
+        first_date: Base date (factor 1.0); must be a row of infl_data
+
+    Returns:
+        Dict mapping date → CPI / CPI at first_date, for dates from first_date
+        (empty if first_date has no CPI row)
+    """
+    cumulative_inflation: Dict[date, float] = {}
+    value_col = "Close" if "Close" in infl_data.columns else "Value"
+    if value_col not in infl_data.columns:
+        return cumulative_inflation
+    infl_values = infl_data[value_col].values
+    infl_dates = list(infl_data.index)
+    if first_date in infl_dates:
+        start_cpi = float(infl_values[infl_dates.index(first_date)])
+        for i, d in enumerate(infl_dates):
+            if d >= first_date:
+                curr_cpi = float(infl_values[i])
+                cumulative_inflation[d] = curr_cpi / start_cpi if start_cpi > 0 else 1.0
+    return cumulative_inflation
+
+
+@dataclass(frozen=True, eq=False)
+class MarketDataBundle:
+    """Aligned prices, dividends and rate series for one ticker set and date range.
+
+    Build with load(); the derived fields (daily reference and risk-free
+    returns, cumulative inflation and dividend events by day position) are
+    computed once on construction.
+
+    Attributes:
+        tickers: Allocation tickers, in allocation order (including CASH)
+        start_date: First date of the loaded range
+        end_date: Last date of the loaded range
+        prices: OHLC prices aligned on the common trading dates
+        dividend_data: Dict mapping ticker → dividend Series (CASH holds BIL's)
+        bil_price_data: BIL prices for CASH sweep interest, if CASH is allocated
+        reference_rate_ticker: Ticker of reference_data, if any
+        reference_data: Date-indexed reference benchmark prices
+        risk_free_rate_ticker: Ticker of risk_free_data, if any
+        risk_free_data: Date-indexed risk-free asset prices
+        inflation_rate_ticker: Ticker of inflation_data, if any
+        inflation_data: Date-indexed CPI history
+    """
+
+    tickers: Tuple[str, ...]
+    start_date: date
+    end_date: date
+    prices: AlignedPriceData
+    dividend_data: Optional[Dict[str, pd.Series]] = None
+    bil_price_data: Optional[pd.DataFrame] = None
+    reference_rate_ticker: Optional[str] = None
+    reference_data: Optional[pd.DataFrame] = None
+    risk_free_rate_ticker: Optional[str] = None
+    risk_free_data: Optional[pd.DataFrame] = None
+    inflation_rate_ticker: Optional[str] = None
+    inflation_data: Optional[pd.DataFrame] = None
+    reference_returns: Dict[date, float] = field(init=False)
+    risk_free_returns: Dict[date, float] = field(init=False)
+    cumulative_inflation: Dict[date, float] = field(init=False)
+    dividend_events: List[Tuple[int, str, date, Any]] = field(init=False)
+
+    def __post_init__(self) -> None:
+        from src.models.simulation import build_dividend_events, close_to_close_returns
+
+        derived = {
+            "reference_returns": (
+                close_to_close_returns(self.reference_data)
+                if self.reference_data is not None
+                else {}
+            ),
+            "risk_free_returns": (
+                close_to_close_returns(self.risk_free_data)
+                if self.risk_free_data is not None
+                else {}
+            ),
+            "cumulative_inflation": (
+                cumulative_inflation_from(self.inflation_data, self.prices.dates[0])
+                if self.inflation_data is not None
+                else {}
+            ),
+            "dividend_events": build_dividend_events(
+                self.dividend_data, self.tickers, self.prices.dates
+            ),
+        }
+        for name, value in derived.items():
+            object.__setattr__(self, name, value)
+
+    @classmethod
+    def load(
+        cls,
+        allocations: Mapping[str, float],
+        start_date: date,
+        end_date: date,
+        dividend_data: Optional[Dict[str, pd.Series]] = None,
+        reference_rate_ticker: Optional[str] = None,
+        risk_free_rate_ticker: Optional[str] = None,
+        inflation_rate_ticker: Optional[str] = None,
+        price_frames: Optional[Mapping[str, Optional[pd.DataFrame]]] = None,
+    ) -> "MarketDataBundle":
+        """Fetch and align the market data of a run.
+
+        Args:
+            allocations: Dict mapping ticker → target allocation (only the
+                         tickers are used)
+            start_date: First date to load
+            end_date: Last date to load
+            dividend_data: Dict mapping ticker → dividend Series. If None
+                           (default), dividends are auto-fetched per ticker
+            reference_rate_ticker: Optional ticker for reference benchmark
+            risk_free_rate_ticker: Optional ticker for risk-free asset
+            inflation_rate_ticker: Optional ticker for inflation data
+            price_frames: Preloaded price history by ticker, used instead of
+                          fetching; None for a ticker means no data
+
+        Returns:
+            MarketDataBundle over the common trading dates in range
+
+        Raises:
+            ValueError: If an asset has no data or the assets share no dates
+        """
+        from src.data.fetcher import HistoryFetcher
+        from src.models.simulation import fetch_dividend_series
+
+        fetcher: Optional[HistoryFetcher] = None
+
+        def get_history(ticker: str) -> Optional[pd.DataFrame]:
+            nonlocal fetcher
+            if price_frames is not None and ticker in price_frames:
+                return price_frames[ticker]
+            if fetcher is None:
+                fetcher = HistoryFetcher()
+            return fetcher.get_history(ticker, start_date, end_date)
+
+        price_data: Dict[str, pd.DataFrame] = {}
+
+        # Separate actual tickers from CASH reserve
+        real_tickers = [t for t in allocations.keys() if t != "CASH"]
+
+        print(f"Fetching data for {len(real_tickers)} assets...")
+        for ticker in real_tickers:
+            print(f"  - {ticker}...", end=" ")
+            df = get_history(ticker)
+            if df is None or df.empty:
+                raise ValueError(f"No data available for {ticker}")
+            price_data[ticker] = df
+            print(f"OK ({len(df)} days)")
+
+        # If CASH allocation exists, fetch BIL data for sweep account interest
+        has_cash_allocation = "CASH" in allocations
+        bil_price_data = None
+
+        if has_cash_allocation:
+            cash_pct = allocations["CASH"] * 100
+            print(f"  - CASH: {cash_pct:.1f}% reserve (sweep account earning BIL yields)")
+
+            # Fetch BIL price data for interest calculations
+            print("  - BIL (sweep account yields)...", end=" ")
+            bil_df = get_history("BIL")
+            if bil_df is not None and not bil_df.empty:
+                bil_price_data = bil_df
+                print(f"OK ({len(bil_df)} days)")
+            else:
+                print("WARNING: No BIL data, CASH will earn 0% interest")
+
+        # Auto-fetch dividend data if not provided
+        if dividend_data is None:
+            print(f"Auto-fetching dividend data for {len(real_tickers)} assets...")
+            dividend_data_auto: Dict[str, pd.Series] = {}
+            for ticker in real_tickers:  # Skip CASH
+                print(f"  - {ticker} dividends...", end=" ")
+                try:
+                    div_series = fetch_dividend_series(ticker, start_date, end_date)
+                    if div_series is not None:
+                        dividend_data_auto[ticker] = div_series
+                        print(f"OK ({len(div_series)} dividends)")
+                    else:
+                        print("None")
+                except Exception as e:
+                    print(f"ERROR: {e}")
+
+            # If CASH allocation exists, fetch BIL dividends for interest
+            if has_cash_allocation:
+                print("  - BIL (CASH interest) dividends...", end=" ")
+                try:
+                    div_series = fetch_dividend_series("BIL", start_date, end_date)
+                    if div_series is not None:
+                        dividend_data_auto["CASH"] = div_series  # Store as CASH dividends
+                        print(
+                            f"OK ({len(div_series)} payments, "
+                            f"~{div_series.sum():.2f}% annual yield)"
+                        )
+                    else:
+                        print("None")
+                except Exception as e:
+                    print(f"ERROR: {e}")
+
+            dividend_data = dividend_data_auto if dividend_data_auto else None
+
+        # Align all tickers on common trading dates (built once, read by day position)
+        prices = AlignedPriceData.from_frames(price_data, start_date, end_date)
+
+        # Fetch reference, risk-free, and inflation data (same logic as backtest.py)
+        reference_data: Optional[pd.DataFrame] = None
+        risk_free_data: Optional[pd.DataFrame] = None
+        inflation_data: Optional[pd.DataFrame] = None
+
+        if reference_rate_ticker:
+            print(f"Fetching reference benchmark ({reference_rate_ticker})...", end=" ")
+            reference_data = _within(
+                _date_indexed(get_history(reference_rate_ticker)), start_date, end_date
+            )
+            if reference_data is not None:
+                print(f"OK ({len(reference_data)} days)")
+            else:
+                print("WARN: No data available, skipping baseline calculation")
+
+        if risk_free_rate_ticker:
+            print(f"Fetching risk-free asset ({risk_free_rate_ticker})...", end=" ")
+            risk_free_data = _within(
+                _date_indexed(get_history(risk_free_rate_ticker)), start_date, end_date
+            )
+            if risk_free_data is not None:
+                print(f"OK ({len(risk_free_data)} days)")
+            else:
+                print("WARN: No data available, falling back to cash_interest_rate_pct")
+
+        if inflation_rate_ticker:
+            print(f"Fetching inflation data ({inflation_rate_ticker})...", end=" ")
+            inflation_data = _within(
+                _date_indexed(get_history(inflation_rate_ticker)), start_date, end_date
+            )
+            if inflation_data is not None:
+                print(f"OK ({len(inflation_data)} days)")
+            else:
+                print("WARN: No data available, skipping inflation adjustment")
+
+        return cls(
+            tickers=tuple(allocations.keys()),
+            start_date=start_date,
+            end_date=end_date,
+            prices=prices,
+            dividend_data=dividend_data,
+            bil_price_data=bil_price_data,
+            reference_rate_ticker=reference_rate_ticker,
+            reference_data=reference_data,
+            risk_free_rate_ticker=risk_free_rate_ticker,
+            risk_free_data=risk_free_data,
+            inflation_rate_ticker=inflation_rate_ticker,
+            inflation_data=inflation_data,
+        )
+
+    @property
+    def dates(self) -> List[date]:
+        """Common trading dates of the bundle."""
+        return self.prices.dates
+
+    def between(self, start_date: date, end_date: date) -> "MarketDataBundle":
+        """Return the bundle restricted to a sub-range of its dates.
+
+        The rate series are cut to the sub-range and the derived fields
+        recomputed, so a run on the slice matches a run that loaded the
+        sub-range itself. Returns self if the range covers the bundle.
+
+        Raises:
+            ValueError: If the range extends past the loaded range or holds
+                        no trading dates
+        """
+        if start_date < self.start_date or end_date > self.end_date:
+            raise ValueError(
+                f"Range {start_date} to {end_date} is outside the loaded range "
+                f"{self.start_date} to {self.end_date}"
+            )
+        if start_date == self.start_date and end_date == self.end_date:
+            return self
+
+        dates = self.prices.dates
+        prices = self.prices.slice(
+            bisect.bisect_left(dates, start_date), bisect.bisect_right(dates, end_date)
+        )
+        return MarketDataBundle(
+            tickers=self.tickers,
+            start_date=start_date,
+            end_date=end_date,
+            prices=prices,
+            dividend_data=self.dividend_data,
+            bil_price_data=self.bil_price_data,
+            reference_rate_ticker=self.reference_rate_ticker,
+            reference_data=_within(self.reference_data, start_date, end_date),
+            risk_free_rate_ticker=self.risk_free_rate_ticker,
+            risk_free_data=_within(self.risk_free_data, start_date, end_date),
+            inflation_rate_ticker=self.inflation_rate_ticker,
+            inflation_data=_within(self.inflation_data, start_date, end_date),
+        )
+
+    def fingerprint(self) -> str:
+        """SHA-256 hex digest of the data a run on this bundle reads.
+
+        Covers the tickers, trading dates, OHLC arrays, dividend events, BIL
+        prices and rate series within the bundle's range, so two bundles
+        with equal fingerprints give identical runs, however they were
+        loaded (a slice of a longer bundle matches a fresh load of the
+        slice's range). Changed or extended price data changes it.
+        """
+        digest = hashlib.sha256()
+
+        def add_frame(name: str, df: Optional[pd.DataFrame]) -> None:
+            digest.update(name.encode())
+            if df is not None:
+                digest.update(repr(list(df.columns)).encode())
+                digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+
+        prices = self.prices
+        digest.update(repr((self.tickers, prices.tickers)).encode())
+        digest.update(prices.ordinals.tobytes())
+        for array in (prices.open, prices.high, prices.low, prices.close):
+            digest.update(np.ascontiguousarray(array).tobytes())
+        events = [(day, ticker, float(amount)) for day, ticker, _, amount in self.dividend_events]
+        digest.update(repr(events).encode())
+        first, last = prices.dates[0], prices.dates[-1]
+        add_frame("bil", _within(_date_indexed(self.bil_price_data), first, last))
+        add_frame(f"reference:{self.reference_rate_ticker}", self.reference_data)
+        add_frame(f"risk-free:{self.risk_free_rate_ticker}", self.risk_free_data)
+        add_frame(f"inflation:{self.inflation_rate_ticker}", self.inflation_data)
+        return digest.hexdigest()
+
+    def check_run(
+        self,
+        allocations: Mapping[str, float],
+        reference_rate_ticker: Optional[str],
+        risk_free_rate_ticker: Optional[str],
+        inflation_rate_ticker: Optional[str],
+    ) -> None:
+        """Check that the bundle holds the data a run asks for.
+
+        The allocation tickers must match; each rate ticker the run names
+        must be the one the bundle loaded (the run ignores rate series it
+        does not name).
+
+        Raises:
+            ValueError: On any mismatch
+        """
+        if set(allocations) != set(self.tickers):
+            raise ValueError(
+                f"Bundle was loaded for {sorted(self.tickers)}, not {sorted(allocations)}"
+            )
+        for name, run_ticker, bundle_ticker in (
+            ("reference", reference_rate_ticker, self.reference_rate_ticker),
+            ("risk-free", risk_free_rate_ticker, self.risk_free_rate_ticker),
+            ("inflation", inflation_rate_ticker, self.inflation_rate_ticker),
+        ):
+            if run_ticker is not None and run_ticker != bundle_ticker:
+                raise ValueError(
+                    f"Bundle was loaded with {name} ticker {bundle_ticker}, not {run_ticker}"
+                )
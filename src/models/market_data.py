@@ -0,0 +1,311 @@
+"""Aligned market data for the simulation engine.
+
+Price histories arrive from the data layer as one pandas DataFrame per ticker,
+each with its own calendar. The simulation only ever needs prices on the common
+trading dates, and it needs them many times per day. This module aligns all
+tickers once per run into contiguous float64 arrays indexed by integer day
+position, so the engine reads prices by position instead of by date label.
+
+Layout:
+    open/high/low/close: 2-D arrays of shape (n_tickers, n_days)
+    Row i holds ticker i's series; column j is common_dates[j]
+    Missing OHLC columns (e.g., Close-only test data) are stored as NaN
+    months/ordinals: 1-D calendar arrays of shape (n_days,)
+"""
+
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.models.model_types import Bar
+
+# Column order used for the OHLC arrays
+PRICE_FIELDS = ("Open", "High", "Low", "Close")
+
+
+class AlignedPriceData:
+    """OHLC prices for a set of tickers aligned on their common trading dates.
+
+    Built once per run from per-ticker DataFrames. Prices are read by integer
+    day position; use index_of() to map a date to its position.
+
+    Example:
+        >>> data = AlignedPriceData.from_frames(price_data, start_date, end_date)
+        >>> i = data.index_of(date(2024, 3, 1))
+        >>> data.close_at("NVDA", i)
+        822.79
+    """
+
+    def __init__(
+        self,
+        tickers: List[str],
+        dates: List[date],
+        open_: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+    ) -> None:
+        """Initialize from pre-aligned arrays.
+
+        Args:
+            tickers: Ticker symbols, in row order
+            dates: Common trading dates, in column order (sorted ascending)
+            open_: Open prices, shape (n_tickers, n_days)
+            high: High prices, shape (n_tickers, n_days)
+            low: Low prices, shape (n_tickers, n_days)
+            close: Close prices, shape (n_tickers, n_days)
+        """
+        self.tickers: List[str] = list(tickers)
+        self.dates: List[date] = list(dates)
+        self.ticker_index: Dict[str, int] = {t: i for i, t in enumerate(self.tickers)}
+        self.date_index: Dict[date, int] = {d: i for i, d in enumerate(self.dates)}
+
+        shape = (len(self.tickers), len(self.dates))
+        self.open = np.ascontiguousarray(open_, dtype=np.float64).reshape(shape)
+        self.high = np.ascontiguousarray(high, dtype=np.float64).reshape(shape)
+        self.low = np.ascontiguousarray(low, dtype=np.float64).reshape(shape)
+        self.close = np.ascontiguousarray(close, dtype=np.float64).reshape(shape)
+        for array in (self.open, self.high, self.low, self.close):
+            array.flags.writeable = False
+
+        # Per-ticker (day, field) matrices of the OHLC fields that have data,
+        # used to build history frames without per-day dict construction
+        self._row_views: Dict[str, Tuple[pd.Index, np.ndarray]] = {}
+        fields_by_name = dict(zip(PRICE_FIELDS, (self.open, self.high, self.low, self.close)))
+        for ticker, row in self.ticker_index.items():
+            present = [f for f in PRICE_FIELDS if not np.isnan(fields_by_name[f][row]).all()]
+            matrix = np.column_stack([fields_by_name[f][row] for f in present])
+            self._row_views[ticker] = (pd.Index(present), matrix)
+
+        # Per-ticker lists of (open, high, low, close) Python floats for bar(),
+        # built on first use
+        self._bar_rows: Dict[str, List[Tuple[float, float, float, float]]] = {}
+
+        # Shared date index for materialized history frames (sliced, never copied)
+        self._date_labels = pd.Index(self.dates, dtype=object)
+
+        # Calendar arrays for vectorized date rules (e.g., rebalance schedules)
+        self.months = np.array([d.month for d in self.dates], dtype=np.int64)
+        self.ordinals = np.array([d.toordinal() for d in self.dates], dtype=np.int64)
+        self.months.flags.writeable = False
+        self.ordinals.flags.writeable = False
+
+    @classmethod
+    def from_frames(
+        cls, price_data: Dict[str, pd.DataFrame], start_date: date, end_date: date
+    ) -> "AlignedPriceData":
+        """Align per-ticker OHLC DataFrames on their common trading dates.
+
+        Args:
+            price_data: Dict mapping ticker → OHLC DataFrame (any datetime-like index)
+            start_date: First date to include (inclusive)
+            end_date: Last date to include (inclusive)
+
+        Returns:
+            AlignedPriceData over the dates present in every frame within range
+
+        Raises:
+            ValueError: If the tickers share no trading dates in range
+        """
+        # Date labels for each frame (Python date objects, no DataFrame copies)
+        frame_dates: Dict[str, pd.Index] = {
+            ticker: pd.Index(pd.to_datetime(df.index).date) for ticker, df in price_data.items()
+        }
+
+        # Find common trading dates
+        all_dates: set[date] = set()
+        for labels in frame_dates.values():
+            dates = set(labels)
+            all_dates = all_dates.intersection(dates) if all_dates else dates
+
+        common_dates = sorted([d for d in all_dates if start_date <= d <= end_date])
+        if not common_dates:
+            raise ValueError("No common trading dates across all assets")
+
+        tickers = list(price_data.keys())
+        shape = (len(tickers), len(common_dates))
+        arrays = {field: np.full(shape, np.nan, dtype=np.float64) for field in PRICE_FIELDS}
+
+        common_index = pd.Index(common_dates)
+        for row, ticker in enumerate(tickers):
+            df = price_data[ticker]
+            positions = frame_dates[ticker].get_indexer(common_index)
+            for field in PRICE_FIELDS:
+                if field in df.columns:
+                    values = df[field].to_numpy(dtype=np.float64)
+                    arrays[field][row, :] = values[positions]
+
+        return cls(
+            tickers=tickers,
+            dates=common_dates,
+            open_=arrays["Open"],
+            high=arrays["High"],
+            low=arrays["Low"],
+            close=arrays["Close"],
+        )
+
+    def __len__(self) -> int:
+        """Number of aligned trading days."""
+        return len(self.dates)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        """Pickle the aligned arrays only; lookup tables are rebuilt on load."""
+        return (
+            AlignedPriceData,
+            (self.tickers, self.dates, self.open, self.high, self.low, self.close),
+        )
+
+    def slice(self, start: int, stop: int) -> "AlignedPriceData":
+        """Return the days [start, stop) as a new AlignedPriceData.
+
+        Raises:
+            ValueError: If the range holds no days
+        """
+        dates = self.dates[start:stop]
+        if not dates:
+            raise ValueError("No common trading dates across all assets")
+        window = slice(start, stop)
+        return AlignedPriceData(
+            tickers=self.tickers,
+            dates=dates,
+            open_=self.open[:, window],
+            high=self.high[:, window],
+            low=self.low[:, window],
+            close=self.close[:, window],
+        )
+
+    def index_of(self, date_: date) -> int:
+        """Return the day position of a trading date.
+
+        Raises:
+            KeyError: If date_ is not a common trading date
+        """
+        return self.date_index[date_]
+
+    def row(self, ticker: str) -> int:
+        """Return the array row holding a ticker's prices."""
+        return self.ticker_index[ticker]
+
+    def has_field(self, ticker: str, field: str) -> bool:
+        """True if the ticker's source data has the OHLC field (e.g., "High")."""
+        return field in self._row_views[ticker][0]
+
+    def closes(self, ticker: str) -> np.ndarray:
+        """Close prices for a ticker over all aligned days (read-only view)."""
+        closes: np.ndarray = self.close[self.ticker_index[ticker]]
+        return closes
+
+    def close_at(self, ticker: str, day_index: int) -> float:
+        """Close price for a ticker at a day position."""
+        return float(self.close[self.ticker_index[ticker], day_index])
+
+    def bar(self, ticker: str, day_index: int) -> Bar:
+        """OHLC prices for one ticker and day as a Bar (missing fields are NaN)."""
+        rows = self._bar_rows.get(ticker)
+        if rows is None:
+            i = self.ticker_index[ticker]
+            rows = list(
+                zip(
+                    self.open[i].tolist(),
+                    self.high[i].tolist(),
+                    self.low[i].tolist(),
+                    self.close[i].tolist(),
+                )
+            )
+            self._bar_rows[ticker] = rows
+        return Bar(*rows[day_index])
+
+    def history_frame(self, ticker: str, day_index: int) -> pd.DataFrame:
+        """OHLC DataFrame for a ticker over days [0, day_index), indexed by date."""
+        fields, matrix = self._row_views[ticker]
+        return pd.DataFrame(
+            matrix[:day_index], index=self._date_labels[:day_index], columns=fields, copy=False
+        )
+
+
+class PriceHistory:
+    """Lazy view of one ticker's aligned prices strictly before a given day.
+
+    The engine hands algorithms a PriceHistory instead of a freshly sliced
+    DataFrame. Construction is O(1); nothing is copied until the algorithm
+    actually reads it. Array accessors (close, open, high, low) return
+    zero-copy prefix views; any DataFrame attribute or indexing materializes
+    the prefix once via to_frame() and delegates to it.
+
+    Example:
+        >>> history = PriceHistory(data, "NVDA", day_index=250)
+        >>> history.close[-20:].mean()       # NumPy view, no DataFrame built
+        >>> history["Close"].rolling(20)    # Materializes a DataFrame once
+    """
+
+    __slots__ = ("_data", "_row", "_ticker", "_end", "_frame")
+
+    def __init__(self, data: AlignedPriceData, ticker: str, day_index: int) -> None:
+        """Create a view of days [0, day_index) for ticker.
+
+        Args:
+            data: Aligned price data for the run
+            ticker: Ticker to view
+            day_index: Current day position (excluded from the history)
+        """
+        self._data = data
+        self._ticker = ticker
+        self._row = data.row(ticker)
+        self._end = day_index
+        self._frame: Optional[pd.DataFrame] = None
+
+    def __len__(self) -> int:
+        """Number of days in the history."""
+        return self._end
+
+    @property
+    def empty(self) -> bool:
+        """True if there are no prior days (first trading day)."""
+        return self._end == 0
+
+    @property
+    def dates(self) -> List[date]:
+        """Dates covered by the history."""
+        return self._data.dates[: self._end]
+
+    @property
+    def open(self) -> np.ndarray:
+        """Open prices before the current day (read-only view)."""
+        return self._data.open[self._row, : self._end]
+
+    @property
+    def high(self) -> np.ndarray:
+        """High prices before the current day (read-only view)."""
+        return self._data.high[self._row, : self._end]
+
+    @property
+    def low(self) -> np.ndarray:
+        """Low prices before the current day (read-only view)."""
+        return self._data.low[self._row, : self._end]
+
+    @property
+    def close(self) -> np.ndarray:
+        """Close prices before the current day (read-only view)."""
+        return self._data.close[self._row, : self._end]
+
+    def to_frame(self) -> pd.DataFrame:
+        """Materialize the history as a date-indexed OHLC DataFrame (cached)."""
+        if self._frame is None:
+            self._frame = self._data.history_frame(self._ticker, self._end)
+        return self._frame
+
+    def __getitem__(self, key: Any) -> Any:
+        """DataFrame-style indexing (e.g., history["Close"])."""
+        return self.to_frame()[key]
+
+    def __getattr__(self, name: str) -> Any:
+        """Delegate any other DataFrame attribute (iloc, tail, columns, ...)."""
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self.to_frame(), name)
+
+    def __repr__(self) -> str:
+        """Short description without materializing the frame."""
+        return f"PriceHistory({self._ticker!r}, days={self._end})"
@@ -5,9 +5,16 @@ Renamed from `types.py` to avoid shadowing the Python standard library module
 `src.models.model_types`.
 """
 
+import math
 from dataclasses import dataclass
 from datetime import date
-from typing import Optional
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Price-row column names and the Bar attributes that hold them
+BAR_FIELDS = {"Open": "open", "High": "high", "Low": "low", "Close": "close"}
 
 
 @dataclass
@@ -21,6 +28,7 @@ class Transaction:
     price: float = 0.0  # Execution price per share (filled by backtest engine)
     ticker: str = ""  # Stock symbol (filled by backtest engine)
     limit_price: Optional[float] = None  # Algorithmic limit price (if this was a limit order)
+    bank_after: Optional[float] = None  # Bank balance after execution (filled by backtest engine)
 
     def to_string(self) -> str:
         """Format transaction as human-readable string."""
@@ -66,3 +74,81 @@ class AssetState:
     ticker: str
     holdings: float  # Share count (changed from int to float for fractional shares)
     price: float  # Current price
+
+
+@dataclass(slots=True)
+class Bar:
+    """One day's OHLC prices for one ticker, as plain floats.
+
+    Passed to algorithms as price_row. Fields missing from the source data
+    (e.g., Close-only test data) are NaN.
+
+    Algorithms written against the pandas Series row keep working: Bar
+    supports price_row["Close"], price_row.get("High"), "High" in price_row
+    and price_row.index, and treats NaN fields as absent, like the Series
+    did. These accessors return NumPy float64 scalars, as the Series did, so
+    price_row["Close"].item() still works. to_series() builds the Series for
+    anything else.
+    """
+
+    open: float
+    high: float
+    low: float
+    close: float
+
+    @classmethod
+    def from_row(cls, row: Any) -> "Bar":
+        """Build a Bar from a pandas Series or mapping price row (a Bar is returned as is)."""
+        if isinstance(row, Bar):
+            return row
+        values = []
+        for field in BAR_FIELDS:
+            value = row.get(field)
+            if value is not None and hasattr(value, "item"):
+                value = value.item()
+            values.append(math.nan if value is None else float(value))
+        return cls(*values)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Series-style get(): the field value, or default if missing or NaN."""
+        attr = BAR_FIELDS.get(key)
+        if attr is None:
+            return default
+        value = getattr(self, attr)
+        return default if math.isnan(value) else np.float64(value)
+
+    def __getitem__(self, key: str) -> np.float64:
+        """Series-style indexing (e.g., price_row["Close"])."""
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return np.float64(value)
+
+    def __contains__(self, key: object) -> bool:
+        """True if the field has data (e.g., "High" in price_row)."""
+        return isinstance(key, str) and self.get(key) is not None
+
+    @property
+    def index(self) -> List[str]:
+        """Names of the fields with data, in Open/High/Low/Close order."""
+        return [field for field in BAR_FIELDS if field in self]
+
+    def to_series(self) -> pd.Series:
+        """The price row as a pandas Series of the fields with data."""
+        return pd.Series({field: self[field] for field in self.index}, dtype=float)
+
+
+@dataclass(slots=True)
+class DayState:
+    """A portfolio's state at the end of one simulated trading day.
+
+    Yielded by iter_portfolio_simulation. Values are those recorded for the
+    day (before any dividend paid after the market step).
+    """
+
+    day_index: int  # Day position in the trading calendar
+    current_date: date
+    bank: float
+    holdings: Tuple[float, ...]  # Shares per ticker, in allocation order (no CASH)
+    portfolio_value: float  # Bank plus asset values
+    fills: Tuple[Transaction, ...] = ()  # Transactions recorded during the day's step
@@ -0,0 +1,628 @@
+"""Monte Carlo backtests: synthetic dividend configurations over N price paths.
+
+A historical backtest answers "what would have happened"; a retirement plan
+needs "how often does it work". simulate_paths() runs K configurations
+(synthetic dividend configs × withdrawal rates) on N synthetic price paths
+(see price_paths) at once. State is kept as (N, K) arrays that advance
+together day by day, as parameter_grid does for K configurations on one
+path:
+
+- trigger detection for every order book is one array comparison per day
+- only the (path, config) cells whose orders fill are updated, as a batch
+- withdrawals, forced sales, interest, drawdowns and depletion are array
+  operations over all cells
+
+Fills follow the single-path engines: limit orders fill at the limit, or at
+the open when the day gaps through it; a buy fills before a sell on the same
+day; a lone triggered order keeps filling one bracket apart from its fill
+price across the day's range; orders are re-placed around the last fill
+price, sized from the holdings. Withdrawals follow run_portfolio_simulation (the same schedule,
+cash first, then forced sales at the close). A cell whose portfolio value
+reaches zero is depleted and stops trading and withdrawing.
+
+    >>> model = GBM(annual_drift=0.07, annual_volatility=0.20)
+    >>> result = run_monte_carlo(
+    ...     model, n_paths=10_000, years=30,
+    ...     configs=["buy-and-hold", "sd8"], withdrawal_rates=[3, 4, 5],
+    ... )
+    >>> result.summary()[["label", "survival_probability", "alpha_p50"]]
+
+Scope: one asset at 100% allocation, no dividends, no opportunity cost on
+negative banks (synthetic paths have no reference series).
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from src.algorithms.base import AlgorithmBase
+from src.models.parameter_grid import GridConfig
+from src.models.price_paths import TRADING_DAYS, PathModel, PricePaths
+from src.models.simulation import withdrawal_schedule
+
+ConfigLike = Union[GridConfig, AlgorithmBase, str]
+
+
+def config_label(config: ConfigLike, grid_config: GridConfig) -> str:
+    """Display name of a configuration (names pass through)."""
+    if isinstance(config, str):
+        return config
+    if grid_config.rebalance_size <= 0:
+        return "buy-and-hold"
+    return f"sd-{grid_config.rebalance_size * 100:g},{grid_config.profit_sharing * 100:g}"
+
+
+@dataclass
+class MonteCarloResult:
+    """Per-path outcomes of K configurations on N price paths.
+
+    Column k of each (N, K) array is configuration labels[k] at annual
+    withdrawal rate withdrawal_rates[k].
+
+    Attributes:
+        labels: Configuration name of each column
+        configs: GridConfig of each column
+        withdrawal_rates: Annual withdrawal rate (0-100) of each column
+        initial_investment: Starting capital of every cell
+        years: Calendar years the paths span
+        final_value: Portfolio value (bank + holdings) on the last day, or on
+                     the day the cell was depleted
+        total_withdrawn: Sum of the withdrawals paid out
+        depleted_day: Day position on which the cell was depleted (-1 if never)
+        max_drawdown: Largest peak-to-trough fall of the portfolio value (0-1)
+        transaction_count: Executed fills, including the initial purchase
+    """
+
+    labels: List[str]
+    configs: List[GridConfig]
+    withdrawal_rates: np.ndarray
+    initial_investment: float
+    years: float
+    final_value: np.ndarray
+    total_withdrawn: np.ndarray
+    depleted_day: np.ndarray
+    max_drawdown: np.ndarray
+    transaction_count: np.ndarray
+
+    @property
+    def n_paths(self) -> int:
+        """Number of paths (N)."""
+        return int(self.final_value.shape[0])
+
+    def survival_probability(self) -> np.ndarray:
+        """Fraction of paths on which each column was never depleted, shape (K,)."""
+        survival: np.ndarray = (self.depleted_day < 0).mean(axis=0)
+        return survival
+
+    def total_return(self) -> np.ndarray:
+        """Total return of each cell (%), from the final value, shape (N, K)."""
+        final_value = self.final_value.astype(np.float64)
+        return (final_value - self.initial_investment) / self.initial_investment * 100
+
+    def baseline_columns(self) -> np.ndarray:
+        """Column of the buy-and-hold configuration at each column's withdrawal rate.
+
+        Raises:
+            ValueError: If some withdrawal rate has no buy-and-hold column
+        """
+        baselines = np.empty(len(self.labels), dtype=int)
+        for k, rate in enumerate(self.withdrawal_rates):
+            matches = [
+                j
+                for j, config in enumerate(self.configs)
+                if config.rebalance_size <= 0 and self.withdrawal_rates[j] == rate
+            ]
+            if not matches:
+                raise ValueError(f"No buy-and-hold configuration at withdrawal rate {rate:g}%")
+            baselines[k] = matches[0]
+        return baselines
+
+    def alpha(self) -> np.ndarray:
+        """Volatility alpha of each cell, shape (N, K).
+
+        Total return minus the total return of buy-and-hold on the same path
+        at the same withdrawal rate, in percentage points (as the backtests'
+        volatility_alpha).
+        """
+        total_return = self.total_return()
+        alpha: np.ndarray = total_return - total_return[:, self.baseline_columns()]
+        return alpha
+
+    def summary(self, quantiles: Sequence[float] = (0.05, 0.5, 0.95)) -> pd.DataFrame:
+        """Distribution statistics, one row per column.
+
+        Columns: label, withdrawal_rate_pct, survival_probability,
+        median_depletion_years (among depleted paths), total return and
+        (if the result has buy-and-hold columns) alpha at each quantile
+        (e.g., total_return_p5), median_max_drawdown and mean_transactions.
+        """
+        table: Dict[str, Any] = {
+            "label": self.labels,
+            "withdrawal_rate_pct": self.withdrawal_rates,
+            "survival_probability": self.survival_probability(),
+        }
+        depleted_years = np.where(self.depleted_day >= 0, self.depleted_day / TRADING_DAYS, np.nan)
+        table["median_depletion_years"] = [
+            np.median(column[~np.isnan(column)]) if (~np.isnan(column)).any() else np.nan
+            for column in depleted_years.T
+        ]
+
+        metrics = [("total_return", self.total_return())]
+        try:
+            metrics.append(("alpha", self.alpha()))
+        except ValueError:
+            pass  # No buy-and-hold baseline to compare against
+        for name, values in metrics:
+            for q, row in zip(quantiles, np.quantile(values, quantiles, axis=0)):
+                table[f"{name}_p{q * 100:g}"] = row
+        table["median_max_drawdown"] = np.median(self.max_drawdown, axis=0)
+        table["mean_transactions"] = self.transaction_count.mean(axis=0)
+        return pd.DataFrame(table)
+
+    @classmethod
+    def concat(cls, results: Sequence["MonteCarloResult"]) -> "MonteCarloResult":
+        """Join results of the same columns on different paths."""
+        first = results[0]
+        return cls(
+            labels=first.labels,
+            configs=first.configs,
+            withdrawal_rates=first.withdrawal_rates,
+            initial_investment=first.initial_investment,
+            years=first.years,
+            **{
+                name: np.concatenate([getattr(result, name) for result in results])
+                for name in (
+                    "final_value",
+                    "total_withdrawn",
+                    "depleted_day",
+                    "max_drawdown",
+                    "transaction_count",
+                )
+            },
+        )
+
+
+class _PathGridState:
+    """State of K configurations on N paths, as flat arrays of K × N cells.
+
+    Cell c is column c // N on path c % N; reshape(K, N) views line each
+    column's cells up with the (N,) prices of a day.
+    """
+
+    def __init__(
+        self,
+        paths: PricePaths,
+        configs: List[GridConfig],
+        initial_investment: float,
+        allow_margin: bool,
+    ) -> None:
+        # Day-major prices (no copy for generated paths): row d is day d of every path
+        self.open, self.high, self.low, self.close = (
+            np.ascontiguousarray(prices.T)
+            for prices in (paths.open, paths.high, paths.low, paths.close)
+        )
+        self.allow_margin = allow_margin
+        n_paths = paths.n_paths
+        k_count = len(configs)
+        self.n_paths = n_paths
+        self.shape = (k_count, n_paths)
+
+        # Per-column parameters (bracket_seed NaN = none)
+        self.rebalance = np.array([c.rebalance_size for c in configs], dtype=np.float64)
+        self.sharing = np.array([c.profit_sharing for c in configs], dtype=np.float64)
+        self.buyback = np.array([c.buyback_enabled for c in configs])
+        self.ath_sell = np.array([c.sell_at_new_ath for c in configs])
+        self.seed = np.array(
+            [np.nan if c.bracket_seed is None else c.bracket_seed for c in configs]
+        )
+        self.seeded_columns = ~np.isnan(self.seed) & (self.rebalance > 0)
+        self.sell_always = ~self.buyback | ~self.ath_sell
+        # Rung ladders (see BracketLadder): ATH-sell orders never ladder
+        self.step = 1 + self.rebalance
+        self.buy_growth = 1 + self.rebalance * self.sharing
+        self.sell_growth = 1 - self.rebalance * self.sharing / (1 + self.rebalance)
+        self.sell_ladders = ~(self.buyback & self.ath_sell)
+
+        # Initial purchase, identical for every column of a path
+        first_price = paths.close[:, 0].astype(np.float64)
+        qty = np.floor(initial_investment / first_price)
+        size = n_paths * k_count
+        self.holdings = np.tile(qty, k_count)
+        self.bank = np.tile(initial_investment - qty * first_price, k_count)
+        self.transactions = np.ones(size, dtype=np.int64)
+        self.ath = first_price.copy()
+
+        # Order books: one buy and one sell limit per cell (NaN = no order)
+        self.buy_limit = np.full(size, np.nan)
+        self.sell_limit = np.full(size, np.nan)
+        self.buy_qty = np.zeros(size)
+        self.sell_qty = np.zeros(size)
+        cells = np.arange(size)
+        self.place_orders(cells, self.holdings, np.tile(first_price, k_count))
+
+    def anchor(self, k: np.ndarray, price: np.ndarray) -> np.ndarray:
+        """Prices moved onto the bracket_seed ladders of columns k (see bracket_anchor)."""
+        if not self.seeded_columns.any():
+            return price
+        r = self.rebalance[k]
+        seed = self.seed[k]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rung = np.round(np.log(price / seed) / np.log1p(r))
+            return np.where(self.seeded_columns[k], seed * (1 + r) ** rung, price)
+
+    def place_orders(self, cells: np.ndarray, holdings: np.ndarray, price: np.ndarray) -> None:
+        """Replace the orders of cells around new anchors (see _GridState.place_orders)."""
+        k = cells // self.n_paths
+        r = self.rebalance[k]
+        anchor = self.anchor(k, price)
+
+        buy_qty = r * holdings * self.sharing[k]
+        sell_qty = buy_qty / (1 + r)
+        buy = self.buyback[k] & (buy_qty > 0)
+        sell = sell_qty > 0
+        if not self.sell_always.all():
+            # ATH-sell configs only place a sell above the all-time high
+            sell &= self.sell_always[k] | (price > self.ath[cells % self.n_paths])
+        self.buy_limit[cells] = np.where(buy, anchor / (1 + r), np.nan)
+        self.buy_qty[cells] = np.where(buy, buy_qty, 0.0)
+        self.sell_limit[cells] = np.where(sell, anchor * (1 + r), np.nan)
+        self.sell_qty[cells] = np.where(sell, sell_qty, 0.0)
+
+    def market_day(self, day: int) -> None:
+        """Fill every cell whose orders trigger on a day."""
+        low = self.low[day]
+        high = self.high[day]
+        self.ath = np.fmax(self.ath, high)
+        buy_hit = (low <= self.buy_limit.reshape(self.shape)).ravel()
+        sell_hit = (high >= self.sell_limit.reshape(self.shape)).ravel()
+        cells = np.flatnonzero(buy_hit | sell_hit)
+        if len(cells):
+            self.fill(day, cells, buy_hit[cells], sell_hit[cells])
+
+    def _execute(
+        self,
+        is_buy: bool,
+        rows: np.ndarray,
+        qty: np.ndarray,
+        price: np.ndarray,
+        holdings: np.ndarray,
+        bank: np.ndarray,
+        executed: np.ndarray,
+    ) -> None:
+        """Execute fills of some rows of a fill batch (SimulationState.execute_transaction)."""
+        if is_buy:
+            cost = qty * price
+            if not self.allow_margin:
+                ok = bank[rows] >= cost
+                rows, qty, cost = rows[ok], qty[ok], cost[ok]
+            holdings[rows] += qty
+            bank[rows] -= cost
+        else:
+            ok = holdings[rows] >= qty
+            rows, qty, price = rows[ok], qty[ok], price[ok]
+            holdings[rows] -= qty
+            bank[rows] += qty * price
+        executed[rows] += 1
+
+    def fill(self, day: int, cells: np.ndarray, buy_hit: np.ndarray, sell_hit: np.ndarray) -> None:
+        """Execute the triggered orders of cells and re-place them (_GridState.fill).
+
+        Cells are processed as a batch of rows; row i is cells[i].
+        """
+        paths = cells % self.n_paths
+        open_ = self.open[day, paths].astype(np.float64)
+        low = self.low[day, paths].astype(np.float64)
+        high = self.high[day, paths].astype(np.float64)
+        holdings = self.holdings[cells]
+        bank = self.bank[cells]
+        # The algorithm sizes its next orders from its own view of holdings,
+        # which includes skipped fills
+        algo_holdings = holdings.copy()
+        last_price = np.empty(len(cells))
+        executed = np.zeros(len(cells), dtype=np.int64)
+
+        # A buy is placed (and fills) before its sell; gapped orders fill at the open
+        for is_buy, hit in ((True, buy_hit), (False, sell_hit)):
+            rows = np.flatnonzero(hit)
+            if not len(rows):
+                continue
+            side_cells = cells[rows]
+            if is_buy:
+                limit = self.buy_limit[side_cells]
+                qty = self.buy_qty[side_cells]
+                price = np.where(limit > high[rows], open_[rows], limit)
+            else:
+                limit = self.sell_limit[side_cells]
+                qty = self.sell_qty[side_cells]
+                price = np.where(limit < low[rows], open_[rows], limit)
+            self._execute(is_buy, rows, qty, price, holdings, bank, executed)
+            algo_holdings[rows] += qty if is_buy else -qty
+            last_price[rows] = price
+
+            # Multi-bracket moves: a lone triggered order fills every rung it
+            # crosses, one bracket apart from its fill price on
+            k = side_cells // self.n_paths
+            step = self.step[k]
+            anchor = self.anchor(k, price)
+            if is_buy:
+                lone = ~sell_hit[rows] & (low[rows] <= anchor / step)
+            else:
+                lone = ~buy_hit[rows] & (high[rows] >= anchor * step)
+                lone &= self.sell_ladders[k]
+            if lone.any():
+                self._ladder(
+                    is_buy,
+                    rows[lone],
+                    anchor[lone],
+                    qty[lone],
+                    cells,
+                    (low, high),
+                    (holdings, bank, algo_holdings, last_price, executed),
+                )
+
+        self.holdings[cells] = holdings
+        self.bank[cells] = bank
+        self.transactions[cells] += executed
+        self.place_orders(cells, algo_holdings, last_price)
+
+    def _ladder(
+        self,
+        is_buy: bool,
+        rows: np.ndarray,
+        anchor: np.ndarray,
+        qty: np.ndarray,
+        cells: np.ndarray,
+        bars: Tuple[np.ndarray, np.ndarray],
+        batch: Tuple[np.ndarray, ...],
+    ) -> None:
+        """Fill the further rungs of lone orders whose first rung filled (BracketLadder.rungs).
+
+        Args:
+            is_buy: Side of the orders
+            rows: Rows of the fill batch whose range reaches their second rung
+            anchor: First-rung fill price of each row, on its bracket_seed ladder
+            qty: First-rung quantity of each row
+            cells: Cells of the fill batch
+            bars: (low, high) of the fill batch
+            batch: (holdings, bank, algo_holdings, last_price, executed) of
+                   the fill batch, updated in place
+        """
+        low, high = bars
+        holdings, bank, algo_holdings, last_price, executed = batch
+        k = cells[rows] // self.n_paths
+        step = self.step[k]
+        growth = self.buy_growth[k] if is_buy else self.sell_growth[k]
+        extreme = low[rows] if is_buy else high[rows]
+        keep = extreme > 0
+        rung = 0
+        while len(rows):
+            rows, anchor, qty, step, growth, extreme = (
+                a[keep] for a in (rows, anchor, qty, step, growth, extreme)
+            )
+            rung += 1
+            qty = qty * growth
+            if is_buy:
+                rung_limit = anchor / step**rung
+                keep = (extreme <= rung_limit) & (qty > 0)
+            else:
+                rung_limit = anchor * step**rung
+                keep = (extreme >= rung_limit) & (qty > 0)
+            if not keep.any():
+                return
+            # Rungs lie beyond the first fill, inside the day's range: they fill at their limits
+            filled = rows[keep]
+            price = rung_limit[keep]
+            self._execute(is_buy, filled, qty[keep], price, holdings, bank, executed)
+            algo_holdings[filled] += qty[keep] if is_buy else -qty[keep]
+            last_price[filled] = price
+
+    def withdraw(self, day: int, amounts: np.ndarray, active: np.ndarray) -> np.ndarray:
+        """Pay one scheduled withdrawal from active cells (see simulation._run_day).
+
+        Cash comes from the bank first; a shortfall is raised by selling
+        ceil(shortfall / close) shares (at most all of them) at the close.
+
+        Args:
+            day: Day position
+            amounts: Withdrawal amount of each column, shape (K,)
+            active: Cells that withdraw, shape (K × N,)
+
+        Returns:
+            Amount withdrawn from each cell
+        """
+        amount = np.repeat(amounts, self.n_paths)
+        price = np.tile(self.close[day].astype(np.float64), len(amounts))
+        due = active & (amount > 0)
+        short = due & (self.bank < amount)
+        if short.any():
+            shortfall = amount - np.maximum(self.bank, 0.0)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                shares = np.minimum(np.ceil(shortfall / price), self.holdings)
+            sold = short & (self.holdings > 0) & (price > 0) & (shares > 0)
+            self.holdings -= np.where(sold, shares, 0.0)
+            self.bank += np.where(sold, shares * price, 0.0)
+        paid = np.where(due, np.where(short, np.minimum(amount, self.bank), amount), 0.0)
+        self.bank -= paid
+        return paid
+
+
+def _by_path(values: np.ndarray, dtype: type) -> np.ndarray:
+    """(N, K) array of per-path results from a (K, N) cell array."""
+    return np.ascontiguousarray(values.T, dtype=dtype)
+
+
+def simulate_paths(
+    paths: PricePaths,
+    configs: Sequence[ConfigLike],
+    withdrawal_rates: Sequence[float] = (0.0,),
+    initial_investment: float = 1_000_000.0,
+    withdrawal_frequency_days: int = 30,
+    allow_margin: bool = True,
+    cash_interest_rate_pct: float = 0.0,
+    dtype: type = np.float64,
+) -> MonteCarloResult:
+    """Simulate every configuration at every withdrawal rate on every path.
+
+    Columns are configs × withdrawal_rates, configuration-major. Each cell
+    matches a single-ticker run_portfolio_simulation() of the path with the
+    configuration's per-asset algorithm (without dividends or opportunity
+    cost), up to float rounding.
+
+    Args:
+        paths: Price paths to trade
+        configs: GridConfigs, algorithm instances, or names (e.g., "buy-and-hold", "sd8")
+        withdrawal_rates: Annual withdrawal rates (0-100) of the initial investment
+        initial_investment: Starting capital of every cell
+        withdrawal_frequency_days: Calendar days between withdrawals
+        allow_margin: Whether banks may go negative (strict mode skips unaffordable buys)
+        cash_interest_rate_pct: Annual interest on positive banks
+        dtype: Storage type of the per-path results; np.float32 halves memory
+
+    Returns:
+        MonteCarloResult
+    """
+    grid_configs = [GridConfig.coerce(config) for config in configs]
+    if not grid_configs:
+        raise ValueError("No configurations to simulate")
+    labels = [config_label(c, grid_config) for c, grid_config in zip(configs, grid_configs)]
+    rates = np.asarray(withdrawal_rates, dtype=np.float64)
+    columns = [(k, rate) for k in range(len(grid_configs)) for rate in rates]
+    column_configs = [grid_configs[k] for k, _ in columns]
+    column_rates = np.array([rate for _, rate in columns])
+
+    state = _PathGridState(paths, column_configs, initial_investment, allow_margin)
+    n_paths, n_days = paths.n_paths, paths.n_days
+    shape = state.shape  # (K, N)
+
+    amounts = initial_investment * column_rates / 100.0 * withdrawal_frequency_days / 365.25
+    due_days = (
+        set(withdrawal_schedule(paths.dates, withdrawal_frequency_days))
+        if (amounts > 0).any()
+        else set()
+    )
+    interest_rate = cash_interest_rate_pct / 100.0 / 365.25 if cash_interest_rate_pct > 0 else 0.0
+
+    size = n_paths * len(columns)
+    alive = np.ones(size, dtype=bool)
+    withdrawn = np.zeros(size)
+    depleted_day = np.full(size, -1, dtype=np.int32)
+    depleted_count = 0
+    # Portfolio values (frozen once depleted), their running peaks, and the
+    # lowest ratio of value to peak so far (1 - max drawdown)
+    value = np.empty(shape)
+    final_value = np.empty(shape)
+    peak = np.zeros(shape)
+    ratio = np.empty(shape)
+    trough = np.ones(shape)
+
+    for day in range(n_days):
+        state.market_day(day)
+        if day in due_days:
+            withdrawn += state.withdraw(day, amounts, alive)
+        if interest_rate:
+            credited = alive & (state.bank > 0)
+            state.bank = np.where(credited, state.bank * (1.0 + interest_rate), state.bank)
+
+        if depleted_count:
+            np.multiply(state.holdings.reshape(shape), state.close[day], out=value)
+            value += state.bank.reshape(shape)
+            np.copyto(final_value, value, where=alive.reshape(shape))
+        else:
+            np.multiply(state.holdings.reshape(shape), state.close[day], out=final_value)
+            final_value += state.bank.reshape(shape)
+        np.fmax(peak, final_value, out=peak)
+        np.divide(final_value, peak, out=ratio)
+        np.fmin(trough, ratio, out=trough)
+
+        # Depleted cells stay at or below zero, so only a larger count is news
+        if (
+            final_value.min() <= 0
+            if not depleted_count
+            else np.count_nonzero(final_value <= 0) > depleted_count
+        ):
+            depleted = alive & (final_value <= 0).ravel()
+            # Depleted cells stop: cancel their orders and withdrawals
+            depleted_day[depleted] = day
+            depleted_count += int(np.count_nonzero(depleted))
+            alive &= ~depleted
+            state.buy_limit[depleted] = np.nan
+            state.sell_limit[depleted] = np.nan
+
+    years = (paths.dates[-1] - paths.dates[0]).days / 365.25
+    return MonteCarloResult(
+        labels=[labels[k] for k, _ in columns],
+        configs=column_configs,
+        withdrawal_rates=column_rates,
+        initial_investment=initial_investment,
+        years=years,
+        final_value=_by_path(final_value, dtype),
+        total_withdrawn=_by_path(withdrawn.reshape(shape), dtype),
+        depleted_day=_by_path(depleted_day.reshape(shape), np.int32),
+        max_drawdown=_by_path(np.clip(1 - trough, 0.0, 1.0), dtype),
+        transaction_count=_by_path(state.transactions.reshape(shape), np.int32),
+    )
+
+
+def run_monte_carlo(
+    model: PathModel,
+    n_paths: int,
+    years: float,
+    configs: Sequence[ConfigLike],
+    withdrawal_rates: Sequence[float] = (0.0,),
+    seed: Optional[int] = None,
+    batch_paths: int = 2_000,
+    dtype: type = np.float64,
+    path_options: Optional[Dict[str, Any]] = None,
+    **options: Any,
+) -> MonteCarloResult:
+    """Generate paths from a model and simulate configurations on them, in batches.
+
+    Paths are generated and simulated batch_paths at a time, so memory
+    stays bounded (about 4 × batch_paths × days prices) however many paths
+    are run. Batch i uses child i of the seed's SeedSequence, so a seed
+    reproduces its results for a given batch_paths.
+
+    Args:
+        model: Path model (e.g., GBM, BlockBootstrap, RegimeSwitching)
+        n_paths: Number of paths
+        years: Length of each path, in years of 252 trading days
+        configs: Configurations to simulate (see simulate_paths)
+        withdrawal_rates: Annual withdrawal rates (0-100)
+        seed: Seed for the paths
+        batch_paths: Paths per batch
+        dtype: Storage type of prices and results (e.g., np.float32)
+        path_options: Further PathModel.generate() arguments (e.g., start_price)
+        **options: Further simulate_paths() arguments (e.g., initial_investment)
+
+    Returns:
+        MonteCarloResult over all paths
+    """
+    grid_configs = [GridConfig.coerce(config) for config in configs]
+    labels = [config_label(c, grid_config) for c, grid_config in zip(configs, grid_configs)]
+    n_days = int(round(years * TRADING_DAYS)) + 1
+    sizes = [min(batch_paths, n_paths - start) for start in range(0, n_paths, batch_paths)]
+    results = []
+    for size, batch_seed in zip(sizes, np.random.SeedSequence(seed).spawn(len(sizes))):
+        paths = model.generate(size, n_days, seed=batch_seed, dtype=dtype, **(path_options or {}))
+        results.append(
+            simulate_paths(paths, grid_configs, withdrawal_rates, dtype=dtype, **options)
+        )
+    result = MonteCarloResult.concat(results)
+    result.labels = [labels[k] for k in range(len(labels)) for _ in withdrawal_rates]
+    return result
+
+
+def survival_table(result: MonteCarloResult) -> pd.DataFrame:
+    """Survival probability as a configuration × withdrawal rate table."""
+    frame = pd.DataFrame(
+        {
+            "label": result.labels,
+            "withdrawal_rate_pct": result.withdrawal_rates,
+            "survival_probability": result.survival_probability(),
+        }
+    )
+    return frame.pivot_table(
+        index="label", columns="withdrawal_rate_pct", values="survival_probability", sort=False
+    )
@@ -0,0 +1,316 @@
+"""Online (streaming) risk and cash metrics of a portfolio simulation.
+
+Each metric is an O(1)-memory accumulator the engine updates once per
+trading day, so drawdown, volatility and bank statistics are available at
+every detail level without keeping the daily series. Idle-day spans are
+folded in with a single vectorized update_span() call.
+
+Per-day inputs:
+    portfolio: Total portfolio value at the end of the day (bank + assets)
+    bank:      Bank balance at the end of the day
+    interest:  Net interest credited that day (negative for opportunity cost)
+    withdrawn: Cumulative withdrawals up to and including that day
+
+Metrics are selected with factories (usually the classes themselves):
+
+    >>> run_portfolio_simulation(..., metrics=[DrawdownMetric, ReturnStatsMetric])
+    >>> summary["metrics"]["max_drawdown"]
+"""
+
+import math
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+# Trading days per year, for annualizing daily return statistics
+TRADING_DAYS_PER_YEAR = 252
+
+
+class OnlineMetric(ABC):
+    """Base class for an accumulator over the daily simulation values.
+
+    Subclasses implement update() and result(); update_span() defaults to
+    one update() per day and is overridden where a vectorized form exists.
+    """
+
+    @abstractmethod
+    def update(self, portfolio: float, bank: float, interest: float, withdrawn: float) -> None:
+        """Fold in one day's values."""
+
+    def update_span(
+        self, portfolio: np.ndarray, bank: np.ndarray, interest: np.ndarray, withdrawn: float
+    ) -> None:
+        """Fold in consecutive days on which no withdrawal occurs.
+
+        Args:
+            portfolio: Portfolio values, one per day
+            bank: Bank balances, one per day
+            interest: Net interest credited, one per day
+            withdrawn: Cumulative withdrawals (constant over the span)
+        """
+        for value, balance, credited in zip(portfolio.tolist(), bank.tolist(), interest.tolist()):
+            self.update(value, balance, credited, withdrawn)
+
+    @abstractmethod
+    def result(self) -> Dict[str, float]:
+        """The metric's values so far, keyed by summary name."""
+
+
+class DrawdownMetric(OnlineMetric):
+    """Running peak and maximum drawdown of the portfolio value."""
+
+    def __init__(self, peak: float = 0.0) -> None:
+        """Start tracking.
+
+        Args:
+            peak: Initial peak value (e.g., the initial capital)
+        """
+        self.peak = peak
+        self.max_drawdown = 0.0
+        self.drawdown_days = 0
+
+    def update(self, portfolio: float, bank: float, interest: float, withdrawn: float) -> None:
+        if portfolio > self.peak:
+            self.peak = portfolio
+        if self.peak > 0:
+            drawdown = (self.peak - portfolio) / self.peak
+            self.max_drawdown = max(self.max_drawdown, drawdown)
+            if drawdown > 0:
+                self.drawdown_days += 1
+
+    def update_span(
+        self, portfolio: np.ndarray, bank: np.ndarray, interest: np.ndarray, withdrawn: float
+    ) -> None:
+        peaks = np.maximum(np.maximum.accumulate(portfolio), self.peak)
+        self.peak = float(peaks[-1])
+        positive = peaks > 0
+        if positive.any():
+            drawdown = (peaks[positive] - portfolio[positive]) / peaks[positive]
+            self.max_drawdown = max(self.max_drawdown, float(drawdown.max()))
+            self.drawdown_days += int((drawdown > 0).sum())
+
+    def result(self) -> Dict[str, float]:
+        return {
+            "peak_value": self.peak,
+            "max_drawdown": self.max_drawdown,
+            "drawdown_days": self.drawdown_days,
+        }
+
+
+class ReturnStatsMetric(OnlineMetric):
+    """Mean and volatility of daily returns, with Sharpe and Sortino ratios.
+
+    Daily returns are flow-adjusted: a withdrawal is added back to the day's
+    value so it does not count as a loss. Mean and variance use Welford's
+    update, with Chan's pairwise merge for idle-day spans. Sharpe and Sortino
+    are annualized over TRADING_DAYS_PER_YEAR with a zero risk-free rate
+    (interest on the bank is already part of the return).
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.downside_sq = 0.0
+        self._last_value: Optional[float] = None
+        self._last_withdrawn = 0.0
+
+    def _add(self, daily_return: float) -> None:
+        self.count += 1
+        delta = daily_return - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (daily_return - self.mean)
+        if daily_return < 0:
+            self.downside_sq += daily_return * daily_return
+
+    def update(self, portfolio: float, bank: float, interest: float, withdrawn: float) -> None:
+        if self._last_value is not None and self._last_value > 0:
+            flow = withdrawn - self._last_withdrawn
+            self._add((portfolio + flow) / self._last_value - 1.0)
+        self._last_value = portfolio
+        self._last_withdrawn = withdrawn
+
+    def update_span(
+        self, portfolio: np.ndarray, bank: np.ndarray, interest: np.ndarray, withdrawn: float
+    ) -> None:
+        if self._last_value is None or self._last_value <= 0 or (portfolio <= 0).any():
+            # Start of run or non-positive values: the per-day rules apply
+            super().update_span(portfolio, bank, interest, withdrawn)
+            return
+
+        flow = withdrawn - self._last_withdrawn
+        previous = np.concatenate(([self._last_value], portfolio[:-1]))
+        adjusted = portfolio.copy()
+        adjusted[0] += flow
+        returns = adjusted / previous - 1.0
+
+        # Chan et al. merge of (count, mean, m2) with the span's statistics
+        n = len(returns)
+        span_mean = float(returns.mean())
+        span_m2 = float(((returns - span_mean) ** 2).sum())
+        total = self.count + n
+        delta = span_mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += span_m2 + delta * delta * self.count * n / total
+        self.count = total
+        downside = returns[returns < 0]
+        self.downside_sq += float((downside * downside).sum())
+
+        self._last_value = float(portfolio[-1])
+        self._last_withdrawn = withdrawn
+
+    def result(self) -> Dict[str, float]:
+        variance = self.m2 / (self.count - 1) if self.count > 1 else 0.0
+        stdev = math.sqrt(variance)
+        downside = math.sqrt(self.downside_sq / self.count) if self.count else 0.0
+        scale = math.sqrt(TRADING_DAYS_PER_YEAR)
+        return {
+            "return_days": self.count,
+            "mean_daily_return": self.mean,
+            "daily_volatility": stdev,
+            "annualized_volatility": stdev * scale,
+            "sharpe_ratio": self.mean / stdev * scale if stdev > 0 else 0.0,
+            "sortino_ratio": self.mean / downside * scale if downside > 0 else 0.0,
+        }
+
+
+class BankMetric(OnlineMetric):
+    """Bank min/max/average, days below and above zero, longest negative run.
+
+    The average divides a sequential running total, so it is bit-for-bit
+    daily_bank_stats() over the full daily bank series.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self.negative_days = 0
+        self.positive_days = 0
+        self.negative_streak = 0
+        self.max_negative_streak = 0
+
+    def update(self, portfolio: float, bank: float, interest: float, withdrawn: float) -> None:
+        self.count += 1
+        self.total += bank
+        self.minimum = min(self.minimum, bank)
+        self.maximum = max(self.maximum, bank)
+        if bank < 0:
+            self.negative_days += 1
+            self.negative_streak += 1
+            self.max_negative_streak = max(self.max_negative_streak, self.negative_streak)
+        else:
+            self.negative_streak = 0
+            if bank > 0:
+                self.positive_days += 1
+
+    def update_span(
+        self, portfolio: np.ndarray, bank: np.ndarray, interest: np.ndarray, withdrawn: float
+    ) -> None:
+        self.count += len(bank)
+        # Sequential running total continued from the carry (np.cumsum is sequential)
+        self.total = float(np.cumsum(np.concatenate(([self.total], bank)))[-1])
+        self.minimum = min(self.minimum, float(bank.min()))
+        self.maximum = max(self.maximum, float(bank.max()))
+        negative = bank < 0
+        self.negative_days += int(negative.sum())
+        self.positive_days += int((bank > 0).sum())
+
+        # Negative runs: the leading run continues the carried streak
+        if negative.all():
+            self.negative_streak += len(bank)
+        else:
+            breaks = np.flatnonzero(~negative)
+            leading = self.negative_streak + int(breaks[0])
+            runs = np.diff(np.concatenate((breaks, [len(bank)]))) - 1
+            self.max_negative_streak = max(self.max_negative_streak, int(runs.max()), leading)
+            self.negative_streak = int(runs[-1])
+        self.max_negative_streak = max(self.max_negative_streak, self.negative_streak)
+
+    def result(self) -> Dict[str, float]:
+        return {
+            "bank_min": self.minimum,
+            "bank_max": self.maximum,
+            "bank_avg": self.total / self.count if self.count else 0.0,
+            "bank_negative_count": self.negative_days,
+            "bank_positive_count": self.positive_days,
+            "bank_max_negative_streak": self.max_negative_streak,
+        }
+
+    def bank_stats(self) -> Dict[str, float]:
+        """The daily_bank_stats() entries."""
+        stats = self.result()
+        del stats["bank_max_negative_streak"]
+        return stats
+
+
+class InterestMetric(OnlineMetric):
+    """Total net interest credited to the bank and days it was credited."""
+
+    def __init__(self) -> None:
+        self.total = 0.0
+        self.interest_days = 0
+
+    def update(self, portfolio: float, bank: float, interest: float, withdrawn: float) -> None:
+        self.total += interest
+        if interest > 0:
+            self.interest_days += 1
+
+    def update_span(
+        self, portfolio: np.ndarray, bank: np.ndarray, interest: np.ndarray, withdrawn: float
+    ) -> None:
+        self.total = float(np.cumsum(np.concatenate(([self.total], interest)))[-1])
+        self.interest_days += int((interest > 0).sum())
+
+    def result(self) -> Dict[str, float]:
+        return {"total_interest": self.total, "interest_days": self.interest_days}
+
+
+MetricFactory = Callable[[], OnlineMetric]
+
+# Metrics computed when run_portfolio_simulation is not given metrics=
+DEFAULT_METRICS: Sequence[MetricFactory] = (DrawdownMetric, ReturnStatsMetric, InterestMetric)
+
+
+class MetricSet:
+    """The metrics of one run, updated together.
+
+    A BankMetric is always included, since the summary's daily_bank_stats
+    come from it.
+    """
+
+    def __init__(self, factories: Optional[Sequence[MetricFactory]] = None) -> None:
+        """Create a fresh instance of each metric.
+
+        Args:
+            factories: Metric factories (default: DEFAULT_METRICS)
+        """
+        self.bank = BankMetric()
+        self.metrics: List[OnlineMetric] = [self.bank]
+        for factory in DEFAULT_METRICS if factories is None else factories:
+            metric = factory()
+            if not isinstance(metric, BankMetric):
+                self.metrics.append(metric)
+
+    def update(self, portfolio: float, bank: float, interest: float, withdrawn: float) -> None:
+        """Fold one day's values into every metric."""
+        for metric in self.metrics:
+            metric.update(portfolio, bank, interest, withdrawn)
+
+    def update_span(
+        self, portfolio: np.ndarray, bank: np.ndarray, interest: np.ndarray, withdrawn: float
+    ) -> None:
+        """Fold consecutive withdrawal-free days into every metric."""
+        if len(portfolio) == 0:
+            return
+        for metric in self.metrics:
+            metric.update_span(portfolio, bank, interest, withdrawn)
+
+    def result(self) -> Dict[str, float]:
+        """All metrics' values, merged into one dict."""
+        merged: Dict[str, float] = {}
+        for metric in self.metrics:
+            merged.update(metric.result())
+        return merged
@@ -0,0 +1,421 @@
+"""Run many portfolio backtests over a process pool.
+
+Research sweeps (e.g., 12 assets × 8 sdN values) are independent backtests
+that differ only in allocations, algorithm and dates. ParallelBacktestRunner
+takes them as BacktestJob specs and fans them out over worker processes:
+
+    >>> jobs = [
+    ...     BacktestJob({ticker: 1.0}, f"per-asset:sd{n}", start, end, tag=(ticker, n))
+    ...     for ticker in tickers
+    ...     for n in (4, 6, 8, 10, 12, 16, 20, 24)
+    ... ]
+    >>> for result in ParallelBacktestRunner(workers=8).run(jobs):
+    ...     print(result.job.tag, result.summary["total_return"])
+
+The market data of each ticker set is loaded once in the parent process as a
+MarketDataBundle spanning all of its jobs' dates, and its price arrays are
+published once through multiprocessing.shared_memory. Workers attach to them
+when they start, so no job pickles, fetches or re-aligns prices; each job
+slices the bundle to its own dates. Results stream back as jobs finish, as
+compact summaries (scalars and dicts of scalars only).
+
+Given a ResultCache, the runner looks every job up before running it and
+stores each result as soon as it finishes, so rerunning a sweep (or resuming
+one that was interrupted) only computes the jobs that are missing, or whose
+data or parameters changed.
+"""
+
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field, fields
+from datetime import date
+from multiprocessing import shared_memory
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import numpy as np
+import pandas as pd
+
+from src.models.market_bundle import MarketDataBundle
+from src.models.market_data import AlignedPriceData
+from src.models.model_types import Transaction
+from src.models.result_cache import ResultCache, algorithm_spec
+
+# Summary values kept by compact_summary() (with dicts of them)
+COMPACT_TYPES = (bool, int, float, str, date, type(None))
+
+
+@dataclass(frozen=True)
+class BacktestJob:
+    """One portfolio backtest of a sweep (see run_portfolio_backtest).
+
+    Attributes:
+        allocations: Dict mapping ticker → target allocation
+        portfolio_algo: Portfolio algorithm name (e.g., "per-asset:sd8")
+        start_date: Backtest start date
+        end_date: Backtest end date
+        initial_investment: Total starting capital
+        initial_qty: Starting shares of a single-asset portfolio, as in
+                     run_algorithm_backtest; overrides initial_investment
+        allow_margin: Whether to allow negative bank balance
+        withdrawal_rate_pct: Annual withdrawal rate (0-100)
+        withdrawal_frequency_days: Days between withdrawals
+        cash_interest_rate_pct: Annual interest rate on cash reserves
+        reference_rate_ticker: Optional ticker for reference benchmark
+        risk_free_rate_ticker: Optional ticker for risk-free asset
+        inflation_rate_ticker: Optional ticker for inflation data
+        tag: Caller's label for the job (e.g., (ticker, sdN)), returned as is
+    """
+
+    allocations: Dict[str, float]
+    portfolio_algo: str
+    start_date: date
+    end_date: date
+    initial_investment: float = 1_000_000.0
+    initial_qty: Optional[float] = None
+    allow_margin: bool = True
+    withdrawal_rate_pct: float = 0.0
+    withdrawal_frequency_days: int = 30
+    cash_interest_rate_pct: float = 0.0
+    reference_rate_ticker: Optional[str] = None
+    risk_free_rate_ticker: Optional[str] = None
+    inflation_rate_ticker: Optional[str] = None
+    tag: Any = field(default=None, compare=False)
+
+    def data_key(self) -> Tuple[Any, ...]:
+        """Jobs with equal keys share one MarketDataBundle."""
+        return (
+            tuple(self.allocations),
+            self.reference_rate_ticker,
+            self.risk_free_rate_ticker,
+            self.inflation_rate_ticker,
+        )
+
+    def options(self) -> Dict[str, Any]:
+        """Run parameters other than the algorithm, for result cache keys."""
+        return {
+            f.name: getattr(self, f.name)
+            for f in fields(self)
+            if f.name not in ("portfolio_algo", "tag")
+        }
+
+
+def portfolio_algo_name(algo_name: str) -> str:
+    """Portfolio algorithm name of a single-asset algorithm name (e.g., sd8)."""
+    if algo_name == "buy-and-hold" or algo_name.startswith("sd"):
+        return f"per-asset:{algo_name}"
+    return algo_name
+
+
+class BacktestResult(NamedTuple):
+    """Outcome of one job: its compact summary, or the error it raised."""
+
+    position: int  # Position of the job in the submitted list
+    job: BacktestJob
+    summary: Optional[Dict[str, Any]]
+    error: Optional[str] = None
+    transactions: Optional[List[Transaction]] = None  # If the runner keeps ledgers
+    cached: bool = False  # True if read from the result cache instead of run
+
+
+def compact_summary(summary: Dict[str, Any]) -> Dict[str, Any]:
+    """Scalar entries of a portfolio summary, keeping nested dicts of scalars.
+
+    Drops daily series, ledgers and other bulky values, so results are cheap
+    to send between processes and to store; per-asset results, metrics and
+    bank statistics are kept.
+    """
+    compact: Dict[str, Any] = {}
+    for key, value in summary.items():
+        if isinstance(value, dict):
+            compact[key] = compact_summary(value)
+        elif isinstance(value, COMPACT_TYPES):
+            compact[key] = value
+    return compact
+
+
+def run_job(
+    job: BacktestJob, bundle: MarketDataBundle, keep_ledger: bool = False
+) -> Tuple[Dict[str, Any], Optional[List[Transaction]]]:
+    """Run one job on market data covering it.
+
+    Returns:
+        Tuple of (compact summary, transactions if keep_ledger else None)
+    """
+    from src.models.backtest import run_portfolio_backtest
+
+    bundle = bundle.between(job.start_date, job.end_date)
+    initial_investment = job.initial_investment
+    if job.initial_qty is not None:
+        initial_investment = job.initial_qty * float(bundle.prices.close[0, 0])
+
+    transactions, summary = run_portfolio_backtest(
+        allocations=job.allocations,
+        start_date=job.start_date,
+        end_date=job.end_date,
+        portfolio_algo=job.portfolio_algo,
+        initial_investment=initial_investment,
+        allow_margin=job.allow_margin,
+        withdrawal_rate_pct=job.withdrawal_rate_pct,
+        withdrawal_frequency_days=job.withdrawal_frequency_days,
+        cash_interest_rate_pct=job.cash_interest_rate_pct,
+        reference_rate_ticker=job.reference_rate_ticker,
+        risk_free_rate_ticker=job.risk_free_rate_ticker,
+        inflation_rate_ticker=job.inflation_rate_ticker,
+        engine="fast",
+        detail="summary",
+        market_bundle=bundle,
+    )
+    return compact_summary(summary), (list(transactions) if keep_ledger else None)
+
+
+def job_cache_key(job: BacktestJob, bundle: MarketDataBundle) -> str:
+    """Result cache key of a job run on (a slice of) a bundle.
+
+    Raises:
+        ValueError: If the job's dates or algorithm are invalid
+    """
+    return ResultCache.key(
+        data=bundle.between(job.start_date, job.end_date).fingerprint(),
+        algorithm=algorithm_spec(job.portfolio_algo, job.allocations),
+        options=job.options(),
+        engine={"engine": "fast", "detail": "summary"},
+    )
+
+
+@dataclass(frozen=True)
+class SharedBundle:
+    """A MarketDataBundle whose price arrays live in a shared memory block.
+
+    Pickles as the block name plus the bundle's small fields (calendar,
+    dividends, rate series), so it is cheap to hand to worker processes.
+    """
+
+    name: str
+    shape: Tuple[int, int, int]  # (OHLC field, ticker, day)
+    price_tickers: List[str]
+    dates: List[date]
+    bundle_fields: Dict[str, Any]  # The bundle's other constructor arguments
+
+    @classmethod
+    def publish(cls, bundle: MarketDataBundle) -> Tuple["SharedBundle", shared_memory.SharedMemory]:
+        """Copy a bundle's prices into a new shared memory block.
+
+        Returns:
+            Tuple of (handle, block); the caller closes and unlinks the block
+        """
+        prices = bundle.prices
+        stacked = np.stack([prices.open, prices.high, prices.low, prices.close])
+        block = shared_memory.SharedMemory(create=True, size=max(stacked.nbytes, 1))
+        np.ndarray(stacked.shape, dtype=np.float64, buffer=block.buf)[:] = stacked
+        bundle_fields = {
+            f.name: getattr(bundle, f.name) for f in fields(bundle) if f.init and f.name != "prices"
+        }
+        handle = cls(block.name, stacked.shape, prices.tickers, prices.dates, bundle_fields)
+        return handle, block
+
+    def attach(self) -> Tuple[MarketDataBundle, shared_memory.SharedMemory]:
+        """Rebuild the bundle over the shared block's prices, without copying.
+
+        Returns:
+            Tuple of (bundle, block); the block must stay open while the
+            bundle is in use
+        """
+        block = shared_memory.SharedMemory(name=self.name)
+        arrays = np.ndarray(self.shape, dtype=np.float64, buffer=block.buf)
+        prices = AlignedPriceData(self.price_tickers, self.dates, *arrays)
+        return MarketDataBundle(prices=prices, **self.bundle_fields), block
+
+
+# Bundles attached by this worker process, by data key index, and their blocks
+_worker_bundles: Dict[int, MarketDataBundle] = {}
+_worker_blocks: List[shared_memory.SharedMemory] = []
+
+
+def _attach_shared(handles: Dict[int, SharedBundle]) -> None:
+    """Worker initializer: attach to every published bundle once."""
+    for index, handle in handles.items():
+        bundle, block = handle.attach()
+        _worker_bundles[index] = bundle
+        _worker_blocks.append(block)
+
+
+def _run_shared(
+    index: int, job: BacktestJob, keep_ledger: bool
+) -> Tuple[Dict[str, Any], Optional[List[Transaction]]]:
+    """Worker task: run a job on its attached bundle."""
+    return run_job(job, _worker_bundles[index], keep_ledger)
+
+
+class ParallelBacktestRunner:
+    """Fan BacktestJobs out over a process pool and stream their results."""
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        cache: Optional[ResultCache] = None,
+        keep_ledgers: bool = False,
+        price_frames: Optional[Mapping[str, Optional[pd.DataFrame]]] = None,
+    ) -> None:
+        """Create a runner.
+
+        Args:
+            workers: Worker processes (default: all cores); 1 runs the jobs
+                     in this process, without a pool
+            cache: Result cache consulted before running each job and
+                   updated as jobs finish (default: no caching)
+            keep_ledgers: Return (and cache) each job's transactions too;
+                          cached entries without them are rerun
+            price_frames: Prefetched price history by ticker, covering the
+                          jobs' dates, used instead of fetching (see
+                          MarketDataBundle.load)
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.cache = cache
+        self.keep_ledgers = keep_ledgers
+        self.price_frames = price_frames
+
+    def _load_bundles(
+        self, jobs: Sequence[BacktestJob]
+    ) -> Tuple[List[int], Dict[int, MarketDataBundle], Dict[int, str]]:
+        """Load one bundle per data key, spanning the dates of its jobs.
+
+        Returns:
+            Tuple of (bundle index of each job, bundles by index, load
+            errors by index)
+        """
+        keys: Dict[Tuple[Any, ...], int] = {}
+        job_bundles = [keys.setdefault(job.data_key(), len(keys)) for job in jobs]
+        bundles: Dict[int, MarketDataBundle] = {}
+        errors: Dict[int, str] = {}
+        for index in keys.values():
+            group = [job for job, i in zip(jobs, job_bundles) if i == index]
+            first = group[0]
+            try:
+                bundles[index] = MarketDataBundle.load(
+                    first.allocations,
+                    min(job.start_date for job in group),
+                    max(job.end_date for job in group),
+                    reference_rate_ticker=first.reference_rate_ticker,
+                    risk_free_rate_ticker=first.risk_free_rate_ticker,
+                    inflation_rate_ticker=first.inflation_rate_ticker,
+                    price_frames=self.price_frames,
+                )
+            except Exception as e:
+                errors[index] = str(e)
+        return job_bundles, bundles, errors
+
+    def _lookup(
+        self, position: int, job: BacktestJob, bundle: MarketDataBundle
+    ) -> Tuple[Optional[str], Optional[BacktestResult]]:
+        """Cache key of a job and its cached result, if the cache has one."""
+        if self.cache is None:
+            return None, None
+        try:
+            key = job_cache_key(job, bundle)
+        except Exception:
+            return None, None  # Run it uncached; the run reports the error
+        entry = self.cache.get(key)
+        if entry is None or (self.keep_ledgers and entry.transactions is None):
+            return key, None
+        return key, BacktestResult(
+            position, job, entry.summary, transactions=entry.transactions, cached=True
+        )
+
+    def _finished(
+        self,
+        position: int,
+        job: BacktestJob,
+        key: Optional[str],
+        output: Tuple[Dict[str, Any], Optional[List[Transaction]]],
+    ) -> BacktestResult:
+        """Result of a job that ran, stored in the cache first."""
+        summary, transactions = output
+        if self.cache is not None and key is not None:
+            self.cache.put(key, summary, transactions)
+        return BacktestResult(position, job, summary, transactions=transactions)
+
+    def run(self, jobs: Iterable[BacktestJob]) -> Iterator[BacktestResult]:
+        """Run jobs, yielding each result as soon as it finishes.
+
+        Jobs found in the cache are yielded first, without running. Jobs
+        whose data fails to load, or which raise, yield a result with
+        summary None and the error message; errors are not cached.
+
+        Args:
+            jobs: Backtests to run
+
+        Yields:
+            BacktestResult per job, in completion order
+        """
+        jobs = list(jobs)
+        job_bundles, bundles, errors = self._load_bundles(jobs)
+
+        runnable = []
+        for position, (job, index) in enumerate(zip(jobs, job_bundles)):
+            if index in errors:
+                yield BacktestResult(position, job, None, errors[index])
+                continue
+            key, cached = self._lookup(position, job, bundles[index])
+            if cached is not None:
+                yield cached
+            else:
+                runnable.append((position, job, index, key))
+
+        if self.workers == 1 or len(runnable) <= 1:
+            for position, job, index, key in runnable:
+                try:
+                    output = run_job(job, bundles[index], self.keep_ledgers)
+                except Exception as e:
+                    yield BacktestResult(position, job, None, str(e))
+                else:
+                    yield self._finished(position, job, key, output)
+            return
+
+        handles: Dict[int, SharedBundle] = {}
+        blocks: List[shared_memory.SharedMemory] = []
+        try:
+            for index in {index for _, _, index, _ in runnable}:
+                handles[index], block = SharedBundle.publish(bundles[index])
+                blocks.append(block)
+            pool = ProcessPoolExecutor(
+                max_workers=min(self.workers, len(runnable)),
+                initializer=_attach_shared,
+                initargs=(handles,),
+            )
+            try:
+                pending: Dict[Future, Tuple[int, BacktestJob, Optional[str]]] = {
+                    pool.submit(_run_shared, index, job, self.keep_ledgers): (position, job, key)
+                    for position, job, index, key in runnable
+                }
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        position, job, key = pending.pop(future)
+                        try:
+                            output = future.result()
+                        except Exception as e:
+                            yield BacktestResult(position, job, None, str(e))
+                        else:
+                            yield self._finished(position, job, key, output)
+            finally:
+                # Jobs not yet started are dropped if the caller stops early
+                pool.shutdown(wait=True, cancel_futures=True)
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+    def run_all(self, jobs: Iterable[BacktestJob]) -> List[BacktestResult]:
+        """Run jobs and return their results in job order."""
+        return sorted(self.run(jobs), key=lambda result: result.position)
@@ -0,0 +1,709 @@
+"""Vectorized parameter-grid backtests for the synthetic dividend algorithm.
+
+Parameter sweeps (sdN × profit sharing grids in optimal_rebalancing,
+volatility_alpha_curves and compare/batch_comparison) used to run one full
+backtest per configuration, re-aligning the same prices and re-stepping the
+same days every time. This module runs K configurations of one ticker in a
+single pass: per-config state (anchor, holdings, bank, buyback stack, order
+book) is kept as length-K vectors that advance together day by day.
+
+Per day, trigger detection for all K order books, opportunity cost and
+interest accrual, and the daily bank series are evaluated as array
+operations. Only configurations whose orders fill on a day are updated
+individually, with the same arithmetic as SyntheticDividendAlgorithm and
+SimulationState, so each configuration's results match a separate
+run_algorithm_backtest() exactly. The all-time high is shared by every
+configuration and is computed once as a running maximum.
+
+Scope: one ticker at 100% allocation, no withdrawals.
+
+Example:
+    >>> summaries, _ = run_synthetic_dividend_grid(df, "NVDA", ["sd4", "sd8", "sd16"])
+    >>> [s["volatility_alpha"] for s in summaries]
+"""
+
+import bisect
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from src.algorithms.base import AlgorithmBase
+from src.algorithms.buy_and_hold import BuyAndHoldAlgorithm
+from src.algorithms.synthetic_dividend import SyntheticDividendAlgorithm
+from src.models.backtest_utils import ShareDayAccumulator, calculate_synthetic_dividend_orders
+from src.models.daily_series import daily_bank_stats
+from src.models.market import BracketLadder, Fill, OrderAction, first_limit_trigger
+from src.models.market_data import AlignedPriceData
+from src.models.model_types import Transaction
+from src.models.online_metrics import MetricSet
+from src.models.simulation import (
+    build_dividend_events,
+    fetch_dividend_series,
+    split_dividend_events,
+)
+
+
+@dataclass(frozen=True)
+class GridConfig:
+    """One synthetic dividend configuration in a parameter grid.
+
+    Fields mirror SyntheticDividendAlgorithm's constructor. A configuration
+    with rebalance_size=0 never places orders and behaves as buy-and-hold.
+    """
+
+    rebalance_size: float
+    profit_sharing: float
+    buyback_enabled: bool = True
+    sell_at_new_ath: bool = False
+    bracket_seed: Optional[float] = None
+
+    @classmethod
+    def from_algorithm(cls, algo: AlgorithmBase) -> "GridConfig":
+        """Build a config from a synthetic dividend or buy-and-hold algorithm.
+
+        Raises:
+            TypeError: For any other algorithm type
+        """
+        if isinstance(algo, SyntheticDividendAlgorithm):
+            return cls(
+                rebalance_size=algo.rebalance_size,
+                profit_sharing=algo.profit_sharing,
+                buyback_enabled=algo.buyback_enabled,
+                sell_at_new_ath=algo.sell_at_new_ath,
+                bracket_seed=algo.bracket_seed,
+            )
+        if isinstance(algo, BuyAndHoldAlgorithm):
+            return cls(rebalance_size=0.0, profit_sharing=0.0)
+        raise TypeError(
+            "Grid backtests support synthetic dividend and buy-and-hold algorithms, "
+            f"got {type(algo).__name__}"
+        )
+
+    @classmethod
+    def coerce(cls, config: Union["GridConfig", AlgorithmBase, str]) -> "GridConfig":
+        """Accept a GridConfig, an algorithm instance, or a name like "sd8,75"."""
+        if isinstance(config, GridConfig):
+            return config
+        if isinstance(config, str):
+            from src.algorithms.factory import build_algo_from_name
+
+            config = build_algo_from_name(config)
+        return cls.from_algorithm(config)
+
+
+class _GridState:
+    """State of K synthetic dividend configurations trading one ticker."""
+
+    def __init__(
+        self,
+        market_data: AlignedPriceData,
+        ticker: str,
+        configs: List[GridConfig],
+        initial_investment: float,
+        allow_margin: bool,
+        record_ledgers: bool,
+    ) -> None:
+        self.market_data = market_data
+        self.ticker = ticker
+        self.configs = configs
+        self.initial_investment = initial_investment
+        self.allow_margin = allow_margin
+        self.record_ledgers = record_ledgers
+        self.dates = market_data.dates
+        k_count = len(configs)
+        n_days = len(market_data)
+
+        # Price rows (arrays for vector triggers, lists for scalar fills)
+        row = market_data.row(ticker)
+        self.low = market_data.low[row]
+        self.close = market_data.close[row]
+        self.high = market_data.high[row]
+        self.lows: List[float] = self.low.tolist()
+        self.highs: List[float] = self.high.tolist()
+        self.opens: Optional[List[float]] = (
+            market_data.open[row].tolist() if market_data.has_field(ticker, "Open") else None
+        )
+        self.has_range = market_data.has_field(ticker, "Low") and market_data.has_field(
+            ticker, "High"
+        )
+
+        # All-time high after each day (entry d + 1), seeded with the first close
+        first_price = market_data.close_at(ticker, 0)
+        self.ath: List[float] = np.fmax.accumulate(
+            np.concatenate(([first_price], self.high))
+        ).tolist()
+
+        # Initial purchase, identical for every configuration
+        qty = int(initial_investment * 1.0 / first_price)
+        self.holdings: List[float] = [qty] * k_count
+        self.bank = np.full(k_count, initial_investment - qty * first_price)
+        self.holdings_history: List[ShareDayAccumulator] = [
+            ShareDayAccumulator() for _ in range(k_count)
+        ]
+        for history in self.holdings_history:
+            history.record(self.dates[0], qty)
+        self.ledgers: List[List[Transaction]] = [
+            (
+                [
+                    Transaction(
+                        transaction_date=self.dates[0],
+                        action="BUY",
+                        qty=qty,
+                        price=first_price,
+                        ticker=ticker,
+                        notes="Initial purchase",
+                        bank_after=initial_investment - qty * first_price,
+                    )
+                ]
+                if record_ledgers
+                else []
+            )
+            for _ in range(k_count)
+        ]
+
+        # Order books: at most one pending buy and one pending sell limit per
+        # config (quantity 0 = no order); limit arrays hold NaN for no order
+        self.buy_qty: List[float] = [0.0] * k_count
+        self.sell_qty: List[float] = [0.0] * k_count
+        self.sell_notes: List[str] = [""] * k_count
+        self.buy_limit = np.full(k_count, np.nan)
+        self.sell_limit = np.full(k_count, np.nan)
+        self.buy_limits: List[float] = [np.nan] * k_count
+        self.sell_limits: List[float] = [np.nan] * k_count
+
+        # Synthetic dividend state (anchor price and buyback stack)
+        self.anchor: List[float] = [0.0] * k_count
+        self.stack_count: List[float] = [0] * k_count
+        self.total_alpha = [0.0] * k_count
+        self.realized_alpha = [0.0] * k_count
+        self.unrealized_alpha = [0.0] * k_count
+
+        # Counters and accumulators
+        self.transaction_count = [1] * k_count  # Initial purchase
+        self.skipped_count = [0] * k_count
+        self.skipped_buy_value = [0.0] * k_count
+        self.total_dividends = [0.0] * k_count
+        self.dividend_count = [0] * k_count
+        self.opportunity_cost = np.zeros(k_count)
+        self.interest_earned = np.zeros(k_count)
+        # Daily bank, portfolio value and net interest, for the online metrics
+        self.bank_path = np.empty((k_count, n_days))
+        self.value_path = np.empty((k_count, n_days))
+        self.interest_path = np.zeros((k_count, n_days))
+
+        # Rung ladders for multi-bracket moves (SyntheticDividendAlgorithm.place_orders);
+        # ATH-sell orders only exist above the all-time high, so they never ladder
+        self.buy_ladders: List[Optional[BracketLadder]] = []
+        self.sell_ladders: List[Optional[BracketLadder]] = []
+        for config in configs:
+            r, s = config.rebalance_size, config.profit_sharing
+            self.buy_ladders.append(BracketLadder(r, 1 + r * s, config.bracket_seed))
+            self.sell_ladders.append(
+                None
+                if config.buyback_enabled and config.sell_at_new_ath
+                else BracketLadder(r, 1 - r * s / (1 + r), config.bracket_seed)
+            )
+
+        for k in range(k_count):
+            self.place_orders(k, qty, first_price, first_price)
+
+    def place_orders(self, k: int, holdings: float, price: float, ath: float) -> None:
+        """Replace config k's orders around a new anchor (SyntheticDividendAlgorithm.place_orders)."""
+        config = self.configs[k]
+        self.anchor[k] = price
+        orders = calculate_synthetic_dividend_orders(
+            holdings=holdings,
+            last_transaction_price=price,
+            rebalance_size=config.rebalance_size,
+            profit_sharing=config.profit_sharing,
+            bracket_seed=config.bracket_seed,
+        )
+
+        buy_qty = 0.0
+        sell_qty = 0.0
+        if config.buyback_enabled:
+            if orders["next_buy_qty"] > 0:
+                buy_qty = orders["next_buy_qty"]
+            if orders["next_sell_qty"] > 0:
+                if not config.sell_at_new_ath:
+                    sell_qty = orders["next_sell_qty"]
+                    self.sell_notes[k] = "Taking profits"
+                elif price > ath:
+                    sell_qty = orders["next_sell_qty"]
+                    self.sell_notes[k] = f"ATH-sell at new ATH ${ath:.2f}"
+        elif orders["next_sell_qty"] > 0:
+            sell_qty = orders["next_sell_qty"]
+            self.sell_notes[k] = f"ATH-only sell, ATH=${ath:.2f}"
+
+        buy_limit = orders["next_buy_price"] if buy_qty > 0 else np.nan
+        sell_limit = orders["next_sell_price"] if sell_qty > 0 else np.nan
+        self.buy_qty[k] = buy_qty
+        self.sell_qty[k] = sell_qty
+        self.buy_limits[k] = self.buy_limit[k] = buy_limit
+        self.sell_limits[k] = self.sell_limit[k] = sell_limit
+
+    def next_trigger_day(self, start: int) -> int:
+        """First day >= start on which any configuration's order triggers."""
+        if not self.has_range:
+            return len(self.dates)
+        buy_limit = float(np.fmax.reduce(self.buy_limit))
+        sell_limit = float(np.fmin.reduce(self.sell_limit))
+        return first_limit_trigger(
+            self.low,
+            self.high,
+            None if np.isnan(buy_limit) else buy_limit,
+            None if np.isnan(sell_limit) else sell_limit,
+            start,
+        )
+
+    def market_day(self, day_index: int) -> None:
+        """Fill every configuration whose order triggers on day_index."""
+        if not self.has_range:
+            return
+        low = self.lows[day_index]
+        high = self.highs[day_index]
+        triggered = (low <= self.buy_limit) | (high >= self.sell_limit)
+        for k in np.flatnonzero(triggered).tolist():
+            self.fill(k, day_index)
+
+    def fill(self, k: int, day_index: int) -> None:
+        """Execute config k's triggered orders and re-place them.
+
+        Mirrors Market.evaluate_day and Order.get_execution_price (fills),
+        SyntheticDividendAlgorithm.on_day (stack, alpha and anchor from the
+        full-precision fill price) and SimulationState.execute_transaction
+        (bank, holdings and skips).
+        """
+        config = self.configs[k]
+        low = self.lows[day_index]
+        high = self.highs[day_index]
+        has_open = self.opens is not None
+
+        # (is_buy, qty, limit, fill price, rung); a buy is placed before its sell
+        fills: List[Tuple[bool, float, float, float, int]] = []
+        limit = self.buy_limits[k]
+        if low <= limit:
+            # Gapped down through the limit: fill at the open
+            price = self.opens[day_index] if has_open and limit > high else limit  # type: ignore
+            fills.append((True, self.buy_qty[k], limit, price, 1))
+        limit = self.sell_limits[k]
+        if high >= limit:
+            # Gapped up through the limit: fill at the open
+            price = self.opens[day_index] if has_open and limit < low else limit  # type: ignore
+            fills.append((False, self.sell_qty[k], limit, price, 1))
+        sell_notes = self.sell_notes[k]
+
+        # Multi-bracket move: a lone triggered order fills every rung its ladder crosses,
+        # one bracket apart from the first fill price on
+        if len(fills) == 1:
+            is_buy, qty, _, first_price, _ = fills[0]
+            ladder = self.buy_ladders[k] if is_buy else self.sell_ladders[k]
+            if ladder is not None:
+                side = OrderAction.BUY if is_buy else OrderAction.SELL
+                for rung, (rung_qty, rung_limit) in enumerate(
+                    ladder.rungs(side, qty, first_price, low, high), start=2
+                ):
+                    fills.append((is_buy, rung_qty, rung_limit, rung_limit, rung))
+
+        # Algorithm bookkeeping, on its own view of holdings (includes skipped buys)
+        algo_holdings = self.holdings[k]
+        for is_buy, qty, limit, price, _ in fills:
+            if is_buy:
+                if config.buyback_enabled:
+                    self.stack_count[k] += qty
+                    current_value = algo_holdings * price
+                    profit = (self.anchor[k] - price) * qty
+                    alpha = (profit / current_value) * 100 if current_value != 0 else 0.0
+                    self.total_alpha[k] += alpha
+                    self.unrealized_alpha[k] += alpha
+                algo_holdings += qty
+            else:
+                if config.buyback_enabled:
+                    shares_to_unwind = min(qty, self.stack_count[k])
+                    if shares_to_unwind > 0 and self.stack_count[k] > 0:
+                        alpha_fraction = shares_to_unwind / self.stack_count[k]
+                        realized_alpha = self.unrealized_alpha[k] * alpha_fraction
+                        self.realized_alpha[k] += realized_alpha
+                        self.unrealized_alpha[k] -= realized_alpha
+                    self.stack_count[k] -= shares_to_unwind
+                algo_holdings -= qty
+            self.anchor[k] = price
+        self.place_orders(k, algo_holdings, fills[-1][3], self.ath[day_index + 1])
+
+        # Engine execution against the config's bank
+        current_date = self.dates[day_index]
+        bank = self.bank[k]
+        for is_buy, qty, limit, actual_price, rung in fills:
+            if is_buy:
+                cost = qty * actual_price
+                executed = bank >= cost or self.allow_margin
+                if executed:
+                    self.holdings[k] += qty
+                    bank -= cost
+                else:
+                    self.skipped_buy_value[k] += actual_price * qty
+                    skip_notes = f"insufficient cash: ${bank:.2f} < ${cost:.2f}"
+            else:
+                executed = self.holdings[k] >= qty
+                if executed:
+                    self.holdings[k] -= qty
+                    bank += qty * actual_price
+                else:
+                    skip_notes = f"insufficient holdings: {self.holdings[k]} < {qty}"
+
+            if executed:
+                self.transaction_count[k] += 1
+                self.holdings_history[k].record(current_date, self.holdings[k])
+            else:
+                self.skipped_count[k] += 1
+
+            if self.record_ledgers:
+                fill = Fill(
+                    side=OrderAction.BUY if is_buy else OrderAction.SELL,
+                    qty=qty,
+                    price=actual_price,
+                    limit_price=limit,
+                    rung=rung,
+                    order_notes="Buying back" if is_buy else sell_notes,
+                )
+                fill.transaction_date = current_date
+                fill.ticker = self.ticker
+                tx: Transaction = fill
+                if not executed:
+                    tx = Transaction(
+                        transaction_date=current_date,
+                        action=f"SKIP {fill.action}",
+                        qty=qty,
+                        price=actual_price,
+                        ticker=self.ticker,
+                        notes=f"{fill.notes}, {skip_notes}",
+                    )
+                tx.bank_after = float(bank)
+                self.ledgers[k].append(tx)
+        self.bank[k] = bank
+
+    def pay_dividend(self, div_date: date, div_per_share: Any) -> None:
+        """Credit one dividend to every configuration (see simulation.pay_dividend)."""
+        period_start = div_date - timedelta(days=90)
+        for k in range(len(self.configs)):
+            avg_holdings = self.holdings_history[k].average(period_start, div_date)
+            div_payment = div_per_share * avg_holdings
+            bank = self.bank[k] + div_payment
+            self.bank[k] = bank
+            self.total_dividends[k] += div_payment
+            self.dividend_count[k] += 1
+            self.transaction_count[k] += 1
+            if self.record_ledgers:
+                self.ledgers[k].append(
+                    Transaction(
+                        transaction_date=div_date,
+                        action="DIVIDEND",
+                        qty=int(avg_holdings),
+                        price=div_per_share,
+                        ticker=self.ticker,
+                        notes=f"${div_payment:.2f} (avg {avg_holdings:.2f} shares over 90 days), bank = {bank:.2f}",
+                        bank_after=float(bank),
+                    )
+                )
+
+    def record_days(self, start: int, stop: int) -> None:
+        """Record the bank and portfolio values of days [start, stop)."""
+        holdings = np.asarray(self.holdings, dtype=np.float64)
+        self.bank_path[:, start:stop] = self.bank[:, None]
+        self.value_path[:, start:stop] = (
+            self.bank[:, None] + holdings[:, None] * self.close[start:stop]
+        )
+
+    def accrue(self, day_index: int, opportunity_rate: float, interest_rate: float) -> None:
+        """Apply one day of opportunity cost and interest to all banks."""
+        bank_before = self.bank
+        if opportunity_rate != 0:
+            negative = self.bank < 0
+            if negative.any():
+                charged = np.where(negative, self.bank * (1.0 + opportunity_rate), self.bank)
+                self.opportunity_cost += self.bank - charged
+                self.bank = charged
+        if interest_rate > 0:
+            credited = self.bank > 0
+            if credited.any():
+                accrued = np.where(credited, self.bank * (1.0 + interest_rate), self.bank)
+                self.interest_earned += accrued - self.bank
+                self.bank = accrued
+        self.interest_path[:, day_index] = self.bank - bank_before
+
+    def portfolio_summary(self, k: int) -> Dict[str, Any]:
+        """Config k's results in run_portfolio_simulation's summary format.
+
+        Results are at the "summary" detail level: daily value series are not
+        kept, only their aggregates such as "daily_bank_stats".
+        """
+        config = self.configs[k]
+        ticker = self.ticker
+        final_index = len(self.dates) - 1
+        final_date = self.dates[final_index]
+        final_price = self.market_data.close_at(ticker, final_index)
+        holdings = self.holdings[k]
+        bank = self.bank[k]
+        initial_investment = self.initial_investment
+
+        final_asset_value = holdings * final_price
+        final_total_value = bank + final_asset_value
+        total_return_pct = ((final_total_value - initial_investment) / initial_investment) * 100
+        years = (final_date - self.dates[0]).days / 365.25
+        annualized_return_pct = (
+            (((final_total_value / initial_investment) ** (1 / years)) - 1) * 100
+            if years > 0
+            else 0
+        )
+        initial_value = initial_investment * 1.0
+
+        bank_stats = daily_bank_stats(self.bank_path[k])
+        metrics = MetricSet()
+        metrics.update_span(self.value_path[k], self.bank_path[k], self.interest_path[k], 0.0)
+
+        return {
+            "total_final_value": final_total_value,
+            "final_bank": bank,
+            "final_asset_value": final_asset_value,
+            "total_return": total_return_pct,
+            "annualized_return": annualized_return_pct,
+            "initial_investment": initial_investment,
+            "start_date": self.dates[0],
+            "end_date": final_date,
+            "trading_days": len(self.dates),
+            "assets": {
+                ticker: {
+                    "allocation": 1.0,
+                    "initial_investment": initial_value,
+                    "final_holdings": holdings,
+                    "final_price": final_price,
+                    "final_value": final_asset_value,
+                    "total_return": (
+                        ((final_asset_value - initial_value) / initial_value) * 100
+                        if initial_value > 0
+                        else 0
+                    ),
+                }
+            },
+            "allocations": {ticker: 1.0},
+            "transaction_count": self.transaction_count[k],
+            "skipped_count": self.skipped_count[k],
+            "skipped_buy_value": self.skipped_buy_value[k],
+            "total_withdrawn": 0.0,
+            "withdrawal_count": 0,
+            "shares_sold_for_withdrawals": 0.0,
+            "withdrawal_rate_pct": 0.0,
+            "cash_interest_earned": float(self.interest_earned[k]),
+            "opportunity_cost": float(self.opportunity_cost[k]),
+            "total_dividends_by_asset": {ticker: self.total_dividends[k]},
+            "total_dividends": self.total_dividends[k],
+            "dividend_payment_count_by_asset": {ticker: self.dividend_count[k]},
+            "bank_min": min(initial_investment, bank_stats["bank_min"]),
+            "bank_max": max(initial_investment, bank_stats["bank_max"]),
+            "daily_bank_stats": bank_stats,
+            "metrics": metrics.result(),
+            "baseline": None,
+            "volatility_alpha": None,
+            "final_stack_size": self.stack_count[k],
+            "total_volatility_alpha": self.total_alpha[k],
+            "realized_volatility_alpha": self.realized_alpha[k],
+            "unrealized_stack_alpha": self.unrealized_alpha[k],
+            "config": config,
+        }
+
+
+def simulate_synthetic_dividend_grid(
+    market_data: AlignedPriceData,
+    ticker: str,
+    configs: Sequence[Union[GridConfig, AlgorithmBase, str]],
+    initial_investment: float = 1_000_000.0,
+    allow_margin: bool = True,
+    dividend_series: Optional[pd.Series] = None,
+    reference_returns: Optional[Dict[date, float]] = None,
+    risk_free_returns: Optional[Dict[date, float]] = None,
+    reference_rate_ticker: Optional[str] = None,
+    cash_interest_rate_pct: float = 0.0,
+    record_ledgers: bool = False,
+) -> Tuple[List[Dict[str, Any]], Optional[List[List[Transaction]]]]:
+    """Simulate K synthetic dividend configurations of one ticker in one pass.
+
+    Each configuration's result equals run_portfolio_simulation() with
+    allocations={ticker: 1.0} and a per-asset algorithm built from it.
+
+    Args:
+        market_data: Aligned prices containing ticker
+        ticker: Ticker to trade
+        configs: GridConfigs, algorithm instances, or names (e.g., "sd8", "sd-9.15,50")
+        initial_investment: Starting capital per configuration
+        allow_margin: Whether banks may go negative (strict mode skips unaffordable buys)
+        dividend_series: Dividends per share indexed by ex-date (None = no dividends)
+        reference_returns: Daily reference returns for opportunity cost on negative banks
+        risk_free_returns: Daily risk-free returns credited on positive banks
+        reference_rate_ticker: If set, enables the 0.027%/day fallback opportunity-cost rate
+        cash_interest_rate_pct: Annual cash rate used when no risk-free return is available
+        record_ledgers: If True, also return each configuration's transaction list
+
+    Returns:
+        Tuple of (portfolio_summaries, ledgers); ledgers is None unless record_ledgers
+    """
+    grid_configs = [GridConfig.coerce(config) for config in configs]
+    if not grid_configs:
+        return [], [] if record_ledgers else None
+
+    state = _GridState(
+        market_data, ticker, grid_configs, initial_investment, allow_margin, record_ledgers
+    )
+    dates = market_data.dates
+    n_days = len(dates)
+
+    # Per-day rates, resolved exactly as SimulationState.process_daily_interest does
+    reference_returns = reference_returns or {}
+    risk_free_returns = risk_free_returns or {}
+    fallback_rate = 0.00027 if reference_rate_ticker else 0.0
+    daily_interest_rate = (
+        (cash_interest_rate_pct / 100.0) / 365.25 if cash_interest_rate_pct > 0 else 0.0
+    )
+    accrues = bool(reference_returns or risk_free_returns) or (
+        fallback_rate != 0 or daily_interest_rate > 0
+    )
+    opportunity_rates = [reference_returns.get(d, fallback_rate) for d in dates]
+    interest_rates = [risk_free_returns.get(d, daily_interest_rate) for d in dates]
+
+    before_market, after_market = split_dividend_events(
+        build_dividend_events({ticker: dividend_series}, [ticker], dates)
+        if dividend_series is not None
+        else []
+    )
+    event_days = sorted(before_market.keys() | after_market.keys())
+
+    day_index = 0
+    while day_index < n_days:
+        for _, _, div_date, div_per_share in before_market.get(day_index, ()):
+            state.pay_dividend(div_date, div_per_share)
+
+        next_day = day_index + 1
+        if accrues:
+            state.market_day(day_index)
+            state.accrue(day_index, opportunity_rates[day_index], interest_rates[day_index])
+            state.record_days(day_index, next_day)
+        else:
+            # Banks only change on fills and dividends: jump to the next one
+            trigger_day = state.next_trigger_day(day_index)
+            if trigger_day == day_index:
+                state.market_day(day_index)
+            elif day_index not in after_market:
+                next_event = bisect.bisect_right(event_days, day_index)
+                next_day = trigger_day
+                if next_event < len(event_days):
+                    next_day = min(next_day, event_days[next_event])
+            state.record_days(day_index, next_day)
+
+        for _, _, div_date, div_per_share in after_market.get(day_index, ()):
+            state.pay_dividend(div_date, div_per_share)
+
+        day_index = next_day
+
+    summaries = [state.portfolio_summary(k) for k in range(len(grid_configs))]
+    return summaries, state.ledgers if record_ledgers else None
+
+
+def run_synthetic_dividend_grid(
+    df: pd.DataFrame,
+    ticker: str,
+    configs: Sequence[Union[GridConfig, AlgorithmBase, str]],
+    initial_qty: Optional[float] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    reference_rate_ticker: str = "",
+    dividend_series: Optional[pd.Series] = None,
+    allow_margin: bool = True,
+    initial_investment: Optional[float] = None,
+    record_ledgers: bool = False,
+) -> Tuple[List[Dict[str, Any]], Optional[List[List[Transaction]]]]:
+    """Backtest a grid of configurations on one ticker (grid form of run_algorithm_backtest).
+
+    Equivalent to calling run_algorithm_backtest(df, ticker, initial_qty,
+    start_date, end_date, algo=config, ...) once per configuration, but
+    prices are aligned once and all configurations advance together.
+
+    Args:
+        df: Historical OHLC price data (indexed by date)
+        ticker: Stock symbol
+        configs: GridConfigs, algorithm instances, or names (e.g., "sd8", "sd-9.15,50")
+        initial_qty: Number of shares to purchase initially (sets the investment)
+        start_date: Backtest start date (defaults to first date)
+        end_date: Backtest end date (defaults to last date)
+        reference_rate_ticker: If set, negative banks pay the fallback
+            opportunity-cost rate, as in run_algorithm_backtest
+        dividend_series: Dividends per share indexed by ex-date
+            (None = auto-fetch, as in run_algorithm_backtest)
+        allow_margin: If False, buys are skipped when the bank cannot cover them
+        initial_investment: Dollar amount to invest if initial_qty is not given
+        record_ledgers: If True, also return each configuration's transactions
+
+    Returns:
+        Tuple of (summaries, ledgers): one single-ticker summary per config
+        (same keys as run_algorithm_backtest) and, if record_ledgers, one
+        transaction list per config (None otherwise)
+    """
+    # Deferred: backtest imports the simulation engine lazily
+    from src.models.backtest import _map_portfolio_to_single_ticker_summary
+
+    if df is None or df.empty:
+        raise ValueError("Empty price data")
+
+    df_indexed = df.copy()
+    df_indexed.index = pd.to_datetime(df_indexed.index).date
+    if start_date is None:
+        start_date = min(df_indexed.index)
+    if end_date is None:
+        end_date = max(df_indexed.index)
+
+    first_idx = min(d for d in df_indexed.index if d >= start_date)
+    start_price = float(df_indexed.loc[first_idx, "Close"])
+    if initial_qty is not None:
+        investment = initial_qty * start_price
+    elif initial_investment is not None:
+        investment = initial_investment
+    else:
+        investment = 1_000_000.0
+
+    if dividend_series is None:
+        try:
+            dividend_series = fetch_dividend_series(ticker, start_date, end_date)
+        except Exception as e:
+            print(f"WARN: Could not fetch dividends for {ticker}: {e}")
+
+    market_data = AlignedPriceData.from_frames({ticker: df_indexed}, start_date, end_date)
+    portfolio_summaries, ledgers = simulate_synthetic_dividend_grid(
+        market_data,
+        ticker,
+        configs,
+        initial_investment=investment,
+        allow_margin=allow_margin,
+        dividend_series=dividend_series,
+        reference_rate_ticker=reference_rate_ticker,
+        record_ledgers=record_ledgers,
+    )
+
+    summaries = []
+    for k, portfolio_summary in enumerate(portfolio_summaries):
+        summary = _map_portfolio_to_single_ticker_summary(
+            portfolio_summary=portfolio_summary,
+            ticker=ticker,
+            df_indexed=df_indexed,
+            start_date=start_date,
+            end_date=end_date,
+            algo_obj=None,
+        )
+        summary["allow_margin"] = allow_margin
+        summary["transaction_count"] = portfolio_summary["transaction_count"]
+        summary["realized_volatility_alpha"] = portfolio_summary["realized_volatility_alpha"]
+        summary["unrealized_stack_alpha"] = portfolio_summary["unrealized_stack_alpha"]
+        summary["config"] = portfolio_summary["config"]
+        summaries.append(summary)
+
+    return summaries, ledgers
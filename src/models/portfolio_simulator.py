@@ -83,16 +83,16 @@ def simulate_portfolio(
         end_date=end_date,
         portfolio_algo="per-asset:buy-and-hold",  # Updated to new API
         initial_investment=initial_value,
+        engine="fast",
+        detail="daily",
     )
 
     # Convert to the expected format for backward compatibility
     # Reconstruct daily_values DataFrame in the original format
+    daily = portfolio_summary["daily"]
     daily_values_df = pd.DataFrame(
-        {
-            "date": list(portfolio_summary["daily_values"].keys()),
-            "total": list(portfolio_summary["daily_values"].values()),
-        }
-    ).set_index("date")
+        {"total": daily.portfolio}, index=pd.Index(list(daily.dates), name="date")
+    )
 
     result = {
         "final_value": portfolio_summary["total_final_value"],
@@ -0,0 +1,333 @@
+"""Synthetic price paths for Monte Carlo backtests.
+
+Backtests replay one historical path per ticker. The models here generate
+N alternative paths as (N, T) arrays of daily log returns, built into
+OHLC bars:
+
+- GBM: geometric Brownian motion, dS = μS dt + σS dW (docs/continuous_model.md)
+- BlockBootstrap: blocks of consecutive historical returns resampled with
+  replacement, keeping short-range structure (volatility clusters, trends)
+- RegimeSwitching: GBM whose drift and volatility follow a Markov chain of
+  regimes (e.g., calm bull and volatile bear markets)
+
+Daily bars are synthesized from the closes (synthesize_ohlc), since the
+synthetic dividend algorithm fills limit orders against each day's low,
+high and open.
+
+    >>> paths = GBM(annual_drift=0.07, annual_volatility=0.20).generate(10_000, 252 * 30, seed=1)
+    >>> paths.close.shape
+    (10000, 7560)
+"""
+
+import math
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import date
+from typing import List, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+# Trading days per year, for annualized drift and volatility
+TRADING_DAYS = 252
+
+Seed = Union[None, int, np.random.SeedSequence, np.random.Generator]
+
+
+class PricePaths(NamedTuple):
+    """N daily OHLC price paths over the same T trading days.
+
+    Arrays have shape (N, T); row n is path n. Generated paths are stored
+    day-major (Fortran order), so the N prices of one day are contiguous.
+    """
+
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    dates: List[date]
+
+    @property
+    def n_paths(self) -> int:
+        """Number of paths (N)."""
+        return int(self.close.shape[0])
+
+    @property
+    def n_days(self) -> int:
+        """Trading days per path (T)."""
+        return int(self.close.shape[1])
+
+    def frame(self, path: int) -> pd.DataFrame:
+        """One path as an OHLC DataFrame indexed by date, for the backtest engines."""
+        return pd.DataFrame(
+            {
+                "Open": self.open[path],
+                "High": self.high[path],
+                "Low": self.low[path],
+                "Close": self.close[path],
+            },
+            index=pd.DatetimeIndex(self.dates),
+        )
+
+
+def trading_dates(start_date: date, n_days: int) -> List[date]:
+    """n_days weekday dates from start_date on (synthetic paths ignore holidays)."""
+    return [d.date() for d in pd.bdate_range(start_date, periods=n_days)]
+
+
+def synthesize_ohlc(
+    close: np.ndarray,
+    rng: np.random.Generator,
+    gap_scale: float = 0.25,
+    range_scale: float = 0.4,
+    volatility: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Daily open, high and low for (N, T) close paths.
+
+    Each path's noise scales with σ, the standard deviation of its daily log
+    returns. The open is the previous close moved by a gap of gap_scale·σ·z,
+    and the range extends beyond the open and close by range_scale·σ·e on
+    each side (e exponential with mean 1, drawn per side), so
+    low <= min(open, close) and high >= max(open, close). The first open
+    equals the first close.
+
+    Args:
+        close: Close prices, shape (N, T)
+        rng: Random generator
+        gap_scale: Overnight gap size, in units of σ
+        range_scale: Intraday range beyond the open and close, in units of σ
+        volatility: σ of each path, shape (N,) (default: measured from close)
+
+    Returns:
+        Tuple of (open, high, low) arrays of close's shape and dtype, laid
+        out day-major like the paths generate() returns
+    """
+    n_paths, n_days = close.shape
+    dtype = close.dtype
+    # Work on (T, N) views: one day's prices are contiguous
+    close_t = close.T
+    if volatility is None:
+        if n_days > 1:
+            volatility = np.diff(np.log(close_t), axis=0).std(axis=0)
+        else:
+            volatility = np.zeros(n_paths)
+    sigma = np.asarray(volatility, dtype=dtype)
+
+    open_t = np.empty((n_days, n_paths), dtype=dtype)
+    open_t[0] = close_t[0]
+    noise = rng.standard_normal((n_days - 1, n_paths), dtype=dtype)
+    noise *= gap_scale * sigma
+    open_t[1:] = close_t[:-1] * np.exp(noise, out=noise)
+
+    extremes = []
+    for side, bound in ((1.0, np.maximum), (-1.0, np.minimum)):
+        noise = rng.standard_exponential((n_days, n_paths), dtype=dtype)
+        noise *= side * range_scale * sigma
+        extreme = np.exp(noise, out=noise)
+        extreme *= bound(open_t, close_t)
+        extremes.append(extreme)
+    high_t, low_t = extremes
+    return open_t.T, high_t.T, low_t.T
+
+
+class PathModel(ABC):
+    """Base class of price path models: subclasses generate daily log returns."""
+
+    @abstractmethod
+    def log_returns(self, n_paths: int, n_steps: int, rng: np.random.Generator) -> np.ndarray:
+        """Daily log returns, shape (n_paths, n_steps)."""
+
+    def generate(
+        self,
+        n_paths: int,
+        n_days: int,
+        seed: Seed = None,
+        start_price: float = 100.0,
+        start_date: date = date(2000, 1, 3),
+        dtype: type = np.float64,
+        gap_scale: float = 0.25,
+        range_scale: float = 0.4,
+    ) -> PricePaths:
+        """Generate OHLC price paths.
+
+        Args:
+            n_paths: Number of paths (N)
+            n_days: Trading days per path (T), including the start day
+            seed: Seed, SeedSequence or Generator (same seed, same paths)
+            start_price: Close of every path on the first day
+            start_date: First trading date
+            dtype: Storage type of the price arrays; np.float32 halves memory
+            gap_scale: Overnight gap size (see synthesize_ohlc)
+            range_scale: Intraday range size (see synthesize_ohlc)
+
+        Returns:
+            PricePaths
+        """
+        if n_paths < 1 or n_days < 1:
+            raise ValueError(f"Need at least one path and one day, got {n_paths} × {n_days}")
+        rng = np.random.default_rng(seed)
+        returns = self.log_returns(n_paths, n_days - 1, rng)
+        volatility = returns.std(axis=1) if n_days > 1 else np.zeros(n_paths)
+        # Day-major (T, N) storage; the (N, T) arrays are its transposed views
+        close_t = np.zeros((n_days, n_paths))
+        np.cumsum(returns.T, axis=0, out=close_t[1:])
+        del returns
+        np.exp(close_t, out=close_t)
+        close_t *= start_price
+        close: np.ndarray = close_t.astype(dtype, copy=False).T
+        del close_t
+        open_, high, low = synthesize_ohlc(close, rng, gap_scale, range_scale, volatility)
+        return PricePaths(open_, high, low, close, trading_dates(start_date, n_days))
+
+
+@dataclass(frozen=True)
+class GBM(PathModel):
+    """Geometric Brownian motion with constant annual drift and volatility.
+
+    Log returns are normal with mean (μ - σ²/2)·dt and standard deviation
+    σ·√dt per trading day, so E[S_t] = S_0·exp(μt).
+
+    Attributes:
+        annual_drift: μ as a decimal (e.g., 0.07)
+        annual_volatility: σ as a decimal (e.g., 0.20)
+    """
+
+    annual_drift: float
+    annual_volatility: float
+
+    def log_returns(self, n_paths: int, n_steps: int, rng: np.random.Generator) -> np.ndarray:
+        """Daily log returns, shape (n_paths, n_steps)."""
+        dt = 1.0 / TRADING_DAYS
+        mean = (self.annual_drift - 0.5 * self.annual_volatility**2) * dt
+        returns = rng.standard_normal((n_paths, n_steps))
+        returns *= self.annual_volatility * math.sqrt(dt)
+        returns += mean
+        return returns
+
+
+def historical_log_returns(
+    ticker: str, start_date: date, end_date: date, fetcher: Optional[object] = None
+) -> np.ndarray:
+    """Daily close-to-close log returns of a ticker, from the price cache.
+
+    Args:
+        ticker: Stock symbol
+        start_date: First date of the history
+        end_date: Last date of the history
+        fetcher: HistoryFetcher to read through (default: a new one)
+
+    Raises:
+        ValueError: If there are fewer than two closes in the range
+    """
+    if fetcher is None:
+        from src.data.fetcher import HistoryFetcher
+
+        fetcher = HistoryFetcher()
+    df = fetcher.get_history(ticker, start_date, end_date)  # type: ignore[attr-defined]
+    if df is None or len(df) < 2:
+        raise ValueError(f"Not enough price history for {ticker} ({start_date} to {end_date})")
+    close = df["Close"].to_numpy(dtype=np.float64).ravel()
+    close = close[np.isfinite(close) & (close > 0)]
+    return np.diff(np.log(close))
+
+
+@dataclass(frozen=True, eq=False)
+class BlockBootstrap(PathModel):
+    """Paths resampled from historical returns in blocks of consecutive days.
+
+    Each path concatenates blocks of block_days returns starting at uniformly
+    random days of the history (the moving block bootstrap). Blocks keep
+    volatility clustering and short trends that resampling single days
+    would destroy; paths have the history's return distribution.
+
+    Attributes:
+        returns: Historical daily log returns (see historical_log_returns)
+        block_days: Days per block
+    """
+
+    returns: np.ndarray
+    block_days: int = 20
+
+    def __post_init__(self) -> None:
+        if self.block_days < 1:
+            raise ValueError(f"block_days must be positive, got {self.block_days}")
+        if len(self.returns) < self.block_days:
+            raise ValueError(
+                f"History of {len(self.returns)} returns is shorter than one "
+                f"{self.block_days}-day block"
+            )
+
+    @classmethod
+    def from_history(
+        cls, ticker: str, start_date: date, end_date: date, block_days: int = 20
+    ) -> "BlockBootstrap":
+        """Bootstrap a ticker's cached price history."""
+        return cls(historical_log_returns(ticker, start_date, end_date), block_days)
+
+    def log_returns(self, n_paths: int, n_steps: int, rng: np.random.Generator) -> np.ndarray:
+        """Daily log returns, shape (n_paths, n_steps)."""
+        returns = np.asarray(self.returns, dtype=np.float64)
+        n_blocks = -(-n_steps // self.block_days)
+        starts = rng.integers(0, len(returns) - self.block_days + 1, size=(n_paths, n_blocks))
+        days = (starts[:, :, None] + np.arange(self.block_days)).reshape(n_paths, -1)
+        sampled: np.ndarray = returns[days[:, :n_steps]]
+        return sampled
+
+
+@dataclass(frozen=True)
+class RegimeSwitching(PathModel):
+    """GBM whose drift and volatility switch between regimes (a Markov chain).
+
+    Each day the regime moves from i to j with probability transitions[i][j];
+    the day's return is GBM with the new regime's parameters. The expected
+    stay in regime i is 1 / (1 - transitions[i][i]) days.
+
+        >>> bull_bear = RegimeSwitching(
+        ...     regimes=((0.12, 0.15), (-0.20, 0.35)),
+        ...     transitions=((0.995, 0.005), (0.02, 0.98)),
+        ... )
+
+    Attributes:
+        regimes: (annual_drift, annual_volatility) of each regime
+        transitions: Daily transition probabilities; rows sum to 1
+        initial_regime: Regime of every path on the first day
+    """
+
+    regimes: Tuple[Tuple[float, float], ...]
+    transitions: Tuple[Tuple[float, ...], ...]
+    initial_regime: int = 0
+
+    def __post_init__(self) -> None:
+        matrix = np.asarray(self.transitions, dtype=np.float64)
+        n = len(self.regimes)
+        if n == 0 or matrix.shape != (n, n):
+            raise ValueError(f"transitions must be {n} × {n} for {n} regimes")
+        if (matrix < 0).any() or not np.allclose(matrix.sum(axis=1), 1.0):
+            raise ValueError("transition rows must be probabilities summing to 1")
+        if not 0 <= self.initial_regime < n:
+            raise ValueError(f"initial_regime must be in [0, {n}), got {self.initial_regime}")
+
+    def regime_paths(self, n_paths: int, n_steps: int, rng: np.random.Generator) -> np.ndarray:
+        """Regime index of each path on each day after the first, shape (n_paths, n_steps)."""
+        cumulative = np.cumsum(np.asarray(self.transitions, dtype=np.float64), axis=1)
+        cumulative[:, -1] = 1.0  # Guard against rounding in the last column
+        draws = rng.random((n_paths, n_steps))
+        states = np.empty((n_paths, n_steps), dtype=np.int8 if len(self.regimes) < 128 else int)
+        state = np.full(n_paths, self.initial_regime)
+        for step in range(n_steps):
+            # Next regime: first column whose cumulative probability exceeds the draw
+            state = (draws[:, step, None] >= cumulative[state]).sum(axis=1)
+            states[:, step] = state
+        return states
+
+    def log_returns(self, n_paths: int, n_steps: int, rng: np.random.Generator) -> np.ndarray:
+        """Daily log returns, shape (n_paths, n_steps)."""
+        dt = 1.0 / TRADING_DAYS
+        drift, volatility = (np.asarray(values) for values in zip(*self.regimes))
+        means = (drift - 0.5 * volatility**2) * dt
+        scales = volatility * math.sqrt(dt)
+        states = self.regime_paths(n_paths, n_steps, rng)
+        returns = rng.standard_normal((n_paths, n_steps))
+        returns *= scales[states]
+        returns += means[states]
+        return returns
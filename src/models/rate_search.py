@@ -0,0 +1,157 @@
+"""Search over withdrawal rates with as few backtests as possible.
+
+Withdrawal studies ask for one rate: the highest one a portfolio survives,
+or the one at which the bank balances out. For a fixed algorithm and price
+path, survival and mean bank are monotone in the withdrawal rate, so these
+rates can be found by bracketing and bisection (or, for a unimodal score,
+golden-section search) to any tolerance: 0.05% resolution over a 0-20%
+range takes about 9 backtests, against 20 for a coarse 1% grid.
+
+RateSearch wraps a function running one backtest at a rate and remembers
+every result, so later searches over the same scenario reuse earlier
+probes:
+
+    >>> search = RateSearch(lambda rate: run_retirement_backtest(..., rate)[1])
+    >>> safe = search.max_rate(lambda s: s["portfolio_survived"], 0.0, 0.20)
+    >>> balanced = search.crossing(lambda s: s["bank_avg"], 0.0, safe)
+    >>> len(search.results)     # Backtests run by both searches together
+"""
+
+import math
+from typing import Callable, Dict, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Probe rates are rounded to this many decimals, so searches share results
+RATE_DECIMALS = 6
+
+# Golden ratio conjugate, the interval shrink factor of golden-section search
+INVERSE_PHI = (math.sqrt(5.0) - 1.0) / 2.0
+
+
+class RateSearch(Generic[T]):
+    """Memoized evaluation of a backtest over withdrawal rates."""
+
+    def __init__(self, evaluate: Callable[[float], T]) -> None:
+        """Create a search.
+
+        Args:
+            evaluate: Runs one backtest at a rate (decimal, e.g. 0.04) and
+                      returns its result (e.g., the summary dict)
+        """
+        self.evaluate = evaluate
+        self.results: Dict[float, T] = {}
+
+    def __call__(self, rate: float) -> T:
+        """Result at a rate, running the backtest only if not already probed."""
+        rate = round(rate, RATE_DECIMALS)
+        if rate not in self.results:
+            self.results[rate] = self.evaluate(rate)
+        return self.results[rate]
+
+    def max_rate(
+        self,
+        passes: Callable[[T], bool],
+        low: float,
+        high: float,
+        tolerance: float = 0.0005,
+        limit: float = 1.0,
+    ) -> Optional[float]:
+        """Highest rate whose result passes a test, to within tolerance.
+
+        passes must be monotone in the rate: true up to some rate, false
+        beyond it. If high passes, the bracket is doubled (up to limit)
+        until it fails.
+
+        Args:
+            passes: Test on a result (e.g., the portfolio survived)
+            low: Lower end of the initial bracket
+            high: Upper end of the initial bracket
+            tolerance: Width of the final bracket
+            limit: Highest rate considered
+
+        Returns:
+            The highest probed rate that passes, or None if low fails
+        """
+        if not passes(self(low)):
+            return None
+        while passes(self(high)):
+            if high >= limit:
+                return round(high, RATE_DECIMALS)
+            low, high = high, min(2.0 * high, limit)
+
+        while high - low > tolerance:
+            mid = (low + high) / 2.0
+            if passes(self(mid)):
+                low = mid
+            else:
+                high = mid
+        return round(low, RATE_DECIMALS)
+
+    def crossing(
+        self,
+        value: Callable[[T], float],
+        low: float,
+        high: float,
+        tolerance: float = 0.0005,
+    ) -> float:
+        """Rate at which a value decreasing with the rate crosses zero.
+
+        Bisects the bracket [low, high] on the sign of the value. If the
+        value does not change sign over the bracket, the end nearer zero is
+        returned.
+
+        Args:
+            value: Value of a result (e.g., the mean bank balance)
+            low: Lower end of the bracket
+            high: Upper end of the bracket
+            tolerance: Width of the final bracket
+
+        Returns:
+            The probed rate whose value is closest to zero
+        """
+        if value(self(low)) <= 0 or value(self(high)) >= 0:
+            return low if abs(value(self(low))) <= abs(value(self(high))) else high
+
+        while high - low > tolerance:
+            mid = (low + high) / 2.0
+            if value(self(mid)) > 0:
+                low = mid
+            else:
+                high = mid
+        return low if abs(value(self(low))) <= abs(value(self(high))) else high
+
+    def minimize(
+        self,
+        objective: Callable[[T], float],
+        low: float,
+        high: float,
+        tolerance: float = 0.0005,
+    ) -> float:
+        """Rate minimizing a unimodal objective, by golden-section search.
+
+        Ties (including infinite scores, e.g. for depleted runs) keep the
+        lower part of the bracket.
+
+        Args:
+            objective: Score of a result, lower is better
+            low: Lower end of the bracket
+            high: Upper end of the bracket
+            tolerance: Width of the final bracket
+
+        Returns:
+            The probed rate with the lowest objective
+        """
+        bracket = (low, high)
+        inner_low = high - INVERSE_PHI * (high - low)
+        inner_high = low + INVERSE_PHI * (high - low)
+        while high - low > tolerance:
+            if objective(self(inner_low)) <= objective(self(inner_high)):
+                high, inner_high = inner_high, inner_low
+                inner_low = high - INVERSE_PHI * (high - low)
+            else:
+                low, inner_low = inner_low, inner_high
+                inner_high = low + INVERSE_PHI * (high - low)
+
+        probed = [rate for rate in self.results if bracket[0] <= rate <= bracket[1]]
+        return min(probed or [round(low, RATE_DECIMALS)], key=lambda r: objective(self(r)))
@@ -0,0 +1,176 @@
+"""On-disk cache of backtest results, keyed by everything that determines them.
+
+Rerunning a research script or an interrupted sweep recomputes backtests whose
+inputs have not changed. ResultCache stores each result under a key hashed
+from three parts:
+
+- the data: MarketDataBundle.fingerprint() of the prices, dividends and rate
+  series the run reads (changes whenever the cached price data changes)
+- the algorithm: algorithm_spec(), the state of the freshly built algorithm,
+  so "sd8" and "sd8,50" (the same parameters) share a key
+- the engine options: investment, withdrawals, margin, engine and so on
+
+    >>> cache = ResultCache()
+    >>> key = cache.key(data=bundle.fingerprint(), algorithm=spec, options=options)
+    >>> entry = cache.get(key)
+    >>> if entry is None:
+    ...     cache.put(key, run(...))
+
+Entries hold compact summaries (see parallel_runner.compact_summary) and,
+optionally, the transaction ledger. Each is one pickle file, written
+atomically, so a sweep killed mid-write never leaves a corrupt entry and
+resumes from the entries it finished. Bump CACHE_VERSION when a change to the
+engine alters results, to invalidate every stored entry.
+"""
+
+import contextlib
+import hashlib
+import io
+import json
+import os
+import pickle
+import tempfile
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Union
+
+import numpy as np
+
+from src import paths
+from src.models.model_types import Transaction
+
+# Part of every key; bump to invalidate all stored results
+CACHE_VERSION = 1
+
+
+class CachedResult(NamedTuple):
+    """A stored result: compact summary and, if it was kept, the ledger."""
+
+    summary: Dict[str, Any]
+    transactions: Optional[List[Transaction]] = None
+
+
+def _canonical(value: Any) -> Any:
+    """JSON-serializable form of a value, with objects as class name and state."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Mapping):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = [_canonical(v) for v in value]
+        return sorted(items, key=repr) if isinstance(value, (set, frozenset)) else items
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if hasattr(value, "__dict__"):
+        cls = type(value)
+        return {"class": f"{cls.__module__}.{cls.__qualname__}", "state": _canonical(vars(value))}
+    return repr(value)
+
+
+def algorithm_spec(portfolio_algo: str, allocations: Mapping[str, float]) -> Dict[str, Any]:
+    """Canonical description of a portfolio algorithm, for cache keys.
+
+    Builds the algorithm with build_portfolio_algo_from_name (quietly) and
+    describes it by class and initial state, recursing into per-asset
+    strategies. Names that build the same algorithm give the same spec;
+    any parameter change gives a different one.
+
+    Args:
+        portfolio_algo: Portfolio algorithm name (e.g., "per-asset:sd8")
+        allocations: Dict mapping ticker → target allocation
+
+    Raises:
+        ValueError: If the name is not a known algorithm
+    """
+    from src.algorithms.portfolio_factory import build_portfolio_algo_from_name
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        algo = build_portfolio_algo_from_name(portfolio_algo, dict(allocations))
+    spec: Dict[str, Any] = _canonical(algo)
+    return spec
+
+
+class ResultCache:
+    """Backtest results stored as one pickle file per key."""
+
+    def __init__(self, directory: Optional[Union[str, Path]] = None) -> None:
+        """Open (creating if needed) a result cache.
+
+        Args:
+            directory: Where entries are stored (default: <cache dir>/results)
+        """
+        self.directory = Path(directory) if directory else paths.get_cache_dir() / "results"
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(**parts: Any) -> str:
+        """Hash key parts (data fingerprint, algorithm spec, options, ...).
+
+        Parts are serialized as canonical JSON together with CACHE_VERSION,
+        so equal parts always give the same key.
+        """
+        payload = json.dumps(
+            {"version": CACHE_VERSION, **_canonical(parts)}, sort_keys=True, separators=(",", ":")
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        """Entry file of a key, fanned out by its first two hex digits."""
+        return self.directory / key[:2] / f"{key}.pkl"
+
+    def __contains__(self, key: str) -> bool:
+        """True if a result is stored for the key."""
+        return self._path(key).exists()
+
+    def __len__(self) -> int:
+        """Number of stored results."""
+        return sum(1 for _ in self.directory.glob("*/*.pkl"))
+
+    def get(self, key: str) -> Optional[CachedResult]:
+        """Return the stored result for a key, or None if there is none.
+
+        Unreadable entries (e.g., written by an incompatible version) count
+        as missing and are overwritten by the next put().
+        """
+        try:
+            with open(self._path(key), "rb") as f:
+                entry = pickle.load(f)
+        except Exception:
+            return None
+        return entry if isinstance(entry, CachedResult) else None
+
+    def put(
+        self,
+        key: str,
+        summary: Dict[str, Any],
+        transactions: Optional[List[Transaction]] = None,
+    ) -> None:
+        """Store a result, replacing any entry for the key.
+
+        Args:
+            key: Key from key()
+            summary: Compact summary of the run
+            transactions: Transaction ledger of the run, if it should be kept
+        """
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(CachedResult(summary, transactions), f, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def clear(self) -> int:
+        """Delete every stored result; returns how many were deleted."""
+        removed = 0
+        for path in self.directory.glob("*/*.pkl"):
+            path.unlink()
+            removed += 1
+        return removed
@@ -0,0 +1,309 @@
+"""Append-only columnar store of sweep results.
+
+Research scripts each wrote their own CSV (or data/best_sdn.json) and later
+analyses re-read and re-parsed them. ResultsStore keeps sweep results as
+columns instead: every append() writes one new NPZ partition (one array per
+column) and existing partitions are never rewritten, so an interrupted sweep
+loses at most its unflushed rows and concurrent readers never see a partial
+file.
+
+    >>> store = ResultsStore("data/sweeps/sdn_grid")
+    >>> store.append([{"cell": key, "name": "NVDA", "algorithm": "sd8", "total_return": 41.2}])
+    >>> store.top_n("total_return", n=1, by=("name",))    # Best algorithm per ticker
+    >>> store.pareto({"total_return": "max", "metrics.max_drawdown": "min"})
+
+Rows are identified by their "cell" column; when a cell is appended again
+(e.g., recomputed), the latest row wins. Queries run as NumPy operations
+over the loaded columns and return pandas DataFrames.
+
+Column types are inferred per append: bools, numbers (None → NaN), dates
+(datetime64[D], None → NaT) and strings (None → ""). Columns that are None
+in every appended row are not written; partitions that lack a column read it
+as missing values.
+"""
+
+import os
+import tempfile
+import uuid
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Set, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+
+def _column(values: Sequence[Any]) -> np.ndarray:
+    """Typed array for one column of appended rows."""
+    present = [v for v in values if v is not None]
+    if present and all(isinstance(v, (bool, np.bool_)) for v in present):
+        if len(present) == len(values):
+            return np.array(values, dtype=bool)
+        return np.array([np.nan if v is None else float(v) for v in values])
+    if present and all(
+        isinstance(v, (int, float, np.integer, np.floating)) and not isinstance(v, bool)
+        for v in present
+    ):
+        if len(present) == len(values) and all(isinstance(v, (int, np.integer)) for v in present):
+            return np.array(values, dtype=np.int64)
+        return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+    if present and all(isinstance(v, date) for v in present):
+        return np.array(
+            [np.datetime64("NaT") if v is None else np.datetime64(v, "D") for v in values],
+            dtype="datetime64[D]",
+        )
+    return np.array(["" if v is None else str(v) for v in values], dtype=str)
+
+
+def _missing(like: np.ndarray, n: int) -> np.ndarray:
+    """Array of n missing values for a column typed like an existing one."""
+    if like.dtype.kind == "M":
+        return np.full(n, np.datetime64("NaT"), dtype="datetime64[D]")
+    if like.dtype.kind in "biuf":
+        return np.full(n, np.nan)
+    return np.full(n, "", dtype=str)
+
+
+def _concat(parts: List[np.ndarray]) -> np.ndarray:
+    """Concatenate column pieces, widening int/bool to float when mixed."""
+    kinds = {part.dtype.kind for part in parts}
+    if len(kinds) > 1 and kinds <= set("biuf"):
+        parts = [part.astype(np.float64) for part in parts]
+    elif len(kinds) > 1:
+        parts = [part.astype(str) for part in parts]
+    return np.concatenate(parts)
+
+
+class ResultsStore:
+    """Sweep results stored as append-only NPZ column partitions."""
+
+    def __init__(self, directory: Union[str, Path]) -> None:
+        """Open (creating if needed) a store.
+
+        Args:
+            directory: Directory holding the partitions
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._loaded: Tuple[Tuple[str, ...], Dict[str, np.ndarray]] = ((), {})
+        self._index: Optional[Dict[str, int]] = None
+
+    def partitions(self) -> List[Path]:
+        """Partition files, in append order."""
+        return sorted(self.directory.glob("part-*.npz"))
+
+    def append(self, rows: Sequence[Mapping[str, Any]]) -> Optional[Path]:
+        """Write rows as a new partition.
+
+        Args:
+            rows: Dicts mapping column → scalar (bool, number, date, str or
+                  None); rows may hold different columns
+
+        Returns:
+            Path of the new partition, or None if rows is empty
+        """
+        if not rows:
+            return None
+        names: Dict[str, None] = {}
+        for row in rows:
+            names.update(dict.fromkeys(row))
+        columns: Dict[str, np.ndarray] = {}
+        for name in names:
+            values = [row.get(name) for row in rows]
+            if any(value is not None for value in values):  # All-None columns read as missing
+                columns[name] = _column(values)
+
+        path = self.directory / f"part-{len(self.partitions()):06d}-{uuid.uuid4().hex[:8]}.npz"
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, allow_pickle=False, **columns)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        return path
+
+    def columns(self, latest: bool = True) -> Dict[str, np.ndarray]:
+        """All stored rows as column arrays.
+
+        Args:
+            latest: Keep only the last row of each cell (default); False
+                    returns every appended row
+
+        Returns:
+            Dict mapping column → array (empty if nothing is stored)
+        """
+        names = tuple(path.name for path in self.partitions())
+        if names != self._loaded[0]:
+            pieces: List[Dict[str, np.ndarray]] = []
+            for name in names:
+                with np.load(self.directory / name, allow_pickle=False) as part:
+                    pieces.append({key: part[key] for key in part.files})
+            all_names: Dict[str, None] = {}
+            for piece in pieces:
+                all_names.update(dict.fromkeys(piece))
+            loaded: Dict[str, np.ndarray] = {}
+            for column in all_names:
+                like = next(piece[column] for piece in pieces if column in piece)
+                loaded[column] = _concat(
+                    [
+                        (
+                            piece[column]
+                            if column in piece
+                            else _missing(like, len(next(iter(piece.values()))))
+                        )
+                        for piece in pieces
+                    ]
+                )
+            self._loaded = (names, loaded)
+            self._index = None
+
+        loaded = self._loaded[1]
+        if not latest or "cell" not in loaded:
+            return loaded
+        keep = self._latest_rows()
+        return {name: values[keep] for name, values in loaded.items()}
+
+    def _latest_rows(self) -> np.ndarray:
+        """Positions of the last row of each cell, in append order."""
+        cells = self._loaded[1]["cell"]
+        # np.unique finds first occurrences; reverse to find last ones
+        _, first_in_reversed = np.unique(cells[::-1], return_index=True)
+        return np.sort(len(cells) - 1 - first_in_reversed)
+
+    def __len__(self) -> int:
+        """Number of distinct cells (rows if there is no cell column)."""
+        columns = self.columns()
+        return len(next(iter(columns.values()))) if columns else 0
+
+    def frame(self, latest: bool = True) -> pd.DataFrame:
+        """Stored rows as a DataFrame (see columns())."""
+        return pd.DataFrame(self.columns(latest))
+
+    def lookup(self, cell: str) -> Optional[Dict[str, Any]]:
+        """Latest row of a cell, or None if it is not stored."""
+        columns = self.columns(latest=False)
+        if "cell" not in columns:
+            return None
+        if self._index is None:
+            # Later rows overwrite earlier ones, so each cell maps to its latest
+            self._index = {key: i for i, key in enumerate(columns["cell"].tolist())}
+        position = self._index.get(cell)
+        if position is None:
+            return None
+        return {name: values[position].item() for name, values in columns.items()}
+
+    def cells(self, completed: bool = True) -> Set[str]:
+        """Stored cell keys.
+
+        Args:
+            completed: Only cells whose latest row has no error (default)
+        """
+        columns = self.columns()
+        if "cell" not in columns:
+            return set()
+        mask = np.ones(len(columns["cell"]), dtype=bool)
+        if completed and "error" in columns:
+            mask = columns["error"] == ""
+        return set(columns["cell"][mask].tolist())
+
+    def _select(self, where: Optional[Mapping[str, Any]]) -> Dict[str, np.ndarray]:
+        """Latest rows matching equality filters (list values match any)."""
+        columns = self.columns()
+        if not columns or not where:
+            return columns
+        mask = np.ones(len(next(iter(columns.values()))), dtype=bool)
+        for name, value in where.items():
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            mask &= np.isin(columns[name], list(values))
+        return {name: array[mask] for name, array in columns.items()}
+
+    def top_n(
+        self,
+        metric: str,
+        n: int = 1,
+        by: Sequence[str] = (),
+        largest: bool = True,
+        where: Optional[Mapping[str, Any]] = None,
+    ) -> pd.DataFrame:
+        """Best n rows by a metric, overall or per group.
+
+        Rows with a missing (NaN) metric are ignored.
+
+        Args:
+            metric: Column to rank by (e.g., "total_return")
+            n: Rows to keep per group
+            by: Grouping columns (e.g., ("name",) for best per ticker)
+            largest: Rank descending (default) or ascending
+            where: Equality filters applied first (e.g., {"algorithm": [...]})
+
+        Returns:
+            DataFrame of the selected rows, by group then rank
+        """
+        columns = self._select(where)
+        if not columns:
+            return pd.DataFrame()
+        values = columns[metric].astype(np.float64)
+        valid = ~np.isnan(values)
+        columns = {name: array[valid] for name, array in columns.items()}
+        values = values[valid]
+
+        group = np.zeros(len(values), dtype=np.int64)
+        for name in reversed(by):
+            _, codes = np.unique(columns[name], return_inverse=True)
+            group = group * (codes.max(initial=0) + 1) + codes
+        order = np.lexsort((-values if largest else values, group))
+        sorted_groups = group[order]
+        starts = np.searchsorted(sorted_groups, sorted_groups, side="left")
+        rank = np.arange(len(order)) - starts
+        keep = order[rank < n]
+        return pd.DataFrame({name: array[keep] for name, array in columns.items()})
+
+    def pareto(
+        self,
+        objectives: Mapping[str, str],
+        by: Sequence[str] = (),
+        where: Optional[Mapping[str, Any]] = None,
+    ) -> pd.DataFrame:
+        """Rows on the Pareto front of several objectives, overall or per group.
+
+        A row is on the front if no other row of its group is at least as
+        good on every objective and better on one. Rows with a missing
+        objective are ignored.
+
+        Args:
+            objectives: Dict mapping column → "max" or "min"
+            by: Grouping columns (a front per group)
+            where: Equality filters applied first
+
+        Returns:
+            DataFrame of the non-dominated rows, in store order
+        """
+        columns = self._select(where)
+        if not columns:
+            return pd.DataFrame()
+        signs = {"max": 1.0, "min": -1.0}
+        points = np.column_stack(
+            [signs[goal] * columns[name].astype(np.float64) for name, goal in objectives.items()]
+        )
+        valid = ~np.isnan(points).any(axis=1)
+        group = np.zeros(len(points), dtype=np.int64)
+        for name in reversed(by):
+            _, codes = np.unique(columns[name], return_inverse=True)
+            group = group * (codes.max(initial=0) + 1) + codes
+
+        on_front = np.zeros(len(points), dtype=bool)
+        for code in np.unique(group[valid]):
+            members = np.flatnonzero(valid & (group == code))
+            p = points[members]
+            dominated = np.zeros(len(p), dtype=bool)
+            # Compare all rows against blocks of candidates to bound memory:
+            # candidate i is dominated if some row is >= everywhere, > somewhere
+            for start in range(0, len(p), 1024):
+                q = p[start : start + 1024]
+                at_least = (p[:, None, :] >= q[None, :, :]).all(axis=2)
+                better = (p[:, None, :] > q[None, :, :]).any(axis=2)
+                dominated[start : start + len(q)] = (at_least & better).any(axis=0)
+            on_front[members[~dominated]] = True
+        return pd.DataFrame({name: array[on_front] for name, array in columns.items()})
@@ -13,13 +13,16 @@ Key features:
 """
 
 from datetime import date
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import pandas as pd
 
 from src.algorithms.base import AlgorithmBase
 from src.models.backtest import Data, run_algorithm_backtest
+from src.models.cash_overlay import CashFlowOverlay, CashFlowReplay
 from src.models.model_types import Transaction
+from src.models.rate_search import RateSearch
+from src.models.stop_conditions import PortfolioBelow, StopPredicate
 
 
 def run_retirement_backtest(
@@ -33,6 +36,7 @@ def run_retirement_backtest(
     withdrawal_frequency: str = "monthly",  # 'monthly', 'quarterly', 'annual'
     cpi_adjust: bool = True,
     simple_mode: bool = False,
+    stop_when: Optional[Sequence[StopPredicate]] = None,
 ) -> Tuple[List[Transaction], Dict[str, Any]]:
     """Run backtest with periodic CPI-adjusted withdrawals.
 
@@ -51,6 +55,8 @@ def run_retirement_backtest(
         withdrawal_frequency: How often to withdraw ('monthly', 'quarterly', 'annual')
         cpi_adjust: If True, adjust withdrawals for CPI inflation
         simple_mode: If True, disable transaction costs and risk-free rate
+        stop_when: Stop predicates ending the run early (e.g., [PortfolioBelow(0.0)]
+                   once the outcome is known); a stopped run did not survive
 
     Returns:
         (transactions, summary) tuple where summary includes:
@@ -102,6 +108,7 @@ def run_retirement_backtest(
         withdrawal_frequency_days=frequency_days,
         inflation_rate_ticker="CPI" if cpi_adjust else None,
         simple_mode=simple_mode,
+        stop_when=stop_when,
     )
 
     # The backtest already calculated withdrawal metrics
@@ -126,7 +133,7 @@ def run_retirement_backtest(
             "withdrawal_frequency": withdrawal_frequency,
             "final_value": final_value,  # For consistency
             "final_purchasing_power": final_purchasing_power,
-            "portfolio_survived": final_value > 0,
+            "portfolio_survived": final_value > 0 and summary.get("stop_date") is None,
             "cpi_adjusted": cpi_adjust and summary.get("inflation_rate_ticker") is not None,
         }
     )
@@ -145,11 +152,13 @@ def calculate_safe_withdrawal_rate(
     cpi_adjust: bool = True,
     simple_mode: bool = False,
     tolerance: float = 0.01,  # 1% tolerance for binary search
+    search: Optional[RateSearch[Dict[str, Any]]] = None,
 ) -> float:
     """Calculate maximum sustainable withdrawal rate for a portfolio.
 
-    Uses binary search to find the highest annual withdrawal rate where the
-    portfolio survives the entire period and maintains target final value.
+    Uses bracketing and binary search to find the highest annual withdrawal
+    rate where the portfolio survives the entire period and maintains target
+    final value. The bracket starts at 0-20% and is widened if 20% survives.
 
     Args:
         df: Price history DataFrame
@@ -162,6 +171,9 @@ def calculate_safe_withdrawal_rate(
         cpi_adjust: If True, adjust withdrawals for CPI inflation
         simple_mode: If True, disable transaction costs
         tolerance: Convergence tolerance for binary search (decimal)
+        search: Optional RateSearch of retirement summaries for this scenario
+                (see safe_withdrawal_search); rates it has already probed are
+                not run again
 
     Returns:
         Maximum safe withdrawal rate (decimal, e.g., 0.05 for 5%)
@@ -174,17 +186,56 @@ def calculate_safe_withdrawal_rate(
         ... )
         >>> print(f"Safe withdrawal rate: {swr*100:.2f}%")
     """
-    # Binary search for maximum withdrawal rate
-    low = 0.0
-    high = 0.20  # Start search at 20% (unlikely to be sustainable)
-
     initial_value = df.iloc[0]["Close"] * initial_qty
     target_final_value = initial_value * target_final_value_pct
 
-    while (high - low) > tolerance:
-        mid = (low + high) / 2
+    if search is None:
+        search = safe_withdrawal_search(
+            df, ticker, initial_qty, start_date, end_date, algo_obj, cpi_adjust, simple_mode
+        )
+
+    # Sustainable: survived with the target final value
+    safe_rate = search.max_rate(
+        lambda summary: summary["portfolio_survived"]
+        and summary["final_value"] >= target_final_value,
+        low=0.0,
+        high=0.20,  # Start search at 20% (unlikely to be sustainable)
+        tolerance=tolerance,
+    )
+    return 0.0 if safe_rate is None else safe_rate
+
+
+def safe_withdrawal_search(
+    df: Data,
+    ticker: str,
+    initial_qty: int,
+    start_date: date,
+    end_date: date,
+    algo_obj: AlgorithmBase,
+    cpi_adjust: bool = True,
+    simple_mode: bool = False,
+) -> RateSearch[Dict[str, Any]]:
+    """Rate search over retirement backtests of one scenario.
+
+    Each probe is a run_retirement_backtest summary at an annual withdrawal
+    rate (decimal). Runs stop once the portfolio is depleted, since such a
+    rate has failed whatever happens later.
 
-        # Test this withdrawal rate
+    Args:
+        df: Price history DataFrame
+        ticker: Asset ticker symbol
+        initial_qty: Initial shares owned
+        start_date: Backtest start date
+        end_date: Backtest end date
+        algo_obj: Trading algorithm instance
+        cpi_adjust: If True, adjust withdrawals for CPI inflation
+        simple_mode: If True, disable transaction costs
+
+    Returns:
+        RateSearch whose results are keyed by withdrawal rate
+    """
+
+    def evaluate(rate: float) -> Dict[str, Any]:
         _, summary = run_retirement_backtest(
             df,
             ticker,
@@ -192,20 +243,14 @@ def calculate_safe_withdrawal_rate(
             start_date,
             end_date,
             algo_obj,
-            annual_withdrawal_rate=mid,
+            annual_withdrawal_rate=rate,
             cpi_adjust=cpi_adjust,
             simple_mode=simple_mode,
+            stop_when=[PortfolioBelow(0.0)],
         )
+        return summary
 
-        # Check if portfolio survived with target final value
-        if summary["portfolio_survived"] and summary["final_value"] >= target_final_value:
-            # This rate is sustainable, try higher
-            low = mid
-        else:
-            # This rate depleted portfolio, try lower
-            high = mid
-
-    return low
+    return RateSearch(evaluate)
 
 
 def compare_withdrawal_strategies(
@@ -221,7 +266,9 @@ def compare_withdrawal_strategies(
     """Compare multiple algorithms across various withdrawal rates.
 
     Tests each algorithm at each withdrawal rate to find which strategy
-    best sustains retirement income.
+    best sustains retirement income. Algorithms that do not read the bank
+    are simulated once and each rate is replayed over that run (see
+    CashFlowReplay); only rates forcing a sale are simulated in full.
 
     Args:
         df: Price history DataFrame
@@ -250,20 +297,50 @@ def compare_withdrawal_strategies(
 
     first_price = df.iloc[0]["Close"]
     initial_qty = int(initial_investment / first_price)
+    overlays = [CashFlowOverlay(withdrawal_rate_pct=rate * 100.0) for rate in withdrawal_rates]
 
     for algo_name, algo_obj in algorithms.items():
-        for rate in withdrawal_rates:
-            _, summary = run_retirement_backtest(
+        # Algorithms that ignore the bank trade the same at every rate: replay one run
+        replayed: List[Optional[Dict[str, Any]]] = [None] * len(withdrawal_rates)
+        if not getattr(algo_obj, "reads_bank", True):
+            replay = CashFlowReplay.record_single_ticker(
                 df,
                 ticker,
                 initial_qty,
                 start_date,
                 end_date,
                 algo_obj,
-                annual_withdrawal_rate=rate,
-                cpi_adjust=cpi_adjust,
-                simple_mode=True,
+                inflation_rate_ticker="CPI" if cpi_adjust else None,
             )
+            replayed = replay.evaluate(overlays)
+
+        for rate, replayed_summary in zip(withdrawal_rates, replayed):
+            if replayed_summary is not None:
+                # The single-ticker final value is the holdings' value
+                final_value = replayed_summary["final_asset_value"]
+                inflation = replayed_summary["cumulative_inflation"]
+                summary = {
+                    "final_value": final_value,
+                    "total_withdrawn": replayed_summary["total_withdrawn"],
+                    "portfolio_survived": final_value > 0,
+                    "final_purchasing_power": (
+                        final_value / (1.0 + inflation / 100.0)
+                        if cpi_adjust and inflation is not None
+                        else final_value
+                    ),
+                }
+            else:
+                _, summary = run_retirement_backtest(
+                    df,
+                    ticker,
+                    initial_qty,
+                    start_date,
+                    end_date,
+                    algo_obj,
+                    annual_withdrawal_rate=rate,
+                    cpi_adjust=cpi_adjust,
+                    simple_mode=True,
+                )
 
             results.append(
                 {
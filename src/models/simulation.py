@@ -11,23 +11,55 @@ Key differences from loop-based approach:
 - Portfolio algorithms run as continuous processes
 - Transactions, withdrawals, and dividends are scheduled events
 - More flexible for modeling complex timing dependencies
+
+The simpy engine is the reference implementation. engine="fast" runs the same
+per-day steps in a plain loop (iter_day_loop) that reproduces simpy's event
+order without generator and event-queue overhead, for parameter sweeps.
+
+Both engines advance in steps; iter_portfolio_simulation exposes them as a
+stream of DayState records, and run_portfolio_simulation runs them to the end.
 """
 
+import bisect
 import math
 import warnings
 from datetime import date, timedelta
-from typing import Any, Dict, Generator, List, Optional, Tuple, Union, cast
-
+from typing import (
+    Any,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+    cast,
+)
+
+import numpy as np
 import pandas as pd
 import simpy
 
 # Import algorithm classes from dedicated package
 from src.algorithms import PortfolioAlgorithmBase
-from src.models.backtest_utils import calculate_time_weighted_average_holdings
-from src.models.model_types import AssetState, Transaction
+from src.models.backtest_utils import ShareDayAccumulator
+from src.models.daily_series import DailySeries, validate_detail
+from src.models.ledger import TransactionLedger
+from src.models.market_bundle import MarketDataBundle
+from src.models.market_data import AlignedPriceData, PriceHistory
+from src.models.model_types import AssetState, Bar, DayState, Transaction
+from src.models.online_metrics import MetricFactory, MetricSet
+from src.models.stop_conditions import StopCondition, StopPredicate, stop_reason
 
+# Simulation engines: simpy is the reference; fast is a plain loop with identical semantics
+SIMULATION_ENGINES = ("simpy", "fast")
 
-def run_portfolio_simulation(
+
+def iter_portfolio_simulation(
     allocations: Dict[str, float],
     start_date: date,
     end_date: date,
@@ -41,13 +73,19 @@ def run_portfolio_simulation(
     reference_rate_ticker: Optional[str] = None,
     risk_free_rate_ticker: Optional[str] = None,
     inflation_rate_ticker: Optional[str] = None,
+    engine: str = "simpy",
+    detail: str = "full",
+    metrics: Optional[Sequence[MetricFactory]] = None,
+    stop_when: Optional[Sequence[StopPredicate]] = None,
+    price_frames: Optional[Mapping[str, Optional[pd.DataFrame]]] = None,
+    market_bundle: Optional[MarketDataBundle] = None,
     # Legacy compatibility parameters (deprecated, ignored with warnings)
     algo: Optional[Union[object, str]] = None,
     simple_mode: bool = False,
     **kwargs: Any,
-) -> Tuple[List[Transaction], Dict[str, Any]]:
+) -> "PortfolioSimulation":
     """
-    Execute portfolio simulation with shared cash pool using discrete event simulation.
+    Prepare a portfolio simulation that is advanced by iterating over it.
 
     This function uses simpy to model the portfolio as a discrete event system:
     - Time advances through scheduled events (transactions, withdrawals, dividends)
@@ -69,12 +107,39 @@ def run_portfolio_simulation(
         reference_rate_ticker: Optional ticker for reference benchmark
         risk_free_rate_ticker: Optional ticker for risk-free asset
         inflation_rate_ticker: Optional ticker for inflation data
+        engine: "simpy" (reference discrete-event engine) or "fast" (plain day
+                loop with identical results and less per-day overhead)
+        detail: Results to keep: "summary" (scalars and aggregates only),
+                "daily" (adds the daily value series) or "full" (adds the
+                transaction ledger too)
+        metrics: Online metric factories updated each day (default:
+                 DEFAULT_METRICS from src.models.online_metrics); their
+                 values are returned under "metrics" at every detail level
+        stop_when: Stop predicates evaluated on each recorded day (see
+                   src.models.stop_conditions); the run ends on the first day
+                   one holds, and the summary reports stop_reason/stop_date
+        price_frames: Preloaded price history by ticker (assets, BIL and the
+                      reference, risk-free and inflation tickers), used
+                      instead of fetching; None for a ticker means no data.
+                      Tickers not in it are fetched with HistoryFetcher
+        market_bundle: Market data loaded by MarketDataBundle.load for these
+                       tickers, used instead of fetching and aligning; it is
+                       sliced to start_date/end_date, and only the rate
+                       series named by the ticker arguments are used.
+                       Excludes dividend_data and price_frames
         algo: DEPRECATED - Use portfolio_algo instead
         simple_mode: DEPRECATED - No longer used
         **kwargs: DEPRECATED - Ignored legacy parameters
 
     Returns:
-        Tuple of (all_transactions, portfolio_summary)
+        PortfolioSimulation yielding a DayState per trading day; finish()
+        returns (all_transactions, portfolio_summary)
+
+    Example:
+        >>> simulation = iter_portfolio_simulation(allocations, start, end, "per-asset:sd8")
+        >>> for day in simulation:
+        ...     progress.update(day.day_index)
+        >>> transactions, summary = simulation.finish()
     """
     # Handle legacy parameters (same as backtest.py)
     if algo is not None:
@@ -93,6 +158,12 @@ def run_portfolio_simulation(
         ignored = ", ".join(kwargs.keys())
         warnings.warn(f"Ignored deprecated parameters: {ignored}", DeprecationWarning, stacklevel=2)
 
+    if engine not in SIMULATION_ENGINES:
+        raise ValueError(
+            f"Unknown engine '{engine}'. Valid engines: {', '.join(SIMULATION_ENGINES)}"
+        )
+    validate_detail(detail)
+
     # Validate allocations
     total_allocation = sum(allocations.values())
     if abs(total_allocation - 1.0) > 0.01:
@@ -110,217 +181,432 @@ def run_portfolio_simulation(
             f"portfolio_algo must be PortfolioAlgorithmBase or string, got {type(portfolio_algo).__name__}"
         )
 
-    # Fetch price data (same as backtest.py)
-    from src.data.fetcher import HistoryFetcher
-
-    fetcher = HistoryFetcher()
-    price_data: Dict[str, pd.DataFrame] = {}
-
-    # Separate actual tickers from CASH reserve
-    real_tickers = [t for t in allocations.keys() if t != "CASH"]
-
-    print(f"Fetching data for {len(real_tickers)} assets...")
-    for ticker in real_tickers:
-        print(f"  - {ticker}...", end=" ")
-        df = fetcher.get_history(ticker, start_date, end_date)
-        if df is None or df.empty:
-            raise ValueError(f"No data available for {ticker}")
-        price_data[ticker] = df
-        print(f"OK ({len(df)} days)")
-
-    # If CASH allocation exists, fetch BIL data for sweep account interest
-    has_cash_allocation = "CASH" in allocations
-    bil_price_data = None
-
-    if has_cash_allocation:
-        cash_pct = allocations["CASH"] * 100
-        print(f"  - CASH: {cash_pct:.1f}% reserve (sweep account earning BIL yields)")
-
-        # Fetch BIL price data for interest calculations
-        print("  - BIL (sweep account yields)...", end=" ")
-        bil_df = fetcher.get_history("BIL", start_date, end_date)
-        if bil_df is not None and not bil_df.empty:
-            bil_price_data = bil_df
-            print(f"OK ({len(bil_df)} days)")
-        else:
-            print("WARNING: No BIL data, CASH will earn 0% interest")
+    # Fetch and align the market data, unless the caller loaded it already
+    if market_bundle is None:
+        market_bundle = MarketDataBundle.load(
+            allocations,
+            start_date,
+            end_date,
+            dividend_data=dividend_data,
+            reference_rate_ticker=reference_rate_ticker,
+            risk_free_rate_ticker=risk_free_rate_ticker,
+            inflation_rate_ticker=inflation_rate_ticker,
+            price_frames=price_frames,
+        )
+    else:
+        if dividend_data is not None or price_frames is not None:
+            raise ValueError("Pass dividend_data and price_frames to MarketDataBundle.load")
+        market_bundle.check_run(
+            allocations, reference_rate_ticker, risk_free_rate_ticker, inflation_rate_ticker
+        )
+        market_bundle = market_bundle.between(start_date, end_date)
+    market_data = market_bundle.prices
+    common_dates = market_data.dates
 
-    # Auto-fetch dividend data if not provided
-    if dividend_data is None:
-        print(f"Auto-fetching dividend data for {len(real_tickers)} assets...")
-        from src.data.asset import Asset
+    print(f"Common trading days: {len(common_dates)} ({common_dates[0]} to {common_dates[-1]})")
 
-        dividend_data_auto: Dict[str, pd.Series] = {}
-        for ticker in real_tickers:  # Skip CASH
-            print(f"  - {ticker} dividends...", end=" ")
-            try:
-                asset = Asset(ticker)
-                div_series = asset.get_dividends(start_date, end_date)
-                if div_series is not None and not div_series.empty:
-                    # Normalize timezone-aware timestamps to naive dates
-                    div_series_copy = div_series.copy()
-                    div_series_copy.index = pd.to_datetime(div_series_copy.index).tz_localize(None)
-                    dividend_data_auto[ticker] = div_series_copy
-                    print(f"OK ({len(div_series_copy)} dividends)")
-                else:
-                    print("None")
-            except Exception as e:
-                print(f"ERROR: {e}")
-
-        # If CASH allocation exists, fetch BIL dividends for interest
-        if has_cash_allocation:
-            print("  - BIL (CASH interest) dividends...", end=" ")
-            try:
-                asset = Asset("BIL")
-                div_series = asset.get_dividends(start_date, end_date)
-                if div_series is not None and not div_series.empty:
-                    div_series_copy = div_series.copy()
-                    div_series_copy.index = pd.to_datetime(div_series_copy.index).tz_localize(None)
-                    dividend_data_auto["CASH"] = div_series_copy  # Store as CASH dividends
-                    print(
-                        f"OK ({len(div_series_copy)} payments, ~{div_series.sum():.2f}% annual yield)"
-                    )
-                else:
-                    print("None")
-            except Exception as e:
-                print(f"ERROR: {e}")
+    # Create the simulation clock (simpy reference engine or plain day counter)
+    env: Union[simpy.Environment, DayClock] = (
+        simpy.Environment() if engine == "simpy" else DayClock()
+    )
 
-        dividend_data = dividend_data_auto if dividend_data_auto else None
+    # Initialize simulation state
+    sim_state = SimulationState(
+        env=env,
+        allocations=allocations,
+        market_data=market_data,
+        initial_investment=initial_investment,
+        allow_margin=allow_margin,
+        withdrawal_rate_pct=withdrawal_rate_pct,
+        withdrawal_frequency_days=withdrawal_frequency_days,
+        cash_interest_rate_pct=cash_interest_rate_pct,
+        dividend_data=market_bundle.dividend_data,
+        reference_returns=market_bundle.reference_returns if reference_rate_ticker else {},
+        risk_free_returns=market_bundle.risk_free_returns if risk_free_rate_ticker else {},
+        reference_rate_ticker=reference_rate_ticker,
+        risk_free_rate_ticker=risk_free_rate_ticker,
+        simple_mode=simple_mode,
+        portfolio_algo=portfolio_algo,
+        reference_data=market_bundle.reference_data if reference_rate_ticker else None,
+        cumulative_inflation=market_bundle.cumulative_inflation if inflation_rate_ticker else {},
+        inflation_rate_ticker=inflation_rate_ticker,
+        bil_price_data=market_bundle.bil_price_data,
+        # Events precomputed by the bundle are in its ticker order, so reuse needs the same
+        dividend_events=(
+            market_bundle.dividend_events if tuple(allocations) == market_bundle.tickers else None
+        ),
+        detail=detail,
+        metrics=metrics,
+        stop_when=stop_when,
+    )
 
-    # Find common trading dates
-    all_dates: set[date] = set()
-    for df in price_data.values():
-        dates = set(pd.to_datetime(df.index).date)
-        all_dates = all_dates.intersection(dates) if all_dates else dates
+    steps = (
+        iter_simpy_steps(env, sim_state, portfolio_algo)
+        if isinstance(env, simpy.Environment)
+        else iter_day_loop(sim_state, portfolio_algo)
+    )
+    return PortfolioSimulation(sim_state, steps)
 
-    common_dates = sorted([d for d in all_dates if start_date <= d <= end_date])
-    if not common_dates:
-        raise ValueError("No common trading dates across all assets")
 
-    print(f"Common trading days: {len(common_dates)} ({common_dates[0]} to {common_dates[-1]})")
+def withdrawal_schedule(common_dates: Sequence[date], frequency_days: int) -> List[int]:
+    """Day positions of the withdrawals of a withdrawal frequency.
 
-    # Index price data by date
-    price_data_indexed: Dict[str, pd.DataFrame] = {}
-    for ticker, df in price_data.items():
-        df_copy = df.copy()
-        df_copy.index = pd.to_datetime(df_copy.index).date
-        price_data_indexed[ticker] = df_copy
-
-    # Fetch reference, risk-free, and inflation data (same logic as backtest.py)
-    reference_returns: Dict[date, float] = {}
-    risk_free_returns: Dict[date, float] = {}
-    cumulative_inflation: Dict[date, float] = {}
-    reference_data: Optional[pd.DataFrame] = None
-
-    if reference_rate_ticker:
-        print(f"Fetching reference benchmark ({reference_rate_ticker})...", end=" ")
-        ref_data = fetcher.get_history(reference_rate_ticker, start_date, end_date)
-        if ref_data is not None and not ref_data.empty:
-            print(f"OK ({len(ref_data)} days)")
-            ref_indexed = ref_data.copy()
-            ref_indexed.index = pd.to_datetime(ref_indexed.index).date
-            reference_data = ref_indexed  # Store for baseline calculation
-            if "Close" in ref_indexed.columns:
-                close_prices = ref_indexed["Close"].values
-                ref_dates = list(ref_indexed.index)
-                for i in range(1, len(close_prices)):
-                    prev_price = float(close_prices[i - 1])
-                    curr_price = float(close_prices[i])
-                    if prev_price > 0:
-                        reference_returns[ref_dates[i]] = (curr_price - prev_price) / prev_price
-        else:
-            print("WARN: No data available, skipping baseline calculation")
-
-    if risk_free_rate_ticker:
-        print(f"Fetching risk-free asset ({risk_free_rate_ticker})...", end=" ")
-        rf_data = fetcher.get_history(risk_free_rate_ticker, start_date, end_date)
-        if rf_data is not None and not rf_data.empty:
-            print(f"OK ({len(rf_data)} days)")
-            rf_indexed = rf_data.copy()
-            rf_indexed.index = pd.to_datetime(rf_indexed.index).date
-            if "Close" in rf_indexed.columns:
-                close_prices = rf_indexed["Close"].values
-                rf_dates = list(rf_indexed.index)
-                for i in range(1, len(close_prices)):
-                    prev_price = float(close_prices[i - 1])
-                    curr_price = float(close_prices[i])
-                    if prev_price > 0:
-                        risk_free_returns[rf_dates[i]] = (curr_price - prev_price) / prev_price
-        else:
-            print("WARN: No data available, falling back to cash_interest_rate_pct")
-
-    if inflation_rate_ticker:
-        print(f"Fetching inflation data ({inflation_rate_ticker})...", end=" ")
-        infl_data = fetcher.get_history(inflation_rate_ticker, start_date, end_date)
-        if infl_data is not None and not infl_data.empty:
-            print(f"OK ({len(infl_data)} days)")
-            infl_indexed = infl_data.copy()
-            infl_indexed.index = pd.to_datetime(infl_indexed.index).date
-            value_col = "Close" if "Close" in infl_indexed.columns else "Value"
-            if value_col in infl_indexed.columns:
-                infl_values = infl_indexed[value_col].values
-                infl_dates = list(infl_indexed.index)
-                if common_dates[0] in infl_dates:
-                    start_cpi_idx = infl_dates.index(common_dates[0])
-                    start_cpi = float(infl_values[start_cpi_idx])
-                    for i, d in enumerate(infl_dates):
-                        if d >= common_dates[0]:
-                            curr_cpi = float(infl_values[i])
-                            cumulative_inflation[d] = curr_cpi / start_cpi if start_cpi > 0 else 1.0
-        else:
-            print("WARN: No data available, skipping inflation adjustment")
+    A withdrawal is due on the first trading day at least frequency_days
+    calendar days after the start or the previous withdrawal.
 
-    # Create simulation environment
-    env = simpy.Environment()
+    Args:
+        common_dates: Trading calendar of the run
+        frequency_days: Calendar days between withdrawals
+    """
+    due_days = []
+    last_date = common_dates[0]
+    for day_index, current_date in enumerate(common_dates):
+        if (current_date - last_date).days >= frequency_days:
+            due_days.append(day_index)
+            last_date = current_date
+    return due_days
+
+
+class PortfolioSimulation:
+    """A prepared simulation, advanced by iterating over it.
+
+    Iteration yields one DayState per trading day as the engine advances;
+    finish() runs any remaining days and builds the results. Only the
+    current step's values are held, so consumers that aggregate as they go
+    (progress bars, charts, long retirement runs) use constant memory.
+    """
 
-    # Initialize simulation state
-    sim_state = SimulationState(
-        env=env,
+    def __init__(self, state: "SimulationState", steps: Iterator[Tuple[int, int]]) -> None:
+        """Wrap a simulation state and its engine's step iterator.
+
+        Args:
+            state: Initialized simulation state
+            steps: Engine steps, each the (start, stop) day range it recorded
+        """
+        self.state = state
+        self._steps = steps
+        self._started = False
+        self._done = False
+        self._transaction_count = len(state.all_transactions)
+
+    def _advance(self) -> Iterator[Tuple[int, int]]:
+        """Run the engine's steps, printing the start and end of the run."""
+        if not self._started:
+            self._started = True
+            print("\nRunning simulation...")
+        for step in self._steps:
+            yield step
+        if not self._done:
+            self._done = True
+            print("Simulation complete.\n")
+
+    def __iter__(self) -> Iterator[DayState]:
+        state = self.state
+        for start, stop in self._advance():
+            transactions = state.all_transactions
+            fills = tuple(transactions[self._transaction_count :])
+            self._transaction_count = len(transactions)
+            holdings = tuple(state.holdings[ticker] for ticker in state.real_tickers)
+            banks = np.asarray(state.recorded_bank).tolist()
+            values = np.asarray(state.recorded_value).tolist()
+            for offset, day_index in enumerate(range(start, stop)):
+                yield DayState(
+                    day_index=day_index,
+                    current_date=state.common_dates[day_index],
+                    bank=banks[offset],
+                    holdings=holdings,
+                    portfolio_value=values[offset],
+                    fills=fills if offset == 0 else (),
+                )
+
+    def finish(self) -> Tuple[List[Transaction], Dict[str, Any]]:
+        """Run the remaining days and build the results.
+
+        Returns:
+            Tuple of (all_transactions, portfolio_summary)
+        """
+        for _ in self._advance():
+            pass
+        # Build results (same format as backtest.py)
+        return self.state.build_results()
+
+    def finish_at(
+        self, end_dates: Sequence[date]
+    ) -> List[Tuple[List[Transaction], Dict[str, Any]]]:
+        """Run the remaining days, building the results of each end date on the way.
+
+        Runs from one start date to different end dates share their path up
+        to the earlier end, so a single pass serves them all: the results at
+        each end are built as soon as that day completes, exactly as a run
+        ending there would build them (final valuation, baseline and real
+        returns included). An end date that is not a trading day ends on the
+        last trading day before it; ends past a stop get the stopped results.
+
+        Must be called before iterating over the simulation.
+
+        Args:
+            end_dates: End dates, each within the simulated calendar
+
+        Returns:
+            (all_transactions, portfolio_summary) for each end date, in order
+
+        Raises:
+            ValueError: If an end date is before the first trading day
+            RuntimeError: If the simulation has already been iterated
+        """
+        if self._started:
+            raise RuntimeError("finish_at() must be called before iterating")
+        state = self.state
+        positions = []
+        for end_date in end_dates:
+            position = bisect.bisect_right(state.common_dates, end_date) - 1
+            if position < 0:
+                raise ValueError(f"End date {end_date} is before the first trading day")
+            positions.append(position)
+        state.horizon_days = set(positions)
+
+        results: Dict[int, Tuple[List[Transaction], Dict[str, Any]]] = {}
+        for _, stop in self._advance():
+            if stop - 1 in state.horizon_days:
+                transactions, summary = state.build_results(stop - 1)
+                results[stop - 1] = (list(transactions), summary)
+        final = state.build_results()
+        return [results.get(position, final) for position in positions]
+
+
+def run_portfolio_simulation(
+    allocations: Dict[str, float],
+    start_date: date,
+    end_date: date,
+    portfolio_algo: Union[PortfolioAlgorithmBase, str],
+    initial_investment: float = 1_000_000.0,
+    allow_margin: bool = False,  # Default: no margin (realistic retail mode)
+    withdrawal_rate_pct: float = 0.0,
+    withdrawal_frequency_days: int = 30,
+    cash_interest_rate_pct: float = 0.0,
+    dividend_data: Optional[Dict[str, pd.Series]] = None,
+    reference_rate_ticker: Optional[str] = None,
+    risk_free_rate_ticker: Optional[str] = None,
+    inflation_rate_ticker: Optional[str] = None,
+    engine: str = "simpy",
+    detail: str = "full",
+    metrics: Optional[Sequence[MetricFactory]] = None,
+    stop_when: Optional[Sequence[StopPredicate]] = None,
+    price_frames: Optional[Mapping[str, Optional[pd.DataFrame]]] = None,
+    market_bundle: Optional[MarketDataBundle] = None,
+    # Legacy compatibility parameters (deprecated, ignored with warnings)
+    algo: Optional[Union[object, str]] = None,
+    simple_mode: bool = False,
+    **kwargs: Any,
+) -> Tuple[List[Transaction], Dict[str, Any]]:
+    """
+    Execute portfolio simulation with shared cash pool using discrete event simulation.
+
+    Runs iter_portfolio_simulation to completion; see it for the arguments.
+
+    Returns:
+        Tuple of (all_transactions, portfolio_summary)
+    """
+    return iter_portfolio_simulation(
         allocations=allocations,
-        price_data=price_data_indexed,
-        common_dates=common_dates,
+        start_date=start_date,
+        end_date=end_date,
+        portfolio_algo=portfolio_algo,
         initial_investment=initial_investment,
         allow_margin=allow_margin,
         withdrawal_rate_pct=withdrawal_rate_pct,
         withdrawal_frequency_days=withdrawal_frequency_days,
         cash_interest_rate_pct=cash_interest_rate_pct,
         dividend_data=dividend_data,
-        reference_returns=reference_returns,
-        risk_free_returns=risk_free_returns,
         reference_rate_ticker=reference_rate_ticker,
         risk_free_rate_ticker=risk_free_rate_ticker,
+        inflation_rate_ticker=inflation_rate_ticker,
+        engine=engine,
+        detail=detail,
+        metrics=metrics,
+        stop_when=stop_when,
+        price_frames=price_frames,
+        market_bundle=market_bundle,
+        algo=algo,
         simple_mode=simple_mode,
+        **kwargs,
+    ).finish()
+
+
+def run_portfolio_horizons(
+    allocations: Dict[str, float],
+    start_date: date,
+    end_dates: Sequence[date],
+    portfolio_algo: Union[PortfolioAlgorithmBase, str],
+    **kwargs: Any,
+) -> Dict[date, Tuple[List[Transaction], Dict[str, Any]]]:
+    """Simulate from one start date to several end dates in a single pass.
+
+    Each result is the one run_portfolio_simulation returns for that end
+    date (see PortfolioSimulation.finish_at), so one 10-year run yields the
+    1- to 10-year horizons.
+
+    Args:
+        allocations: Dict mapping ticker → target allocation
+        start_date: Simulation start date
+        end_dates: End dates to build results for
+        portfolio_algo: Portfolio algorithm or string name
+        **kwargs: Other run_portfolio_simulation arguments
+
+    Returns:
+        Dict mapping each end date → (all_transactions, portfolio_summary)
+
+    Example:
+        >>> ends = [date(2015 + years, 1, 1) for years in range(1, 11)]
+        >>> horizons = run_portfolio_horizons({"VOO": 1.0}, date(2015, 1, 1), ends, "per-asset:sd8")
+        >>> [horizons[end][1]["annualized_return"] for end in ends]
+    """
+    simulation = iter_portfolio_simulation(
+        allocations=allocations,
+        start_date=start_date,
+        end_date=max(end_dates),
         portfolio_algo=portfolio_algo,
-        reference_data=reference_data,
-        cumulative_inflation=cumulative_inflation,
-        inflation_rate_ticker=inflation_rate_ticker,
-        bil_price_data=bil_price_data,
+        **kwargs,
     )
+    return dict(zip(end_dates, simulation.finish_at(end_dates)))
 
-    # Start the simulation processes
-    env.process(market_process(env, sim_state, portfolio_algo))
 
-    # Schedule dividend events
-    if dividend_data:
-        env.process(dividend_process(env, sim_state))
+def fetch_dividend_series(ticker: str, start_date: date, end_date: date) -> Optional[pd.Series]:
+    """Fetch a ticker's dividends with timezone-naive timestamps.
+
+    Returns:
+        Dividend Series indexed by ex-date, or None if the ticker paid none
+    """
+    from src.data.asset import Asset
+
+    div_series = Asset(ticker).get_dividends(start_date, end_date)
+    if div_series is None or div_series.empty:
+        return None
+    # Normalize timezone-aware timestamps to naive dates
+    normalized = div_series.copy()
+    normalized.index = pd.to_datetime(normalized.index).tz_localize(None)
+    return normalized
+
+
+def annualized_return_pct(final_value: float, initial_value: float, years: float) -> float:
+    """Annualized return (%) of initial_value growing to final_value over years.
+
+    Zero-length spans return 0. A final value at or below zero has no
+    annual rate and returns NaN.
+    """
+    growth = final_value / initial_value
+    if years <= 0:
+        return 0.0
+    if growth > 0:
+        return float(((growth ** (1 / years)) - 1) * 100)
+    return float("nan")
+
+
+def reference_baseline(
+    reference_data: pd.DataFrame,
+    reference_rate_ticker: Optional[str],
+    first_date: date,
+    final_date: date,
+    initial_investment: float,
+    final_total_value: float,
+    years: float,
+) -> Dict[str, Any]:
+    """Buy-and-hold reference benchmark of a run, and the run's alpha over it.
+
+    Args:
+        reference_data: Date-indexed reference prices with a "Close" column
+        reference_rate_ticker: Ticker of the reference prices
+        first_date: First trading day of the run
+        final_date: Last trading day of the run
+        initial_investment: Capital invested in the benchmark on first_date
+        final_total_value: Final portfolio value of the run
+        years: Length of the run in years
 
-    # Run simulation
-    print("\nRunning simulation...")
-    env.run(until=len(common_dates))  # Run for number of trading days
-    print("Simulation complete.\n")
+    Returns:
+        The summary entries "baseline", "volatility_alpha" and "alpha_pct"
+    """
+    ref_start_price = float(cast(float, reference_data.at[first_date, "Close"]))
+    ref_end_price = float(cast(float, reference_data.at[final_date, "Close"]))
+
+    # Calculate baseline buy-and-hold return for reference benchmark
+    ref_shares = initial_investment / ref_start_price
+    ref_end_value = ref_shares * ref_end_price
+    ref_total_return = (ref_end_value - initial_investment) / initial_investment
+
+    if years > 0:
+        ref_annualized = (ref_end_value / initial_investment) ** (1.0 / years) - 1.0
+    else:
+        ref_annualized = 0.0
+
+    baseline_summary = {
+        "ticker": reference_rate_ticker,
+        "start_date": first_date,
+        "end_date": final_date,
+        "start_price": ref_start_price,
+        "end_price": ref_end_price,
+        "start_value": initial_investment,
+        "end_value": ref_end_value,
+        "total": ref_end_value,
+        "total_return": ref_total_return,
+        "annualized": ref_annualized,
+    }
+
+    # Alpha = portfolio return - benchmark return
+    volatility_alpha = (
+        final_total_value - initial_investment
+    ) / initial_investment - ref_total_return
+
+    return {
+        "baseline": baseline_summary,
+        "volatility_alpha": volatility_alpha,
+        "alpha_pct": volatility_alpha * 100.0,
+    }
+
+
+def close_to_close_returns(price_df: pd.DataFrame) -> Dict[date, float]:
+    """Daily close-to-close returns keyed by date (reference/risk-free rates).
+
+    Args:
+        price_df: Price history with a "Close" column (any datetime-like index)
+
+    Returns:
+        Dict mapping date → return since the previous row (days after a
+        non-positive close are omitted)
+    """
+    returns: Dict[date, float] = {}
+    if "Close" not in price_df.columns:
+        return returns
+    close_prices = price_df["Close"].values
+    dates = list(pd.to_datetime(price_df.index).date)
+    for i in range(1, len(close_prices)):
+        prev_price = float(close_prices[i - 1])
+        curr_price = float(close_prices[i])
+        if prev_price > 0:
+            returns[dates[i]] = (curr_price - prev_price) / prev_price
+    return returns
+
+
+class DayClock:
+    """Day counter used in place of simpy.Environment by the fast engine.
+
+    SimulationState only reads env.now (the current day position), so the
+    fast loop advances this counter directly.
+    """
+
+    __slots__ = ("now",)
 
-    # Build results (same format as backtest.py)
-    return sim_state.build_results()
+    def __init__(self) -> None:
+        self.now = 0
 
 
 class SimulationState:
     """Holds the state of the portfolio simulation."""
 
-    def __init__(self, env: simpy.Environment, **kwargs):
+    def __init__(self, env: Union[simpy.Environment, DayClock], **kwargs):
         self.env = env
         self.allocations = kwargs["allocations"]
-        self.price_data = kwargs["price_data"]
-        self.common_dates = kwargs["common_dates"]
+        self.market_data: AlignedPriceData = kwargs["market_data"]
+        self.common_dates = self.market_data.dates
         self.initial_investment = kwargs["initial_investment"]
         self.allow_margin = kwargs["allow_margin"]
         self.withdrawal_rate_pct = kwargs["withdrawal_rate_pct"]
@@ -337,6 +623,17 @@ class SimulationState:
         self.cumulative_inflation = kwargs.get("cumulative_inflation", {})
         self.inflation_rate_ticker = kwargs.get("inflation_rate_ticker", None)
         self.bil_price_data = kwargs.get("bil_price_data", None)
+        # Dividend events precomputed for these dates and allocations (see MarketDataBundle)
+        self.dividend_events: Optional[List[Tuple[int, str, date, Any]]] = kwargs.get(
+            "dividend_events"
+        )
+        self.detail = kwargs.get("detail", "full")
+        self.metrics = MetricSet(kwargs.get("metrics"))
+        self.stop_when: List[StopPredicate] = list(kwargs.get("stop_when") or ())
+        self.stop_index: Optional[int] = None  # Day the run stopped early, if it did
+        self.stop_reason: Optional[str] = None
+        # Days whose results PortfolioSimulation.finish_at() builds as they complete
+        self.horizon_days: Set[int] = set()
 
         # Separate real tickers from CASH
         self.real_tickers = [t for t in self.allocations.keys() if t != "CASH"]
@@ -345,18 +642,21 @@ class SimulationState:
         self.shared_bank = self.initial_investment
         self.holdings: Dict[str, float] = {}
         self.all_transactions: List[Transaction] = []
+        self.skipped_buy_value = 0.0  # Cost of buys skipped for insufficient cash
 
-        # Track daily values
-        self.daily_portfolio_values: Dict[date, float] = {}
-        self.daily_bank_values: Dict[date, float] = {}
-        self.daily_asset_values: Dict[str, Dict[date, float]] = {
-            ticker: {} for ticker in self.allocations.keys()
-        }
-        self.daily_withdrawals: Dict[date, float] = {}
+        # Track daily values, one array slot per trading day (not kept for "summary")
+        self.daily: Optional[DailySeries] = (
+            DailySeries(self.common_dates, self.real_tickers) if self.detail != "summary" else None
+        )
+        # Bank and portfolio values of the days recorded by the latest engine step
+        # (a 1-tuple for a single day, arrays for an idle span)
+        self.recorded_bank: Union[Tuple[float, ...], np.ndarray] = ()
+        self.recorded_value: Union[Tuple[float, ...], np.ndarray] = ()
 
         # Withdrawal tracking
         self.total_withdrawn = 0.0
         self.withdrawal_count = 0
+        self.shares_sold_for_withdrawals = 0.0
         self.last_withdrawal_date = None
         self.base_withdrawal_amount = 0.0
 
@@ -369,6 +669,7 @@ class SimulationState:
 
         # Interest tracking
         self.total_interest_earned = 0.0
+        self.interest_today = 0.0  # Net interest credited by the last process_daily_interest
         self.opportunity_cost_total = 0.0
         self.daily_interest_rate = (
             (self.cash_interest_rate_pct / 100.0) / 365.25
@@ -380,10 +681,16 @@ class SimulationState:
         # Dividend tracking
         self.total_dividends_by_asset = {ticker: 0.0 for ticker in self.allocations}
         self.dividend_payment_count_by_asset = {ticker: 0 for ticker in self.allocations}
-        self.holdings_history = {
-            ticker: [(self.common_dates[0], 0.0)] for ticker in self.real_tickers
+        # Cumulative share-days per ticker, for time-weighted dividend accrual
+        self.holdings_history: Dict[str, ShareDayAccumulator] = {
+            ticker: ShareDayAccumulator() for ticker in self.real_tickers
         }
 
+        # Cumulative dollar-days of the bank, for CASH sweep interest
+        self.bank_history: Optional[ShareDayAccumulator] = (
+            ShareDayAccumulator() if "CASH" in self.allocations else None
+        )
+
         # Bank balance tracking
         self.bank_min = self.shared_bank
         self.bank_max = self.shared_bank
@@ -397,14 +704,14 @@ class SimulationState:
                 print(f"  {ticker}: ${cash_reserve:,.2f} reserve (kept in bank)")
                 continue
 
-            first_price = self.price_data[ticker].loc[self.common_dates[0], "Close"].item()
+            first_price = self.market_data.close_at(ticker, 0)
             qty = int((self.initial_investment * alloc_pct) / first_price)
             cost = qty * first_price
             self.holdings[ticker] = qty
             self.shared_bank -= cost
             print(f"  {ticker}: {qty} shares × ${first_price:.2f} = ${cost:,.2f}")
 
-            self.all_transactions.append(
+            self.record_transaction(
                 Transaction(
                     transaction_date=self.common_dates[0],
                     action="BUY",
@@ -416,14 +723,25 @@ class SimulationState:
             )
 
             # Update holdings history
-            self.holdings_history[ticker].append((self.common_dates[0], qty))
+            self.holdings_history[ticker].record(self.common_dates[0], qty)
+
+        if self.bank_history is not None:
+            self.bank_history.record(self.common_dates[0], self.shared_bank)
 
         print(f"Initial bank balance: ${self.shared_bank:,.2f}\n")
 
+    def record_transaction(self, tx: Transaction) -> None:
+        """Append a transaction to the ledger, stamped with the bank balance after it."""
+        tx.bank_after = self.shared_bank
+        self.all_transactions.append(tx)
+
+    def get_current_day_index(self) -> int:
+        """Get current simulation day position based on environment time."""
+        return min(int(self.env.now), len(self.common_dates) - 1)
+
     def get_current_date(self) -> date:
         """Get current simulation date based on environment time."""
-        day_index = int(self.env.now)
-        return cast(date, self.common_dates[min(day_index, len(self.common_dates) - 1)])
+        return cast(date, self.common_dates[self.get_current_day_index()])
 
     def execute_transaction(self, tx: Transaction, ticker: str) -> None:
         """Execute a transaction against the portfolio state."""
@@ -439,11 +757,12 @@ class SimulationState:
             if self.shared_bank >= cost or self.allow_margin:
                 self.holdings[ticker] += tx.qty
                 self.shared_bank -= cost
-                self.all_transactions.append(tx)
+                self.record_transaction(tx)
                 # Update holdings history
-                self.holdings_history[ticker].append((current_date, self.holdings[ticker]))
+                self.holdings_history[ticker].record(current_date, self.holdings[ticker])
             else:
                 # Insufficient cash - skip transaction
+                self.skipped_buy_value += cost
                 skipped_tx = Transaction(
                     transaction_date=current_date,
                     action="SKIP BUY",
@@ -452,16 +771,16 @@ class SimulationState:
                     ticker=ticker,
                     notes=f"{tx.notes}, insufficient cash: ${self.shared_bank:.2f} < ${cost:.2f}",
                 )
-                self.all_transactions.append(skipped_tx)
+                self.record_transaction(skipped_tx)
 
         elif tx.action.upper() == "SELL":
             if self.holdings[ticker] >= tx.qty:
                 proceeds = tx.qty * tx.price
                 self.holdings[ticker] -= tx.qty
                 self.shared_bank += proceeds
-                self.all_transactions.append(tx)
+                self.record_transaction(tx)
                 # Update holdings history
-                self.holdings_history[ticker].append((current_date, self.holdings[ticker]))
+                self.holdings_history[ticker].record(current_date, self.holdings[ticker])
             else:
                 # Insufficient holdings - skip transaction
                 skipped_tx = Transaction(
@@ -472,60 +791,243 @@ class SimulationState:
                     ticker=ticker,
                     notes=f"{tx.notes}, insufficient holdings: {self.holdings[ticker]} < {tx.qty}",
                 )
-                self.all_transactions.append(skipped_tx)
+                self.record_transaction(skipped_tx)
 
-    def process_daily_interest(self) -> None:
-        """Process daily interest and opportunity cost."""
-        current_date = self.get_current_date()
+    def process_daily_interest(self, current_date: Optional[date] = None) -> None:
+        """Process daily interest and opportunity cost.
 
-        # Apply opportunity cost on negative balance
+        Args:
+            current_date: Day to accrue for (defaults to the current simulation date)
+        """
+        if current_date is None:
+            current_date = self.get_current_date()
+        bank_before = self.shared_bank
+
+        # Apply opportunity cost on negative balance: the debt grows with the reference return
         if self.shared_bank < 0 and not self.simple_mode:
             daily_return = self.reference_returns.get(
                 current_date, self.daily_reference_rate_fallback
             )
-            opportunity_cost_today = abs(self.shared_bank) * daily_return
-            self.shared_bank -= opportunity_cost_today
-            self.opportunity_cost_total += opportunity_cost_today
+            charged = self.shared_bank * (1.0 + daily_return)
+            self.opportunity_cost_total += self.shared_bank - charged
+            self.shared_bank = charged
 
-        # Accrue interest on positive balance
+        # Accrue interest on positive balance (balances are scaled by 1 + rate,
+        # so idle spans can compound in one step; see idle_bank_path)
         if self.shared_bank > 0:
             if self.risk_free_returns and current_date in self.risk_free_returns:
                 daily_return = self.risk_free_returns[current_date]
-                daily_interest = self.shared_bank * daily_return
-            elif self.daily_interest_rate > 0:
-                daily_interest = self.shared_bank * self.daily_interest_rate
             else:
-                daily_interest = 0.0
+                daily_return = self.daily_interest_rate
+
+            if daily_return > 0:
+                credited = self.shared_bank * (1.0 + daily_return)
+                self.total_interest_earned += credited - self.shared_bank
+                self.shared_bank = credited
 
-            if daily_interest > 0:
-                self.shared_bank += daily_interest
-                self.total_interest_earned += daily_interest
+        self.interest_today = self.shared_bank - bank_before
 
     def record_daily_values(self) -> None:
         """Record daily portfolio and bank values."""
-        current_date = self.get_current_date()
+        day_index = self.get_current_day_index()
+        current_date = self.common_dates[day_index]
 
         # Calculate current asset values
+        asset_values = []
         total_asset_value = 0.0
         for ticker in self.real_tickers:
-            current_price = self.price_data[ticker].loc[current_date, "Close"].item()
+            current_price = self.market_data.close_at(ticker, day_index)
             asset_value = self.holdings[ticker] * current_price
-            self.daily_asset_values[ticker][current_date] = asset_value
+            asset_values.append(asset_value)
             total_asset_value += asset_value
 
         # Record values
-        self.daily_portfolio_values[current_date] = self.shared_bank + total_asset_value
-        self.daily_bank_values[current_date] = self.shared_bank
+        portfolio_value = self.shared_bank + total_asset_value
+        if self.daily is not None:
+            self.daily.record(day_index, self.shared_bank, asset_values, portfolio_value)
+        self.metrics.update(
+            portfolio_value, self.shared_bank, self.interest_today, self.total_withdrawn
+        )
+        self.recorded_bank = (self.shared_bank,)
+        self.recorded_value = (portfolio_value,)
+        if self.stop_when:
+            self.check_stop(day_index, np.array([self.shared_bank]), np.array([portfolio_value]))
+        self.interest_today = 0.0
+        if self.bank_history is not None:
+            self.bank_history.record(current_date, self.shared_bank)
 
         # Update bank min/max
         self.bank_min = min(self.bank_min, self.shared_bank)
         self.bank_max = max(self.bank_max, self.shared_bank)
 
-    def build_results(self) -> Tuple[List[Transaction], Dict[str, Any]]:
-        """Build final results in the same format as backtest.py."""
-        final_date = self.common_dates[-1]
+    def accrues_interest(self) -> bool:
+        """True if process_daily_interest can change the bank balance.
+
+        False when no cash rate, risk-free series, or opportunity-cost rate
+        is configured, so the bank is constant between transactions.
+        """
+        if self.risk_free_returns or self.daily_interest_rate > 0:
+            return True
+        if self.simple_mode:
+            return False
+        return bool(self.reference_returns) or self.daily_reference_rate_fallback != 0
+
+    def withdrawal_day_indices(self) -> List[int]:
+        """Day positions on which a scheduled withdrawal is due.
+
+        Withdrawals are due withdrawal_frequency_days calendar days after the
+        start or the previous withdrawal, so the schedule depends only on the
+        trading calendar.
+        """
+        if self.base_withdrawal_amount <= 0:
+            return []
+        return withdrawal_schedule(self.common_dates, self.withdrawal_frequency_days)
+
+    def check_stop(self, start: int, bank: np.ndarray, portfolio: np.ndarray) -> Optional[int]:
+        """Find the first of consecutive recorded days on which a stop predicate holds.
+
+        Sets stop_index and stop_reason when one does.
+
+        Args:
+            start: Day position of the first value
+            bank: Bank balances, one per day
+            portfolio: Portfolio values, one per day
+
+        Returns:
+            Offset of the stop day from start, or None
+        """
+        first: Optional[int] = None
+        reason: Optional[str] = None
+        holdings = tuple(self.holdings[ticker] for ticker in self.real_tickers)
+        for predicate in self.stop_when:
+            limit = len(bank) if first is None else first
+            if isinstance(predicate, StopCondition):
+                offset = predicate.first_day(bank[:limit], portfolio[:limit])
+                if offset is not None:
+                    first, reason = offset, predicate.reason
+                continue
+            for offset in range(limit):
+                day_index = start + offset
+                result = predicate(
+                    DayState(
+                        day_index=day_index,
+                        current_date=self.common_dates[day_index],
+                        bank=float(bank[offset]),
+                        holdings=holdings,
+                        portfolio_value=float(portfolio[offset]),
+                    )
+                )
+                if result:
+                    first, reason = offset, stop_reason(predicate, result)
+                    break
+        if first is not None:
+            self.stop_index = start + first
+            self.stop_reason = reason
+        return first
+
+    def idle_bank_path(self, dates: Sequence[date]) -> np.ndarray:
+        """Bank balance at the end of each of a span of idle days, in closed form.
+
+        Without transactions the bank keeps its sign, so process_daily_interest
+        multiplies it by one factor a day: 1 + the reference return while it
+        is negative (opportunity cost), 1 + the credited interest rate while it
+        is positive. The path is the running product of the factors.
+
+        Args:
+            dates: Consecutive idle days, starting the day after the current balance
+        """
+        bank = self.shared_bank
+        if bank < 0 and not self.simple_mode:
+            fallback = self.daily_reference_rate_fallback
+            rates = np.array([self.reference_returns.get(d, fallback) for d in dates])
+        elif bank > 0:
+            default = max(self.daily_interest_rate, 0.0)
+            if self.risk_free_returns:
+                rates = np.array([self.risk_free_returns.get(d, default) for d in dates])
+                np.maximum(rates, 0.0, out=rates)  # Only positive interest is credited
+            else:
+                rates = np.full(len(dates), default)
+        else:
+            return np.full(len(dates), bank)
+        factors = np.empty(len(dates) + 1)
+        factors[0] = bank
+        np.add(rates, 1.0, out=factors[1:])
+        return np.multiply.accumulate(factors)[1:]
+
+    def advance_idle_days(self, start: int, stop: int) -> None:
+        """Advance over days [start, stop) on which no transactions occur.
+
+        Interest and opportunity cost over the span are accrued in closed form
+        (see idle_bank_path), and the daily value series are filled by
+        vectorized valuation of the unchanged holdings. With stop predicates,
+        the span ends on the day one holds.
+
+        Args:
+            start: First idle day position
+            stop: Day position after the last idle day
+        """
+        asset_values = np.empty((len(self.real_tickers), stop - start))
+        total_asset_value = np.zeros(stop - start)
+        for row, ticker in enumerate(self.real_tickers):
+            asset_values[row] = self.holdings[ticker] * self.market_data.closes(ticker)[start:stop]
+            total_asset_value += asset_values[row]
+
+        dates = self.common_dates[start:stop]
+        accrues = self.accrues_interest()
+        if accrues:
+            bank_path = self.idle_bank_path(dates)
+        else:
+            bank_path = np.full(len(dates), self.shared_bank)
+        if self.stop_when:
+            stop_offset = self.check_stop(start, bank_path, bank_path + total_asset_value)
+            if stop_offset is not None:
+                stop = start + stop_offset + 1
+
+        # Keep only the days advanced over (all of them unless the run stopped)
+        span = stop - start
+        dates = dates[:span]
+        bank_path = bank_path[:span]
+        asset_values = asset_values[:, :span]
+        interest = np.diff(bank_path, prepend=self.shared_bank)
+        if accrues and self.shared_bank != 0:
+            # Running totals add the daily changes in order, as day-by-day accrual does
+            if self.shared_bank < 0:
+                totals = np.add.accumulate(np.append(self.opportunity_cost_total, -interest))
+                self.opportunity_cost_total = float(totals[-1])
+            else:
+                totals = np.add.accumulate(np.append(self.total_interest_earned, interest))
+                self.total_interest_earned = float(totals[-1])
+            self.shared_bank = float(bank_path[-1])
+        portfolio_path = bank_path + total_asset_value[:span]
+        if self.daily is not None:
+            self.daily.record_span(start, bank_path, asset_values, portfolio_path)
+        self.metrics.update_span(portfolio_path, bank_path, interest, self.total_withdrawn)
+        self.recorded_bank = bank_path
+        self.recorded_value = portfolio_path
+        if self.bank_history is not None:
+            for current_date, balance in zip(dates, bank_path.tolist()):
+                self.bank_history.record(current_date, balance)
+
+        self.bank_min = min(self.bank_min, float(bank_path.min()))
+        self.bank_max = max(self.bank_max, float(bank_path.max()))
+
+    def build_results(
+        self, final_index: Optional[int] = None
+    ) -> Tuple[List[Transaction], Dict[str, Any]]:
+        """Build final results in the same format as backtest.py.
+
+        Args:
+            final_index: Last day the results cover (default: the last
+                simulated day). An earlier day gives the results of the run
+                ending there, if the state has just completed that day.
+        """
+        # Last simulated day: the stop day if the run ended early
+        if final_index is None:
+            final_index = len(self.common_dates) - 1 if self.stop_index is None else self.stop_index
+        stopped = final_index == self.stop_index
+        final_date = self.common_dates[final_index]
         final_asset_value = sum(
-            self.holdings[ticker] * self.price_data[ticker].loc[final_date, "Close"].item()
+            self.holdings[ticker] * self.market_data.close_at(ticker, final_index)
             for ticker in self.real_tickers
         )
         final_total_value = self.shared_bank + final_asset_value
@@ -536,11 +1038,7 @@ class SimulationState:
         ) * 100
         days = (final_date - self.common_dates[0]).days
         years = days / 365.25
-        annualized_return_pct = (
-            (((final_total_value / self.initial_investment) ** (1 / years)) - 1) * 100
-            if years > 0
-            else 0
-        )
+        annualized_pct = annualized_return_pct(final_total_value, self.initial_investment, years)
 
         # Build per-asset summaries
         asset_results = {}
@@ -556,7 +1054,7 @@ class SimulationState:
                     "total_return": 0.0,  # Bank balance is tracked separately
                 }
             else:
-                final_price = self.price_data[ticker].loc[final_date, "Close"].item()
+                final_price = self.market_data.close_at(ticker, final_index)
                 final_value = self.holdings[ticker] * final_price
                 initial_value = self.initial_investment * alloc_pct
 
@@ -579,17 +1077,15 @@ class SimulationState:
             "final_bank": self.shared_bank,
             "final_asset_value": final_asset_value,
             "total_return": total_return_pct,
-            "annualized_return": annualized_return_pct,
+            "annualized_return": annualized_pct,
             "initial_investment": self.initial_investment,
             "start_date": self.common_dates[0],
             "end_date": final_date,
-            "trading_days": len(self.common_dates),
+            "trading_days": final_index + 1,
+            "stop_reason": self.stop_reason if stopped else None,
+            "stop_date": final_date if stopped else None,
             "assets": asset_results,
             "allocations": self.allocations,
-            "daily_values": self.daily_portfolio_values,
-            "daily_bank_values": self.daily_bank_values,
-            "daily_asset_values": self.daily_asset_values,
-            "daily_withdrawals": self.daily_withdrawals,
             "transaction_count": len(
                 [
                     tx
@@ -598,57 +1094,49 @@ class SimulationState:
                 ]
             ),
             "skipped_count": len([tx for tx in self.all_transactions if "SKIP" in tx.action]),
+            "skipped_buy_value": self.skipped_buy_value,
             "total_withdrawn": self.total_withdrawn,
             "withdrawal_count": self.withdrawal_count,
+            "shares_sold_for_withdrawals": self.shares_sold_for_withdrawals,
             "withdrawal_rate_pct": self.withdrawal_rate_pct,
             "cash_interest_earned": self.total_interest_earned,
             "opportunity_cost": self.opportunity_cost_total,
             "cash_interest_rate_pct": self.cash_interest_rate_pct,
             "risk_free_rate_ticker": self.risk_free_rate_ticker,
-            "total_dividends_by_asset": self.total_dividends_by_asset,
+            "total_dividends_by_asset": dict(self.total_dividends_by_asset),
             "total_dividends": sum(self.total_dividends_by_asset.values()),
-            "dividend_payment_count_by_asset": self.dividend_payment_count_by_asset,
+            "dividend_payment_count_by_asset": dict(self.dividend_payment_count_by_asset),
             "bank_min": self.bank_min,
             "bank_max": self.bank_max,
+            "daily_bank_stats": self.metrics.bank.bank_stats(),
+            "metrics": self.metrics.result(),
         }
 
+        # Daily series and ledger only at the requested detail level
+        if self.daily is not None:
+            daily = self.daily
+            if final_index < len(self.common_dates) - 1:
+                daily = self.daily.head(final_index + 1)
+            portfolio_summary["daily"] = daily
+            portfolio_summary.update(daily.views())
+        if self.detail == "full":
+            # Copied: a horizon's ledger must not see later days' transactions
+            transactions = list(self.all_transactions)
+            portfolio_summary["ledger"] = TransactionLedger.from_transactions(transactions)
+
         # Compute baseline (buy-and-hold reference benchmark) if reference data provided
         if self.reference_data is not None and not self.reference_data.empty:
-            first_date = self.common_dates[0]
-            ref_start_price = float(self.reference_data.loc[first_date, "Close"])
-            ref_end_price = float(self.reference_data.loc[final_date, "Close"])
-
-            # Calculate baseline buy-and-hold return for reference benchmark
-            ref_shares = self.initial_investment / ref_start_price
-            ref_end_value = ref_shares * ref_end_price
-            ref_total_return = (ref_end_value - self.initial_investment) / self.initial_investment
-
-            if years > 0:
-                ref_annualized = (ref_end_value / self.initial_investment) ** (1.0 / years) - 1.0
-            else:
-                ref_annualized = 0.0
-
-            baseline_summary = {
-                "ticker": self.reference_rate_ticker,
-                "start_date": first_date,
-                "end_date": final_date,
-                "start_price": ref_start_price,
-                "end_price": ref_end_price,
-                "start_value": self.initial_investment,
-                "end_value": ref_end_value,
-                "total": ref_end_value,
-                "total_return": ref_total_return,
-                "annualized": ref_annualized,
-            }
-
-            # Alpha = portfolio return - benchmark return
-            volatility_alpha = (
-                final_total_value - self.initial_investment
-            ) / self.initial_investment - ref_total_return
-
-            portfolio_summary["baseline"] = baseline_summary
-            portfolio_summary["volatility_alpha"] = volatility_alpha
-            portfolio_summary["alpha_pct"] = volatility_alpha * 100.0
+            portfolio_summary.update(
+                reference_baseline(
+                    self.reference_data,
+                    self.reference_rate_ticker,
+                    self.common_dates[0],
+                    final_date,
+                    self.initial_investment,
+                    final_total_value,
+                    years,
+                )
+            )
         else:
             portfolio_summary["baseline"] = None
             portfolio_summary["volatility_alpha"] = None
@@ -661,13 +1149,9 @@ class SimulationState:
                 (real_final_value - self.initial_investment) / self.initial_investment * 100.0
             )
 
-            if years > 0:
-                real_annualized_pct = (real_final_value / self.initial_investment) ** (
-                    1.0 / years
-                ) - 1.0
-                real_annualized_pct *= 100.0
-            else:
-                real_annualized_pct = 0.0
+            real_annualized_pct = annualized_return_pct(
+                real_final_value, self.initial_investment, years
+            )
 
             portfolio_summary["inflation_rate_ticker"] = self.inflation_rate_ticker
             portfolio_summary["cumulative_inflation"] = (inflation_multiplier - 1.0) * 100.0
@@ -707,162 +1191,207 @@ class SimulationState:
         return self.all_transactions, portfolio_summary
 
 
-def market_process(
-    env: simpy.Environment, state: SimulationState, portfolio_algo: PortfolioAlgorithmBase
-) -> Generator[simpy.events.Event, Any, Any]:
-    """Main market process that advances through trading days."""
-    # Initialize per-asset algorithms if needed
+def initialize_portfolio_algorithm(
+    state: SimulationState, portfolio_algo: PortfolioAlgorithmBase
+) -> None:
+    """Seed per-asset algorithms with the initial holdings before day 0."""
     from src.algorithms import PerAssetPortfolioAlgorithm
 
     if isinstance(portfolio_algo, PerAssetPortfolioAlgorithm):
         print("Initializing per-asset algorithms...")
         for ticker, algo in portfolio_algo.strategies.items():
             if hasattr(algo, "on_new_holdings"):
-                first_price = state.price_data[ticker].loc[state.common_dates[0], "Close"].item()
+                first_price = state.market_data.close_at(ticker, 0)
                 algo.on_new_holdings(state.holdings[ticker], first_price)
                 print(
                     f"  {ticker}: initialized with {state.holdings[ticker]} shares @ ${first_price:.2f}"
                 )
         print()
 
-    # Process each trading day
-    for day_index in range(len(state.common_dates)):
-        current_date = state.common_dates[day_index]
 
-        # Build current state for algorithm
-        assets = {}
-        prices = {}
-        history = {}
+def process_market_day(
+    state: SimulationState,
+    portfolio_algo: PortfolioAlgorithmBase,
+    day_index: int,
+    needs_history: bool = True,
+) -> None:
+    """Run one trading day: algorithm orders, withdrawals, interest, and recording.
 
-        for ticker in state.real_tickers:
-            current_price = state.price_data[ticker].loc[current_date, "Close"].item()
-            assets[ticker] = AssetState(
-                ticker=ticker, holdings=state.holdings[ticker], price=current_price
-            )
-            prices[ticker] = state.price_data[ticker].loc[current_date]
-            history[ticker] = state.price_data[ticker][
-                state.price_data[ticker].index < current_date
-            ]
-
-        # Ask portfolio algorithm for transactions
-        transactions_by_ticker = portfolio_algo.on_portfolio_day(
-            date_=current_date,
-            assets=assets,
-            bank=state.shared_bank,
-            prices=prices,
-            history=history,
+    Shared by both engines so the simpy process and the fast day loop apply
+    identical per-day semantics.
+    """
+    current_date = state.common_dates[day_index]
+
+    # Build current state for algorithm
+    assets = {}
+    prices: Dict[str, Bar] = {}
+    history: Dict[str, PriceHistory] = {}
+
+    close_prices = {
+        ticker: state.market_data.close_at(ticker, day_index) for ticker in state.real_tickers
+    }
+
+    for ticker in state.real_tickers:
+        assets[ticker] = AssetState(
+            ticker=ticker, holdings=state.holdings[ticker], price=close_prices[ticker]
         )
+        prices[ticker] = state.market_data.bar(ticker, day_index)
+        if needs_history:
+            # Lazy prefix view: nothing is copied unless the algorithm reads it
+            history[ticker] = PriceHistory(state.market_data, ticker, day_index)
+
+    # Ask portfolio algorithm for transactions
+    transactions_by_ticker = portfolio_algo.on_portfolio_day(
+        date_=current_date,
+        assets=assets,
+        bank=state.shared_bank,
+        prices=prices,
+        history=history,
+    )
+
+    # Execute transactions
+    for ticker, txns in transactions_by_ticker.items():
+        for tx in txns:
+            state.execute_transaction(tx, ticker)
 
-        # Execute transactions
-        for ticker, txns in transactions_by_ticker.items():
-            for tx in txns:
-                state.execute_transaction(tx, ticker)
-
-        # Process withdrawals (if enabled and due)
-        if state.base_withdrawal_amount > 0:
-            # Check if withdrawal is due
-            days_since_last = None
-            if state.last_withdrawal_date is None:
-                # First withdrawal happens after withdrawal_frequency_days from start
-                days_since_last = (current_date - state.common_dates[0]).days
+    # Process withdrawals (if enabled and due)
+    if state.base_withdrawal_amount > 0:
+        # Check if withdrawal is due
+        days_since_last = None
+        if state.last_withdrawal_date is None:
+            # First withdrawal happens after withdrawal_frequency_days from start
+            days_since_last = (current_date - state.common_dates[0]).days
+        else:
+            days_since_last = (current_date - state.last_withdrawal_date).days
+
+        if days_since_last >= state.withdrawal_frequency_days:
+            # Withdraw from shared bank (portfolio-level, not per-asset)
+            withdrawal_amount = state.base_withdrawal_amount
+
+            # Check if we have enough cash
+            if state.shared_bank >= withdrawal_amount:
+                # Simple case: withdraw from cash
+                actual_withdrawal = withdrawal_amount
+                state.shared_bank -= actual_withdrawal
+                withdrawal_notes = (
+                    f"${actual_withdrawal:.2f} withdrawn from cash, bank=${state.shared_bank:.2f}"
+                )
             else:
-                days_since_last = (current_date - state.last_withdrawal_date).days
-
-            if days_since_last >= state.withdrawal_frequency_days:
-                # Withdraw from shared bank (portfolio-level, not per-asset)
-                withdrawal_amount = state.base_withdrawal_amount
-
-                # Check if we have enough cash
-                if state.shared_bank >= withdrawal_amount:
-                    # Simple case: withdraw from cash
-                    actual_withdrawal = withdrawal_amount
-                    state.shared_bank -= actual_withdrawal
-                    withdrawal_notes = f"${actual_withdrawal:.2f} withdrawn from cash, bank=${state.shared_bank:.2f}"
-                else:
-                    # Need to sell assets to meet withdrawal
-                    # First, withdraw all available cash
-                    cash_available = max(0, state.shared_bank)
-                    shortfall = withdrawal_amount - cash_available
-
-                    # Sell assets proportionally to raise cash for shortfall
-                    total_asset_value = sum(
-                        state.holdings[t] * state.price_data[t].loc[current_date, "Close"].item()
-                        for t in state.real_tickers
-                    )
+                # Need to sell assets to meet withdrawal
+                # First, withdraw all available cash
+                cash_available = max(0, state.shared_bank)
+                shortfall = withdrawal_amount - cash_available
 
-                    if total_asset_value > 0:
-                        # Sell proportionally from each asset
-                        for ticker in state.real_tickers:
-                            if state.holdings[ticker] > 0:
-                                asset_value = (
-                                    state.holdings[ticker]
-                                    * state.price_data[ticker].loc[current_date, "Close"].item()
-                                )
-                                proportion = asset_value / total_asset_value
-                                amount_to_raise = shortfall * proportion
-                                shares_to_sell = math.ceil(
-                                    amount_to_raise
-                                    / state.price_data[ticker].loc[current_date, "Close"].item()
-                                )
+                # Sell assets proportionally to raise cash for shortfall
+                total_asset_value = sum(
+                    state.holdings[t] * close_prices[t] for t in state.real_tickers
+                )
 
-                                if shares_to_sell > 0:
-                                    shares_to_sell = min(shares_to_sell, state.holdings[ticker])
-                                    proceeds = (
-                                        shares_to_sell
-                                        * state.price_data[ticker].loc[current_date, "Close"].item()
-                                    )
-                                    state.holdings[ticker] -= shares_to_sell
-                                    state.shared_bank += proceeds
-
-                                    # Record forced sale
-                                    state.all_transactions.append(
-                                        Transaction(
-                                            transaction_date=current_date,
-                                            action="SELL",
-                                            qty=shares_to_sell,
-                                            price=state.price_data[ticker]
-                                            .loc[current_date, "Close"]
-                                            .item(),
-                                            ticker=ticker,
-                                            notes=f"Forced sale to fund withdrawal (raised ${proceeds:.2f})",
-                                        )
+                if total_asset_value > 0:
+                    # Sell proportionally from each asset
+                    for ticker in state.real_tickers:
+                        if state.holdings[ticker] > 0:
+                            price = close_prices[ticker]
+                            asset_value = state.holdings[ticker] * price
+                            proportion = asset_value / total_asset_value
+                            amount_to_raise = shortfall * proportion
+                            shares_to_sell = math.ceil(amount_to_raise / price)
+
+                            if shares_to_sell > 0:
+                                shares_to_sell = min(shares_to_sell, state.holdings[ticker])
+                                proceeds = shares_to_sell * price
+                                state.holdings[ticker] -= shares_to_sell
+                                state.shared_bank += proceeds
+                                state.shares_sold_for_withdrawals += shares_to_sell
+
+                                # Record forced sale
+                                state.record_transaction(
+                                    Transaction(
+                                        transaction_date=current_date,
+                                        action="SELL",
+                                        qty=shares_to_sell,
+                                        price=price,
+                                        ticker=ticker,
+                                        notes=f"Forced sale to fund withdrawal (raised ${proceeds:.2f})",
                                     )
+                                )
 
-                    # Now withdraw what we can (cash available + proceeds from sales)
-                    actual_withdrawal = min(withdrawal_amount, state.shared_bank)
-                    state.shared_bank -= actual_withdrawal
-                    withdrawal_notes = f"${actual_withdrawal:.2f} withdrawn (${cash_available:.2f} cash + ${actual_withdrawal - cash_available:.2f} from asset sales), bank=${state.shared_bank:.2f}"
+                # Now withdraw what we can (cash available + proceeds from sales)
+                actual_withdrawal = min(withdrawal_amount, state.shared_bank)
+                state.shared_bank -= actual_withdrawal
+                withdrawal_notes = f"${actual_withdrawal:.2f} withdrawn (${cash_available:.2f} cash + ${actual_withdrawal - cash_available:.2f} from asset sales), bank=${state.shared_bank:.2f}"
 
-                state.total_withdrawn += actual_withdrawal
-                state.withdrawal_count += 1
-                state.last_withdrawal_date = current_date
+            state.total_withdrawn += actual_withdrawal
+            state.withdrawal_count += 1
+            state.last_withdrawal_date = current_date
 
-                # Record withdrawal transaction
-                state.all_transactions.append(
-                    Transaction(
-                        transaction_date=current_date,
-                        action="WITHDRAWAL",
-                        qty=int(actual_withdrawal * 100),  # Amount in cents (preserves precision)
-                        price=0.01,  # $0.01 per cent (so qty=12345 = $123.45)
-                        ticker="CASH",
-                        notes=withdrawal_notes,
-                    )
+            # Record withdrawal transaction
+            state.record_transaction(
+                Transaction(
+                    transaction_date=current_date,
+                    action="WITHDRAWAL",
+                    qty=int(actual_withdrawal * 100),  # Amount in cents (preserves precision)
+                    price=0.01,  # $0.01 per cent (so qty=12345 = $123.45)
+                    ticker="CASH",
+                    notes=withdrawal_notes,
                 )
+            )
+
+            # Track daily withdrawals for visualization
+            if state.daily is not None:
+                state.daily.record_withdrawal(day_index, actual_withdrawal)
+
+    # Process daily interest/opportunity cost
+    state.process_daily_interest()
 
-                # Track daily withdrawals for visualization
-                state.daily_withdrawals[current_date] = actual_withdrawal
+    # Record daily values
+    state.record_daily_values()
+
+
+def market_process(
+    env: simpy.Environment, state: SimulationState, portfolio_algo: PortfolioAlgorithmBase
+) -> Generator[simpy.events.Event, Any, Any]:
+    """Main market process that advances through trading days."""
+    initialize_portfolio_algorithm(state, portfolio_algo)
 
-        # Process daily interest/opportunity cost
-        state.process_daily_interest()
+    # Algorithms that never read price history let us skip building it
+    needs_history = getattr(portfolio_algo, "needs_history", True)
 
-        # Record daily values
-        state.record_daily_values()
+    # Process each trading day
+    for day_index in range(len(state.common_dates)):
+        process_market_day(state, portfolio_algo, day_index, needs_history)
 
         # Advance to next day
         if day_index < len(state.common_dates) - 1:
             yield env.timeout(1)
 
 
+def iter_simpy_steps(
+    env: simpy.Environment, state: SimulationState, portfolio_algo: PortfolioAlgorithmBase
+) -> Iterator[Tuple[int, int]]:
+    """Reference engine: run the simpy processes one trading day at a time.
+
+    Running until the start of each next day processes exactly the events of
+    the current day, so stepping gives the same event order as one run over
+    the whole calendar.
+
+    Yields:
+        (day_index, day_index + 1) after each day
+    """
+    # Start the simulation processes
+    env.process(market_process(env, state, portfolio_algo))
+
+    # Schedule dividend events
+    if state.dividend_data:
+        env.process(dividend_process(env, state))
+
+    for day_index in range(len(state.common_dates)):
+        env.run(until=day_index + 1)
+        yield day_index, day_index + 1
+        if state.stop_index is not None:
+            return
+
+
 def withdrawal_process(
     env: simpy.Environment, state: SimulationState, base_amount: float, frequency_days: int
 ) -> Generator[simpy.events.Event, Any, Any]:
@@ -872,11 +1401,8 @@ def withdrawal_process(
         # Find the next withdrawal day based on calendar days, not simulation time
         start_date = state.common_dates[0]
         current_day_index = int(env.now)
-        current_date = (
-            state.common_dates[current_day_index]
-            if current_day_index < len(state.common_dates)
-            else state.common_dates[-1]
-        )
+        price_index = min(current_day_index, len(state.common_dates) - 1)
+        current_date = state.common_dates[price_index]
 
         # Calculate days since start or last withdrawal
         if state.last_withdrawal_date is None:
@@ -900,42 +1426,35 @@ def withdrawal_process(
                 cash_available = max(0, state.shared_bank)
                 shortfall = withdrawal_amount - cash_available
 
+                close_prices = {
+                    t: state.market_data.close_at(t, price_index) for t in state.real_tickers
+                }
                 total_asset_value = sum(
-                    state.holdings[t] * state.price_data[t].loc[current_date, "Close"].item()
-                    for t in state.real_tickers
+                    state.holdings[t] * close_prices[t] for t in state.real_tickers
                 )
 
                 if total_asset_value > 0:
                     for ticker in state.real_tickers:
                         if state.holdings[ticker] > 0:
-                            asset_value = (
-                                state.holdings[ticker]
-                                * state.price_data[ticker].loc[current_date, "Close"].item()
-                            )
+                            price = close_prices[ticker]
+                            asset_value = state.holdings[ticker] * price
                             proportion = asset_value / total_asset_value
                             amount_to_raise = shortfall * proportion
-                            shares_to_sell = math.ceil(
-                                amount_to_raise
-                                / state.price_data[ticker].loc[current_date, "Close"].item()
-                            )
+                            shares_to_sell = math.ceil(amount_to_raise / price)
 
                             if shares_to_sell > 0:
                                 shares_to_sell = min(shares_to_sell, state.holdings[ticker])
-                                proceeds = (
-                                    shares_to_sell
-                                    * state.price_data[ticker].loc[current_date, "Close"].item()
-                                )
+                                proceeds = shares_to_sell * price
                                 state.holdings[ticker] -= shares_to_sell
                                 state.shared_bank += proceeds
+                                state.shares_sold_for_withdrawals += shares_to_sell
 
-                                state.all_transactions.append(
+                                state.record_transaction(
                                     Transaction(
                                         transaction_date=current_date,
                                         action="SELL",
                                         qty=shares_to_sell,
-                                        price=state.price_data[ticker]
-                                        .loc[current_date, "Close"]
-                                        .item(),
+                                        price=price,
                                         ticker=ticker,
                                         notes=f"Forced sale to fund withdrawal (raised ${proceeds:.2f})",
                                     )
@@ -948,9 +1467,10 @@ def withdrawal_process(
             state.total_withdrawn += actual_withdrawal
             state.withdrawal_count += 1
             state.last_withdrawal_date = current_date
-            state.daily_withdrawals[current_date] = actual_withdrawal
+            if state.daily is not None:
+                state.daily.record_withdrawal(state.get_current_day_index(), actual_withdrawal)
 
-            state.all_transactions.append(
+            state.record_transaction(
                 Transaction(
                     transaction_date=current_date,
                     action="WITHDRAWAL",
@@ -972,94 +1492,238 @@ def withdrawal_process(
             break  # End of simulation
 
 
-def dividend_process(
-    env: simpy.Environment, state: SimulationState
-) -> Generator[simpy.events.Event, Any, Any]:
-    """Process that handles dividend payments."""
+def collect_dividend_events(state: SimulationState) -> List[Tuple[int, str, date, Any]]:
+    """Collect (day_index, ticker, div_date, div_per_share) events, sorted by day."""
+    if state.dividend_events is not None:
+        return state.dividend_events
+    return build_dividend_events(state.dividend_data, state.allocations.keys(), state.common_dates)
+
+
+def build_dividend_events(
+    dividend_data: Optional[Dict[str, pd.Series]],
+    tickers: Iterable[str],
+    common_dates: List[date],
+) -> List[Tuple[int, str, date, Any]]:
+    """Build (day_index, ticker, div_date, div_per_share) events, sorted by day.
+
+    Args:
+        dividend_data: Dict mapping ticker → dividend Series (None entries skipped)
+        tickers: Tickers to collect dividends for
+        common_dates: Trading calendar of the run
+
+    Returns:
+        Events within the calendar, sorted by day position
+    """
     # Collect all dividend events
-    dividend_events = []
+    dividend_events: List[Tuple[int, str, date, Any]] = []
+    if not dividend_data:
+        return dividend_events
 
-    for ticker in state.allocations.keys():
-        if ticker in state.dividend_data and state.dividend_data[ticker] is not None:
-            div_series = state.dividend_data[ticker]
+    # Calendar ordinals of the trading days, for binary search of dividend dates
+    calendar = np.array([d.toordinal() for d in common_dates], dtype=np.int64)
+
+    for ticker in tickers:
+        if ticker in dividend_data and dividend_data[ticker] is not None:
+            div_series = dividend_data[ticker]
             if not div_series.empty:
                 div_dates = pd.to_datetime(div_series.index).date
-                for div_date in div_dates:
-                    if state.common_dates[0] <= div_date <= state.common_dates[-1]:
-                        day_index = state.common_dates.index(div_date)
+                positions = np.searchsorted(calendar, [d.toordinal() for d in div_dates])
+                for div_date, day_index in zip(div_dates, positions.tolist()):
+                    if common_dates[0] <= div_date <= common_dates[-1]:
+                        if common_dates[day_index] != div_date:
+                            raise ValueError(f"Dividend date {div_date} is not a trading day")
                         div_per_share = div_series.loc[pd.Timestamp(div_date)]
                         dividend_events.append((day_index, ticker, div_date, div_per_share))
 
     # Sort events by day
     dividend_events.sort(key=lambda x: x[0])
 
-    # Process events in order
-    for day_index, ticker, div_date, div_per_share in dividend_events:
+    return dividend_events
+
+
+def split_dividend_events(
+    dividend_events: List[Tuple[int, str, date, Any]],
+) -> Tuple[
+    Dict[int, List[Tuple[int, str, date, Any]]], Dict[int, List[Tuple[int, str, date, Any]]]
+]:
+    """Split sorted dividend events by when the simpy engine pays them.
+
+    The simpy dividend process starts after market day 0 and each dividend
+    waits on its own timeout, so a dividend is paid after that day's market
+    step while dividend days form an unbroken run of consecutive days from
+    day 0. After the first gap of more than one day, its timeout fires ahead
+    of the market process and every later dividend is paid before that day's
+    market step.
+
+    Args:
+        dividend_events: Events from build_dividend_events()
+
+    Returns:
+        Tuple of (before_market, after_market) dicts mapping day position → events
+    """
+    before_market: Dict[int, List[Tuple[int, str, date, Any]]] = {}
+    after_market: Dict[int, List[Tuple[int, str, date, Any]]] = {}
+    last_wake = 0
+    pays_after_market = True
+    for event in dividend_events:
+        if event[0] - last_wake > 1:
+            pays_after_market = False
+        last_wake = event[0]
+        target = after_market if pays_after_market else before_market
+        target.setdefault(event[0], []).append(event)
+    return before_market, after_market
+
+
+def pay_dividend(state: SimulationState, ticker: str, div_date: date, div_per_share: Any) -> None:
+    """Credit one dividend (or CASH sweep interest) to the shared bank."""
+    # Special handling for CASH (sweep account interest from BIL)
+    if ticker == "CASH":
+        # Calculate interest based on cash balance (not holdings)
+        # Bank balance earns BIL yield as if invested in BIL shares
+        if state.bil_price_data is not None:
+            try:
+                # Get BIL price on dividend date
+                bil_price = state.bil_price_data.loc[pd.Timestamp(div_date), "Close"].item()
+
+                # Calculate equivalent BIL shares from the time-weighted
+                # average bank balance over the accrual period (end-of-day
+                # balances, with the current balance for the payment day)
+                accrual_period_days = 30  # Monthly for BIL
+                period_start = div_date - timedelta(days=accrual_period_days)
+                avg_cash_balance = state.shared_bank
+                if state.bank_history is not None:
+                    state.bank_history.record(div_date, state.shared_bank)
+                    avg_cash_balance = state.bank_history.average(period_start, div_date)
+
+                # Equivalent BIL shares
+                equivalent_shares = avg_cash_balance / bil_price
+
+                # Interest payment
+                div_payment = div_per_share * equivalent_shares
+                state.shared_bank += div_payment
+                state.total_dividends_by_asset[ticker] += div_payment
+                state.dividend_payment_count_by_asset[ticker] += 1
+
+                state.record_transaction(
+                    Transaction(
+                        transaction_date=div_date,
+                        action="INTEREST",
+                        qty=int(div_payment * 100),  # Interest amount in cents
+                        price=0.01,  # $0.01 per cent
+                        ticker=ticker,
+                        notes=f"${div_payment:.2f} (${avg_cash_balance:,.0f} @ {(div_per_share/bil_price)*12*100:.2f}% APY via BIL), bank = {state.shared_bank:.2f}",
+                    )
+                )
+            except (KeyError, IndexError):
+                # No BIL price data for this date, skip interest payment
+                pass
+        return
+
+    # Standard dividend payment for regular tickers
+    accrual_period_days = 90
+    period_start = div_date - timedelta(days=accrual_period_days)
+    avg_holdings = state.holdings_history[ticker].average(period_start, div_date)
+
+    div_payment = div_per_share * avg_holdings
+    state.shared_bank += div_payment
+    state.total_dividends_by_asset[ticker] += div_payment
+    state.dividend_payment_count_by_asset[ticker] += 1
+
+    state.record_transaction(
+        Transaction(
+            transaction_date=div_date,
+            action="DIVIDEND",
+            qty=int(avg_holdings),
+            price=div_per_share,
+            ticker=ticker,
+            notes=f"${div_payment:.2f} (avg {avg_holdings:.2f} shares over 90 days), bank = {state.shared_bank:.2f}",
+        )
+    )
+
+
+def dividend_process(
+    env: simpy.Environment, state: SimulationState
+) -> Generator[simpy.events.Event, Any, Any]:
+    """Process that handles dividend payments."""
+    for day_index, ticker, div_date, div_per_share in collect_dividend_events(state):
         # Wait until the dividend date
         if day_index > env.now:
             yield env.timeout(day_index - int(env.now))
 
-        # Special handling for CASH (sweep account interest from BIL)
-        if ticker == "CASH":
-            # Calculate interest based on cash balance (not holdings)
-            # Bank balance earns BIL yield as if invested in BIL shares
-            if state.bil_price_data is not None:
-                try:
-                    # Get BIL price on dividend date
-                    bil_price = state.bil_price_data.loc[pd.Timestamp(div_date), "Close"].item()
-
-                    # Calculate equivalent BIL shares from current bank balance
-                    # Use time-weighted average bank balance over accrual period
-                    accrual_period_days = 30  # Monthly for BIL
-                    period_start = div_date - timedelta(days=accrual_period_days)
-
-                    # Calculate average bank balance over period
-                    # (Simple approximation: just use current balance)
-                    avg_cash_balance = state.shared_bank
-
-                    # Equivalent BIL shares
-                    equivalent_shares = avg_cash_balance / bil_price
-
-                    # Interest payment
-                    div_payment = div_per_share * equivalent_shares
-                    state.shared_bank += div_payment
-                    state.total_dividends_by_asset[ticker] += div_payment
-                    state.dividend_payment_count_by_asset[ticker] += 1
-
-                    state.all_transactions.append(
-                        Transaction(
-                            transaction_date=div_date,
-                            action="INTEREST",
-                            qty=int(div_payment * 100),  # Interest amount in cents
-                            price=0.01,  # $0.01 per cent
-                            ticker=ticker,
-                            notes=f"${div_payment:.2f} (${avg_cash_balance:,.0f} @ {(div_per_share/bil_price)*12*100:.2f}% APY via BIL), bank = {state.shared_bank:.2f}",
-                        )
-                    )
-                except (KeyError, IndexError):
-                    # No BIL price data for this date, skip interest payment
-                    pass
-            continue
-
-        # Standard dividend payment for regular tickers
-        accrual_period_days = 90
-        period_start = div_date - timedelta(days=accrual_period_days)
-        avg_holdings = calculate_time_weighted_average_holdings(
-            state.holdings_history[ticker], period_start, div_date
-        )
+        pay_dividend(state, ticker, div_date, div_per_share)
 
-        div_payment = div_per_share * avg_holdings
-        state.shared_bank += div_payment
-        state.total_dividends_by_asset[ticker] += div_payment
-        state.dividend_payment_count_by_asset[ticker] += 1
-
-        state.all_transactions.append(
-            Transaction(
-                transaction_date=div_date,
-                action="DIVIDEND",
-                qty=int(avg_holdings),
-                price=div_per_share,
-                ticker=ticker,
-                notes=f"${div_payment:.2f} (avg {avg_holdings:.2f} shares over 90 days), bank = {state.shared_bank:.2f}",
-            )
-        )
+
+def iter_day_loop(
+    state: SimulationState, portfolio_algo: PortfolioAlgorithmBase
+) -> Iterator[Tuple[int, int]]:
+    """Fast engine: advance through trading days with a plain loop.
+
+    Reproduces the simpy engine's event order exactly, without generator or
+    event-queue overhead, including when dividends are paid relative to the
+    market step (see split_dividend_events).
+
+    Days on which the algorithm is idle (see next_active_day) are not
+    stepped one by one: the loop jumps to the next active day or scheduled
+    withdrawal/dividend day, whichever comes first, and fills the skipped
+    span with advance_idle_days.
+
+    Args:
+        state: Simulation state whose env is a DayClock
+        portfolio_algo: Portfolio algorithm driving the market days
+
+    Yields:
+        (day_index, next_day) after each step: one market day or an idle span
+    """
+    clock = cast(DayClock, state.env)
+    n_days = len(state.common_dates)
+
+    initialize_portfolio_algorithm(state, portfolio_algo)
+    needs_history = getattr(portfolio_algo, "needs_history", True)
+
+    # Split dividend events by whether simpy would pay them before or after the market step
+    before_market, after_market = split_dividend_events(collect_dividend_events(state))
+
+    # Scheduled days that must not fall inside a skipped span, and the days
+    # after result snapshots so that a span ends on each snapshot day
+    withdrawal_days = set(state.withdrawal_day_indices())
+    snapshot_ends = {day + 1 for day in state.horizon_days}
+    event_days = sorted(
+        withdrawal_days | before_market.keys() | after_market.keys() | snapshot_ends
+    )
+
+    day_index = 0
+    while day_index < n_days:
+        clock.now = day_index
+
+        for _, ticker, div_date, div_per_share in before_market.get(day_index, ()):
+            pay_dividend(state, ticker, div_date, div_per_share)
+
+        next_day = day_index + 1
+        active_day = day_index
+        if day_index not in withdrawal_days:
+            active_day = portfolio_algo.next_active_day(state.market_data, day_index)
+
+        if active_day > day_index:
+            # Idle until the next active day or scheduled event. Dividends paid
+            # after today's market step must land before tomorrow is recorded.
+            next_event = bisect.bisect_right(event_days, day_index)
+            if day_index in after_market:
+                next_day = day_index + 1
+            elif next_event < len(event_days):
+                next_day = min(active_day, event_days[next_event])
+            else:
+                next_day = active_day
+            portfolio_algo.skip_idle_days(state.market_data, day_index, next_day)
+            state.advance_idle_days(day_index, next_day)
+        else:
+            process_market_day(state, portfolio_algo, day_index, needs_history)
+
+        for _, ticker, div_date, div_per_share in after_market.get(day_index, ()):
+            pay_dividend(state, ticker, div_date, div_per_share)
+
+        if state.stop_index is not None:
+            # Stopped early: the step ended on the stop day
+            yield day_index, state.stop_index + 1
+            return
+        yield day_index, next_day
+        day_index = next_day
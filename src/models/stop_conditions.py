@@ -0,0 +1,91 @@
+"""Early-exit conditions for portfolio simulations.
+
+Withdrawal stress scans usually know a run's outcome long before its end
+date: the portfolio is depleted, or the bank has fallen through a margin
+floor. Stop predicates passed as stop_when= are evaluated on each recorded
+day, and the run ends on the first day one of them holds. The summary then
+covers the simulated days only and reports stop_reason and stop_date.
+
+A predicate is either a StopCondition, which checks a span of idle days
+with one vectorized test, or any callable taking the day's DayState and
+returning a truthy value (a string is used as the stop reason):
+
+    >>> run_portfolio_backtest(..., stop_when=[PortfolioBelow(0.0), BankBelow(-50_000)])
+    >>> run_portfolio_backtest(..., stop_when=[lambda day: day.bank < 0 and "in debt"])
+
+Callables see the day's bank, holdings and portfolio value; fills are not
+populated for them.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Optional, Union
+
+import numpy as np
+
+from src.models.model_types import DayState
+
+StopPredicate = Union["StopCondition", Callable[[DayState], Any]]
+
+
+class StopCondition(ABC):
+    """Base class for a stop condition on the daily bank and portfolio values."""
+
+    reason = "stopped"
+
+    @abstractmethod
+    def first_day(self, bank: np.ndarray, portfolio: np.ndarray) -> Optional[int]:
+        """Position of the first day the condition holds, or None.
+
+        Args:
+            bank: Bank balances, one per day
+            portfolio: Portfolio values, one per day
+        """
+
+    def __call__(self, day: DayState) -> bool:
+        """True if the condition holds on a day."""
+        return self.first_day(np.array([day.bank]), np.array([day.portfolio_value])) is not None
+
+
+def _first(mask: np.ndarray) -> Optional[int]:
+    """Position of the first True entry, or None."""
+    positions = np.flatnonzero(mask)
+    return int(positions[0]) if len(positions) else None
+
+
+class PortfolioBelow(StopCondition):
+    """Stop once the portfolio value is at or below a floor (default: depleted)."""
+
+    reason = "depleted"
+
+    def __init__(self, floor: float = 0.0) -> None:
+        self.floor = floor
+
+    def first_day(self, bank: np.ndarray, portfolio: np.ndarray) -> Optional[int]:
+        return _first(portfolio <= self.floor)
+
+
+class BankBelow(StopCondition):
+    """Stop once the bank balance falls below a floor (e.g., a margin limit)."""
+
+    reason = "bank_floor"
+
+    def __init__(self, floor: float) -> None:
+        self.floor = floor
+
+    def first_day(self, bank: np.ndarray, portfolio: np.ndarray) -> Optional[int]:
+        return _first(bank < self.floor)
+
+
+def stop_reason(predicate: StopPredicate, result: Any) -> str:
+    """Reason reported when a predicate stops a run.
+
+    Args:
+        predicate: The predicate that held
+        result: Its return value (a string result is the reason)
+    """
+    if isinstance(result, str):
+        return result
+    if isinstance(predicate, StopCondition):
+        return predicate.reason
+    name = str(getattr(predicate, "__name__", "<lambda>"))
+    return "stopped" if name == "<lambda>" else name
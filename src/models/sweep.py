@@ -0,0 +1,306 @@
+"""Declarative backtest sweeps: grid spec, data planner and results store.
+
+Research modules each hard-code a grid (sdN lists, asset classes, withdrawal
+rates) and loop over it. A SweepSpec declares the grid instead, as the
+product tickers × windows × algorithms × withdrawal rates:
+
+    {
+        "tickers": ["NVDA", "GLD", "BTC-USD"],
+        "portfolios": {"60-40": {"VOO": 0.6, "BND": 0.4}},
+        "windows": {"start_year": 2015, "end_year": 2024, "years": 5},
+        "algorithms": ["buy-and-hold", "sd4", "sd8", "sd16", "quarterly-rebalance"],
+        "withdrawal_rates": [0, 4],
+        "reference_rate_ticker": "VOO"
+    }
+
+Tickers run as single-asset portfolios; "portfolios" adds named allocations.
+Windows are [start, end] pairs or a rolling spec (every `years`-year calendar
+window from start_year to end_year). Single-asset algorithm names (e.g.,
+"sd8") apply per asset.
+
+run_sweep() plans the grid (skipping cells already in the ResultsStore),
+prefetches the union of the data every cell needs once, runs the remaining
+cells with ParallelBacktestRunner and appends their results to the store as
+they finish:
+
+    >>> spec = SweepSpec.from_file("experiments/sweeps/sdn_grid.json")
+    >>> store = ResultsStore("data/sweeps/sdn_grid")
+    >>> run_sweep(spec, store, workers=8, cache=ResultCache())
+    >>> store.top_n("total_return", by=("name", "start_date"))
+"""
+
+import json
+from dataclasses import dataclass, field, fields
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Set, Tuple, Union
+
+import pandas as pd
+
+from src.models.parallel_runner import (
+    BacktestJob,
+    BacktestResult,
+    ParallelBacktestRunner,
+    portfolio_algo_name,
+)
+from src.models.result_cache import ResultCache
+from src.models.results_store import ResultsStore
+
+# Summary entries keyed by ticker; not stored (their columns would vary by ticker)
+PER_ASSET_KEYS = (
+    "allocations",
+    "assets",
+    "dividend_payment_count_by_asset",
+    "total_dividends_by_asset",
+)
+
+
+def _parse_date(value: Union[str, date]) -> date:
+    """Parse a YYYY-MM-DD date (dates pass through)."""
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+@dataclass(frozen=True)
+class SweepSpec:
+    """A grid of backtests: (tickers + portfolios) × windows × algorithms × rates.
+
+    Attributes:
+        tickers: Tickers run as single-asset portfolios
+        portfolios: Dict mapping portfolio name → allocations
+        windows: (start_date, end_date) of each backtest window
+        algorithms: Algorithm names (e.g., "sd8", "quarterly-rebalance")
+        withdrawal_rates: Annual withdrawal rates (0-100)
+        initial_investment: Starting capital of each backtest
+        initial_qty: Starting shares of single-asset runs; overrides
+                     initial_investment for them
+        reference_rate_ticker: Optional ticker for reference benchmark
+        risk_free_rate_ticker: Optional ticker for risk-free asset
+        inflation_rate_ticker: Optional ticker for inflation data
+    """
+
+    tickers: Tuple[str, ...] = ()
+    portfolios: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    windows: Tuple[Tuple[date, date], ...] = ()
+    algorithms: Tuple[str, ...] = ("buy-and-hold",)
+    withdrawal_rates: Tuple[float, ...] = (0.0,)
+    initial_investment: float = 1_000_000.0
+    initial_qty: Optional[float] = None
+    reference_rate_ticker: Optional[str] = None
+    risk_free_rate_ticker: Optional[str] = None
+    inflation_rate_ticker: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, spec: Mapping[str, Any]) -> "SweepSpec":
+        """Build a spec from its JSON form (see the module docstring).
+
+        Raises:
+            ValueError: On unknown keys, malformed windows or an empty grid
+        """
+        unknown = set(spec) - {f.name for f in fields(cls)}
+        if unknown:
+            raise ValueError(f"Unknown sweep spec keys: {sorted(unknown)}")
+        values = dict(spec)
+
+        windows = values.get("windows", ())
+        if isinstance(windows, Mapping):
+            years = int(windows["years"])
+            windows = [
+                (date(year, 1, 1), date(year + years - 1, 12, 31))
+                for year in range(int(windows["start_year"]), int(windows["end_year"]) - years + 2)
+            ]
+        try:
+            values["windows"] = tuple((_parse_date(s), _parse_date(e)) for s, e in windows)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Malformed sweep windows: {e}") from e
+        for name in ("tickers", "algorithms", "withdrawal_rates"):
+            if name in values:
+                values[name] = tuple(values[name])
+
+        result = cls(**values)
+        if not (result.tickers or result.portfolios) or not result.windows:
+            raise ValueError("Sweep spec needs tickers or portfolios, and windows")
+        return result
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path]) -> "SweepSpec":
+        """Read a spec from a JSON file."""
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+    def jobs(self) -> List[BacktestJob]:
+        """One BacktestJob per cell of the grid, tagged with the cell's labels.
+
+        Tags are dicts of the cell's columns: name (ticker or portfolio),
+        start_date, end_date, algorithm and withdrawal_rate_pct.
+        """
+        targets = [(ticker, {ticker: 1.0}) for ticker in self.tickers]
+        targets += [(name, dict(allocations)) for name, allocations in self.portfolios.items()]
+        jobs = []
+        for name, allocations in targets:
+            single = len(allocations) == 1
+            for start_date, end_date in self.windows:
+                for algorithm in self.algorithms:
+                    for rate in self.withdrawal_rates:
+                        jobs.append(
+                            BacktestJob(
+                                allocations,
+                                portfolio_algo_name(algorithm),
+                                start_date,
+                                end_date,
+                                initial_investment=self.initial_investment,
+                                initial_qty=self.initial_qty if single else None,
+                                withdrawal_rate_pct=float(rate),
+                                reference_rate_ticker=self.reference_rate_ticker,
+                                risk_free_rate_ticker=self.risk_free_rate_ticker,
+                                inflation_rate_ticker=self.inflation_rate_ticker,
+                                tag={
+                                    "name": name,
+                                    "start_date": start_date,
+                                    "end_date": end_date,
+                                    "algorithm": algorithm,
+                                    "withdrawal_rate_pct": float(rate),
+                                },
+                            )
+                        )
+        return jobs
+
+
+def cell_key(job: BacktestJob) -> str:
+    """Store key of a sweep cell: its algorithm and run options."""
+    return ResultCache.key(algorithm=job.portfolio_algo, options=job.options())
+
+
+class SweepPlan(NamedTuple):
+    """What a sweep still has to run and the data it needs."""
+
+    jobs: List[BacktestJob]  # Cells not yet in the store
+    skipped: int  # Cells already stored
+    data_ranges: Dict[str, Tuple[date, date]]  # Ticker → date range to prefetch
+
+
+def plan_sweep(
+    spec: SweepSpec, store: Optional[ResultsStore] = None, recompute: bool = False
+) -> SweepPlan:
+    """Plan a sweep: the cells left to run and the union of their data.
+
+    Args:
+        spec: Grid to run
+        store: Results already computed; their cells are skipped (cells
+               whose latest row is an error are run again)
+        recompute: Run every cell, even stored ones
+
+    Returns:
+        SweepPlan
+    """
+    done: Set[str] = store.cells() if store is not None and not recompute else set()
+    jobs = [job for job in spec.jobs() if cell_key(job) not in done]
+
+    data_ranges: Dict[str, Tuple[date, date]] = {}
+    for job in jobs:
+        tickers = [t for t in job.allocations if t != "CASH"]
+        if "CASH" in job.allocations:
+            tickers.append("BIL")
+        rate_tickers = (
+            job.reference_rate_ticker,
+            job.risk_free_rate_ticker,
+            job.inflation_rate_ticker,
+        )
+        for ticker in tickers + [t for t in rate_tickers if t]:
+            start, end = data_ranges.get(ticker, (job.start_date, job.end_date))
+            data_ranges[ticker] = (min(start, job.start_date), max(end, job.end_date))
+    return SweepPlan(jobs, len(spec.jobs()) - len(jobs), data_ranges)
+
+
+def prefetch(plan: SweepPlan) -> Dict[str, Optional[pd.DataFrame]]:
+    """Fetch each ticker of a plan once, over the union of its date ranges.
+
+    Returns:
+        Dict mapping ticker → price history (None if no data), for
+        ParallelBacktestRunner's price_frames
+    """
+    from src.data.fetcher import HistoryFetcher
+
+    fetcher = HistoryFetcher()
+    frames: Dict[str, Optional[pd.DataFrame]] = {}
+    for ticker, (start_date, end_date) in plan.data_ranges.items():
+        df = fetcher.get_history(ticker, start_date, end_date)
+        frames[ticker] = df if df is not None and not df.empty else None
+    return frames
+
+
+def _flatten(summary: Mapping[str, Any], prefix: str = "") -> Dict[str, Any]:
+    """Summary scalars as columns, nested dicts as dotted names."""
+    flat: Dict[str, Any] = {}
+    for key, value in summary.items():
+        if isinstance(value, Mapping):
+            if not prefix and key in PER_ASSET_KEYS:
+                continue
+            flat.update(_flatten(value, f"{prefix}{key}."))
+        else:
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+def result_row(result: BacktestResult) -> Dict[str, Any]:
+    """Store row of a sweep cell's result: cell columns, error, summary."""
+    row: Dict[str, Any] = {"cell": cell_key(result.job), **result.job.tag}
+    row["error"] = result.error or ""
+    if result.summary is not None:
+        for column, value in _flatten(result.summary).items():
+            row.setdefault(column, value)
+    return row
+
+
+def run_sweep(
+    spec: SweepSpec,
+    store: ResultsStore,
+    workers: Optional[int] = None,
+    cache: Optional[ResultCache] = None,
+    recompute: bool = False,
+    flush_every: int = 100,
+) -> SweepPlan:
+    """Run the cells of a sweep not yet in the store and append their results.
+
+    Results are appended as a partition every flush_every cells (and when
+    the sweep ends or is interrupted), so rerunning a stopped sweep resumes
+    with the cells that were not flushed.
+
+    Args:
+        spec: Grid to run
+        store: Store to read completed cells from and append results to
+        workers: Worker processes (default: all cores)
+        cache: Result cache consulted before running each cell
+        recompute: Run every cell, even stored ones
+        flush_every: Cells per appended partition
+
+    Returns:
+        The SweepPlan that was run
+    """
+    plan = plan_sweep(spec, store, recompute)
+    print(
+        f"Sweep: {len(plan.jobs)} cells to run, {plan.skipped} already stored, "
+        f"{len(plan.data_ranges)} tickers of data"
+    )
+    if not plan.jobs:
+        return plan
+
+    runner = ParallelBacktestRunner(workers, cache=cache, price_frames=prefetch(plan))
+    rows: List[Dict[str, Any]] = []
+    try:
+        for done, result in enumerate(runner.run(plan.jobs), 1):
+            rows.append(result_row(result))
+            tag = result.job.tag
+            status = f"ERROR: {result.error}" if result.error else "OK"
+            print(
+                f"[{done}/{len(plan.jobs)}] {tag['name']} {tag['start_date']}..{tag['end_date']} "
+                f"{tag['algorithm']} {tag['withdrawal_rate_pct']:g}%: {status}"
+                + (" (cached)" if result.cached else "")
+            )
+            if len(rows) >= flush_every:
+                store.append(rows)
+                rows = []
+    finally:
+        store.append(rows)
+    return plan
@@ -14,6 +14,7 @@ from datetime import date
 from typing import Any, Dict, List, Optional, Tuple
 
 from .model_types import Transaction
+from .online_metrics import DrawdownMetric
 
 logger = logging.getLogger(__name__)
 
@@ -147,6 +148,7 @@ class SyntheticPortfolio:
 
         # Performance metrics
         self.peak_value = cash
+        self.drawdown = DrawdownMetric(peak=cash)
         self.total_dividends = 0.0
         self.total_withdrawals = 0.0
 
@@ -515,9 +517,10 @@ class SyntheticPortfolio:
 
         self.snapshots.append(snapshot)
 
-        # Update peak value
+        # Update peak value and drawdown
         if snapshot.total_value > self.peak_value:
             self.peak_value = snapshot.total_value
+        self.drawdown.update(snapshot.total_value, self.bank, 0.0, self.total_withdrawals)
 
     # Performance properties
     @property
@@ -537,19 +540,7 @@ class SyntheticPortfolio:
     @property
     def max_drawdown(self) -> float:
         """Maximum drawdown from peak."""
-        if not self.snapshots:
-            return 0.0
-
-        peak = self.initial_capital
-        max_dd = 0.0
-
-        for snapshot in self.snapshots:
-            if snapshot.total_value > peak:
-                peak = snapshot.total_value
-            dd = (peak - snapshot.total_value) / peak
-            max_dd = max(max_dd, dd)
-
-        return max_dd
+        return self.drawdown.max_drawdown
 
     def summary(self) -> Dict[str, Any]:
         """Get comprehensive portfolio summary."""
@@ -8,7 +8,6 @@ This module creates comprehensive PDF reports showing:
 - Observations and recommendations
 """
 
-import re
 from datetime import date
 from typing import Any, Dict, List, Optional
 
@@ -18,26 +17,6 @@ import pandas as pd
 from matplotlib.backends.backend_pdf import PdfPages
 
 
-def _extract_limit_price(notes: str) -> Optional[float]:
-    """Extract algorithmic limit price from transaction notes.
-
-    Args:
-        notes: Transaction notes containing limit price info
-
-    Returns:
-        Limit price if found, None otherwise
-    """
-    # Pattern: "limit=$52.53"
-    match = re.search(r"limit=\$?([\d,]+\.?\d*)", notes)
-    if match:
-        price_str = match.group(1).replace(",", "")
-        try:
-            return float(price_str)
-        except ValueError:
-            pass
-    return None
-
-
 def create_backtest_pdf_report(
     ticker: str,
     transactions: List[Any],
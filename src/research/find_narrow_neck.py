@@ -10,10 +10,15 @@ This tests the true stress limits of the synthetic dividend strategy.
 """
 
 from datetime import date
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
+
+import numpy as np
 
 from src.algorithms.portfolio_factory import build_portfolio_algo_from_name
 from src.models.backtest import run_portfolio_backtest
+from src.models.cash_overlay import CashFlowOverlay, CashFlowReplay, ReplayNotSupported
+from src.models.rate_search import RateSearch
+from src.models.stop_conditions import BankBelow, PortfolioBelow
 
 
 def find_narrow_neck(
@@ -50,32 +55,38 @@ def find_narrow_neck(
     # Build auto algorithm
     portfolio_algo = build_portfolio_algo_from_name("auto", allocations)
 
+    # Rates that never force a sale are replayed over one trading run
+    replay = _record_replay(allocations, start_date, end_date, portfolio_algo, initial_investment)
+    replayed = (
+        replay.evaluate([CashFlowOverlay(withdrawal_rate_pct=rate) for rate in withdrawal_rates])
+        if replay is not None
+        else [None] * len(withdrawal_rates)
+    )
+
     results = []
 
-    for rate in withdrawal_rates:
+    for rate, summary in zip(withdrawal_rates, replayed):
         print(f"Testing {rate:.1f}% withdrawal rate...")
 
         try:
-            transactions, summary = run_portfolio_backtest(
-                allocations=allocations,
-                start_date=start_date,
-                end_date=end_date,
-                portfolio_algo=portfolio_algo,
-                initial_investment=initial_investment,
-                withdrawal_rate_pct=rate,
-                allow_margin=True,  # Allow temporary margin to see how deep we go
-            )
+            if summary is None:
+                transactions, summary = run_portfolio_backtest(
+                    allocations=allocations,
+                    start_date=start_date,
+                    end_date=end_date,
+                    portfolio_algo=portfolio_algo,
+                    initial_investment=initial_investment,
+                    withdrawal_rate_pct=rate,
+                    allow_margin=True,  # Allow temporary margin to see how deep we go
+                    detail="daily",
+                    # Past depletion the trajectory tells us nothing more
+                    stop_when=[PortfolioBelow(0.0)],
+                )
 
             # Analyze cash reserve trajectory to find narrow neck
-            daily_bank_values = summary.get("daily_bank_values", [])
-            min_bank = min(daily_bank_values) if daily_bank_values else summary.get("final_bank", 0)
-
-            # Find when the neck was narrowest
-            min_bank_index = (
-                daily_bank_values.index(min_bank)
-                if daily_bank_values and min_bank in daily_bank_values
-                else -1
-            )
+            daily_bank = np.array(summary["daily_bank_values"].values())
+            min_bank_index = int(daily_bank.argmin())  # Day when the neck was narrowest
+            min_bank = float(daily_bank[min_bank_index])
 
             final_bank = summary.get("final_bank", 0)
             total_withdrawn = summary.get("total_withdrawn", 0)
@@ -92,6 +103,7 @@ def find_narrow_neck(
                     "final_value": final_value,
                     "total_return": total_return,
                     "success": min_bank >= 0,  # Never went negative (no forced selling)
+                    "depleted_on": summary["stop_date"],
                 }
             )
 
@@ -100,6 +112,8 @@ def find_narrow_neck(
             print(f"  Total withdrawn: ${total_withdrawn:,.0f}")
             print(f"  Final value: ${final_value:,.0f}")
             print(f"  Total return: {total_return:.2f}%")
+            if summary["stop_date"] is not None:
+                print(f"  Portfolio depleted on {summary['stop_date']}")
             print()
 
         except Exception as e:
@@ -148,6 +162,8 @@ def find_narrow_neck(
             value_str = f"${value:,.0f}"
             ret_str = f"{ret:.2f}%"
             status = "OK" if success else "MARGIN"
+            if result.get("depleted_on") is not None:
+                status = "DEPLETED"
 
             # Track narrowest neck that stayed positive
             if success and min_bank is not None and min_bank < min_bank_positive:
@@ -198,6 +214,89 @@ def find_narrow_neck(
         print("All tested rates either failed or required margin.")
 
 
+def _record_replay(
+    allocations: Dict[str, float],
+    start_date: date,
+    end_date: date,
+    portfolio_algo: Any,
+    initial_investment: float,
+) -> Optional[CashFlowReplay]:
+    """Record the trading run shared by all withdrawal rates, if it can be replayed."""
+    try:
+        return CashFlowReplay.record(
+            allocations=allocations,
+            start_date=start_date,
+            end_date=end_date,
+            portfolio_algo=portfolio_algo,
+            initial_investment=initial_investment,
+        )
+    except ReplayNotSupported as e:
+        print(f"Replay not supported ({e}); running every rate in full")
+        return None
+
+
+def find_narrow_neck_rate(
+    allocations: Dict[str, float],
+    start_date: date,
+    end_date: date,
+    initial_investment: float = 1_000_000,
+    max_rate: float = 20.0,
+    tolerance: float = 0.05,
+) -> Optional[float]:
+    """Find the narrow-neck withdrawal rate by bisection instead of a grid.
+
+    The minimum bank balance falls as the withdrawal rate rises, so the
+    highest rate whose bank never goes negative is found by bracketing and
+    bisection: about 9 backtests for 0.05% resolution over 0-20%.
+
+    Args:
+        allocations: Portfolio allocations
+        start_date: Backtest start date
+        end_date: Backtest end date
+        initial_investment: Initial investment amount
+        max_rate: Upper end of the initial bracket (percent)
+        tolerance: Resolution of the search (percent)
+
+    Returns:
+        Highest withdrawal rate (percent) keeping the bank non-negative, or
+        None if even 0% draws on margin
+    """
+    portfolio_algo = build_portfolio_algo_from_name("auto", allocations)
+    replay = _record_replay(allocations, start_date, end_date, portfolio_algo, initial_investment)
+
+    def evaluate(rate: float) -> Dict[str, Any]:
+        if replay is not None:
+            (summary,) = replay.evaluate([CashFlowOverlay(withdrawal_rate_pct=rate)])
+            if summary is not None:
+                return summary
+        _, summary = run_portfolio_backtest(
+            allocations=allocations,
+            start_date=start_date,
+            end_date=end_date,
+            portfolio_algo=portfolio_algo,
+            initial_investment=initial_investment,
+            withdrawal_rate_pct=rate,
+            allow_margin=True,
+            detail="summary",
+            # The first day in margin decides the probe
+            stop_when=[BankBelow(0.0)],
+        )
+        return summary
+
+    def in_cash(summary: Dict[str, Any]) -> bool:
+        # Replayed runs are not stopped: their bank path decides
+        return summary["stop_date"] is None and summary["daily_bank_stats"]["bank_min"] >= 0
+
+    search = RateSearch(evaluate)
+    return search.max_rate(
+        in_cash,
+        low=0.0,
+        high=max_rate,
+        tolerance=tolerance,
+        limit=100.0,
+    )
+
+
 def main():
     """Run narrow neck finder with validation portfolio."""
     # Classic-plus-crypto (60/30/10) - the validation portfolio
@@ -211,6 +310,17 @@ def main():
         withdrawal_rates=[0, 2, 4, 6, 8, 10, 12, 14, 16, 18, 20],
     )
 
+    # Refine the grid's answer to 0.05%
+    rate = find_narrow_neck_rate(
+        allocations=allocations,
+        start_date=date(2019, 1, 1),
+        end_date=date(2024, 12, 31),
+        initial_investment=1_000_000,
+    )
+    if rate is not None:
+        print()
+        print(f"Narrow neck rate (bisection, 0.05% resolution): {rate:.2f}%")
+
 
 if __name__ == "__main__":
     main()
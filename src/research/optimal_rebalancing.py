@@ -7,13 +7,17 @@ optimal rebalancing frequencies for different volatility regimes.
 Usage:
     python -m src.research.optimal_rebalancing --start 2020-01-01 --end 2025-01-01 --output research_results.csv
     python -m src.research.optimal_rebalancing --ticker NVDA --quick  # Quick test on single asset
+
+Pass --cache to reuse results cached under cache/results, so a rerun (or a
+resumed interrupted sweep) only computes configurations whose data or
+parameters changed.
 """
 import argparse
 import csv
 import sys
 from datetime import date, datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import pandas as pd
 
@@ -23,6 +27,9 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from src.algorithms.factory import build_algo_from_name  # noqa: E402
 from src.data.fetcher import HistoryFetcher  # noqa: E402
 from src.models.backtest import run_algorithm_backtest  # noqa: E402
+from src.models.parallel_runner import BacktestJob, ParallelBacktestRunner  # noqa: E402
+from src.models.parameter_grid import run_synthetic_dividend_grid  # noqa: E402
+from src.models.result_cache import ResultCache  # noqa: E402
 from src.research.asset_classes import (  # noqa: E402
     ASSET_CLASSES,
     get_class_for_ticker,
@@ -41,6 +48,48 @@ def parse_date(s: str) -> date:
     raise ValueError(f"Unrecognized date format: {s}")
 
 
+def _strategy_name(sd_n: int, profit_pct: float) -> str:
+    """Algorithm name for an sdN configuration."""
+    return f"sd{sd_n}" if profit_pct == 50.0 else f"sd{sd_n},{profit_pct}"
+
+
+def _build_result(
+    ticker: str,
+    start_date: date,
+    end_date: date,
+    sd_n: int,
+    profit_pct: float,
+    summary: Dict,
+    transaction_count: int,
+    rebalance_trigger: float = 0,
+) -> Dict:
+    """Result row for one (ticker, sdN) backtest summary."""
+    # Note: summary uses 'total_return' (decimal), 'holdings', 'bank', etc.
+    # Convert to percentage and use correct key names
+    total_return_pct = summary.get("total_return", 0) * 100  # Convert to percentage
+    volatility_alpha_pct = summary.get("volatility_alpha", 0) * 100
+    metrics = summary.get("metrics", {})
+
+    return {
+        "ticker": ticker,
+        "asset_class": get_class_for_ticker(ticker),
+        "strategy": _strategy_name(sd_n, profit_pct),
+        "sd_n": sd_n,
+        "profit_pct": profit_pct,
+        "rebalance_trigger": rebalance_trigger,
+        "total_return_pct": total_return_pct,
+        "volatility_alpha_pct": volatility_alpha_pct,
+        "max_drawdown_pct": metrics.get("max_drawdown", 0) * 100,
+        "sharpe_ratio": metrics.get("sharpe_ratio", 0),
+        "transaction_count": transaction_count,
+        "final_holdings": summary.get("holdings", 0),
+        "final_bank": summary.get("bank", 0),
+        "final_value": summary.get("total", 0),
+        "start_date": start_date.isoformat(),
+        "end_date": end_date.isoformat(),
+    }
+
+
 def run_single_backtest(
     ticker: str,
     start_date: date,
@@ -62,11 +111,7 @@ def run_single_backtest(
         return None
 
     # Build strategy name
-    if profit_pct == 50.0:
-        strategy = f"sd{sd_n}"
-    else:
-        strategy = f"sd{sd_n},{profit_pct}"
-
+    strategy = _strategy_name(sd_n, profit_pct)
     algo = build_algo_from_name(strategy)
 
     try:
@@ -79,44 +124,169 @@ def run_single_backtest(
             algo=algo,
         )
 
-        # Extract key metrics from summary dict
-        # Note: summary uses 'total_return' (decimal), 'holdings', 'bank', etc.
-        # Convert to percentage and use correct key names
-        total_return_pct = summary.get("total_return", 0) * 100  # Convert to percentage
-        volatility_alpha_pct = summary.get("volatility_alpha", 0) * 100
-        transaction_count = len(transactions)  # Count transactions (excluding initial buy)
-
         # Get algorithm trigger percentage if available (from algo object)
         rebalance_trigger = 0
         if hasattr(algo, "alpha_pct"):
             rebalance_trigger = algo.alpha_pct
 
-        result = {
-            "ticker": ticker,
-            "asset_class": get_class_for_ticker(ticker),
-            "strategy": strategy,
-            "sd_n": sd_n,
-            "profit_pct": profit_pct,
-            "rebalance_trigger": rebalance_trigger,
-            "total_return_pct": total_return_pct,
-            "volatility_alpha_pct": volatility_alpha_pct,
-            "max_drawdown_pct": 0,  # TODO: Calculate from bank/holdings history
-            "sharpe_ratio": 0,  # TODO: Calculate from daily returns
-            "transaction_count": transaction_count,
-            "final_holdings": summary.get("holdings", 0),
-            "final_bank": summary.get("bank", 0),
-            "final_value": summary.get("total", 0),
-            "start_date": start_date.isoformat(),
-            "end_date": end_date.isoformat(),
-        }
-
-        return result
+        return _build_result(
+            ticker,
+            start_date,
+            end_date,
+            sd_n,
+            profit_pct,
+            summary,
+            transaction_count=len(transactions),
+            rebalance_trigger=rebalance_trigger,
+        )
 
     except Exception as e:
         print(f"  [ERROR] Error backtesting {ticker} with {strategy}: {e}")
         return None
 
 
+def run_ticker_sweep(
+    ticker: str,
+    start_date: date,
+    end_date: date,
+    sd_values: List[int],
+    profit_pct: float = 50.0,
+    initial_qty: int = 10000,
+) -> List[Dict]:
+    """Run all sdN values for one ticker in a single grid pass.
+
+    Equivalent to run_single_backtest() per sdN value, but the price data
+    is fetched and aligned once and all configurations are simulated together.
+
+    Returns:
+        List of result dicts (empty if data unavailable)
+    """
+    fetcher = HistoryFetcher()
+    df = fetcher.get_history(ticker, start_date, end_date)
+
+    if df is None or df.empty:
+        print(f"  [WARNING] No data for {ticker}")
+        return []
+
+    strategies = [_strategy_name(sd_n, profit_pct) for sd_n in sd_values]
+    try:
+        summaries, _ = run_synthetic_dividend_grid(
+            df=df,
+            ticker=ticker,
+            configs=strategies,
+            initial_qty=initial_qty,
+            start_date=start_date,
+            end_date=end_date,
+        )
+    except Exception as e:
+        print(f"  [ERROR] Error backtesting {ticker}: {e}")
+        return []
+
+    return [
+        _build_result(
+            ticker,
+            start_date,
+            end_date,
+            sd_n,
+            profit_pct,
+            summary,
+            # Ledger length: executed transactions plus skipped orders
+            transaction_count=summary["transaction_count"] + summary["skipped_buys"],
+        )
+        for sd_n, summary in zip(sd_values, summaries)
+    ]
+
+
+def run_parallel_sweep(
+    ticker_sd_values: Dict[str, List[int]],
+    start_date: date,
+    end_date: date,
+    profit_pct: float = 50.0,
+    initial_qty: int = 10000,
+    workers: Optional[int] = None,
+    cache: Optional[ResultCache] = None,
+) -> List[Dict]:
+    """Run every (ticker, sdN) configuration over a process pool.
+
+    Each configuration runs as a single-asset portfolio backtest (see
+    ParallelBacktestRunner), alongside a buy-and-hold run per ticker for the
+    volatility alpha; results are printed as they finish. With a cache,
+    configurations already computed on the same data are not rerun.
+
+    Args:
+        ticker_sd_values: Dict mapping ticker → sdN values to test
+        start_date: Backtest start date
+        end_date: Backtest end date
+        profit_pct: Profit sharing percentage
+        initial_qty: Initial shares of each ticker
+        workers: Worker processes (default: all cores)
+        cache: Result cache to read and update (default: none)
+
+    Returns:
+        List of result dicts, in (ticker, sdN) order
+    """
+    jobs = []
+    for ticker, sd_values in ticker_sd_values.items():
+        for sd_n in [0, *sd_values]:  # 0: the buy-and-hold baseline
+            strategy = _strategy_name(sd_n, profit_pct) if sd_n else "buy-and-hold"
+            jobs.append(
+                BacktestJob(
+                    {ticker: 1.0},
+                    f"per-asset:{strategy}",
+                    start_date,
+                    end_date,
+                    initial_qty=initial_qty,
+                    tag=(ticker, sd_n),
+                )
+            )
+
+    summaries: Dict[Tuple[str, int], Dict] = {}
+    for result in ParallelBacktestRunner(workers, cache=cache).run(jobs):
+        ticker, sd_n = result.job.tag
+        if result.summary is None:
+            print(f"  [ERROR] Error backtesting {ticker} with sd{sd_n}: {result.error}")
+            continue
+        summaries[result.job.tag] = result.summary
+        if sd_n:
+            print(
+                f"  [OK] {ticker} sd{sd_n}: {result.summary['total_return']:.2f}% return, "
+                f"{result.summary['transaction_count']} txns"
+                + (" (cached)" if result.cached else "")
+            )
+
+    results = []
+    for ticker, sd_values in ticker_sd_values.items():
+        baseline = summaries.get((ticker, 0))
+        for sd_n in sd_values:
+            summary = summaries.get((ticker, sd_n))
+            if summary is None:
+                continue
+            total_return = summary["total_return"] / 100.0
+            single_ticker = {
+                "total_return": total_return,
+                "volatility_alpha": (
+                    total_return - baseline["total_return"] / 100.0 if baseline else 0
+                ),
+                "metrics": summary["metrics"],
+                "holdings": summary["assets"][ticker]["final_holdings"],
+                "bank": summary["final_bank"],
+                "total": summary["total_final_value"],
+            }
+            results.append(
+                _build_result(
+                    ticker,
+                    start_date,
+                    end_date,
+                    sd_n,
+                    profit_pct,
+                    single_ticker,
+                    # Ledger length: executed transactions plus skipped orders
+                    transaction_count=summary["transaction_count"] + summary["skipped_count"],
+                )
+            )
+    return results
+
+
 def run_asset_class_sweep(
     asset_class_name: str,
     start_date: date,
@@ -136,22 +306,20 @@ def run_asset_class_sweep(
 
     for ticker in tickers:
         print(f"\n[{ticker}] ({asset_class_name}):")
-        for sd_n in recommended_sd:
-            result = run_single_backtest(
-                ticker=ticker,
-                start_date=start_date,
-                end_date=end_date,
-                sd_n=sd_n,
-                profit_pct=profit_pct,
-                initial_qty=initial_qty,
+        for result in run_ticker_sweep(
+            ticker=ticker,
+            start_date=start_date,
+            end_date=end_date,
+            sd_values=recommended_sd,
+            profit_pct=profit_pct,
+            initial_qty=initial_qty,
+        ):
+            results.append(result)
+            print(
+                f"  [OK] sd{result['sd_n']}: {result['total_return_pct']:.2f}% return, "
+                f"{result['transaction_count']} txns, "
+                f"{result['max_drawdown_pct']:.2f}% max drawdown"
             )
-            if result:
-                results.append(result)
-                print(
-                    f"  [OK] sd{sd_n}: {result['total_return_pct']:.2f}% return, "
-                    f"{result['transaction_count']} txns, "
-                    f"{result['max_drawdown_pct']:.2f}% max drawdown"
-                )
 
     return results
 
@@ -290,6 +458,17 @@ def main(argv: Optional[List[str]] = None) -> int:
         action="store_true",
         help="Quick test: 1-year lookback from end date",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes; above 1 runs all configurations in parallel (default: 1)",
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Reuse and update cached results under cache/results",
+    )
 
     args = parser.parse_args(argv)
 
@@ -305,23 +484,41 @@ def main(argv: Optional[List[str]] = None) -> int:
     print(f"Profit Sharing: {args.profit}%")
     print(f"Initial Quantity: {args.initial_investment:,} shares\n")
 
-    # Run appropriate sweep
-    if args.ticker:
+    # Run appropriate sweep (through the runner unless neither workers nor
+    # the result cache are wanted)
+    if args.jobs > 1 or args.cache:
+        if args.ticker:
+            ticker_sd_values = {args.ticker: get_recommended_sd_values(args.ticker)}
+        else:
+            classes = [args.asset_class] if args.asset_class else list(ASSET_CLASSES)
+            ticker_sd_values = {
+                ticker: ASSET_CLASSES[name]["recommended_sd"]
+                for name in classes
+                for ticker in ASSET_CLASSES[name]["tickers"]
+            }
+        print(f"Running {len(ticker_sd_values)} tickers on {args.jobs} worker processes")
+        results = run_parallel_sweep(
+            ticker_sd_values,
+            start_date=start_date,
+            end_date=end_date,
+            profit_pct=args.profit,
+            initial_qty=args.initial_investment,
+            workers=args.jobs,
+            cache=ResultCache() if args.cache else None,
+        )
+
+    elif args.ticker:
         # Single ticker test
         print(f"Testing single ticker: {args.ticker}")
         sd_values = get_recommended_sd_values(args.ticker)
-        results = []
-        for sd_n in sd_values:
-            result = run_single_backtest(
-                ticker=args.ticker,
-                start_date=start_date,
-                end_date=end_date,
-                sd_n=sd_n,
-                profit_pct=args.profit,
-                initial_qty=args.initial_investment,
-            )
-            if result:
-                results.append(result)
+        results = run_ticker_sweep(
+            ticker=args.ticker,
+            start_date=start_date,
+            end_date=end_date,
+            sd_values=sd_values,
+            profit_pct=args.profit,
+            initial_qty=args.initial_investment,
+        )
 
     elif args.asset_class:
         # Single asset class test
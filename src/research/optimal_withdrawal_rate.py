@@ -35,14 +35,16 @@ Metrics:
 from dataclasses import dataclass
 from datetime import date
 from pathlib import Path
-from typing import List, Optional, TypedDict
+from typing import Any, Dict, List, Optional, TypedDict
 
 import numpy as np
 import pandas as pd
 
 from src.algorithms.factory import build_algo_from_name
 from src.data.fetcher import HistoryFetcher
+from src.models.rate_search import RateSearch
 from src.models.retirement_backtest import run_retirement_backtest
+from src.models.stop_conditions import PortfolioBelow
 
 
 class Scenario(TypedDict):
@@ -55,6 +57,7 @@ class Scenario(TypedDict):
     min_rate: float
     max_rate: float
     step: float
+    tolerance: float
     qty: int
 
 
@@ -73,6 +76,7 @@ class WithdrawalRateResult:
     total_return: float
     final_value: float
     total_withdrawn: float
+    depleted_on: Optional[date] = None  # Set if the portfolio ran out before end_date
 
     @property
     def margin_usage_pct(self) -> float:
@@ -83,6 +87,8 @@ class WithdrawalRateResult:
     @property
     def balance_score(self) -> float:
         """Lower is better - measures how balanced the withdrawals are."""
+        if self.depleted_on is not None:
+            return float("inf")  # Not self-sustaining, whatever the bank did until then
         return self.abs_mean_bank + 0.5 * self.std_bank
 
 
@@ -98,9 +104,21 @@ def find_optimal_withdrawal_rate(
     simple_mode: bool = True,
     risk_free_data: Optional[pd.DataFrame] = None,
     risk_free_asset_ticker: Optional[str] = None,
+    tolerance: Optional[float] = None,
 ) -> List[WithdrawalRateResult]:
     """Find the withdrawal rate that minimizes abs(mean(bank)).
 
+    Mean bank decreases as the withdrawal rate rises, so with a tolerance
+    the rate where it crosses zero is found by bisection over
+    [min_rate, max_rate] (about 9 backtests for 0.05% resolution). Without
+    one, the rates on the step grid are tested in turn.
+
+    Runs stop when the portfolio is depleted, and a depleted rate is
+    strictly dominated by every lower one: each higher rate depletes too.
+    The grid therefore stops at the first depleted rate, and the bisection
+    treats depleted rates as below zero rather than using their mean bank,
+    which only covers the days before they stopped.
+
     Args:
         ticker: Asset symbol
         start_date: Start of test period
@@ -113,9 +131,12 @@ def find_optimal_withdrawal_rate(
         simple_mode: Whether to use simple mode (no costs/gains)
         risk_free_data: Optional price data for risk-free asset
         risk_free_asset_ticker: Ticker for risk-free asset
+        tolerance: Resolution of the bisection search (e.g., 0.0005); None
+                   tests the full step grid instead
 
     Returns:
-        List of WithdrawalRateResult sorted by balance_score (best first)
+        List of WithdrawalRateResult for every rate tested (depleted grid
+        rates after the first are pruned), sorted by balance_score (best first)
     """
     # Fetch price data
     fetcher = HistoryFetcher()
@@ -124,23 +145,10 @@ def find_optimal_withdrawal_rate(
     if df.empty:
         raise ValueError(f"No data available for {ticker}")
 
-    # Test withdrawal rates
-    results = []
-    test_rates = np.arange(min_rate, max_rate + step, step)
-
-    print(
-        f"Testing {len(test_rates)} withdrawal rates from {min_rate*100:.0f}% to {max_rate*100:.0f}%"
-    )
-    print(f"Asset: {ticker} ({start_date} to {end_date})")
-    print(f"Algorithm: {algorithm_name}")
-    print(f"Simple mode: {simple_mode}")
-    print()
-
-    for i, rate in enumerate(test_rates, 1):
+    def evaluate(rate: float) -> Dict[str, Any]:
         # Build algorithm (fresh instance for each test)
         algo = build_algo_from_name(algorithm_name)
 
-        # Run backtest
         _, summary = run_retirement_backtest(
             df,
             ticker,
@@ -152,28 +160,41 @@ def find_optimal_withdrawal_rate(
             withdrawal_frequency="monthly",
             cpi_adjust=True,
             simple_mode=simple_mode,
+            # A depleting rate is out of the running; stop simulating it there
+            stop_when=[PortfolioBelow(0.0)],
         )
+        return summary
+
+    search = RateSearch(evaluate)
 
-        # Calculate statistics
-        result = WithdrawalRateResult(
-            withdrawal_rate=rate,
-            mean_bank=summary["bank_avg"],
-            std_bank=np.std([summary["bank_min"], summary["bank_max"], summary["bank"]]),
-            bank_negative_count=summary["bank_negative_count"],
-            bank_positive_count=summary["bank_positive_count"],
-            bank_min=summary["bank_min"],
-            bank_max=summary["bank_max"],
-            abs_mean_bank=abs(summary["bank_avg"]),
-            total_return=summary["total_return"],
-            final_value=summary["total"],
-            total_withdrawn=summary["total_withdrawn"],
+    print(f"Asset: {ticker} ({start_date} to {end_date})")
+    print(f"Algorithm: {algorithm_name}")
+    print(f"Simple mode: {simple_mode}")
+
+    if tolerance is not None:
+        print(
+            f"Searching {min_rate*100:.1f}% to {max_rate*100:.1f}% "
+            f"for mean bank = 0 (tolerance {tolerance*100:.2f}%)"
         )
+        print()
+        search.crossing(_sustained_bank_avg, min_rate, max_rate, tolerance)
+        print(f"Tested {len(search.results)} rates")
+    else:
+        test_rates = np.arange(min_rate, max_rate + step, step)
+        print(
+            f"Testing {len(test_rates)} withdrawal rates from {min_rate*100:.0f}% to {max_rate*100:.0f}%"
+        )
+        print()
+        for i, rate in enumerate(test_rates, 1):
+            if search(rate)["stop_date"] is not None:
+                print(f"Depleted at {rate*100:.1f}%; higher rates pruned")
+                break
 
-        results.append(result)
+            # Progress indicator
+            if i % 5 == 0 or i == len(test_rates):
+                print(f"Progress: {i}/{len(test_rates)} rates tested")
 
-        # Progress indicator
-        if i % 5 == 0 or i == len(test_rates):
-            print(f"Progress: {i}/{len(test_rates)} rates tested")
+    results = [_rate_result(rate, summary) for rate, summary in search.results.items()]
 
     # Sort by balance score (lower is better)
     results.sort(key=lambda r: r.balance_score)
@@ -181,6 +202,31 @@ def find_optimal_withdrawal_rate(
     return results
 
 
+def _sustained_bank_avg(summary: Dict[str, Any]) -> float:
+    """Mean bank of a run over the full horizon, or -inf if it was depleted."""
+    if summary["stop_date"] is not None:
+        return float("-inf")
+    return float(summary["bank_avg"])
+
+
+def _rate_result(rate: float, summary: Dict[str, Any]) -> WithdrawalRateResult:
+    """Bank statistics of a retirement backtest summary at one rate."""
+    return WithdrawalRateResult(
+        withdrawal_rate=rate,
+        mean_bank=summary["bank_avg"],
+        std_bank=np.std([summary["bank_min"], summary["bank_max"], summary["bank"]]),
+        bank_negative_count=summary["bank_negative_count"],
+        bank_positive_count=summary["bank_positive_count"],
+        bank_min=summary["bank_min"],
+        bank_max=summary["bank_max"],
+        abs_mean_bank=abs(summary["bank_avg"]),
+        total_return=summary["total_return"],
+        final_value=summary["total"],
+        total_withdrawn=summary["total_withdrawn"],
+        depleted_on=summary["stop_date"],
+    )
+
+
 def print_results(results: List[WithdrawalRateResult], ticker: str, top_n: int = 10):
     """Print results in a readable format.
 
@@ -277,6 +323,7 @@ def run_experiment():
             "min_rate": 0.04,
             "max_rate": 0.30,
             "step": 0.01,
+            "tolerance": 0.0005,
             "qty": 10000,
         },
         {
@@ -287,6 +334,7 @@ def run_experiment():
             "min_rate": 0.03,
             "max_rate": 0.15,
             "step": 0.01,
+            "tolerance": 0.0005,
             "qty": 1000,
         },
         {
@@ -297,6 +345,7 @@ def run_experiment():
             "min_rate": 0.00,
             "max_rate": 0.10,
             "step": 0.01,
+            "tolerance": 0.0005,
             "qty": 1000,
         },
     ]
@@ -316,6 +365,7 @@ def run_experiment():
             max_rate=scenario["max_rate"],
             step=scenario["step"],
             simple_mode=True,
+            tolerance=scenario["tolerance"],
         )
 
         print_results(results, scenario["ticker"], top_n=10)
@@ -13,6 +13,9 @@ This analysis helps understand:
 1. Which ratios lead to stable vs unstable strategies
 2. How quickly holdings deplete or accumulate
 3. The trade-off between cash flow and long-term growth
+
+All ratios are simulated together in one grid pass over the price data
+(see src.models.parameter_grid).
 """
 
 import sys
@@ -20,14 +23,14 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict
 
-# Add src to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import matplotlib.pyplot as plt
+import numpy as np
 
-import matplotlib.pyplot as plt  # noqa: E402
-import numpy as np  # noqa: E402
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from data.fetcher import HistoryFetcher  # noqa: E402
-from models.backtest import build_algo_from_name, run_algorithm_backtest  # noqa: E402
+from src.data.fetcher import HistoryFetcher  # noqa: E402
+from src.models.parameter_grid import GridConfig, run_synthetic_dividend_grid  # noqa: E402
 
 
 def analyze_profit_sharing_spectrum(
@@ -98,26 +101,24 @@ def analyze_profit_sharing_spectrum(
         profit_sharing_min, profit_sharing_max + profit_sharing_step / 2, profit_sharing_step
     )
 
+    # One configuration (with buybacks) per ratio, all run in one grid pass
+    configs = [
+        GridConfig(rebalance_size=rebalance_threshold, profit_sharing=float(ps_ratio))
+        for ps_ratio in ratios
+    ]
+    summaries, _ = run_synthetic_dividend_grid(
+        df=df,
+        ticker=ticker,
+        configs=configs,
+        initial_qty=initial_qty,
+        start_date=start_dt,
+        end_date=end_dt,
+    )
+
     results = {}
 
-    for ps_ratio in ratios:
-        print(f"Running: {ps_ratio:+4.0%}...", end=" ", flush=True)
-
-        # Build Enhanced algorithm (with buybacks)
-        algo = build_algo_from_name("sd1")  # Enhanced strategy
-        algo.rebalance_threshold_pct = rebalance_threshold
-        algo.profit_taking_pct = ps_ratio
-        algo.verbose = False  # Quiet mode
-
-        # Run backtest
-        transactions, summary = run_algorithm_backtest(
-            df=df,
-            ticker=ticker,
-            initial_qty=initial_qty,
-            start_date=start_dt,
-            end_date=end_dt,
-            algo=algo,
-        )
+    for ps_ratio, summary in zip(ratios, summaries):
+        print(f"Ratio: {ps_ratio:+4.0%}...", end=" ", flush=True)
 
         results[ps_ratio] = summary
 
@@ -11,12 +11,15 @@ The question: Does volatility alpha hold up across ALL periods, not just cherry-
 """
 
 from datetime import date
-from typing import Dict, List, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import pandas as pd
 
 from src.algorithms import QuarterlyRebalanceAlgorithm, build_portfolio_algo_from_name
+from src.algorithms.portfolio_base import PortfolioAlgorithmBase
 from src.models.backtest import run_portfolio_backtest
+from src.models.cash_overlay import CashFlowOverlay, CashFlowReplay, ReplayNotSupported
+from src.models.market_bundle import MarketDataBundle
 
 
 def generate_rolling_windows(
@@ -40,103 +43,138 @@ def generate_rolling_windows(
     return windows
 
 
-def run_single_window_comparison(
+def _window_strategies(
+    allocations: Dict[str, float],
+) -> List[Tuple[str, Callable[[], PortfolioAlgorithmBase]]]:
+    """(name, algorithm factory) of each compared strategy."""
+    from src.algorithms import BuyAndHoldAlgorithm, PerAssetPortfolioAlgorithm
+
+    return [
+        (
+            "buy-and-hold",
+            lambda: PerAssetPortfolioAlgorithm(
+                {ticker: BuyAndHoldAlgorithm() for ticker in allocations.keys()}
+            ),
+        ),
+        (
+            "quarterly-rebalance",
+            lambda: QuarterlyRebalanceAlgorithm(
+                target_allocations=allocations, rebalance_months=[3, 6, 9, 12]
+            ),
+        ),
+        ("synthetic-dividend-auto", lambda: build_portfolio_algo_from_name("auto", allocations)),
+    ]
+
+
+def _window_metrics(summary: Dict[str, Any]) -> Dict[str, Any]:
+    """Per-strategy results kept from a backtest summary."""
+    return {
+        "final_value": summary["total_final_value"],
+        "final_bank": summary["final_bank"],
+        "total_return": summary["total_return"],
+        "transactions": summary["transaction_count"],
+    }
+
+
+def run_window_comparisons(
     allocations: Dict[str, float],
     start_date: date,
     end_date: date,
-    withdrawal_rate_pct: float,
+    withdrawal_rates: List[float],
     initial_investment: float = 1_000_000,
-) -> Dict[str, Dict]:
-    """Run all strategies on a single time window.
+    market_bundle: Optional[MarketDataBundle] = None,
+) -> Dict[float, Dict[str, Dict]]:
+    """Run all strategies on a single time window at each withdrawal rate.
+
+    Strategies whose trades do not depend on the bank are simulated once
+    and each withdrawal rate is replayed over that run (see CashFlowReplay);
+    the others, and rates that would force a sale, are simulated in full.
 
     Args:
         allocations: Asset allocations (must sum to 1.0)
         start_date: Window start
         end_date: Window end
-        withdrawal_rate_pct: Annual withdrawal rate (e.g., 4.0 for 4%)
+        withdrawal_rates: Annual withdrawal rates (e.g., 4.0 for 4%)
         initial_investment: Starting capital
+        market_bundle: Market data covering the window, loaded once for
+                       all windows (default: fetched for this window)
 
     Returns:
-        Dict of strategy_name → results summary
+        Dict of withdrawal rate → strategy_name → results summary
     """
-    results = {}
-
-    # Strategy 1: Buy-and-hold (no rebalancing, no withdrawals initially)
-    print("\n  [1/3] Running buy-and-hold...")
+    results: Dict[float, Dict[str, Dict]] = {rate: {} for rate in withdrawal_rates}
+    strategies = _window_strategies(allocations)
     try:
-        from src.algorithms import BuyAndHoldAlgorithm, PerAssetPortfolioAlgorithm
-
-        buy_hold_algo = PerAssetPortfolioAlgorithm(
-            {ticker: BuyAndHoldAlgorithm() for ticker in allocations.keys()}
-        )
-
-        txns, summary = run_portfolio_backtest(
-            allocations=allocations,
-            start_date=start_date,
-            end_date=end_date,
-            portfolio_algo=buy_hold_algo,
-            initial_investment=initial_investment,
-        )
-
-        results["buy-and-hold"] = {
-            "final_value": summary["total_final_value"],
-            "final_bank": summary["final_bank"],
-            "total_return": summary["total_return"],
-            "transactions": summary["transaction_count"],
-        }
-    except Exception as e:
+        if market_bundle is None:
+            market_bundle = MarketDataBundle.load(allocations, start_date, end_date)
+        market_bundle = market_bundle.between(start_date, end_date)
+    except ValueError as e:
         print(f"    ERROR: {e}")
-        results["buy-and-hold"] = {"error": str(e)}
-
-    # Strategy 2: Quarterly rebalancing
-    print("  [2/3] Running quarterly-rebalance...")
-    try:
-        quarterly_algo = QuarterlyRebalanceAlgorithm(
-            target_allocations=allocations, rebalance_months=[3, 6, 9, 12]
-        )
-
-        txns, summary = run_portfolio_backtest(
-            allocations=allocations,
-            start_date=start_date,
-            end_date=end_date,
-            portfolio_algo=quarterly_algo,
-            initial_investment=initial_investment,
-        )
+        return {rate: {name: {"error": str(e)} for name, _ in strategies} for rate in results}
+
+    for index, (name, build_algo) in enumerate(strategies, 1):
+        print(f"\n  [{index}/{len(strategies)}] Running {name}...")
+        try:
+            replayed: List[Optional[Dict[str, Any]]] = [None] * len(withdrawal_rates)
+            try:
+                replay = CashFlowReplay.record(
+                    allocations=allocations,
+                    start_date=start_date,
+                    end_date=end_date,
+                    portfolio_algo=build_algo(),
+                    initial_investment=initial_investment,
+                    market_bundle=market_bundle,
+                )
+                replayed = replay.evaluate(
+                    [CashFlowOverlay(withdrawal_rate_pct=rate) for rate in withdrawal_rates]
+                )
+            except ReplayNotSupported:
+                pass
+
+            for rate, summary in zip(withdrawal_rates, replayed):
+                if summary is None:
+                    _, summary = run_portfolio_backtest(
+                        allocations=allocations,
+                        start_date=start_date,
+                        end_date=end_date,
+                        portfolio_algo=build_algo(),
+                        initial_investment=initial_investment,
+                        withdrawal_rate_pct=rate,
+                        engine="fast",
+                        detail="summary",
+                        market_bundle=market_bundle,
+                    )
+                results[rate][name] = _window_metrics(summary)
+        except Exception as e:
+            print(f"    ERROR: {e}")
+            for rate in withdrawal_rates:
+                results[rate][name] = {"error": str(e)}
 
-        results["quarterly-rebalance"] = {
-            "final_value": summary["total_final_value"],
-            "final_bank": summary["final_bank"],
-            "total_return": summary["total_return"],
-            "transactions": summary["transaction_count"],
-        }
-    except Exception as e:
-        print(f"    ERROR: {e}")
-        results["quarterly-rebalance"] = {"error": str(e)}
+    return results
 
-    # Strategy 3: Synthetic dividend auto
-    print("  [3/3] Running synthetic-dividend-auto...")
-    try:
-        auto_algo = build_portfolio_algo_from_name("auto", allocations)
 
-        txns, summary = run_portfolio_backtest(
-            allocations=allocations,
-            start_date=start_date,
-            end_date=end_date,
-            portfolio_algo=auto_algo,
-            initial_investment=initial_investment,
-        )
+def run_single_window_comparison(
+    allocations: Dict[str, float],
+    start_date: date,
+    end_date: date,
+    withdrawal_rate_pct: float,
+    initial_investment: float = 1_000_000,
+) -> Dict[str, Dict]:
+    """Run all strategies on a single time window.
 
-        results["synthetic-dividend-auto"] = {
-            "final_value": summary["total_final_value"],
-            "final_bank": summary["final_bank"],
-            "total_return": summary["total_return"],
-            "transactions": summary["transaction_count"],
-        }
-    except Exception as e:
-        print(f"    ERROR: {e}")
-        results["synthetic-dividend-auto"] = {"error": str(e)}
+    Args:
+        allocations: Asset allocations (must sum to 1.0)
+        start_date: Window start
+        end_date: Window end
+        withdrawal_rate_pct: Annual withdrawal rate (e.g., 4.0 for 4%)
+        initial_investment: Starting capital
 
-    return results
+    Returns:
+        Dict of strategy_name → results summary
+    """
+    return run_window_comparisons(
+        allocations, start_date, end_date, [withdrawal_rate_pct], initial_investment
+    )[withdrawal_rate_pct]
 
 
 def run_rolling_window_validation(
@@ -174,23 +212,25 @@ def run_rolling_window_validation(
     print(f"Initial investment: ${initial_investment:,.0f}")
     print()
 
+    # Fetch and align the full span once; each window runs on a slice of it
+    market_bundle = MarketDataBundle.load(allocations, windows[0][0], windows[-1][1])
+
     all_results = []
 
     for window_idx, (start_date, end_date) in enumerate(windows, 1):
         print(f"Window {window_idx}/{len(windows)}: {start_date} to {end_date}")
 
-        for withdrawal_rate in withdrawal_rates:
-            print(f"  Withdrawal rate: {withdrawal_rate}%")
-
-            # Run all strategies on this window
-            results = run_single_window_comparison(
-                allocations=allocations,
-                start_date=start_date,
-                end_date=end_date,
-                withdrawal_rate_pct=withdrawal_rate,
-                initial_investment=initial_investment,
-            )
+        # Run all strategies on this window, at every withdrawal rate
+        window_results = run_window_comparisons(
+            allocations=allocations,
+            start_date=start_date,
+            end_date=end_date,
+            withdrawal_rates=withdrawal_rates,
+            initial_investment=initial_investment,
+            market_bundle=market_bundle,
+        )
 
+        for withdrawal_rate, results in window_results.items():
             # Calculate alpha vs buy-and-hold
             buy_hold_return = results.get("buy-and-hold", {}).get("total_return", 0)
 
@@ -28,12 +28,15 @@ from datetime import date, datetime
 from pathlib import Path
 from typing import Any, Dict, List
 
+import numpy as np
+
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from src.algorithms.factory import build_algo_from_name  # noqa: E402
 from src.data.fetcher import HistoryFetcher  # noqa: E402
 from src.models.backtest import run_algorithm_backtest  # noqa: E402
+from src.models.ledger import TransactionLedger  # noqa: E402
 
 
 def parse_date(s: str) -> date:
@@ -47,12 +50,12 @@ def parse_date(s: str) -> date:
 
 
 def calculate_yearly_cash_flow(
-    transactions: List[str], start_date: date, end_date: date
+    ledger: TransactionLedger, start_date: date, end_date: date
 ) -> Dict[int, float]:
     """Calculate net cash flow by year from transaction history.
 
     Args:
-        transactions: List of transaction strings
+        ledger: Columnar transaction ledger of the backtest
         start_date: Backtest start date
         end_date: Backtest end date
 
@@ -61,46 +64,15 @@ def calculate_yearly_cash_flow(
 
     Note: Excludes the initial BUY transaction to focus on ongoing cash generation
     """
-    yearly_cash: Dict[int, float] = {}
-
     # Initialize all years in range
-    for year in range(start_date.year, end_date.year + 1):
-        yearly_cash[year] = 0.0
-
-    # Skip first transaction (initial BUY)
-    for tx in transactions[1:] if len(transactions) > 1 else []:
-        # Parse transaction format: "2024-01-15 SELL 100 NVDA @ 500.00 = 50000.00, holdings = 9900, bank = 50000.00  # Notes"
-        try:
-            parts = tx.split()
-            if len(parts) < 7:
-                continue
-
-            tx_date_str = parts[0]
-            action = parts[1]
-            # qty_str = parts[2]  # Not used for cash flow
-            # ticker = parts[3]  # Not used
-            # at_sym = parts[4]  # '@'
-            # price_str = parts[5]  # Not used for cash flow
-            # eq_sym = parts[6]  # '='
-            value_str = parts[7].rstrip(",")
-
-            tx_date = datetime.fromisoformat(tx_date_str).date()
-            value = float(value_str)
-
-            year = tx_date.year
-            if year not in yearly_cash:
-                yearly_cash[year] = 0.0
-
-            if action == "SELL":
-                # Received cash
-                yearly_cash[year] += value
-            elif action == "BUY":
-                # Paid cash
-                yearly_cash[year] -= value
+    yearly_cash: Dict[int, float] = {
+        year: 0.0 for year in range(start_date.year, end_date.year + 1)
+    }
 
-        except Exception:
-            # Skip malformed transactions
-            continue
+    # Sells received cash, buys paid cash; skip the first transaction (initial BUY)
+    after_initial = np.arange(len(ledger)) > 0
+    for year, cash in ledger.sum_by_year(ledger.cash_flow(), after_initial).items():
+        yearly_cash[year] = yearly_cash.get(year, 0.0) + cash
 
     return yearly_cash
 
@@ -192,6 +164,7 @@ def run_strategy_backtest(
             start_date=start_date,
             end_date=end_date,
             algo=algo,
+            engine="fast",
         )
     except Exception as e:
         return {
@@ -200,8 +173,9 @@ def run_strategy_backtest(
         }
 
     # Calculate yearly cash flow
-    transaction_strings = [tx.to_string() for tx in transactions]
-    yearly_cash = calculate_yearly_cash_flow(transaction_strings, start_date, end_date)
+    yearly_cash = calculate_yearly_cash_flow(
+        TransactionLedger.from_transactions(transactions), start_date, end_date
+    )
     cash_flow_stats = analyze_cash_flow_patterns(yearly_cash)
 
     # Extract metrics
@@ -30,6 +30,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from src.algorithms.factory import build_algo_from_name  # noqa: E402
 from src.data.fetcher import HistoryFetcher  # noqa: E402
 from src.models.backtest import run_algorithm_backtest  # noqa: E402
+from src.models.parameter_grid import run_synthetic_dividend_grid  # noqa: E402
 
 # SDN parameters to test (covering the full spectrum)
 SDN_RANGE = [4, 6, 8, 10, 12, 16, 20, 24, 32]
@@ -139,26 +140,72 @@ def sweep_sdn_parameters(
     end_date: date,
     sdn_range: List[int] = SDN_RANGE,
     profit_pct: float = 50.0,
+    initial_qty: int = 10000,
 ) -> List[Dict]:
     """
     Sweep across all sdN parameters for a single ticker.
 
+    All sdN values are simulated together in one grid pass over the price
+    data (see src.models.parameter_grid); results match run_backtest_for_sdn().
+
     Returns:
         List of result dictionaries, one per sdN parameter
     """
     print(f"\n[{ticker}] {start_date} to {end_date}:")
-    results = []
 
-    for sd_n in sdn_range:
-        result = run_backtest_for_sdn(
+    fetcher = HistoryFetcher()
+    df = fetcher.get_history(ticker, start_date, end_date)
+
+    if df is None or df.empty:
+        print(f"    [SKIP] {ticker}: No data available")
+        return []
+
+    strategies = [
+        f"sd{sd_n}" if profit_pct == 50.0 else f"sd{sd_n},{profit_pct}" for sd_n in sdn_range
+    ]
+    try:
+        summaries, _ = run_synthetic_dividend_grid(
+            df=df,
             ticker=ticker,
+            configs=strategies,
+            initial_qty=initial_qty,
             start_date=start_date,
             end_date=end_date,
-            sd_n=sd_n,
-            profit_pct=profit_pct,
         )
-        if result:
-            results.append(result)
+    except Exception as e:
+        print(f"    [ERROR] {ticker}: {e}")
+        return []
+
+    results = []
+    for sd_n, summary in zip(sdn_range, summaries):
+        total_return_pct = summary.get("total_return", 0) * 100
+        # BUY/SELL transactions: executed transactions other than dividends
+        transaction_count = summary["transaction_count"] - summary["dividend_payment_count"]
+        realized_alpha = summary["realized_volatility_alpha"]
+        unrealized_alpha = summary["unrealized_stack_alpha"]
+        total_alpha = summary["total_volatility_alpha"]
+        stack_size = summary["final_stack_size"]
+
+        print(
+            f"    sd{sd_n:2d}: return={total_return_pct:7.2f}%, "
+            f"realized={realized_alpha:6.2f}%, "
+            f"unrealized={unrealized_alpha:6.2f}%, "
+            f"txns={transaction_count:3d}, stack={stack_size}"
+        )
+
+        results.append(
+            {
+                "ticker": ticker,
+                "sd_n": sd_n,
+                "total_return_pct": total_return_pct,
+                "realized_vol_alpha_pct": realized_alpha,
+                "unrealized_vol_alpha_pct": unrealized_alpha,
+                "total_vol_alpha_pct": total_alpha,
+                "estimated_vol_alpha_pct": total_alpha,  # Backwards compatibility
+                "transaction_count": transaction_count,
+                "buyback_stack_size": stack_size,
+            }
+        )
 
     return results
 
@@ -10,6 +10,8 @@ Usage:
 Commands:
     run                   Run backtests, research, and comparisons
     analyze               Analyze results and generate reports
+    sweep                 Run a declarative backtest grid and query its results
+    monte-carlo           Simulate algorithms over thousands of synthetic price paths
     dump                  Dump transaction history without visualization
     order                 Calculate order recommendations
     test                  Run test suite
@@ -250,12 +252,21 @@ Examples:
     # Run optimal rebalancing research
     synthetic-dividend-tool run research optimal-rebalancing --output results.csv
 
+    # Same sweep on 8 worker processes
+    synthetic-dividend-tool run research optimal-rebalancing --output results.csv --jobs 8
+
     # Compare algorithms
     synthetic-dividend-tool run compare algorithms --ticker SPY --start 2023-01-01 --end 2024-01-01
 
     # Batch comparison across assets
     synthetic-dividend-tool run compare batch --tickers NVDA AAPL GLD --strategies sd8 sd16 --start 2024-01-01 --end 2025-01-01
 
+    # Batch comparison using all cores (ticker x strategy backtests run in parallel)
+    synthetic-dividend-tool run compare batch --tickers NVDA AAPL GLD --strategies buy-and-hold sd8 sd16 --start 2024-01-01 --end 2025-01-01 --jobs 8
+
+    # Reuse results cached in cache/results so reruns only compute what changed
+    synthetic-dividend-tool run research optimal-rebalancing --output results.csv --cache
+
     # Auto-analyze volatility and suggest optimal SD
     synthetic-dividend-tool analyze volatility-alpha --ticker GLD --start 2024-01-01 --end 2025-01-01
 
@@ -271,6 +282,21 @@ Examples:
     # Get monthly candle data and save to file
     synthetic-dividend-tool run ticker --ticker AAPL --start 2020-01-01 --end 2024-12-31 --interval monthly --output apple_monthly.csv
 
+    # Run a sweep grid from a JSON spec into a results store (resumes if rerun)
+    synthetic-dividend-tool sweep run experiments/sweeps/sdn_grid.json --jobs 8
+
+    # Best algorithm per ticker and window from the stored results
+    synthetic-dividend-tool sweep query --store data/sweeps/sdn_grid --top 1 --metric total_return --by name,start_date
+
+    # Return vs drawdown Pareto front per ticker
+    synthetic-dividend-tool sweep query --store data/sweeps/sdn_grid --pareto total_return,-metrics.max_drawdown --by name
+
+    # Retirement plan: survival of a 4% withdrawal over 10,000 simulated 30-year markets
+    synthetic-dividend-tool monte-carlo --drift 7 --volatility 20 --years 30 --paths 10000 --algorithms buy-and-hold sd8 --withdrawal-rates 3 4 5
+
+    # Same, on paths block-bootstrapped from cached NVDA history
+    synthetic-dividend-tool monte-carlo --model bootstrap --ticker NVDA --start 2015-01-01 --end 2024-12-31 --algorithms buy-and-hold sd8 sd16
+
     # Run tests
     synthetic-dividend-tool test
 
@@ -434,6 +460,12 @@ For detailed help on any command:
     )
     run_optimal_parser.add_argument("--asset-class", help="Specific asset class (optional)")
     run_optimal_parser.add_argument("--output", required=True, help="Output CSV file")
+    run_optimal_parser.add_argument(
+        "--jobs", type=int, default=1, help="Worker processes for the sweep (default: 1)"
+    )
+    run_optimal_parser.add_argument(
+        "--cache", action="store_true", help="Reuse and update cached results in cache/results"
+    )
 
     # Return adjustment options
     run_optimal_parser.add_argument(
@@ -543,6 +575,12 @@ For detailed help on any command:
     run_batch_compare_parser.add_argument("--start", required=True, help="Start date")
     run_batch_compare_parser.add_argument("--end", required=True, help="End date")
     run_batch_compare_parser.add_argument("--output", help="Output CSV file")
+    run_batch_compare_parser.add_argument(
+        "--jobs", type=int, default=1, help="Worker processes for the backtests (default: 1)"
+    )
+    run_batch_compare_parser.add_argument(
+        "--cache", action="store_true", help="Reuse and update cached results in cache/results"
+    )
 
     # Return adjustment options
     run_batch_compare_parser.add_argument(
@@ -654,6 +692,128 @@ Examples:
     coverage_parser = analyze_subparsers.add_parser("coverage", help="Analyze coverage ratios")
     coverage_parser.add_argument("--input", required=True, help="Research CSV file")
 
+    # ========================================================================
+    # SWEEP command
+    # ========================================================================
+    sweep_parser = subparsers.add_parser(
+        "sweep",
+        help="Run a declarative backtest grid and query its results",
+        description="Run tickers x windows x algorithms x withdrawal rates from a JSON spec "
+        "(see src.models.sweep) into a columnar results store, and query the store",
+    )
+    sweep_subparsers = sweep_parser.add_subparsers(dest="sweep_type", help="Sweep action")
+
+    # sweep run
+    sweep_run_parser = sweep_subparsers.add_parser("run", help="Run the missing cells of a grid")
+    sweep_run_parser.add_argument("spec", help="Sweep spec JSON file")
+    sweep_run_parser.add_argument(
+        "--store", help="Results store directory (default: data/sweeps/<spec name>)"
+    )
+    sweep_run_parser.add_argument(
+        "--jobs", type=int, default=1, help="Worker processes for the backtests (default: 1)"
+    )
+    sweep_run_parser.add_argument(
+        "--cache", action="store_true", help="Reuse and update cached results in cache/results"
+    )
+    sweep_run_parser.add_argument(
+        "--recompute", action="store_true", help="Run every cell, even those already stored"
+    )
+    sweep_run_parser.add_argument(
+        "--dry-run", action="store_true", help="Print the plan without running anything"
+    )
+
+    # sweep query
+    sweep_query_parser = sweep_subparsers.add_parser("query", help="Query a results store")
+    sweep_query_parser.add_argument("--store", required=True, help="Results store directory")
+    sweep_query_parser.add_argument(
+        "--top", type=int, help="Best N rows by --metric (per --by group)"
+    )
+    sweep_query_parser.add_argument(
+        "--metric", default="total_return", help="Column ranked by --top (default: total_return)"
+    )
+    sweep_query_parser.add_argument(
+        "--ascending", action="store_true", help="Rank --top ascending (smaller is better)"
+    )
+    sweep_query_parser.add_argument(
+        "--pareto",
+        help="Comma-separated objectives for a Pareto front; prefix '-' to minimize "
+        "(e.g., total_return,-metrics.max_drawdown)",
+    )
+    sweep_query_parser.add_argument(
+        "--by", default="", help="Comma-separated grouping columns (e.g., name,start_date)"
+    )
+    sweep_query_parser.add_argument(
+        "--where",
+        action="append",
+        default=[],
+        help="Filter column=value (repeatable; value may be a comma-separated list)",
+    )
+    sweep_query_parser.add_argument(
+        "--columns",
+        default="name,start_date,end_date,algorithm,withdrawal_rate_pct,total_return",
+        help="Comma-separated columns to show",
+    )
+    sweep_query_parser.add_argument("--output", help="Write the selected rows to a CSV file")
+
+    # ========================================================================
+    # MONTE-CARLO command
+    # ========================================================================
+    mc_parser = subparsers.add_parser(
+        "monte-carlo",
+        help="Simulate algorithms over thousands of synthetic price paths",
+        description="Run algorithms x withdrawal rates on N synthetic price paths "
+        "(see src.models.monte_carlo) and report survival and return distributions",
+    )
+    mc_parser.add_argument(
+        "--model",
+        choices=["gbm", "bootstrap"],
+        default="gbm",
+        help="Path model: geometric Brownian motion or block bootstrap of history (default: gbm)",
+    )
+    mc_parser.add_argument(
+        "--drift", type=float, default=7.0, help="GBM annual drift in %% (default: 7)"
+    )
+    mc_parser.add_argument(
+        "--volatility", type=float, default=20.0, help="GBM annual volatility in %% (default: 20)"
+    )
+    mc_parser.add_argument("--ticker", help="Ticker whose cached history is bootstrapped")
+    mc_parser.add_argument("--start", help="Start of the bootstrapped history (YYYY-MM-DD)")
+    mc_parser.add_argument("--end", help="End of the bootstrapped history (YYYY-MM-DD)")
+    mc_parser.add_argument(
+        "--block-days", type=int, default=20, help="Bootstrap block length (default: 20)"
+    )
+    mc_parser.add_argument(
+        "--paths", type=int, default=10_000, help="Number of paths (default: 10000)"
+    )
+    mc_parser.add_argument("--years", type=float, default=30.0, help="Years per path (default: 30)")
+    mc_parser.add_argument(
+        "--algorithms",
+        nargs="+",
+        default=["buy-and-hold", "sd8"],
+        help="Algorithms (e.g., buy-and-hold sd8 sd16,75; default: buy-and-hold sd8)",
+    )
+    mc_parser.add_argument(
+        "--withdrawal-rates",
+        nargs="+",
+        type=float,
+        default=[4.0],
+        help="Annual withdrawal rates in %% (default: 4)",
+    )
+    mc_parser.add_argument(
+        "--initial-investment",
+        type=float,
+        default=1_000_000,
+        help="Initial investment amount (default: 1,000,000)",
+    )
+    mc_parser.add_argument(
+        "--no-margin", action="store_true", help="Skip buys the bank cannot cover"
+    )
+    mc_parser.add_argument("--seed", type=int, help="Random seed (same seed, same paths)")
+    mc_parser.add_argument(
+        "--float32", action="store_true", help="Store prices and results as float32"
+    )
+    mc_parser.add_argument("--output", help="Write the summary table to a CSV file")
+
     # ========================================================================
     # ORDER command
     # ========================================================================
@@ -1028,13 +1188,17 @@ def run_research(args) -> int:
             args.start,
             "--end",
             args.end,
-            "--profit-pct",
+            "--profit",
             str(args.profit_pct),
-            "--initial-qty",
+            "--initial-investment",
             str(args.initial_qty),
             "--output",
             args.output,
+            "--jobs",
+            str(args.jobs),
         ]
+        if args.cache:
+            research_args.append("--cache")
 
         if args.ticker:
             research_args.extend(["--ticker", args.ticker])
@@ -1087,10 +1251,30 @@ def run_compare(args) -> int:
         return 0
 
     elif args.compare_type == "batch":
-        pass
+        from src.compare.batch_comparison import (
+            calculate_deltas,
+            parse_date,
+            run_parallel_batch,
+            write_csv,
+        )
+        from src.models.result_cache import ResultCache
 
         print(f"Running batch comparison: {args.tickers} with {args.strategies}...")
-        # Would integrate with batch_comparison
+        results = run_parallel_batch(
+            args.tickers,
+            parse_date(args.start),
+            parse_date(args.end),
+            args.strategies,
+            workers=args.jobs,
+            cache=ResultCache() if args.cache else None,
+        )
+
+        # Deltas are taken against each ticker's own buy-and-hold row
+        rows = []
+        for ticker in args.tickers:
+            rows.extend(calculate_deltas([r for r in results if r["ticker"] == ticker]))
+        if args.output:
+            write_csv(rows, args.output)
         return 0
 
     elif args.compare_type == "table":
@@ -1392,6 +1576,139 @@ def run_dump(args) -> int:
         return 1
 
 
+def run_sweep(args) -> int:
+    """Execute sweep run/query commands."""
+    from pathlib import Path
+
+    import numpy as np
+
+    from src.models.result_cache import ResultCache
+    from src.models.results_store import ResultsStore
+    from src.models.sweep import SweepSpec, plan_sweep
+    from src.models.sweep import run_sweep as run_sweep_grid
+    from src.paths import get_data_dir
+
+    try:
+        if args.sweep_type == "run":
+            spec = SweepSpec.from_file(args.spec)
+            store = ResultsStore(args.store or get_data_dir() / "sweeps" / Path(args.spec).stem)
+            if args.dry_run:
+                plan = plan_sweep(spec, store, args.recompute)
+                print(f"{len(plan.jobs)} cells to run, {plan.skipped} already stored")
+                for ticker, (start, end) in plan.data_ranges.items():
+                    print(f"  {ticker}: {start} to {end}")
+                return 0
+            run_sweep_grid(
+                spec,
+                store,
+                workers=args.jobs,
+                cache=ResultCache() if args.cache else None,
+                recompute=args.recompute,
+            )
+            print(f"Results: {store.directory} ({len(store)} cells)")
+            return 0
+
+        store = ResultsStore(args.store)
+        by = [c for c in args.by.split(",") if c]
+        # Filter values parsed to the column's type (numbers, dates or text)
+        kinds = {name: values.dtype.kind for name, values in store.columns().items()}
+        parsers = {"M": np.datetime64, "b": lambda v: v == "True"}
+        where = {}
+        for clause in args.where:
+            column, _, value = clause.partition("=")
+            kind = kinds.get(column, "U")
+            parse = parsers.get(kind, float if kind in "iuf" else str)
+            where[column] = [parse(v) for v in value.split(",")]
+
+        objectives = {}
+        if args.pareto:
+            objectives = {
+                name.lstrip("-"): "min" if name.startswith("-") else "max"
+                for name in args.pareto.split(",")
+            }
+            rows = store.pareto(objectives, by=by, where=where)
+        elif args.top:
+            rows = store.top_n(
+                args.metric, n=args.top, by=by, largest=not args.ascending, where=where
+            )
+        else:
+            rows = store.frame()
+        columns = [c for c in args.columns.split(",") if c in rows.columns]
+        ranked = list(objectives) or ([args.metric] if args.top else [])
+        columns += [c for c in ranked if c in rows.columns and c not in columns]
+        if args.output:
+            rows.to_csv(args.output, index=False)
+            print(f"Wrote {len(rows)} rows to {args.output}")
+        else:
+            print(rows[columns].to_string(index=False) if len(rows) else "No results")
+        return 0
+
+    except Exception as e:
+        print(f"Error running sweep: {e}")
+        return 1
+
+
+def run_monte_carlo(args) -> int:
+    """Execute the monte-carlo command."""
+    import contextlib
+    import io
+    import time
+    from datetime import datetime
+
+    import numpy as np
+    import pandas as pd
+
+    from src.models.monte_carlo import run_monte_carlo as run_paths
+    from src.models.price_paths import GBM, BlockBootstrap, PathModel
+
+    model: PathModel
+    try:
+        if args.model == "bootstrap":
+            if not (args.ticker and args.start and args.end):
+                print("Error: --model bootstrap needs --ticker, --start and --end")
+                return 1
+            model = BlockBootstrap.from_history(
+                args.ticker,
+                datetime.strptime(args.start, "%Y-%m-%d").date(),
+                datetime.strptime(args.end, "%Y-%m-%d").date(),
+                block_days=args.block_days,
+            )
+            source = f"{args.ticker} {args.start}..{args.end} ({args.block_days}-day blocks)"
+        else:
+            model = GBM(args.drift / 100.0, args.volatility / 100.0)
+            source = f"GBM drift {args.drift:g}%, volatility {args.volatility:g}%"
+
+        print(f"Monte Carlo: {args.paths} paths x {args.years:g} years of {source}")
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = run_paths(
+                model,
+                args.paths,
+                args.years,
+                args.algorithms,
+                args.withdrawal_rates,
+                seed=args.seed,
+                dtype=np.float32 if args.float32 else np.float64,
+                initial_investment=args.initial_investment,
+                allow_margin=not args.no_margin,
+            )
+        elapsed = time.perf_counter() - started
+        print(f"Simulated {result.n_paths * len(result.labels)} path-backtests in {elapsed:.1f}s")
+        print()
+
+        summary = result.summary()
+        if args.output:
+            summary.to_csv(args.output, index=False)
+            print(f"Wrote summary to {args.output}")
+        with pd.option_context("display.width", 200, "display.max_columns", None):
+            print(summary.to_string(index=False, float_format=lambda v: f"{v:.2f}"))
+        return 0
+
+    except Exception as e:
+        print(f"Error running Monte Carlo simulation: {e}")
+        return 1
+
+
 def run_test(args) -> int:
     """Execute test suite."""
     import subprocess
@@ -1452,6 +1769,15 @@ def main(argv: Optional[List[str]] = None) -> int:
             return 1
         return run_analyze(args)
 
+    elif args.command == "sweep":
+        if not args.sweep_type:
+            parser.parse_args(["sweep", "--help"])
+            return 1
+        return run_sweep(args)
+
+    elif args.command == "monte-carlo":
+        return run_monte_carlo(args)
+
     elif args.command == "order":
         return run_order(args)
 
@@ -10,14 +10,14 @@ This tool:
 """
 
 import math
-import re
 from datetime import date
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Optional, Tuple
 
 import pandas as pd
 
 from src.data.fetcher import HistoryFetcher
 from src.models.backtest import SyntheticDividendAlgorithm, run_algorithm_backtest
+from src.models.ledger import TransactionLedger
 
 
 def calculate_annualized_volatility(df: pd.DataFrame) -> float:
@@ -96,38 +96,10 @@ def calculate_minimum_alpha_per_cycle(trigger_pct: float) -> float:
     return (trigger_decimal**2) / 2.0
 
 
-def _parse_transaction_line(line: str) -> Optional[Dict[str, Any]]:
-    """Parse transaction log line to extract date, action, and price.
-
-    Args:
-        line: Transaction log line (e.g., "2024-01-15 SELL 10.5 shares @ 150.25")
-
-    Returns:
-        Dict with date, action, price or None if unparseable
-    """
-    parts = line.split()
-    if not parts:
-        return None
-
-    date_str = parts[0]
-    action = parts[1].upper() if len(parts) > 1 else None
-
-    # Extract price after '@'
-    price = None
-    m = re.search(r"@\s*([0-9,.]+)", line)
-    if m:
-        try:
-            price = float(m.group(1).replace(",", ""))
-        except Exception:
-            pass
-
-    return {"date": date_str, "action": action, "price": price}
-
-
 def plot_volatility_alpha_chart(
     df: pd.DataFrame,
     ticker: str,
-    transactions: List[str],
+    ledger: TransactionLedger,
     sd_n: int,
     volatility: float,
     vol_alpha: float,
@@ -138,7 +110,7 @@ def plot_volatility_alpha_chart(
     Args:
         df: Price data DataFrame with 'Close' column
         ticker: Stock ticker symbol
-        transactions: List of transaction log strings
+        ledger: Transaction ledger of the run
         sd_n: SD parameter used (e.g., 8 for SD8)
         volatility: Annualized volatility as decimal
         vol_alpha: Volatility alpha as percentage
@@ -164,34 +136,11 @@ def plot_volatility_alpha_chart(
     else:
         price_series = df_plot.select_dtypes(include=["number"]).iloc[:, 0]
 
-    # Parse transactions
-    buys_x, buys_y = [], []
-    sells_x, sells_y = [], []
-
-    for line in transactions:
-        parsed = _parse_transaction_line(line)
-        if not parsed or not parsed.get("date"):
-            continue
-
-        try:
-            dt = pd.to_datetime(parsed["date"])
-        except Exception:
-            continue
-
-        price = parsed.get("price")
-        # If price missing, lookup close price for that date
-        if price is None:
-            try:
-                price = float(price_series.loc[dt])
-            except Exception:
-                continue
-
-        if parsed.get("action") == "BUY":
-            buys_x.append(dt)
-            buys_y.append(price)
-        elif parsed.get("action") == "SELL":
-            sells_x.append(dt)
-            sells_y.append(price)
+    # Markers at the fill price of each executed trade
+    buys = ledger.mask(action="BUY")
+    sells = ledger.mask(action="SELL")
+    buys_x, buys_y = ledger.dates[buys], ledger.price[buys]
+    sells_x, sells_y = ledger.dates[sells], ledger.price[sells]
 
     # Create plot
     fig, ax = plt.subplots(figsize=(14, 7))
@@ -199,7 +148,7 @@ def plot_volatility_alpha_chart(
         price_series.index, price_series.values, label=f"{ticker} Close", color="blue", linewidth=2
     )
 
-    if buys_x:
+    if len(buys_x):
         ax.scatter(
             buys_x,
             buys_y,
@@ -211,7 +160,7 @@ def plot_volatility_alpha_chart(
             edgecolors="darkred",
             linewidths=1.5,
         )
-    if sells_x:
+    if len(sells_x):
         ax.scatter(
             sells_x,
             sells_y,
@@ -423,7 +372,7 @@ def analyze_volatility_alpha(
         output_file = plot_volatility_alpha_chart(
             df=df,
             ticker=ticker,
-            transactions=[tx.to_string() for tx in transactions_full],
+            ledger=TransactionLedger.from_transactions(transactions_full),
             sd_n=sd_n,
             volatility=volatility,
             vol_alpha=vol_alpha,
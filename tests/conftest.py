@@ -5,6 +5,8 @@ This file is automatically loaded by pytest and sets up global test fixtures.
 
 import os
 
+import numpy as np
+import pandas as pd
 import pytest
 
 
@@ -77,3 +79,77 @@ def setup_static_provider_for_ci():
     yield  # Run tests
 
     # No cleanup needed - provider registry resets naturally
+
+
+@pytest.fixture
+def mock_prices(monkeypatch):
+    """Factory serving synthetic OHLC prices through a mocked HistoryFetcher.
+
+    Call it with the parameters of the price path; it returns the OHLC
+    DataFrame and patches src.data.fetcher.HistoryFetcher to serve it
+    (sliced to the requested dates) for the rest of the test.
+
+    Args (of the returned factory):
+        seed: Seed of the random daily log returns
+        drift: Mean daily log return
+        days: Number of business days
+        returns: Daily log returns to use instead of random ones
+        start: First business day of the index
+        scale: Ticker → price multiplier; other tickers get no history.
+               If None, every ticker gets the same prices.
+        calls: List to record each fetch in, as (ticker, start, end)
+        frame: OHLC DataFrame to serve instead of a generated path
+        frames: Ticker → OHLC DataFrame served for that ticker instead
+        closes: Daily closes of a hand-built path, served as flat bars
+                (Open = High = Low = Close) from `start`
+
+    Example:
+        >>> df = mock_prices(seed=7, drift=-0.001)
+        >>> df = mock_prices(seed=7, scale={"AAA": 1.0, "BBB": 0.4})
+        >>> df = mock_prices(frame=volatile, frames={"BND": bonds})
+        >>> df = mock_prices(closes=[100.0, 110.0, 121.0])
+    """
+
+    def install(
+        seed=0,
+        drift=0.0003,
+        days=500,
+        returns=None,
+        start="2021-01-01",
+        scale=None,
+        calls=None,
+        frame=None,
+        frames=None,
+        closes=None,
+    ):
+        if closes is not None:
+            bars = np.asarray(closes, dtype=float)
+            frame = pd.DataFrame(
+                {"Open": bars, "High": bars, "Low": bars, "Close": bars},
+                index=pd.bdate_range(start, periods=len(bars)),
+            )
+        if frame is None:
+            if returns is None:
+                returns = np.random.default_rng(seed).normal(drift, 0.02, days)
+            close = 100.0 * np.exp(np.cumsum(returns))
+            frame = pd.DataFrame(
+                {"Open": close, "High": close * 1.01, "Low": close * 0.99, "Close": close},
+                index=pd.bdate_range(start, periods=len(close)),
+            )
+        served = dict(frames or {})
+
+        class MockFetcher:
+            def get_history(self, ticker, start_date, end_date):
+                if calls is not None:
+                    calls.append((ticker, start_date, end_date))
+                if ticker in served:
+                    return served[ticker].loc[str(start_date) : str(end_date)]
+                if scale is not None and ticker not in scale:
+                    return None
+                factor = 1.0 if scale is None else scale[ticker]
+                return frame.loc[str(start_date) : str(end_date)] * factor
+
+        monkeypatch.setattr("src.data.fetcher.HistoryFetcher", MockFetcher)
+        return frame
+
+    return install
@@ -0,0 +1,216 @@
+"""Tests for cash-flow overlay replay.
+
+A recorded run replayed under a withdrawal/interest overlay matches a full
+simulation of that overlay, and runs whose trades depend on cash are refused.
+"""
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.algorithms.buy_and_hold import BuyAndHoldAlgorithm
+from src.models.backtest import run_algorithm_backtest
+from src.models.cash_overlay import CashFlowOverlay, CashFlowReplay, ReplayNotSupported
+from src.models.simulation import run_portfolio_simulation
+
+START, END = date(2021, 1, 1), date(2022, 12, 30)
+
+
+@pytest.fixture
+def prices(mock_prices):
+    # An early rally lets sd8 build up cash before the first withdrawal
+    steps = np.random.default_rng(17).normal(0.001, 0.02, 500)
+    steps[:40] = 0.015
+    return mock_prices(returns=steps)
+
+
+@pytest.fixture
+def dividends(prices):
+    # Quarterly dividends, the first on day 1 so it is paid after the market step
+    days = prices.index[[1, 60, 120, 180, 240, 300, 360, 420]]
+    return {"TEST": pd.Series(0.5, index=days)}
+
+
+def _full_run(overlay, dividends, algo="per-asset:sd8"):
+    return run_portfolio_simulation(
+        allocations={"TEST": 1.0},
+        start_date=START,
+        end_date=END,
+        portfolio_algo=algo,
+        initial_investment=100_000.0,
+        withdrawal_rate_pct=overlay.withdrawal_rate_pct,
+        withdrawal_frequency_days=overlay.withdrawal_frequency_days,
+        cash_interest_rate_pct=overlay.cash_interest_rate_pct,
+        reference_rate_ticker=overlay.reference_rate_ticker,
+        risk_free_rate_ticker=overlay.risk_free_rate_ticker,
+        simple_mode=overlay.simple_mode,
+        allow_margin=True,
+        dividend_data=dividends,
+        engine="fast",
+        detail="daily",
+    )[1]
+
+
+def _record(dividends, algo="per-asset:sd8"):
+    return CashFlowReplay.record(
+        {"TEST": 1.0}, START, END, algo, initial_investment=100_000.0, dividend_data=dividends
+    )
+
+
+OVERLAYS = [
+    CashFlowOverlay(),
+    CashFlowOverlay(cash_interest_rate_pct=5.0),
+    CashFlowOverlay(withdrawal_rate_pct=4.0),
+    CashFlowOverlay(withdrawal_rate_pct=6.0, withdrawal_frequency_days=91),
+    CashFlowOverlay(withdrawal_rate_pct=4.0, cash_interest_rate_pct=5.0),
+    CashFlowOverlay(withdrawal_rate_pct=5.0, reference_rate_ticker="REF"),
+    CashFlowOverlay(withdrawal_rate_pct=5.0, reference_rate_ticker="REF", simple_mode=True),
+    CashFlowOverlay(withdrawal_rate_pct=3.0, risk_free_rate_ticker="RF"),
+]
+
+
+class TestReplay:
+    """Overlays agree with full simulations."""
+
+    @pytest.mark.parametrize(
+        "algo, overlays",
+        [
+            ("per-asset:sd8", OVERLAYS),
+            # Buy-and-hold keeps no cash to withdraw from: interest on dividends only
+            ("per-asset:buy-and-hold", [o for o in OVERLAYS if not o.withdrawal_rate_pct]),
+        ],
+    )
+    def test_matches_full_runs(self, prices, dividends, algo, overlays):
+        replayed = _record(dividends, algo).evaluate(overlays)
+        for overlay, summary in zip(overlays, replayed):
+            full = _full_run(overlay, dividends, algo)
+            assert summary is not None
+            for key in (
+                "total_final_value",
+                "final_bank",
+                "final_asset_value",
+                "total_withdrawn",
+                "withdrawal_count",
+                "cash_interest_earned",
+                "opportunity_cost",
+                "bank_min",
+                "bank_max",
+                "transaction_count",
+                "total_dividends",
+            ):
+                assert summary[key] == pytest.approx(full[key], rel=1e-9, abs=1e-6), key
+            assert summary["daily_bank_stats"] == pytest.approx(
+                full["daily_bank_stats"], rel=1e-9, abs=1e-6
+            )
+            assert summary["daily_bank_values"].values() == pytest.approx(
+                full["daily"].bank.tolist(), rel=1e-9, abs=1e-6
+            )
+            assert summary["metrics"] == pytest.approx(full["metrics"], rel=1e-9, abs=1e-6)
+            assert summary["baseline"] == full["baseline"]
+            for key in ("volatility_alpha", "alpha_pct"):
+                assert summary.get(key) == pytest.approx(full.get(key), rel=1e-9, abs=1e-9), key
+
+    def test_interest_on_step_path(self, mock_prices):
+        # sd8 sells once on the step to 110, where the price then stays
+        mock_prices(closes=[100.0] + [110.0] * 59, start="2024-01-01")
+        replay = CashFlowReplay.record(
+            {"TEST": 1.0},
+            date(2024, 1, 1),
+            date(2024, 3, 22),
+            "per-asset:sd8",
+            initial_investment=10_000.0,
+            dividend_data={},
+        )
+        plain, paid = replay.evaluate(
+            [CashFlowOverlay(), CashFlowOverlay(cash_interest_rate_pct=5.0)]
+        )
+
+        # The sale keeps the value at 100 × 110; its proceeds earn 59 days of interest
+        assert plain["total_final_value"] == pytest.approx(11_000.0)
+        grown = plain["final_bank"] * (1 + 0.05 / 365.25) ** 59
+        assert paid["final_bank"] == pytest.approx(grown, rel=1e-12)
+        assert paid["cash_interest_earned"] == pytest.approx(grown - plain["final_bank"])
+        assert paid["total_final_value"] == pytest.approx(grown + plain["final_asset_value"])
+
+    def test_value_below_zero_has_no_annualized_rate(self, mock_prices):
+        # Prices fall 1% a day and sd8 keeps buying on margin: the value ends below zero
+        mock_prices(returns=np.full(500, -0.01))
+        overlay = CashFlowOverlay(cash_interest_rate_pct=5.0)
+        replay = CashFlowReplay.record(
+            {"TEST": 1.0},
+            START,
+            END,
+            "per-asset:sd8",
+            initial_investment=100_000.0,
+            dividend_data={},
+            inflation_rate_ticker="CPI",
+        )
+        (summary,) = replay.evaluate([overlay])
+        _, full = run_portfolio_simulation(
+            allocations={"TEST": 1.0},
+            start_date=START,
+            end_date=END,
+            portfolio_algo="per-asset:sd8",
+            initial_investment=100_000.0,
+            cash_interest_rate_pct=5.0,
+            inflation_rate_ticker="CPI",
+            allow_margin=True,
+            dividend_data={},
+            engine="fast",
+        )
+        assert full["total_final_value"] < 0
+        assert summary["total_final_value"] == pytest.approx(full["total_final_value"], rel=1e-9)
+        for key in ("annualized_return", "real_annualized_return"):
+            assert np.isnan(summary[key]) and np.isnan(full[key]), key
+
+    def test_forced_sale_is_refused(self, prices, dividends):
+        # Buy-and-hold keeps no cash, so any withdrawal would sell shares
+        replay = _record(dividends, "per-asset:buy-and-hold")
+        assert replay.evaluate([CashFlowOverlay(withdrawal_rate_pct=200.0)]) == [None]
+
+    def test_single_ticker(self, prices, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)  # The single-ticker path writes a price cache
+        replay = CashFlowReplay.record_single_ticker(
+            prices, "TEST", 1000, START, END, BuyAndHoldAlgorithm(), pd.Series(dtype=float)
+        )
+        (summary,) = replay.evaluate([CashFlowOverlay()])
+        _, full = run_algorithm_backtest(
+            prices,
+            "TEST",
+            initial_qty=1000,
+            start_date=START,
+            end_date=END,
+            algo=BuyAndHoldAlgorithm(),
+            dividend_series=pd.Series(dtype=float),
+        )
+        assert summary["total_final_value"] == pytest.approx(full["total"], rel=1e-9)
+
+
+class TestRefusal:
+    """Runs whose trades depend on cash cannot be replayed."""
+
+    def test_bank_reading_algorithm(self, prices):
+        with pytest.raises(ReplayNotSupported):
+            CashFlowReplay.record({"TEST": 1.0}, START, END, "quarterly-rebalance")
+
+    def test_cash_allocation(self, prices):
+        with pytest.raises(ReplayNotSupported):
+            CashFlowReplay.record({"TEST": 0.8, "CASH": 0.2}, START, END, "per-asset:sd8")
+
+    def test_needs_a_run_without_cash_flows(self, prices, dividends):
+        full = _full_run(CashFlowOverlay(withdrawal_rate_pct=4.0), dividends)
+        with pytest.raises(ValueError):
+            CashFlowReplay(full)
+
+
+class TestConsumers:
+    """Withdrawal studies replay their rates."""
+
+    def test_rolling_window_rates_are_applied(self, prices):
+        from src.research.rolling_window_validation import run_window_comparisons
+
+        results = run_window_comparisons({"TEST": 1.0}, START, END, [0.0, 4.0], 100_000.0)
+        for strategy in ("buy-and-hold", "quarterly-rebalance", "synthetic-dividend-auto"):
+            assert results[4.0][strategy]["final_value"] < results[0.0][strategy]["final_value"]
@@ -0,0 +1,143 @@
+"""Tests for the columnar daily result series.
+
+DailySeries keeps a run's daily portfolio, bank, per-asset and withdrawal
+values as arrays over the trading calendar; detail= selects how much of a
+run's results the summary keeps.
+"""
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.models.daily_series import DailySeries, DailyValues, daily_bank_stats, validate_detail
+from src.models.simulation import run_portfolio_simulation
+
+
+@pytest.fixture
+def series():
+    dates = [date(2024, 1, 2), date(2024, 1, 3), date(2024, 1, 4), date(2024, 1, 5)]
+    daily = DailySeries(dates, ["VOO", "BIL"])
+    daily.record(0, 100.0, [1000.0, 500.0], 1600.0)
+    daily.record_span(
+        1,
+        np.array([-50.0, 0.0, 25.0]),
+        np.array([[1010.0, 990.0, 1020.0], [501.0, 502.0, 503.0]]),
+        np.array([1461.0, 1492.0, 1548.0]),
+    )
+    daily.record_withdrawal(2, 40.0)
+    return daily
+
+
+class TestDailySeries:
+    """Columns, frame and legacy views."""
+
+    def test_columns(self, series):
+        assert len(series) == 4
+        assert series.bank.tolist() == [100.0, -50.0, 0.0, 25.0]
+        assert series.asset("BIL").tolist() == [500.0, 501.0, 502.0, 503.0]
+        assert series.portfolio[-1] == 1548.0
+        assert np.isnan(series.withdrawals[0])
+
+    def test_bank_stats(self, series):
+        assert series.bank_stats() == {
+            "bank_min": -50.0,
+            "bank_max": 100.0,
+            "bank_avg": 75.0 / 4,
+            "bank_negative_count": 1,
+            "bank_positive_count": 2,
+        }
+
+    def test_bank_stats_match_sequential_sum(self):
+        rng = np.random.default_rng(3)
+        bank = rng.normal(0.0, 1e4, 1000)
+        assert daily_bank_stats(bank)["bank_avg"] == sum(bank.tolist()) / len(bank)
+
+    def test_to_frame(self, series):
+        frame = series.to_frame()
+        assert list(frame.columns) == ["portfolio", "bank", "withdrawal", "VOO", "BIL"]
+        assert frame.index[0] == pd.Timestamp("2024-01-02")
+        assert frame["withdrawal"].fillna(0.0).sum() == 40.0
+
+    def test_views(self, series):
+        views = series.views()
+        assert views["daily_bank_values"][date(2024, 1, 3)] == -50.0
+        assert views["daily_values"].values() == series.portfolio.tolist()
+        assert dict(views["daily_asset_values"]["VOO"])[date(2024, 1, 5)] == 1020.0
+        withdrawals = views["daily_withdrawals"]
+        assert dict(withdrawals) == {date(2024, 1, 4): 40.0}
+        assert date(2024, 1, 2) not in withdrawals
+        with pytest.raises(KeyError):
+            withdrawals[date(2024, 1, 2)]
+
+    def test_daily_values_is_mapping(self):
+        dates = [date(2024, 1, 2), date(2024, 1, 3)]
+        assert DailyValues(dates, np.array([1.0, 2.0])) == {dates[0]: 1.0, dates[1]: 2.0}
+
+    def test_validate_detail(self):
+        assert validate_detail("daily") == "daily"
+        with pytest.raises(ValueError, match="Unknown detail level"):
+            validate_detail("everything")
+
+
+class TestEngineDetail:
+    """The simulation keeps results at the requested detail level."""
+
+    @pytest.fixture
+    def prices(self, mock_prices):
+        return mock_prices(seed=11, drift=0.0005, days=300)
+
+    def _run(self, engine, detail):
+        return run_portfolio_simulation(
+            allocations={"TEST": 1.0},
+            start_date=date(2021, 1, 1),
+            end_date=date(2022, 2, 28),
+            portfolio_algo="per-asset:sd8",
+            initial_investment=100_000.0,
+            withdrawal_rate_pct=4.0,
+            engine=engine,
+            detail=detail,
+        )[1]
+
+    @pytest.mark.parametrize("engine", ["simpy", "fast"])
+    def test_detail_levels(self, prices, engine):
+        full = self._run(engine, "full")
+        daily = self._run(engine, "daily")
+        summary = self._run(engine, "summary")
+
+        assert "ledger" in full and "daily" in full
+        assert "ledger" not in daily and "daily" in daily
+        assert "ledger" not in summary and "daily" not in summary
+        assert "daily_bank_values" not in summary
+        assert summary["daily_bank_stats"] == full["daily_bank_stats"]
+        assert summary["total_final_value"] == full["total_final_value"]
+
+        series = daily["daily"]
+        assert len(series) == daily["trading_days"]
+        assert series.portfolio[-1] == pytest.approx(daily["total_final_value"])
+        assert np.nansum(series.withdrawals) == pytest.approx(daily["total_withdrawn"])
+        np.testing.assert_array_equal(series.portfolio, series.bank + series.asset("TEST"))
+
+    @pytest.mark.parametrize("engine", ["simpy", "fast"])
+    def test_buy_and_hold_on_step_path(self, mock_prices, engine):
+        mock_prices(closes=[100.0, 110.0, 121.0, 110.0, 100.0], start="2024-01-01")
+        summary = run_portfolio_simulation(
+            allocations={"TEST": 1.0},
+            start_date=date(2024, 1, 1),
+            end_date=date(2024, 1, 5),
+            portfolio_algo="per-asset:buy-and-hold",
+            initial_investment=10_000.0,
+            engine=engine,
+            detail="daily",
+        )[1]
+
+        # 100 shares bought on day one and never traded: value is 100 × close
+        series = summary["daily"]
+        assert series.portfolio.tolist() == [10_000.0, 11_000.0, 12_100.0, 11_000.0, 10_000.0]
+        assert series.bank.tolist() == [0.0] * 5
+        np.testing.assert_array_equal(series.asset("TEST"), series.portfolio)
+
+    def test_unknown_detail(self, prices):
+        with pytest.raises(ValueError, match="Unknown detail level"):
+            self._run("fast", "everything")
@@ -0,0 +1,170 @@
+"""Tests for results at several end dates from one simulation pass.
+
+Each horizon's results match a separate run ending on that date, on both
+engines, including the reference baseline and inflation-adjusted returns.
+"""
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.models.simulation import (
+    iter_portfolio_simulation,
+    run_portfolio_horizons,
+    run_portfolio_simulation,
+)
+from src.models.stop_conditions import PortfolioBelow
+
+START = date(2021, 1, 1)
+# The second end is a Saturday: that horizon ends on the Friday before
+END_DATES = [date(2021, 6, 30), date(2022, 1, 1), date(2022, 6, 30), date(2022, 11, 30)]
+
+
+@pytest.fixture
+def prices(mock_prices):
+    return mock_prices(seed=19)
+
+
+def _kwargs(prices, engine):
+    days = prices.index[[1, 70, 140, 210, 280, 350]]
+    return dict(
+        initial_investment=100_000.0,
+        withdrawal_rate_pct=6.0,
+        cash_interest_rate_pct=3.0,
+        reference_rate_ticker="REF",
+        inflation_rate_ticker="CPI",
+        allow_margin=True,
+        dividend_data={"TEST": pd.Series(0.4, index=days)},
+        engine=engine,
+        detail="full",
+    )
+
+
+SCALARS = (
+    "total_final_value",
+    "final_bank",
+    "final_asset_value",
+    "total_return",
+    "annualized_return",
+    "end_date",
+    "trading_days",
+    "transaction_count",
+    "total_withdrawn",
+    "cash_interest_earned",
+    "opportunity_cost",
+    "total_dividends",
+    "bank_min",
+    "bank_max",
+    "daily_bank_stats",
+    "volatility_alpha",
+    "cumulative_inflation",
+    "real_final_value",
+    "real_annualized_return",
+    "stop_reason",
+    "stop_date",
+)
+
+
+def _assert_same(horizon, separate):
+    horizon_transactions, horizon_summary = horizon
+    transactions, summary = separate
+    for key in SCALARS:
+        assert horizon_summary[key] == summary[key], key
+    assert horizon_summary["baseline"] == summary["baseline"]
+    # Idle spans split at the snapshots, which regroups the return statistics' sums
+    assert horizon_summary["metrics"] == pytest.approx(summary["metrics"], rel=1e-9)
+    assert len(horizon_summary["daily"]) == len(summary["daily"])
+    assert horizon_summary["daily"].bank.tolist() == summary["daily"].bank.tolist()
+    assert len(horizon_summary["ledger"]) == len(summary["ledger"])
+    assert list(horizon_summary["ledger"].lines) == list(summary["ledger"].lines)
+    assert [t.to_string() for t in horizon_transactions] == [t.to_string() for t in transactions]
+
+
+class TestHorizons:
+    """One pass yields the results of every end date."""
+
+    @pytest.mark.parametrize("engine", ["simpy", "fast"])
+    @pytest.mark.parametrize("algo", ["per-asset:sd8", "per-asset:buy-and-hold"])
+    def test_matches_separate_runs(self, prices, engine, algo):
+        horizons = run_portfolio_horizons(
+            {"TEST": 1.0}, START, END_DATES, algo, **_kwargs(prices, engine)
+        )
+        assert list(horizons) == END_DATES
+        assert horizons[date(2022, 1, 1)][1]["end_date"] == date(2021, 12, 31)
+        for end_date in END_DATES:
+            separate = run_portfolio_simulation(
+                {"TEST": 1.0}, START, end_date, algo, **_kwargs(prices, engine)
+            )
+            _assert_same(horizons[end_date], separate)
+
+    def test_ledger_stops_at_each_end_date(self, prices):
+        horizons = run_portfolio_horizons(
+            {"TEST": 1.0}, START, END_DATES, "per-asset:sd8", **_kwargs(prices, "fast")
+        )
+        final_ledger = horizons[END_DATES[-1]][1]["ledger"]
+        for end_date in END_DATES:
+            transactions, summary = horizons[end_date]
+            ledger = summary["ledger"]
+            assert len(ledger.lines) == len(ledger) == len(transactions)
+            assert ledger.to_string() == "\n".join(t.to_string() for t in transactions)
+            assert ledger.dates.max() <= np.datetime64(end_date)
+            assert all(tx.transaction_date <= end_date for tx in ledger.transactions)
+        assert len(horizons[END_DATES[0]][1]["ledger"]) < len(final_ledger)
+
+    @pytest.mark.parametrize("engine", ["simpy", "fast"])
+    def test_ledger_on_step_path(self, mock_prices, engine):
+        # Every 10% step crosses the sd8 trigger: sell on the way up, buy back down
+        mock_prices(closes=[100.0, 110.0, 121.0, 110.0, 100.0], start="2024-01-01")
+        ends = [date(2024, 1, 2), date(2024, 1, 3), date(2024, 1, 5)]
+        horizons = run_portfolio_horizons(
+            {"TEST": 1.0},
+            date(2024, 1, 1),
+            ends,
+            "per-asset:sd8",
+            initial_investment=10_000.0,
+            dividend_data={},
+            engine=engine,
+            detail="full",
+        )
+
+        expected = [
+            ("BUY", 100.0),
+            ("SELL", 110.0),
+            ("SELL", 121.0),
+            ("BUY", 110.0),
+            ("BUY", 100.0),
+        ]
+        for end_date, count in zip(ends, [2, 3, 5]):
+            ledger = horizons[end_date][1]["ledger"]
+            actions = [ledger.actions[code] for code in ledger.action_codes]
+            assert list(zip(actions, ledger.price.tolist())) == expected[:count]
+        # The first sale leaves the value at 100 × 110
+        assert horizons[ends[0]][1]["total_final_value"] == pytest.approx(11_000.0)
+
+    def test_ends_past_a_stop(self, prices):
+        kwargs = dict(_kwargs(prices, "fast"), stop_when=[PortfolioBelow(95_000.0)])
+        horizons = run_portfolio_horizons(
+            {"TEST": 1.0}, START, END_DATES, "per-asset:sd8", **kwargs
+        )
+        _, full = run_portfolio_simulation(
+            {"TEST": 1.0}, START, END_DATES[-1], "per-asset:sd8", **kwargs
+        )
+        stop_date = full["stop_date"]
+        assert stop_date is not None
+        for end_date in END_DATES:
+            summary = horizons[end_date][1]
+            if end_date < stop_date:
+                assert summary["stop_date"] is None
+            else:
+                assert summary["stop_date"] == stop_date
+                assert summary["total_final_value"] == full["total_final_value"]
+
+    def test_must_precede_iteration(self, prices):
+        simulation = iter_portfolio_simulation(
+            {"TEST": 1.0}, START, END_DATES[-1], "per-asset:sd8", engine="fast"
+        )
+        next(iter(simulation))
+        with pytest.raises(RuntimeError):
+            simulation.finish_at(END_DATES)
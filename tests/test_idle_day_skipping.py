@@ -0,0 +1,265 @@
+"""Tests for idle-day skipping in the fast simulation engine.
+
+The fast engine asks the algorithm for the next day on which it can act
+(Market.next_trigger_index for synthetic dividend orders, the rebalance
+calendar for rebalancing, never for buy-and-hold) and jumps over the idle
+days in between. Results must match the simpy engine exactly.
+"""
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import src.models.simulation as simulation
+from src.algorithms import QuarterlyRebalanceAlgorithm, SyntheticDividendAlgorithm
+from src.models.market import Market, Order, OrderAction, OrderType
+from src.models.market_data import AlignedPriceData
+from src.models.simulation import run_portfolio_simulation
+
+
+def _index_like_prices(periods: int = 1000, seed: int = 7) -> pd.DataFrame:
+    """Low-volatility random walk resembling a broad index ETF."""
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0003, 0.01, periods)))
+    return pd.DataFrame(
+        {"Open": close * 0.999, "High": close * 1.006, "Low": close * 0.994, "Close": close},
+        index=pd.bdate_range("2020-01-01", periods=periods),
+    )
+
+
+class TestNextTriggerIndex:
+    """Vectorized search for the next day an order can fill."""
+
+    low = np.array([95.0, 94.0, 92.0, 89.0, 93.0])
+    high = np.array([101.0, 99.0, 98.0, 97.0, 111.0])
+
+    def _market(self, *orders: Order) -> Market:
+        market = Market()
+        for order in orders:
+            market.place_order(order)
+        return market
+
+    def test_empty_book_never_triggers(self):
+        """No pending orders means no day can fill."""
+        assert Market().next_trigger_index(self.low, self.high) == 5
+
+    def test_buy_limit_triggers_on_low(self):
+        """A buy limit fills on the first day Low reaches it."""
+        market = self._market(Order(OrderAction.BUY, 10, OrderType.LIMIT, limit_price=90.0))
+        assert market.next_trigger_index(self.low, self.high) == 3
+
+    def test_sell_limit_triggers_on_high(self):
+        """A sell limit fills on the first day High reaches it."""
+        market = self._market(Order(OrderAction.SELL, 10, OrderType.LIMIT, limit_price=110.0))
+        assert market.next_trigger_index(self.low, self.high) == 4
+
+    def test_earliest_of_buy_and_sell(self):
+        """With both orders pending, the earlier trigger wins."""
+        market = self._market(
+            Order(OrderAction.BUY, 10, OrderType.LIMIT, limit_price=92.0),
+            Order(OrderAction.SELL, 10, OrderType.LIMIT, limit_price=110.0),
+        )
+        assert market.next_trigger_index(self.low, self.high) == 2
+        assert market.next_trigger_index(self.low, self.high, start=4) == 4
+
+    def test_limit_equal_to_price_triggers(self):
+        """Touching the limit exactly counts as a trigger, as in is_triggered()."""
+        market = self._market(Order(OrderAction.BUY, 10, OrderType.LIMIT, limit_price=94.0))
+        assert market.next_trigger_index(self.low, self.high) == 1
+
+    def test_nan_prices_never_trigger(self):
+        """Days with missing prices are skipped over."""
+        low = np.array([np.nan, np.nan, 80.0])
+        high = np.array([np.nan, np.nan, 85.0])
+        market = self._market(Order(OrderAction.BUY, 10, OrderType.LIMIT, limit_price=90.0))
+        assert market.next_trigger_index(low, high) == 2
+
+    def test_market_order_triggers_immediately(self):
+        """Market orders fill on the first evaluated day."""
+        market = self._market(Order(OrderAction.BUY, 10, OrderType.MARKET))
+        assert market.next_trigger_index(self.low, self.high, start=2) == 2
+
+    def test_distant_trigger_across_chunks(self):
+        """Triggers far beyond the first search chunk are found."""
+        low = np.full(5000, 100.0)
+        low[4321] = 50.0
+        high = low + 1.0
+        market = self._market(Order(OrderAction.BUY, 10, OrderType.LIMIT, limit_price=60.0))
+        assert market.next_trigger_index(low, high) == 4321
+
+
+class TestSyntheticDividendIdleDays:
+    """Synthetic dividend hooks used by the fast engine."""
+
+    def _data(self) -> AlignedPriceData:
+        df = pd.DataFrame(
+            {
+                "Open": [100.0, 101.0, 103.0, 99.0],
+                "High": [101.0, 104.0, np.nan, 102.0],
+                "Low": [99.0, 100.0, 101.0, 85.0],
+                "Close": [100.0, 103.0, 102.0, 90.0],
+            },
+            index=pd.bdate_range("2024-01-01", periods=4),
+        )
+        return AlignedPriceData.from_frames({"SPY": df}, date(2024, 1, 1), date(2024, 1, 31))
+
+    def test_next_active_day_is_first_fill(self):
+        """The next active day is the first day a bracket order fills."""
+        algo = SyntheticDividendAlgorithm(rebalance_size=0.0905, profit_sharing=0.5)
+        algo.on_new_holdings(holdings=100, current_price=100.0)
+        assert algo.next_active_day(self._data(), "SPY", 0) == 3
+
+    def test_skip_idle_days_tracks_all_time_high(self):
+        """Skipping idle days still records the highest High (ignoring NaN)."""
+        algo = SyntheticDividendAlgorithm(
+            rebalance_size=0.0905, profit_sharing=0.5, buyback_enabled=False
+        )
+        algo.on_new_holdings(holdings=100, current_price=100.0)
+        algo.skip_idle_days(self._data(), "SPY", 0, 3)
+        assert algo.all_time_high == 104.0
+        assert algo.ath_price == 104.0
+
+    def test_close_only_data_never_active(self):
+        """Without Low/High there is no range to fill orders against."""
+        df = pd.DataFrame({"Close": [100.0, 50.0]}, index=pd.bdate_range("2024-01-01", periods=2))
+        data = AlignedPriceData.from_frames({"SPY": df}, date(2024, 1, 1), date(2024, 1, 31))
+        algo = SyntheticDividendAlgorithm(rebalance_size=0.0905, profit_sharing=0.5)
+        algo.on_new_holdings(holdings=100, current_price=100.0)
+        assert algo.next_active_day(data, "SPY", 0) == 2
+
+
+class TestRebalanceCalendar:
+    """Rebalance days come from the calendar, not from prices."""
+
+    def _data(self) -> AlignedPriceData:
+        df = pd.DataFrame(
+            {"Close": np.linspace(100.0, 200.0, 300)},
+            index=pd.bdate_range("2024-01-01", periods=300),
+        )
+        return AlignedPriceData.from_frames({"VOO": df}, date(2024, 1, 1), date(2025, 12, 31))
+
+    def test_first_day_of_rebalance_month(self):
+        """Before any rebalance, the first trading day of a rebalance month is active."""
+        data = self._data()
+        algo = QuarterlyRebalanceAlgorithm({"VOO": 1.0}, rebalance_months=[3, 6, 9, 12])
+        assert data.dates[algo.next_active_day(data, 0)] == date(2024, 3, 1)
+
+    def test_minimum_spacing_after_rebalance(self):
+        """After a rebalance the next one waits at least 80 days."""
+        data = self._data()
+        algo = QuarterlyRebalanceAlgorithm({"VOO": 1.0}, rebalance_months=list(range(1, 13)))
+        algo.last_rebalance = date(2024, 1, 2)
+        next_day = data.dates[algo.next_active_day(data, 1)]
+        assert next_day == date(2024, 3, 22)  # Jan 2 + 80 days
+
+    def test_no_rebalance_left(self):
+        """Past the last rebalance month the algorithm is idle to the end."""
+        data = self._data()
+        algo = QuarterlyRebalanceAlgorithm({"VOO": 1.0}, rebalance_months=[1])
+        assert algo.next_active_day(data, data.index_of(date(2025, 2, 3))) == len(data)
+
+
+class TestFastEngineSkipping:
+    """Skipping must not change results, only the number of day steps."""
+
+    @pytest.fixture
+    def step_counter(self, monkeypatch, mock_prices):
+        """Serve index-like prices and count the days the engine steps."""
+        # Distinct path for a second asset so rebalancing has drift to correct
+        df = mock_prices(frame=_index_like_prices(), frames={"BND": _index_like_prices(seed=11)})
+
+        steps = {"count": 0}
+        step_day = simulation.process_market_day
+
+        def counting_step(*args, **kwargs):
+            steps["count"] += 1
+            return step_day(*args, **kwargs)
+
+        monkeypatch.setattr(simulation, "process_market_day", counting_step)
+        return df, steps
+
+    @pytest.mark.parametrize("algo", ["per-asset:sd4", "per-asset:sd8"])
+    def test_fewer_day_steps_with_identical_results(self, step_counter, algo):
+        """sd4-sd8 on an index-like series steps an order of magnitude fewer days."""
+        df, steps = step_counter
+        div_dates = df.index[[10, 70, 130, 190, 250, 400, 700]]
+        kwargs = dict(
+            allocations={"SPY": 0.9, "CASH": 0.1},
+            start_date=date(2020, 1, 1),
+            end_date=date(2024, 12, 31),
+            portfolio_algo=algo,
+            initial_investment=1_000_000.0,
+            withdrawal_rate_pct=4.0,
+            cash_interest_rate_pct=4.5,
+            dividend_data={
+                "SPY": pd.Series(1.5, index=div_dates),
+                "CASH": pd.Series(0.4, index=div_dates),
+            },
+        )
+
+        txns_simpy, summary_simpy = run_portfolio_simulation(engine="simpy", **kwargs)
+        simpy_steps = steps["count"]
+        steps["count"] = 0
+        txns_fast, summary_fast = run_portfolio_simulation(engine="fast", **kwargs)
+
+        assert simpy_steps == len(df)
+        assert steps["count"] * 10 < simpy_steps
+        assert [t.to_string() for t in txns_fast] == [t.to_string() for t in txns_simpy]
+        for key in ("daily_values", "daily_bank_values", "daily_asset_values", "total_final_value"):
+            assert summary_fast[key] == summary_simpy[key], key
+        assert summary_fast["bank_min"] == summary_simpy["bank_min"]
+        assert summary_fast["bank_max"] == summary_simpy["bank_max"]
+
+    @pytest.mark.parametrize(
+        "algo",
+        [
+            "per-asset:buy-and-hold",
+            "monthly-rebalance",
+            "quarterly-rebalance",
+            "annual-rebalance",
+        ],
+    )
+    def test_calendar_algorithms_step_only_trade_days(self, step_counter, algo):
+        """Buy-and-hold and rebalancing only step rebalance checks, with identical results."""
+        df, steps = step_counter
+        kwargs = dict(
+            allocations={"SPY": 0.6, "BND": 0.4},
+            start_date=date(2020, 1, 1),
+            end_date=date(2024, 12, 31),
+            portfolio_algo=algo,
+            initial_investment=1_000_000.0,
+            dividend_data={},
+        )
+
+        txns_simpy, summary_simpy = run_portfolio_simulation(engine="simpy", **kwargs)
+        steps["count"] = 0
+        txns_fast, summary_fast = run_portfolio_simulation(engine="fast", **kwargs)
+
+        assert steps["count"] <= 4 * 12  # at most one check per month over 4 years
+        assert [t.to_string() for t in txns_fast] == [t.to_string() for t in txns_simpy]
+        for key in ("daily_values", "daily_bank_values", "daily_asset_values", "total_final_value"):
+            assert summary_fast[key] == summary_simpy[key], key
+
+
+class TestDepletedRuns:
+    """Runs whose value ends at or below zero report no annualized rate."""
+
+    @pytest.mark.parametrize("engine", ["simpy", "fast"])
+    def test_annualized_return_is_nan(self, mock_prices, engine):
+        # Prices fall 2% a day while 60% withdrawals use up the holding
+        mock_prices(returns=np.full(500, -0.02), start="2021-01-01")
+        _, summary = run_portfolio_simulation(
+            allocations={"TEST": 1.0},
+            start_date=date(2021, 1, 1),
+            end_date=date(2022, 12, 30),
+            portfolio_algo="per-asset:buy-and-hold",
+            initial_investment=100_000.0,
+            allow_margin=True,
+            withdrawal_rate_pct=60.0,
+            dividend_data={},
+            engine=engine,
+        )
+        assert summary["total_final_value"] <= 0
+        assert np.isnan(summary["annualized_return"])
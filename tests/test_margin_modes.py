@@ -5,6 +5,7 @@ Test allow_margin parameter: simple bank vs strict whole account modes.
 from datetime import date
 
 import pandas as pd
+import pytest
 
 from src.models.backtest import SyntheticDividendAlgorithm, run_algorithm_backtest
 
@@ -121,6 +122,9 @@ def test_allow_margin_false_bank_never_negative():
     skip_messages = [t for t in transactions if t.action == "SKIP BUY"]
     assert len(skip_messages) > 0, "Should have SKIP BUY transaction messages"
     assert len(skip_messages) == summary["skipped_buys"]
+    assert summary["skipped_buy_value"] == pytest.approx(
+        sum(t.price * t.qty for t in skip_messages)
+    )
 
 
 def test_strict_mode_withdrawal_covers_negative_balance():
@@ -160,6 +164,8 @@ def test_strict_mode_withdrawal_covers_negative_balance():
 
     assert summary["bank_min"] >= 0, "Bank should never go negative in strict mode"
     assert summary["shares_sold_for_withdrawals"] > 0, "Should sell shares for withdrawals"
+    forced_sales = [t for t in transactions if t.action == "SELL" and "withdrawal" in t.notes]
+    assert summary["shares_sold_for_withdrawals"] == sum(t.qty for t in forced_sales)
     assert summary["allow_margin"] is False
 
 
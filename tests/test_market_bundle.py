@@ -0,0 +1,150 @@
+"""Tests for market data loaded once and shared across runs.
+
+A run on a MarketDataBundle (or a slice of one) matches a run that fetches
+its own data, without fetching anything; bundles survive pickling.
+"""
+
+import pickle
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from src.models.market_bundle import MarketDataBundle
+from src.models.simulation import run_portfolio_simulation
+
+START, END = date(2021, 1, 1), date(2022, 11, 30)
+ALLOCATIONS = {"TEST": 0.7, "OTHER": 0.3}
+
+
+@pytest.fixture
+def prices(mock_prices):
+    return mock_prices(seed=23, scale={"TEST": 1.0, "OTHER": 0.5, "REF": 1.0, "CPI": 1.0})
+
+
+@pytest.fixture
+def dividends(prices):
+    days = prices.index[[1, 70, 140, 210, 280, 350, 420]]
+    return {"TEST": pd.Series(0.4, index=days), "OTHER": pd.Series(0.3, index=days[1:])}
+
+
+TICKERS = dict(reference_rate_ticker="REF", inflation_rate_ticker="CPI")
+
+
+def _run(start, end, engine, **kwargs):
+    return run_portfolio_simulation(
+        ALLOCATIONS,
+        start,
+        end,
+        "per-asset:sd8",
+        initial_investment=100_000.0,
+        withdrawal_rate_pct=5.0,
+        cash_interest_rate_pct=2.0,
+        allow_margin=True,
+        engine=engine,
+        detail="daily",
+        **TICKERS,
+        **kwargs,
+    )
+
+
+def _assert_same(result, expected):
+    transactions, summary = result
+    expected_transactions, expected_summary = expected
+    for key in ("total_final_value", "final_bank", "total_dividends", "opportunity_cost"):
+        assert summary[key] == expected_summary[key], key
+    assert summary["baseline"] == expected_summary["baseline"]
+    assert summary["real_final_value"] == expected_summary["real_final_value"]
+    assert summary["daily"].bank.tolist() == expected_summary["daily"].bank.tolist()
+    assert [t.to_string() for t in transactions] == [t.to_string() for t in expected_transactions]
+
+
+class RefusingFetcher:
+    def get_history(self, ticker, start_date, end_date):
+        raise AssertionError(f"fetched {ticker}")
+
+
+class TestBundleRuns:
+    """Runs on a bundle match runs that fetch their own data."""
+
+    @pytest.mark.parametrize("engine", ["simpy", "fast"])
+    def test_matches_fresh_run(self, prices, dividends, engine):
+        bundle = MarketDataBundle.load(ALLOCATIONS, START, END, dividend_data=dividends, **TICKERS)
+        expected = _run(START, END, engine, dividend_data=dividends)
+        _assert_same(_run(START, END, engine, market_bundle=bundle), expected)
+
+    @pytest.mark.parametrize("engine", ["simpy", "fast"])
+    def test_slice_matches_fresh_run(self, prices, dividends, engine):
+        bundle = MarketDataBundle.load(ALLOCATIONS, START, END, dividend_data=dividends, **TICKERS)
+        for start, end in [(date(2021, 3, 1), date(2021, 12, 31)), (date(2022, 2, 5), END)]:
+            expected = _run(start, end, engine, dividend_data=dividends)
+            _assert_same(_run(start, end, engine, market_bundle=bundle), expected)
+
+    @pytest.mark.parametrize("engine", ["simpy", "fast"])
+    def test_slice_on_linear_path(self, mock_prices, monkeypatch, engine):
+        # TEST rises $5 a day from 100 and OTHER is half of it; nothing else trades
+        mock_prices(
+            closes=[100.0 + 5.0 * day for day in range(20)],
+            start="2024-01-01",
+            scale={"TEST": 1.0, "OTHER": 0.5},
+        )
+        halves = {"TEST": 0.5, "OTHER": 0.5}
+        bundle = MarketDataBundle.load(
+            halves, date(2024, 1, 1), date(2024, 1, 26), dividend_data={}
+        )
+        monkeypatch.setattr("src.data.fetcher.HistoryFetcher", RefusingFetcher)
+        _, summary = run_portfolio_simulation(
+            halves,
+            date(2024, 1, 8),
+            date(2024, 1, 22),
+            "per-asset:buy-and-hold",
+            initial_investment=10_000.0,
+            engine=engine,
+            market_bundle=bundle,
+        )
+
+        # Bought at 125 and 62.5 on the slice's first day, valued at 175 and 87.5
+        assert summary["assets"]["TEST"]["final_holdings"] == 40.0
+        assert summary["assets"]["OTHER"]["final_holdings"] == 80.0
+        assert summary["total_final_value"] == 14_000.0
+
+    def test_does_not_fetch(self, prices, dividends, monkeypatch):
+        bundle = MarketDataBundle.load(ALLOCATIONS, START, END, dividend_data=dividends, **TICKERS)
+        monkeypatch.setattr("src.data.fetcher.HistoryFetcher", RefusingFetcher)
+        _run(date(2021, 6, 1), END, "fast", market_bundle=bundle)
+
+    def test_pickle_round_trip(self, prices, dividends):
+        bundle = MarketDataBundle.load(ALLOCATIONS, START, END, dividend_data=dividends, **TICKERS)
+        restored = pickle.loads(pickle.dumps(bundle))
+        assert not restored.prices.close.flags.writeable
+        _assert_same(
+            _run(START, END, "fast", market_bundle=restored),
+            _run(START, END, "fast", market_bundle=bundle),
+        )
+
+
+class TestBundleChecks:
+    """Bundles refuse runs they were not loaded for."""
+
+    @pytest.fixture
+    def bundle(self, prices, dividends):
+        return MarketDataBundle.load(ALLOCATIONS, START, END, dividend_data=dividends, **TICKERS)
+
+    def test_other_tickers(self, bundle):
+        with pytest.raises(ValueError):
+            run_portfolio_simulation(
+                {"TEST": 1.0}, START, END, "per-asset:sd8", market_bundle=bundle
+            )
+        with pytest.raises(ValueError):
+            _run(START, END, "fast", market_bundle=bundle, risk_free_rate_ticker="RF")
+
+    def test_range_outside_bundle(self, bundle):
+        with pytest.raises(ValueError):
+            bundle.between(date(2020, 6, 1), END)
+
+    def test_between_full_range_is_same_bundle(self, bundle):
+        assert bundle.between(START, END) is bundle
+        window = bundle.between(date(2021, 3, 1), date(2021, 12, 31))
+        assert window.dates[0] == date(2021, 3, 1)
+        assert window.dates[-1] == date(2021, 12, 31)
+        assert window.cumulative_inflation[date(2021, 3, 1)] == 1.0
@@ -0,0 +1,263 @@
+"""Tests for the aligned price data and lazy price history used by the simulation engine."""
+
+from datetime import date
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.algorithms import (
+    AlgorithmBase,
+    BuyAndHoldAlgorithm,
+    PerAssetPortfolioAlgorithm,
+    QuarterlyRebalanceAlgorithm,
+    SyntheticDividendAlgorithm,
+)
+from src.models.backtest import run_algorithm_backtest, run_portfolio_backtest
+from src.models.market_data import AlignedPriceData, PriceHistory
+from src.models.model_types import Bar, Transaction
+
+
+def _frame(dates, closes, with_ohlc=True):
+    data = {"Close": closes}
+    if with_ohlc:
+        data["Open"] = [c - 1 for c in closes]
+        data["High"] = [c + 2 for c in closes]
+        data["Low"] = [c - 2 for c in closes]
+    return pd.DataFrame(data, index=pd.to_datetime(dates))
+
+
+class TestAlignedPriceData:
+    """Alignment, positional lookups and price rows."""
+
+    def test_aligns_on_common_dates(self):
+        """Only dates present for every ticker (and within range) are kept."""
+        a = _frame(["2024-01-01", "2024-01-02", "2024-01-03", "2024-01-04"], [10, 11, 12, 13])
+        b = _frame(["2024-01-02", "2024-01-03", "2024-01-04", "2024-01-05"], [20, 21, 22, 23])
+
+        data = AlignedPriceData.from_frames({"A": a, "B": b}, date(2024, 1, 1), date(2024, 1, 3))
+
+        assert data.dates == [date(2024, 1, 2), date(2024, 1, 3)]
+        assert len(data) == 2
+        assert data.index_of(date(2024, 1, 3)) == 1
+        assert data.close_at("A", 0) == 11.0
+        assert data.close_at("B", 1) == 21.0
+        np.testing.assert_array_equal(data.closes("B"), [20.0, 21.0])
+        np.testing.assert_array_equal(data.high[data.row("A")], [13.0, 14.0])
+
+    def test_arrays_are_float64_and_read_only(self):
+        """Arrays are contiguous float64 and cannot be mutated by consumers."""
+        a = _frame(["2024-01-01", "2024-01-02"], [10, 11])
+        data = AlignedPriceData.from_frames({"A": a}, date(2024, 1, 1), date(2024, 1, 2))
+
+        assert data.close.dtype == np.float64
+        assert data.close.flags["C_CONTIGUOUS"]
+        with pytest.raises(ValueError):
+            data.close[0, 0] = 1.0
+
+    def test_no_common_dates_raises(self):
+        """Disjoint calendars are rejected with the engine's error message."""
+        a = _frame(["2024-01-01"], [10])
+        b = _frame(["2024-01-02"], [20])
+
+        with pytest.raises(ValueError, match="No common trading dates"):
+            AlignedPriceData.from_frames({"A": a, "B": b}, date(2024, 1, 1), date(2024, 1, 2))
+
+
+class TestBar:
+    """Bar price rows and their Series-style compatibility accessors."""
+
+    def test_bar_matches_source_row(self):
+        """bar() holds the same OHLC values as the DataFrame row."""
+        a = _frame(["2024-01-01", "2024-01-02"], [10, 11])
+        data = AlignedPriceData.from_frames({"A": a}, date(2024, 1, 1), date(2024, 1, 2))
+
+        assert data.bar("A", 1) == Bar(open=10.0, high=13.0, low=9.0, close=11.0)
+        assert data.bar("A", 1).to_series().to_dict() == a.iloc[1].to_dict()
+
+    def test_series_style_access(self):
+        """Algorithms written for Series rows keep working."""
+        bar = Bar(open=10.0, high=13.0, low=9.0, close=11.0)
+
+        assert bar["Close"] == 11.0
+        assert bar.get("High") == 13.0
+        assert bar.get("Volume") is None
+        assert "Low" in bar
+        assert list(bar.index) == ["Open", "High", "Low", "Close"]
+
+    def test_series_style_scalars_support_item(self):
+        """Series-style access returns NumPy scalars, so .item() callers keep working."""
+        bar = Bar(open=10.0, high=13.0, low=9.0, close=11.0)
+
+        assert bar["Close"].item() == 11.0
+        assert bar.get("High").item() == 13.0
+
+    def test_missing_fields_are_absent(self):
+        """Close-only data yields NaN fields that Series-style access treats as missing."""
+        a = _frame(["2024-01-01", "2024-01-02"], [10, 11], with_ohlc=False)
+        data = AlignedPriceData.from_frames({"A": a}, date(2024, 1, 1), date(2024, 1, 2))
+
+        bar = data.bar("A", 0)
+        assert np.isnan(bar.high)
+        assert bar.get("High") is None
+        assert "High" not in bar
+        assert bar.index == ["Close"]
+        with pytest.raises(KeyError):
+            bar["High"]
+
+    def test_from_series_row(self):
+        """from_row() accepts pandas rows, including missing columns."""
+        bar = Bar.from_row(pd.Series({"High": np.float64(13.0), "Close": 11.0}))
+
+        assert bar.high == 13.0
+        assert type(bar.high) is float
+        assert np.isnan(bar.open)
+        assert Bar.from_row(bar) is bar
+
+
+class TestPriceHistory:
+    """Lazy history views passed to algorithms."""
+
+    def _data(self):
+        a = _frame(["2024-01-01", "2024-01-02", "2024-01-03", "2024-01-04"], [10, 11, 12, 13])
+        return AlignedPriceData.from_frames({"A": a}, date(2024, 1, 1), date(2024, 1, 4))
+
+    def test_prefix_excludes_current_day(self):
+        """History at day i covers days [0, i) only."""
+        history = PriceHistory(self._data(), "A", 2)
+
+        assert len(history) == 2
+        assert not history.empty
+        assert history.dates == [date(2024, 1, 1), date(2024, 1, 2)]
+        np.testing.assert_array_equal(history.close, [10.0, 11.0])
+        np.testing.assert_array_equal(history.low, [8.0, 9.0])
+
+    def test_first_day_is_empty(self):
+        """No history exists on the first trading day."""
+        history = PriceHistory(self._data(), "A", 0)
+
+        assert history.empty
+        assert len(history) == 0
+        assert history.to_frame().empty
+
+    def test_dataframe_access_materializes(self):
+        """DataFrame-style access matches the equivalent boolean-mask slice."""
+        history = PriceHistory(self._data(), "A", 3)
+
+        frame = history.to_frame()
+        assert list(frame.index) == [date(2024, 1, 1), date(2024, 1, 2), date(2024, 1, 3)]
+        assert list(history["Close"]) == [10.0, 11.0, 12.0]
+        assert history.iloc[-1]["High"] == 14.0
+        assert list(history.columns) == ["Open", "High", "Low", "Close"]
+        # Materialized once and reused
+        assert history.to_frame() is frame
+
+
+class _HistoryRecorder(AlgorithmBase):
+    """Test algorithm that records the history it is given."""
+
+    def __init__(self, needs_history: bool) -> None:
+        super().__init__()
+        self.needs_history = needs_history
+        self.seen: List[Optional[int]] = []
+        self.closes: List[float] = []
+
+    def on_new_holdings(self, holdings: float, current_price: float) -> None:
+        pass
+
+    def on_day(self, date_, price_row, holdings, bank, history) -> List[Transaction]:
+        self.seen.append(None if history is None else len(history))
+        self.closes.append(price_row["Close"])
+        return []
+
+    def on_end_holding(self) -> None:
+        pass
+
+
+class TestEngineHistory:
+    """The engine builds history only for algorithms that ask for it."""
+
+    @pytest.fixture(autouse=True)
+    def prices(self, mock_prices):
+        """Five flat business days, Monday 2024-01-01 to Friday 2024-01-05."""
+        return mock_prices(returns=np.zeros(5), start="2024-01-01")
+
+    def _run(self, algo: AlgorithmBase) -> None:
+        run_portfolio_backtest(
+            allocations={"TEST": 1.0},
+            start_date=date(2024, 1, 1),
+            end_date=date(2024, 1, 5),
+            portfolio_algo=PerAssetPortfolioAlgorithm({"TEST": algo}),
+            initial_investment=10_000.0,
+            dividend_data={},
+        )
+
+    def test_history_provided_when_needed(self):
+        """Algorithms that read history see one more day each trading day."""
+        algo = _HistoryRecorder(needs_history=True)
+        self._run(algo)
+        assert algo.seen == [0, 1, 2, 3, 4]
+
+    def test_history_skipped_when_not_needed(self):
+        """Algorithms that opt out receive None."""
+        algo = _HistoryRecorder(needs_history=False)
+        self._run(algo)
+        assert algo.seen == [None] * 5
+
+    def test_price_row_indexing(self):
+        """Algorithms that index price_row["Close"] still get the day's close."""
+        algo = _HistoryRecorder(needs_history=False)
+        self._run(algo)
+        assert algo.closes == [100.0] * 5
+
+    def test_builtin_algorithms_opt_out(self):
+        """Built-in algorithms declare that they do not read history."""
+        assert not BuyAndHoldAlgorithm.needs_history
+        assert not SyntheticDividendAlgorithm.needs_history
+        assert not QuarterlyRebalanceAlgorithm.needs_history
+        assert not PerAssetPortfolioAlgorithm({"A": BuyAndHoldAlgorithm()}).needs_history
+        assert PerAssetPortfolioAlgorithm({"A": _HistoryRecorder(True)}).needs_history
+
+
+class TestPriceFrames:
+    """Preloaded price frames replace fetching."""
+
+    @pytest.fixture
+    def no_fetching(self, monkeypatch, tmp_path):
+        class RefusingFetcher:
+            def __init__(self, *args, **kwargs):
+                raise AssertionError("HistoryFetcher used despite preloaded frames")
+
+        monkeypatch.setattr("src.data.fetcher.HistoryFetcher", RefusingFetcher)
+        monkeypatch.chdir(tmp_path)
+        return tmp_path
+
+    def test_portfolio_backtest_uses_frames(self, no_fetching):
+        a = _frame(pd.bdate_range("2024-01-01", periods=30), [100.0 + i for i in range(30)])
+        _, summary = run_portfolio_backtest(
+            allocations={"A": 1.0},
+            start_date=date(2024, 1, 1),
+            end_date=date(2024, 2, 9),
+            portfolio_algo="per-asset:buy-and-hold",
+            initial_investment=10_000.0,
+            dividend_data={},
+            reference_rate_ticker="REF",
+            price_frames={"A": a, "REF": a},
+        )
+        assert summary["trading_days"] == 30
+        assert summary["baseline"]["end_price"] == 129.0
+
+    def test_single_ticker_backtest_writes_nothing(self, no_fetching):
+        df = _frame(pd.bdate_range("2024-01-01", periods=30), [100.0 + i for i in range(30)])
+        _, summary = run_algorithm_backtest(
+            df,
+            "A",
+            initial_qty=100,
+            algo=BuyAndHoldAlgorithm(),
+            dividend_series=pd.Series(dtype=float),
+            reference_rate_ticker="REF",
+            inflation_rate_ticker="CPI",
+        )
+        assert summary["total"] == 100 * 129.0
+        assert list(no_fetching.iterdir()) == []
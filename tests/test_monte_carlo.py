@@ -0,0 +1,216 @@
+"""Tests for the Monte Carlo engine over synthetic price paths.
+
+Each cell of the N-path × K-column engine matches the single-path engines on
+the same prices, and the distribution statistics summarize the cells.
+"""
+
+import contextlib
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.models.monte_carlo import (
+    MonteCarloResult,
+    run_monte_carlo,
+    simulate_paths,
+    survival_table,
+)
+from src.models.parameter_grid import GridConfig, run_synthetic_dividend_grid
+from src.models.price_paths import GBM
+from src.models.simulation import run_portfolio_simulation, withdrawal_schedule
+from src.synthetic_dividend_tool import main
+
+CONFIGS = [
+    "buy-and-hold",
+    "sd8",
+    "sd16,75",
+    GridConfig(0.0905, 0.5, sell_at_new_ath=True),
+    GridConfig(0.0905, 0.5, buyback_enabled=False),
+    GridConfig(0.0905, 0.5, bracket_seed=100.0),
+]
+
+
+@pytest.fixture(scope="module")
+def paths():
+    return GBM(0.05, 0.45).generate(3, 252 * 4, seed=3)
+
+
+@pytest.fixture(scope="module")
+def result():
+    with contextlib.redirect_stdout(io.StringIO()):
+        return run_monte_carlo(
+            GBM(0.03, 0.35),
+            n_paths=300,
+            years=15,
+            configs=["buy-and-hold", "sd8"],
+            withdrawal_rates=[0, 5, 10],
+            seed=9,
+            batch_paths=128,
+            allow_margin=False,
+        )
+
+
+class TestParity:
+    """Cells match single-path backtests of the same prices."""
+
+    @pytest.mark.parametrize("allow_margin", [True, False])
+    def test_matches_grid_engine(self, paths, allow_margin):
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = simulate_paths(paths, CONFIGS, allow_margin=allow_margin)
+        for p in range(paths.n_paths):
+            with contextlib.redirect_stdout(io.StringIO()):
+                summaries, _ = run_synthetic_dividend_grid(
+                    paths.frame(p),
+                    "X",
+                    CONFIGS,
+                    initial_investment=1_000_000,
+                    dividend_series=pd.Series(dtype=float),
+                    allow_margin=allow_margin,
+                )
+            expected = [s["total"] for s in summaries]
+            assert result.final_value[p] == pytest.approx(expected, rel=1e-9)
+            assert result.transaction_count[p].tolist() == [
+                s["transaction_count"] for s in summaries
+            ]
+
+    def test_matches_portfolio_simulation_with_withdrawals(self, paths):
+        configs, rates = ["buy-and-hold", "sd8"], [4.0, 15.0]
+        result = simulate_paths(paths, configs, rates, allow_margin=False, cash_interest_rate_pct=3)
+        for p in range(paths.n_paths):
+            k = 0
+            for config in configs:
+                for rate in rates:
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        _, summary = run_portfolio_simulation(
+                            {"X": 1.0},
+                            paths.dates[0],
+                            paths.dates[-1],
+                            f"per-asset:{config}",
+                            allow_margin=False,
+                            withdrawal_rate_pct=rate,
+                            cash_interest_rate_pct=3,
+                            price_frames={"X": paths.frame(p)},
+                            dividend_data={"X": pd.Series(dtype=float)},
+                            engine="fast",
+                        )
+                    assert result.final_value[p, k] == pytest.approx(
+                        summary["total_final_value"], rel=1e-9, abs=1e-6
+                    )
+                    assert result.total_withdrawn[p, k] == pytest.approx(
+                        summary["total_withdrawn"], rel=1e-9
+                    )
+                    k += 1
+
+
+class TestDeterministicPaths:
+    """Paths without volatility have results known in closed form."""
+
+    def test_rising_path(self):
+        # Every day rises by exp(0.1 / 252): after 252 days the price is 100·e^0.1
+        paths = GBM(0.1, 0.0).generate(2, 253, seed=1)
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = simulate_paths(paths, ["buy-and-hold", "sd8"])
+        assert result.final_value[:, 0] == pytest.approx(1_000_000 * np.exp(0.1))
+        assert np.all(result.max_drawdown == 0)
+        # The 10.5% rise crosses the 9.05% sd8 trigger once: one sale after the purchase
+        assert result.transaction_count[:, 1].tolist() == [2, 2]
+
+    def test_depletion_on_flat_path(self):
+        paths = GBM(0.0, 0.0).generate(1, 253, seed=1)
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = simulate_paths(paths, ["buy-and-hold"], [100.0, 120.0], allow_margin=False)
+        due = withdrawal_schedule(paths.dates, 30)
+        amount = 1_000_000 * 30 / 365.25
+
+        # Eleven withdrawals fall due: at 100% they leave 1,000,000 less eleven
+        # payments, and at 120% the eleventh runs the portfolio dry
+        assert len(due) == 11
+        assert result.final_value[0, 0] == pytest.approx(1_000_000 - 11 * amount)
+        assert result.depleted_day[0].tolist() == [-1, due[10]]
+        assert result.total_withdrawn[0, 1] == pytest.approx(1_000_000)
+
+
+class TestStatistics:
+    """Results summarize survival and return distributions."""
+
+    def test_columns(self, result):
+        assert result.labels == ["buy-and-hold"] * 3 + ["sd8"] * 3
+        assert result.withdrawal_rates.tolist() == [0, 5, 10, 0, 5, 10]
+        assert result.final_value.shape == (300, 6)
+        assert result.baseline_columns().tolist() == [0, 1, 2, 0, 1, 2]
+        assert np.all(result.alpha()[:, :3] == 0)
+
+    def test_survival_falls_with_withdrawal_rate(self, result):
+        survival = result.survival_probability()
+        assert survival[0] == survival[3] == 1.0
+        assert np.all(np.diff(survival[:3]) <= 0) and np.all(np.diff(survival[3:]) <= 0)
+        assert survival[2] < 1.0
+        depleted = result.depleted_day >= 0
+        assert np.all(result.final_value[depleted] <= 0)
+
+        table = survival_table(result)
+        assert table.loc["sd8", 10.0] == survival[5]
+
+    def test_summary(self, result):
+        summary = result.summary()
+        assert summary.columns[:4].tolist() == [
+            "label",
+            "withdrawal_rate_pct",
+            "survival_probability",
+            "median_depletion_years",
+        ]
+        assert {"total_return_p5", "total_return_p95", "alpha_p50"} <= set(summary.columns)
+        assert np.all(summary["total_return_p5"] <= summary["total_return_p95"])
+        assert summary["median_max_drawdown"].between(0, 1).all()
+
+    def test_reproducible_and_batched(self, result):
+        with contextlib.redirect_stdout(io.StringIO()):
+            again = run_monte_carlo(
+                GBM(0.03, 0.35),
+                300,
+                15,
+                ["buy-and-hold", "sd8"],
+                [0, 5, 10],
+                seed=9,
+                batch_paths=128,
+                allow_margin=False,
+            )
+        assert np.array_equal(again.final_value, result.final_value)
+
+    def test_float32(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = run_monte_carlo(
+                GBM(0.07, 0.2), 50, 5, ["buy-and-hold", "sd8"], seed=1, dtype=np.float32
+            )
+        assert result.final_value.dtype == np.float32
+        assert result.depleted_day.dtype == np.int32
+
+    def test_concat(self, result):
+        halves = MonteCarloResult.concat([result, result])
+        assert halves.n_paths == 600
+        assert np.array_equal(halves.survival_probability(), result.survival_probability())
+
+    def test_no_baseline(self, paths):
+        result = simulate_paths(paths, ["sd8"])
+        with pytest.raises(ValueError):
+            result.alpha()
+        assert "alpha_p50" not in result.summary()
+
+
+class TestMonteCarloCommand:
+    """The monte-carlo CLI prints and writes the summary."""
+
+    def test_writes_summary(self, tmp_path, capsys):
+        output = tmp_path / "mc.csv"
+        argv = ["monte-carlo", "--paths", "40", "--years", "3", "--seed", "2"]
+        argv += ["--withdrawal-rates", "0", "4", "--output", str(output)]
+        assert main(argv) == 0
+        summary = pd.read_csv(output)
+        assert summary["label"].tolist() == ["buy-and-hold", "buy-and-hold", "sd8", "sd8"]
+        assert "survival_probability" in capsys.readouterr().out
+
+    def test_bootstrap_needs_history(self, capsys):
+        assert main(["monte-carlo", "--model", "bootstrap"]) == 1
+        assert "--ticker" in capsys.readouterr().out
@@ -1,17 +1,19 @@
 """Unit tests for multi-bracket gap handling.
 
-Tests verify that when price gaps by more than one bracket width,
-the algorithm correctly processes multiple transactions on the same day.
+Tests verify that when the day's range spans more than one bracket width,
+the algorithm processes multiple transactions on the same day, each one
+bracket beyond the previous fill.
 
 Example: With 9.05% brackets (sd8):
 - Start at $100, sell at $109.05
-- If price gaps from $100 to $120 (20% jump = 2.2 brackets)
-- Should trigger sells at $109.05 AND $118.92 on the same day
+- If price gaps from $100 to $120, the sell fills at the $120 open
+- If the day then runs on to $132, a second sell fills at $120 * 1.0905 = $130.86
 """
 
 from datetime import date, timedelta
 
 import pandas as pd
+import pytest
 
 from src.models.backtest import SyntheticDividendAlgorithm, run_algorithm_backtest
 
@@ -19,6 +21,7 @@ from src.models.backtest import SyntheticDividendAlgorithm, run_algorithm_backte
 def create_multi_bracket_gap_scenario(
     start_price: float = 100.0,
     gap_multiplier: float = 1.20,  # 20% gap = 2.2 brackets for sd8
+    gap_day_range: float = 1.0,
 ) -> pd.DataFrame:
     """Create price history with a controlled multi-bracket gap.
 
@@ -36,6 +39,7 @@ def create_multi_bracket_gap_scenario(
     Args:
         start_price: Starting price level
         gap_multiplier: Multiplier for the gap (1.20 = 20% gap)
+        gap_day_range: Ratio of the gap day's High to its Open
 
     Returns:
         DataFrame with Date index and OHLC columns
@@ -73,6 +77,7 @@ def create_multi_bracket_gap_scenario(
         }
     )
     df.set_index("Date", inplace=True)
+    df.loc[dates[20], "High"] = gap_price * gap_day_range
 
     return df
 
@@ -123,21 +128,47 @@ class TestMultiBracketGaps:
         assert len(sells) == 2, f"Expected 2 total sells, got {len(sells)}"
         assert len(gap_day_sells) == 1, f"Expected 1 sell on gap day, got {len(gap_day_sells)}"
 
-    def test_double_bracket_gap(self):
-        """Test: 20% gap with 9.05% bracket should trigger TWO sells.
+    def test_pure_gap_fills_at_open_and_reanchors(self):
+        """Test: a 20% gap with no range beyond the open sells once, at the open.
+
+        The re-placed brackets are anchored at the fill price, as the ladder
+        would continue: the next sell is one bracket above the $120 open.
+        """
+        df = create_multi_bracket_gap_scenario(start_price=100.0, gap_multiplier=1.20)
+
+        algo = SyntheticDividendAlgorithm(
+            rebalance_size=9.05 / 100.0, profit_sharing=50.0 / 100.0, buyback_enabled=True
+        )
+
+        txns, summary = run_algorithm_backtest(
+            df=df,
+            ticker="TEST",
+            initial_qty=1000,
+            start_date=df.index[0],
+            end_date=df.index[-1],
+            algo=algo,
+        )
+
+        gap_day_sells = [
+            t for t in txns if t.action == "SELL" and t.transaction_date == date(2024, 1, 21)
+        ]
+        assert [(round(t.limit_price, 2), t.price) for t in gap_day_sells] == [(109.05, 120.0)]
+
+        limits = sorted(order.limit_price for order in algo.market.pending_orders)
+        assert limits == pytest.approx([120.0 / 1.0905, 120.0 * 1.0905])
 
-        Current behavior: Only processes one transaction per day (BUG)
-        Expected behavior: Should process both bracket triggers
+    def test_double_bracket_gap(self):
+        """Test: 20% gap running on to $132 should trigger TWO sells.
 
         Math:
         - Start: $100
-        - Bracket 1 sell: $100 * 1.0905 = $109.05
-        - Bracket 2 sell: $109.05 * 1.0905 = $118.92
-        - Gap to: $120 (exceeds both thresholds)
+        - Bracket 1 sell: $100 * 1.0905 = $109.05, gapped through: fills at the $120 open
+        - Bracket 2 sell: $120 * 1.0905 = $130.86, one bracket beyond the fill
+        - Day's high: $132 (reaches bracket 2, not bracket 3 at $142.70)
         - Should trigger: 2 sells on same day
         """
         df = create_multi_bracket_gap_scenario(
-            start_price=100.0, gap_multiplier=1.20  # 20% gap = 2.2 brackets
+            start_price=100.0, gap_multiplier=1.20, gap_day_range=1.10
         )
 
         algo = SyntheticDividendAlgorithm(
@@ -166,26 +197,21 @@ class TestMultiBracketGaps:
         for i, t in enumerate(txns):
             print(f"  {i+1}. {t.to_string()}")
 
-        # EXPECTED (after fix): 1 buy, 2 sells
-        # CURRENT (before fix): 1 buy, 1 sell (BUG - misses second bracket)
+        gap_day_sells = [t for t in sells if t.transaction_date == date(2024, 1, 21)]
 
-        # Temporarily mark expected behavior for when we fix the algorithm
-        # assert len(buys) == 1, f"Expected 1 buy, got {len(buys)}"
-        # assert len(sells) == 2, f"Expected 2 sells (multi-bracket), got {len(sells)}"
+        # 1 buy (dip), then 2 sells on the gap day; the top rung's buyback sits
+        # one bracket below it, at the $120 the price settles at afterwards
+        assert len([t for t in buys if t.transaction_date < date(2024, 1, 21)]) == 1
+        assert len(gap_day_sells) == 2, f"Expected 2 gap-day sells, got {len(gap_day_sells)}"
 
-        # Current assertion (documents the bug)
-        assert len(buys) == 1, f"Expected 1 buy, got {len(buys)}"
-        if len(sells) == 1:
-            print("\n⚠️  BUG CONFIRMED: Only processed ONE sell despite 20% gap")
-            print("    Expected: 2 sells (one at each bracket level)")
-            print("    Algorithm returns after first transaction per day")
-        else:
-            print("\n✅ BUG FIXED: Correctly processed MULTIPLE sells on gap day")
+        # The gapped rung fills at the open, the next one bracket above it
+        assert [round(t.limit_price, 2) for t in gap_day_sells] == [109.05, 130.86]
+        assert [round(t.price, 2) for t in gap_day_sells] == [120.0, 130.86]
 
     def test_triple_bracket_gap(self):
-        """Test: 30% gap should trigger THREE sells."""
+        """Test: 30% gap running on another 20% should trigger THREE sells."""
         df = create_multi_bracket_gap_scenario(
-            start_price=100.0, gap_multiplier=1.30  # 30% gap = 3.3 brackets
+            start_price=100.0, gap_multiplier=1.30, gap_day_range=1.20  # Up to $156
         )
 
         algo = SyntheticDividendAlgorithm(
@@ -211,27 +237,23 @@ class TestMultiBracketGaps:
         print(f"  Buys: {len(buys)}")
         print(f"  Sells: {len(sells)}")
 
-        # EXPECTED: 1 buy, 3 sells
-        # CURRENT: 1 buy, 1 sell (BUG - misses 2nd and 3rd brackets)
+        gap_day_sells = [t for t in sells if t.transaction_date == date(2024, 1, 21)]
 
-        assert len(buys) == 1, f"Expected 1 buy, got {len(buys)}"
-        if len(sells) == 1:
-            print("\n⚠️  BUG CONFIRMED: Only processed ONE sell despite 30% gap")
-            print("    Expected: 3 sells (brackets at +9.05%, +18.92%, +29.67%)")
-        else:
-            print(f"\n✅ Processed {len(sells)} sells (expected 3)")
+        # Bracket 1 at the $130 open, then $141.77 and $154.60 within the day's range
+        assert len([t for t in buys if t.transaction_date < date(2024, 1, 21)]) == 1
+        assert len(gap_day_sells) == 3, f"Expected 3 gap-day sells, got {len(gap_day_sells)}"
 
     def test_gap_down_multiple_buys(self):
         """Test: Large gap DOWN should trigger multiple BUY orders.
 
-        Example: Price crashes 20% in one day (e.g., market crash)
-        - Should buy at multiple bracket levels
+        Example: Price gaps down 20% and keeps falling in the day (e.g., market crash)
+        - Should buy at the open, then one bracket below the fill
         - Each buy should go onto the buyback stack
         """
         # Create crash scenario
         dates = [date(2024, 1, 1) + timedelta(days=i) for i in range(20)]
         start_price = 100.0
-        crash_price = 80.0  # 20% crash = ~2.2 brackets down
+        crash_price = 80.0  # Gaps through the $91.70 buy
 
         prices = [start_price] * 10 + [crash_price] * 10
 
@@ -245,6 +267,7 @@ class TestMultiBracketGaps:
             }
         )
         df.set_index("Date", inplace=True)
+        df.loc[dates[10], "Low"] = 72.0  # Reaches $80 / 1.0905 = $73.36
 
         algo = SyntheticDividendAlgorithm(
             rebalance_size=9.05 / 100.0, profit_sharing=50.0 / 100.0, buyback_enabled=True
@@ -262,18 +285,18 @@ class TestMultiBracketGaps:
         # Count transactions (transactions are now Transaction objects)
         # Exclude initial purchase from counts
         buys = [t for t in txns if t.action == "BUY" and "Initial purchase" not in t.notes]
+        assert [round(t.price, 2) for t in buys] == [80.0, 73.36]
 
         print("\nGap DOWN (20% crash):")
         print(f"  Total buys: {len(buys)}")
 
-        # EXPECTED: 2 buys (one at each bracket level)
-        # CURRENT: 1 buy (BUG - misses second bracket)
+        # One buy at each bracket level, each a separate stack entry
+        assert len(buys) == 2, f"Expected 2 buys, got {len(buys)}"
+        assert algo.buyback_stack_count == pytest.approx(sum(t.qty for t in buys))
 
-        if len(buys) == 1:
-            print("\n⚠️  BUG CONFIRMED: Only processed ONE buy despite 20% crash")
-            print("    Expected: 2 buys (one at each bracket down)")
-        else:
-            print(f"\n✅ Processed {len(buys)} buys (expected 2)")
+        # Each rung's quantity follows from the holdings after the previous rung
+        first, second = buys
+        assert second.qty == pytest.approx(first.qty * (1 + 0.0905 * 0.5))
 
 
 class TestGapBonusVolatilityAlpha:
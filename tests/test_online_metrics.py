@@ -0,0 +1,194 @@
+"""Tests for the online (streaming) simulation metrics.
+
+Each metric is checked against a direct computation over the full daily
+series, and update_span() against the same days folded in one at a time.
+"""
+
+import math
+from datetime import date
+
+import numpy as np
+import pytest
+
+from src.models.daily_series import daily_bank_stats
+from src.models.online_metrics import (
+    BankMetric,
+    DrawdownMetric,
+    InterestMetric,
+    MetricSet,
+    OnlineMetric,
+    ReturnStatsMetric,
+)
+from src.models.simulation import run_portfolio_simulation
+from src.models.synthetic_portfolio import SyntheticPortfolio
+
+
+@pytest.fixture
+def days():
+    rng = np.random.default_rng(7)
+    n = 400
+    portfolio = 1000.0 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, n)))
+    bank = np.cumsum(rng.normal(0.0, 20.0, n))
+    interest = np.where(bank > 0, bank * 0.0001, bank * 0.0002)
+    return portfolio, bank, interest
+
+
+def _per_day(metric, portfolio, bank, interest, withdrawn=0.0):
+    for value, balance, credited in zip(portfolio.tolist(), bank.tolist(), interest.tolist()):
+        metric.update(value, balance, credited, withdrawn)
+    return metric.result()
+
+
+def _spans(metric, portfolio, bank, interest, cuts=(1, 57, 58, 200, 333)):
+    bounds = [0, *cuts, len(portfolio)]
+    for start, stop in zip(bounds, bounds[1:]):
+        metric.update_span(portfolio[start:stop], bank[start:stop], interest[start:stop], 0.0)
+    return metric.result()
+
+
+class TestMetrics:
+    """Metric values against direct computation over the series."""
+
+    def test_drawdown(self, days):
+        portfolio, bank, interest = days
+        result = _per_day(DrawdownMetric(), portfolio, bank, interest)
+        peaks = np.maximum.accumulate(portfolio)
+        assert result["max_drawdown"] == ((peaks - portfolio) / peaks).max()
+        assert result["peak_value"] == portfolio.max()
+        assert result["drawdown_days"] == int((portfolio < peaks).sum())
+
+    def test_return_stats(self, days):
+        portfolio, bank, interest = days
+        result = _per_day(ReturnStatsMetric(), portfolio, bank, interest)
+        returns = portfolio[1:] / portfolio[:-1] - 1.0
+        assert result["return_days"] == len(returns)
+        assert result["mean_daily_return"] == pytest.approx(returns.mean(), rel=1e-9)
+        assert result["daily_volatility"] == pytest.approx(returns.std(ddof=1), rel=1e-9)
+        downside = math.sqrt((np.minimum(returns, 0.0) ** 2).mean())
+        assert result["sortino_ratio"] == pytest.approx(
+            returns.mean() / downside * math.sqrt(252), rel=1e-9
+        )
+        assert result["sharpe_ratio"] == pytest.approx(
+            returns.mean() / returns.std(ddof=1) * math.sqrt(252), rel=1e-9
+        )
+
+    def test_withdrawals_are_not_losses(self):
+        metric = ReturnStatsMetric()
+        metric.update(100.0, 0.0, 0.0, 0.0)
+        metric.update(90.0, 0.0, 0.0, 10.0)  # Flat day with a 10.0 withdrawal
+        metric.update(99.0, 0.0, 0.0, 10.0)
+        assert metric.result()["mean_daily_return"] == pytest.approx(0.05)
+
+    def test_bank(self, days):
+        portfolio, bank, interest = days
+        result = _per_day(BankMetric(), portfolio, bank, interest)
+        for key, value in daily_bank_stats(bank).items():
+            assert result[key] == value, key
+        negative = np.concatenate(([0], (bank < 0).astype(int), [0]))
+        edges = np.flatnonzero(np.diff(negative))
+        assert result["bank_max_negative_streak"] == (edges[1::2] - edges[::2]).max()
+
+    def test_interest(self, days):
+        portfolio, bank, interest = days
+        result = _per_day(InterestMetric(), portfolio, bank, interest)
+        assert result["total_interest"] == pytest.approx(interest.sum())
+        assert result["interest_days"] == int((interest > 0).sum())
+
+    @pytest.mark.parametrize(
+        "metric_class", [DrawdownMetric, ReturnStatsMetric, BankMetric, InterestMetric]
+    )
+    def test_span_matches_per_day(self, days, metric_class):
+        portfolio, bank, interest = days
+        expected = _per_day(metric_class(), portfolio, bank, interest)
+        result = _spans(metric_class(), portfolio, bank, interest)
+        assert result.keys() == expected.keys()
+        for key in expected:
+            assert result[key] == pytest.approx(expected[key], rel=1e-9), key
+        if metric_class is BankMetric:
+            assert result == expected
+
+    def test_metric_set_always_has_bank(self, days):
+        metrics = MetricSet([DrawdownMetric])
+        _per_day(metrics, *days)
+        result = metrics.result()
+        assert "bank_min" in result and "max_drawdown" in result
+        assert "sharpe_ratio" not in result
+
+    def test_incomplete_metric_fails_on_creation(self):
+        class UpdateOnly(OnlineMetric):
+            def update(self, portfolio, bank, interest, withdrawn):
+                pass
+
+        with pytest.raises(TypeError):
+            UpdateOnly()
+
+    def test_synthetic_portfolio_drawdown(self):
+        portfolio = SyntheticPortfolio(cash=100.0)
+        for day, value in enumerate([100.0, 120.0, 90.0, 130.0, 117.0], start=1):
+            portfolio.bank = value
+            portfolio._create_snapshot(date(2024, 1, day), {})
+        assert portfolio.max_drawdown == pytest.approx(0.25)
+
+
+class TestEngineMetrics:
+    """The simulation reports metrics at every detail level."""
+
+    @pytest.fixture
+    def prices(self, mock_prices):
+        return mock_prices(seed=5, drift=0.0005, days=300)
+
+    def _run(self, engine, detail):
+        return run_portfolio_simulation(
+            allocations={"TEST": 0.9, "CASH": 0.1},
+            start_date=date(2021, 1, 1),
+            end_date=date(2022, 2, 28),
+            portfolio_algo="per-asset:sd8",
+            initial_investment=100_000.0,
+            withdrawal_rate_pct=6.0,
+            cash_interest_rate_pct=4.0,
+            allow_margin=True,
+            dividend_data={},
+            engine=engine,
+            detail=detail,
+        )[1]
+
+    def test_summary_detail_matches_daily_series(self, prices):
+        daily = self._run("fast", "daily")
+        summary = self._run("fast", "summary")
+        series = daily["daily"]
+
+        assert summary["metrics"] == daily["metrics"]
+        assert summary["daily_bank_stats"] == series.bank_stats()
+        peaks = np.maximum.accumulate(series.portfolio)
+        assert summary["metrics"]["max_drawdown"] == ((peaks - series.portfolio) / peaks).max()
+        assert summary["metrics"]["total_interest"] == pytest.approx(
+            summary["cash_interest_earned"] - summary["opportunity_cost"]
+        )
+
+    @pytest.mark.parametrize("engine", ["simpy", "fast"])
+    def test_buy_and_hold_on_hand_built_path(self, mock_prices, engine):
+        mock_prices(closes=[100.0, 120.0, 90.0, 130.0, 117.0], start="2024-01-01")
+        metrics = run_portfolio_simulation(
+            allocations={"TEST": 1.0},
+            start_date=date(2024, 1, 1),
+            end_date=date(2024, 1, 5),
+            portfolio_algo="per-asset:buy-and-hold",
+            initial_investment=10_000.0,
+            dividend_data={},
+            engine=engine,
+            detail="summary",
+        )[1]["metrics"]
+
+        # Worst fall is 120 → 90; days 3 and 5 close below the running peak
+        assert metrics["max_drawdown"] == pytest.approx(0.25)
+        assert metrics["peak_value"] == 13_000.0
+        assert metrics["drawdown_days"] == 2
+        assert metrics["mean_daily_return"] == pytest.approx((0.2 - 0.25 + 40 / 90 - 0.1) / 4)
+        assert metrics["bank_min"] == metrics["bank_max"] == 0.0
+
+    def test_engines_agree(self, prices):
+        simpy_metrics = self._run("simpy", "summary")["metrics"]
+        fast_metrics = self._run("fast", "summary")["metrics"]
+        assert simpy_metrics.keys() == fast_metrics.keys()
+        for key in simpy_metrics:
+            assert fast_metrics[key] == pytest.approx(simpy_metrics[key], rel=1e-9), key
@@ -11,7 +11,15 @@ The tests document the expected behavior for all combinations of:
 - Whether order triggers and at what price it fills
 """
 
-from src.models.market import Order, OrderAction, OrderType
+import dataclasses
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.models.market import BracketLadder, Fill, Market, Order, OrderAction, OrderType
+from src.models.model_types import Transaction
 
 
 class TestBuyLimitOrderTriggering:
@@ -248,3 +256,196 @@ class TestMarketOrderExecutionPrice:
         price = order.get_execution_price(open_price, low, high)
 
         assert price == 51.23, "Market order should fill at open price"
+
+
+class TestLadderGapFills:
+    """Test multi-bracket fills along an order's BracketLadder.
+
+    Rungs continue one bracket from each fill price: a 10% sell ladder whose
+    first rung fills at a $115 open (gapped through $100) continues at
+    $126.50, $139.15, ...
+    """
+
+    ladder = BracketLadder(rebalance_size=0.10, quantity_growth=0.5)
+
+    def _evaluate(self, *orders, open_, low, high):
+        market = Market()
+        for order in orders:
+            market.place_order(order)
+        prices = pd.Series({"Open": open_, "High": high, "Low": low, "Close": open_})
+        return market, market.evaluate_day(date(2024, 1, 2), prices)
+
+    def test_sell_gap_fills_every_rung_crossed(self):
+        """The gapped first rung fills at the open; later rungs, beyond it, at their limits."""
+        order = Order(OrderAction.SELL, 8.0, limit_price=100.0, notes="Sell", ladder=self.ladder)
+        market, txns = self._evaluate(order, open_=115.0, low=114.0, high=140.0)
+
+        assert [t.limit_price for t in txns] == pytest.approx([100.0, 126.5, 139.15])
+        assert [t.price for t in txns] == pytest.approx([115.0, 126.5, 139.15])
+        assert [t.qty for t in txns] == [8.0, 4.0, 2.0]
+        assert [t.notes.split(":")[0] for t in txns] == ["Sell #1", "Sell #2", "Sell #3"]
+        assert not market.has_pending_orders()
+
+    def test_pure_gap_fills_once(self):
+        """A gap with no range beyond the open fills only the first rung."""
+        order = Order(OrderAction.SELL, 8.0, limit_price=100.0, ladder=self.ladder)
+        _, txns = self._evaluate(order, open_=125.0, low=125.0, high=125.0)
+
+        assert [(t.limit_price, t.price) for t in txns] == [(100.0, 125.0)]
+
+    def test_buy_gap_fills_every_rung_crossed(self):
+        """A crash through three buy rungs fills all three in one pass."""
+        ladder = BracketLadder(rebalance_size=0.10, quantity_growth=1.1)
+        order = Order(OrderAction.BUY, 10.0, limit_price=100.0, ladder=ladder)
+        _, txns = self._evaluate(order, open_=95.0, low=78.0, high=96.0)
+
+        assert [t.limit_price for t in txns] == pytest.approx([100.0, 95 / 1.1, 95 / 1.21])
+        assert [t.price for t in txns] == pytest.approx([95.0, 95 / 1.1, 95 / 1.21])
+        assert [t.qty for t in txns] == pytest.approx([10.0, 11.0, 12.1])
+
+    def test_seeded_ladder_stays_on_seed_rungs(self):
+        """With a bracket seed, rungs continue from the fill price's nearest seed rung."""
+        ladder = BracketLadder(rebalance_size=0.10, quantity_growth=0.5, bracket_seed=100.0)
+        order = Order(OrderAction.SELL, 8.0, limit_price=110.0, ladder=ladder)
+        _, txns = self._evaluate(order, open_=115.0, low=114.0, high=140.0)
+
+        # $115 is nearest the $110 rung, so the ladder continues at $121, $133.10
+        assert [t.price for t in txns] == pytest.approx([115.0, 121.0, 133.1])
+
+    def test_exact_rung_boundary_fills(self):
+        """A range that exactly touches a rung fills it (Low <= limit)."""
+        # Doubling ladder so every rung is exact in floating point
+        ladder = BracketLadder(rebalance_size=1.0, quantity_growth=1.0)
+        order = Order(OrderAction.BUY, 10.0, limit_price=128.0, ladder=ladder)
+        _, txns = self._evaluate(order, open_=128.0, low=32.0, high=128.0)
+
+        assert [t.limit_price for t in txns] == [128.0, 64.0, 32.0]
+
+    def test_extreme_gap_is_not_truncated(self):
+        """A 99% crash through a 1% ladder fills every rung, far beyond 20."""
+        ladder = BracketLadder(rebalance_size=0.01, quantity_growth=1.0)
+        order = Order(OrderAction.BUY, 1.0, limit_price=100.0, ladder=ladder)
+        _, txns = self._evaluate(order, open_=100.0, low=1.0, high=100.0)
+
+        # 100 / 1.01^k >= 1 for k <= log(100) / log(1.01) = 462.8
+        assert len(txns) == 463
+
+    def test_without_ladder_fills_once(self):
+        """Orders without a ladder fill a single time however far the gap runs."""
+        order = Order(OrderAction.SELL, 8.0, limit_price=100.0)
+        _, txns = self._evaluate(order, open_=150.0, low=150.0, high=160.0)
+
+        assert len(txns) == 1
+
+    def test_both_sides_triggered_fill_first_rungs_only(self):
+        """With a buy and a sell triggered the intraday path is unknown: no cascade."""
+        buy = Order(OrderAction.BUY, 10.0, limit_price=90.0, ladder=self.ladder)
+        sell = Order(OrderAction.SELL, 8.0, limit_price=110.0, ladder=self.ladder)
+        _, txns = self._evaluate(buy, sell, open_=100.0, low=60.0, high=140.0)
+
+        assert [(t.action, t.price) for t in txns] == [("BUY", 90.0), ("SELL", 110.0)]
+
+
+class TestFillRecords:
+    """Test the typed execution records returned by Market.evaluate_day."""
+
+    def test_fill_keeps_full_precision_price(self):
+        """Fill price and limit are not rounded to cents."""
+        order = Order(OrderAction.BUY, 1000.0, limit_price=91.70105456212747, notes="Buying back")
+        market = Market()
+        market.place_order(order)
+        prices = pd.Series({"Open": 95.0, "High": 96.0, "Low": 90.0, "Close": 91.0})
+        (fill,) = market.evaluate_day(date(2024, 1, 2), prices)
+
+        assert fill.price == 91.70105456212747
+        assert fill.limit_price == 91.70105456212747
+        assert fill.side is OrderAction.BUY
+        assert fill.action == "BUY"
+        assert fill.rung == 1
+
+    def test_notes_rendered_from_fields(self):
+        """Notes keep the established format, rendered on access."""
+        fill = Fill(OrderAction.SELL, 10, 120.0, 118.9175, rung=2, order_notes="Taking profits")
+        assert fill.notes == "Taking profits #2: limit=$118.92, filled=$120.00"
+
+    def test_market_fill_notes(self):
+        fill = Fill(OrderAction.BUY, 10, 51.23, None)
+        assert fill.notes == "#1: market fill=$51.23"
+
+    def test_has_every_transaction_field(self):
+        """Fields a Fill does not set keep the Transaction defaults."""
+        fill = Fill(OrderAction.BUY, 10, 51.23, 50.0)
+        plain = Transaction(action="BUY", qty=10, price=51.23, limit_price=50.0)
+        for field in dataclasses.fields(Transaction):
+            if field.name != "notes":
+                assert getattr(fill, field.name) == getattr(plain, field.name), field.name
+
+    def test_notes_can_be_overridden(self):
+        fill = Fill(OrderAction.BUY, 10, 51.23, 50.0)
+        fill.notes = "custom"
+        assert fill.notes == "custom"
+
+
+class TestOrderBook:
+    """Test the price-indexed order book kept by Market."""
+
+    def _prices(self, low, high):
+        return pd.Series({"Open": low, "High": high, "Low": low, "Close": low})
+
+    def test_pending_orders_keep_placement_order(self):
+        """Ladders are sorted by price, but pending_orders reports placement order."""
+        market = Market()
+        orders = [
+            Order(OrderAction.SELL, 1.0, limit_price=120.0),
+            Order(OrderAction.BUY, 1.0, limit_price=80.0),
+            Order(OrderAction.SELL, 1.0, limit_price=110.0),
+            Order(OrderAction.BUY, 1.0, limit_price=90.0),
+        ]
+        for order in orders:
+            market.place_order(order)
+
+        assert market.pending_orders == orders
+        assert market.get_pending_order_count() == 4
+
+    def test_only_best_prices_trigger(self):
+        """A range reaching the best bid and ask leaves deeper orders pending."""
+        market = Market()
+        for limit in (80.0, 90.0):
+            market.place_order(Order(OrderAction.BUY, 1.0, limit_price=limit))
+        for limit in (110.0, 120.0):
+            market.place_order(Order(OrderAction.SELL, 1.0, limit_price=limit))
+
+        fills = market.evaluate_day(date(2024, 1, 2), self._prices(low=85.0, high=115.0))
+
+        assert [t.limit_price for t in fills] == [90.0, 110.0]
+        assert [o.limit_price for o in market.pending_orders] == [80.0, 120.0]
+
+    def test_fills_follow_placement_order(self):
+        """Triggered orders fill in the order they were placed, not by price."""
+        market = Market()
+        market.place_order(Order(OrderAction.SELL, 1.0, limit_price=105.0))
+        market.place_order(Order(OrderAction.BUY, 1.0, limit_price=95.0))
+        market.place_order(Order(OrderAction.BUY, 1.0, limit_price=99.0))
+
+        fills = market.evaluate_day(date(2024, 1, 2), self._prices(low=90.0, high=110.0))
+
+        assert [(t.action, t.limit_price) for t in fills] == [
+            ("SELL", 105.0),
+            ("BUY", 95.0),
+            ("BUY", 99.0),
+        ]
+        assert not market.has_pending_orders()
+
+    def test_replace_orders_swaps_whole_book(self):
+        market = Market()
+        market.place_order(Order(OrderAction.BUY, 1.0, limit_price=90.0))
+        market.place_order(Order(OrderAction.SELL, 1.0, order_type=OrderType.MARKET))
+
+        replacement = [
+            Order(OrderAction.BUY, 2.0, limit_price=95.0),
+            Order(OrderAction.SELL, 2.0, limit_price=105.0),
+        ]
+        market.replace_orders(replacement)
+
+        assert market.pending_orders == replacement
+        assert market.next_trigger_index(np.array([99.0, 94.0]), np.array([101.0, 96.0])) == 1
@@ -0,0 +1,132 @@
+"""Tests for running backtest jobs over a process pool.
+
+Jobs run in worker processes on shared-memory price arrays give the same
+results as serial runs and as run_portfolio_backtest itself.
+"""
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.models.backtest import run_portfolio_backtest
+from src.models.market_bundle import MarketDataBundle
+from src.models.parallel_runner import (
+    BacktestJob,
+    ParallelBacktestRunner,
+    SharedBundle,
+    compact_summary,
+)
+
+START, END = date(2021, 1, 1), date(2022, 11, 30)
+
+
+@pytest.fixture
+def prices(mock_prices, monkeypatch):
+    df = mock_prices(seed=29, scale={"AAA": 1.0, "BBB": 0.4, "REF": 2.0})
+
+    def dividends(ticker, start_date, end_date):
+        days = df.index[[1, 100, 200, 300, 400]]
+        return pd.Series(0.3, index=days) if ticker == "AAA" else None
+
+    monkeypatch.setattr("src.models.simulation.fetch_dividend_series", dividends)
+    return df
+
+
+JOBS = [
+    BacktestJob({"AAA": 1.0}, "per-asset:sd8", START, END, tag="sd8"),
+    BacktestJob({"AAA": 1.0}, "per-asset:buy-and-hold", date(2021, 6, 1), END, initial_qty=100),
+    BacktestJob(
+        {"AAA": 0.6, "BBB": 0.4},
+        "quarterly-rebalance",
+        date(2021, 3, 1),
+        date(2022, 6, 30),
+        withdrawal_rate_pct=4.0,
+        reference_rate_ticker="REF",
+    ),
+    BacktestJob({"BBB": 1.0}, "per-asset:sd16", START, date(2022, 1, 31)),
+    BacktestJob({"MISSING": 1.0}, "per-asset:sd8", START, END),
+]
+
+
+class TestParallelRunner:
+    """Pool runs agree with serial runs."""
+
+    def test_matches_direct_runs(self, prices):
+        results = ParallelBacktestRunner(workers=1).run_all(JOBS[:4])
+        for result in results:
+            job = result.job
+            assert result.error is None
+            investment = job.initial_investment
+            if job.initial_qty is not None:
+                first_close = prices.loc[str(job.start_date) :].iloc[0]["Close"]
+                investment = job.initial_qty * float(first_close)
+            _, summary = run_portfolio_backtest(
+                job.allocations,
+                job.start_date,
+                job.end_date,
+                job.portfolio_algo,
+                initial_investment=investment,
+                withdrawal_rate_pct=job.withdrawal_rate_pct,
+                reference_rate_ticker=job.reference_rate_ticker,
+                engine="fast",
+                detail="summary",
+            )
+            assert result.summary == compact_summary(summary)
+
+    def test_buy_and_hold_on_linear_path(self, mock_prices, monkeypatch):
+        # AAA rises $1 a day from 100, closing at 110 on Jan 15 and 119 on Jan 26
+        mock_prices(closes=[100.0 + day for day in range(20)], start="2024-01-01")
+        monkeypatch.setattr("src.models.simulation.fetch_dividend_series", lambda *args: None)
+        jobs = [
+            BacktestJob(
+                {"AAA": 1.0},
+                "per-asset:buy-and-hold",
+                date(2024, 1, day),
+                date(2024, 1, 26),
+                initial_qty=qty,
+            )
+            for day, qty in [(1, 100), (15, 50)]
+        ]
+        results = ParallelBacktestRunner(workers=2).run_all(jobs)
+        assert [r.summary["total_final_value"] for r in results] == [100 * 119.0, 50 * 119.0]
+        assert [r.summary["initial_investment"] for r in results] == [100 * 100.0, 50 * 110.0]
+
+    def test_pool_matches_serial(self, prices):
+        serial = ParallelBacktestRunner(workers=1).run_all(JOBS)
+        pooled = ParallelBacktestRunner(workers=3).run_all(JOBS)
+        assert [r.position for r in pooled] == list(range(len(JOBS)))
+        assert [r.summary for r in pooled] == [r.summary for r in serial]
+        assert pooled[0].job.tag == "sd8"
+
+    def test_errors_are_reported(self, prices):
+        result = ParallelBacktestRunner(workers=2).run_all(JOBS)[-1]
+        assert result.summary is None
+        assert "MISSING" in result.error
+
+    def test_streams_in_completion_order(self, prices):
+        seen = [result.position for result in ParallelBacktestRunner(workers=2).run(JOBS)]
+        assert sorted(seen) == list(range(len(JOBS)))
+
+
+class TestSharedBundle:
+    """Bundles round-trip through shared memory."""
+
+    def test_attach_rebuilds_bundle(self, prices):
+        bundle = MarketDataBundle.load({"AAA": 0.5, "BBB": 0.5}, START, END)
+        handle, block = SharedBundle.publish(bundle)
+        try:
+            attached, view = handle.attach()
+            assert attached.dates == bundle.dates
+            assert np.array_equal(attached.prices.close, bundle.prices.close)
+            assert attached.dividend_events == bundle.dividend_events
+            assert not attached.prices.close.flags.writeable
+            view.close()
+        finally:
+            block.close()
+            block.unlink()
+
+    def test_compact_summary_drops_series(self):
+        summary = {"total": 1.0, "daily": [1.0, 2.0], "assets": {"A": {"v": 2, "lots": []}}}
+        assert compact_summary(summary) == {"total": 1.0, "assets": {"A": {"v": 2}}}
@@ -0,0 +1,189 @@
+"""Tests for the vectorized synthetic dividend parameter grid.
+
+run_synthetic_dividend_grid() advances K configurations together over one
+aligned price array. Each configuration must produce exactly what
+run_algorithm_backtest() produces for it on its own, including the ledger.
+"""
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.algorithms import (
+    BuyAndHoldAlgorithm,
+    QuarterlyRebalanceAlgorithm,
+    SyntheticDividendAlgorithm,
+    build_algo_from_name,
+)
+from src.models.backtest import run_algorithm_backtest
+from src.models.market_data import AlignedPriceData
+from src.models.parameter_grid import (
+    GridConfig,
+    run_synthetic_dividend_grid,
+    simulate_synthetic_dividend_grid,
+)
+
+GRID_NAMES = [
+    "buy-and-hold",
+    "sd4",
+    "sd8",
+    "sd8,75",
+    "sd-9.15,50,100",
+    "sd-ath-only-9.15,50",
+    "sd-ath-sell-9.15,50",
+    "sd6,125",
+]
+
+
+def _volatile_prices(periods: int = 500, seed: int = 7, vol: float = 0.025) -> pd.DataFrame:
+    """OHLC random walk with gaps, so some fills happen at the Open."""
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0008, vol, periods)))
+    open_ = close * np.exp(rng.normal(0, 0.02, periods))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.015, periods)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.015, periods)))
+    return pd.DataFrame(
+        {"Open": open_, "High": high, "Low": low, "Close": close},
+        index=pd.bdate_range("2020-01-01", periods=periods),
+    )
+
+
+def _ledger(transactions):
+    return [
+        (
+            t.transaction_date,
+            t.action,
+            t.qty,
+            t.price,
+            t.ticker,
+            t.notes,
+            t.limit_price,
+            t.bank_after,
+        )
+        for t in transactions
+    ]
+
+
+class TestGridParity:
+    """Every grid result equals the corresponding single backtest."""
+
+    @pytest.fixture
+    def prices(self):
+        return _volatile_prices()
+
+    @pytest.fixture
+    def dividends(self, prices):
+        # First-day and second-day dividends exercise both payment orderings
+        return pd.Series([0.5, 0.4, 0.3, 0.6], index=prices.index[[0, 1, 200, 450]])
+
+    def _assert_parity(self, prices, tmp_path, names=GRID_NAMES, **kwargs):
+        summaries, ledgers = run_synthetic_dividend_grid(
+            prices, "TEST", names, record_ledgers=True, **kwargs
+        )
+        assert len(summaries) == len(ledgers) == len(names)
+
+        for name, summary, ledger in zip(names, summaries, ledgers):
+            transactions, expected = run_algorithm_backtest(
+                df=prices,
+                ticker="TEST",
+                algo=build_algo_from_name(name),
+                engine="fast",
+                cache_dir=str(tmp_path),
+                **kwargs,
+            )
+            assert _ledger(ledger) == _ledger(transactions), name
+            for key, value in expected.items():
+                if key == "bank_avg":
+                    assert summary[key] == pytest.approx(value), name
+                elif key == "metrics":
+                    assert summary[key] == pytest.approx(value, rel=1e-9), name
+                elif isinstance(value, float) and np.isnan(value):
+                    assert np.isnan(summary[key]), (name, key)
+                else:
+                    assert summary[key] == value, (name, key)
+
+    def test_margin_mode(self, prices, dividends, tmp_path):
+        self._assert_parity(prices, tmp_path, dividend_series=dividends)
+
+    def test_strict_mode(self, prices, dividends, tmp_path):
+        self._assert_parity(prices, tmp_path, dividend_series=dividends, allow_margin=False)
+
+    def test_reference_fallback_rate(self, prices, dividends, tmp_path):
+        """Negative banks pay the fallback opportunity cost, stepping every day."""
+        self._assert_parity(
+            prices, tmp_path, dividend_series=dividends, reference_rate_ticker="VOO"
+        )
+
+    def test_initial_qty_without_dividends(self, prices, tmp_path):
+        self._assert_parity(
+            prices,
+            tmp_path,
+            dividend_series=pd.Series(dtype=float),
+            allow_margin=False,
+            initial_qty=1000,
+        )
+
+    def test_multi_bracket_gaps(self, dividends, tmp_path):
+        """Crypto-like moves cross several narrow brackets in one day."""
+        prices = _volatile_prices(vol=0.07)
+        names = GRID_NAMES + ["sd16", "sd24"]
+        self._assert_parity(prices, tmp_path, names=names, dividend_series=dividends)
+
+        _, ledgers = run_synthetic_dividend_grid(
+            prices, "TEST", ["sd24"], dividend_series=dividends, record_ledgers=True
+        )
+        assert any(" #3: " in t.notes for t in ledgers[0])
+
+
+class TestGridConfig:
+    """Configurations accepted by the grid."""
+
+    def test_from_synthetic_dividend(self):
+        algo = SyntheticDividendAlgorithm(
+            rebalance_size=0.0915, profit_sharing=0.5, buyback_enabled=False
+        )
+        config = GridConfig.from_algorithm(algo)
+        assert config.rebalance_size == 0.0915
+        assert config.profit_sharing == 0.5
+        assert config.buyback_enabled is False
+
+    def test_buy_and_hold_never_trades(self):
+        config = GridConfig.from_algorithm(BuyAndHoldAlgorithm())
+        assert config.rebalance_size == 0.0
+        assert config.profit_sharing == 0.0
+
+    def test_coerce_name(self):
+        assert GridConfig.coerce("sd8") == GridConfig.coerce(build_algo_from_name("sd8"))
+
+    def test_rejects_other_algorithms(self):
+        with pytest.raises(TypeError):
+            GridConfig.coerce(QuarterlyRebalanceAlgorithm({"VOO": 1.0}))
+
+
+class TestGridSimulation:
+    """simulate_synthetic_dividend_grid() on pre-aligned data."""
+
+    def _data(self) -> AlignedPriceData:
+        return AlignedPriceData.from_frames(
+            {"TEST": _volatile_prices(periods=120)}, date(2020, 1, 1), date(2020, 12, 31)
+        )
+
+    def test_empty_grid(self):
+        summaries, ledgers = simulate_synthetic_dividend_grid(self._data(), "TEST", [])
+        assert summaries == []
+        assert ledgers is None
+
+    def test_ledgers_only_when_requested(self):
+        summaries, ledgers = simulate_synthetic_dividend_grid(self._data(), "TEST", ["sd8"])
+        assert len(summaries) == 1
+        assert ledgers is None
+
+    def test_configs_are_independent(self):
+        """A config's result does not depend on which other configs share the grid."""
+        data = self._data()
+        alone, _ = simulate_synthetic_dividend_grid(data, "TEST", ["sd8"])
+        together, _ = simulate_synthetic_dividend_grid(data, "TEST", ["sd4", "sd8", "sd16"])
+        assert together[1]["total_final_value"] == alone[0]["total_final_value"]
+        assert together[1]["transaction_count"] == alone[0]["transaction_count"]
@@ -0,0 +1,101 @@
+"""Tests for synthetic price path models.
+
+Paths have the requested shape, a seed reproduces them, the synthesized bars
+are valid OHLC, and each model draws returns the way it describes.
+"""
+
+from datetime import date
+
+import numpy as np
+import pytest
+
+from src.models.price_paths import GBM, BlockBootstrap, PathModel, RegimeSwitching
+
+
+class TestGenerate:
+    """PathModel.generate() builds OHLC paths from log returns."""
+
+    def test_shape_and_reproducibility(self):
+        paths = GBM(0.07, 0.2).generate(50, 300, seed=7, start_price=40.0)
+        assert paths.close.shape == (50, 300)
+        assert (paths.n_paths, paths.n_days, len(paths.dates)) == (50, 300, 300)
+        assert np.all(paths.close[:, 0] == 40.0)
+        assert np.allclose(paths.close, GBM(0.07, 0.2).generate(50, 300, seed=7).close * 0.4)
+        assert not np.array_equal(paths.close, GBM(0.07, 0.2).generate(50, 300, seed=8).close)
+
+    def test_bars_are_valid_ohlc(self):
+        paths = GBM(0.05, 0.6).generate(20, 500, seed=1, dtype=np.float32)
+        assert paths.close.dtype == np.float32
+        assert np.all(paths.low <= np.minimum(paths.open, paths.close))
+        assert np.all(paths.high >= np.maximum(paths.open, paths.close))
+        assert np.all(paths.low > 0)
+
+    def test_frame(self):
+        paths = GBM(0.07, 0.2).generate(3, 10, seed=2)
+        df = paths.frame(1)
+        assert list(df.columns) == ["Open", "High", "Low", "Close"]
+        assert len(df) == 10 and df.index[0].date() == paths.dates[0]
+        assert np.array_equal(df["Close"].to_numpy(), paths.close[1])
+
+    def test_rejects_empty(self):
+        with pytest.raises(ValueError):
+            GBM(0.07, 0.2).generate(0, 10)
+
+    def test_model_without_log_returns_fails_on_creation(self):
+        class Flat(PathModel):
+            pass
+
+        with pytest.raises(TypeError):
+            Flat()
+
+
+class TestModels:
+    """Each model's returns follow its parameters."""
+
+    def test_gbm_moments(self):
+        returns = GBM(0.1, 0.3).log_returns(2_000, 252, np.random.default_rng(3))
+        assert returns.mean() * 252 == pytest.approx(0.1 - 0.5 * 0.3**2, abs=0.01)
+        assert returns.std() * np.sqrt(252) == pytest.approx(0.3, rel=0.01)
+
+    def test_bootstrap_draws_historical_blocks(self):
+        history = np.arange(100) / 1000.0
+        model = BlockBootstrap(history, block_days=5)
+        returns = model.log_returns(10, 23, np.random.default_rng(4))
+        assert returns.shape == (10, 23)
+        assert np.isin(returns, history).all()
+        # Within a block, days follow each other in the history
+        steps = np.diff(returns[:, :5], axis=1)
+        assert np.allclose(steps, 0.001)
+
+    def test_bootstrap_validation(self):
+        with pytest.raises(ValueError):
+            BlockBootstrap(np.zeros(3), block_days=5)
+        with pytest.raises(ValueError):
+            BlockBootstrap(np.zeros(30), block_days=0)
+
+    def test_bootstrap_from_history(self, mock_prices):
+        mock_prices(returns=np.full(60, 0.01), start="2020-01-01")
+        model = BlockBootstrap.from_history("X", date(2020, 1, 1), date(2020, 6, 1), block_days=10)
+        assert np.allclose(model.returns, 0.01)
+
+    def test_regime_switching(self):
+        model = RegimeSwitching(
+            regimes=((0.2, 0.1), (-0.3, 0.5)),
+            transitions=((0.99, 0.01), (0.05, 0.95)),
+        )
+        states = model.regime_paths(500, 400, np.random.default_rng(5))
+        assert set(np.unique(states)) == {0, 1}
+        # Stationary share of regime 1 is 0.01 / (0.01 + 0.05)
+        assert (states[:, -100:] == 1).mean() == pytest.approx(1 / 6, abs=0.03)
+        # Regimes persist: switches are rare
+        assert (np.diff(states, axis=1) != 0).mean() < 0.05
+
+        sticky = RegimeSwitching(((0.0, 0.1), (0.0, 0.9)), ((1.0, 0.0), (0.0, 1.0)), 1)
+        returns = sticky.log_returns(200, 252, np.random.default_rng(6))
+        assert returns.std() * np.sqrt(252) == pytest.approx(0.9, rel=0.02)
+
+    def test_regime_validation(self):
+        with pytest.raises(ValueError):
+            RegimeSwitching(((0.1, 0.2), (0.0, 0.3)), ((0.5, 0.4), (0.5, 0.5)))
+        with pytest.raises(ValueError):
+            RegimeSwitching(((0.1, 0.2),), ((1.0,),), initial_regime=1)
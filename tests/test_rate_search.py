@@ -0,0 +1,157 @@
+"""Tests for bracketing/bisection search over withdrawal rates.
+
+RateSearch finds the highest passing rate, a zero crossing or a minimum in
+a handful of memoized probes; calculate_safe_withdrawal_rate and
+find_optimal_withdrawal_rate use it.
+"""
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import src.data.fetcher
+from src.algorithms.buy_and_hold import BuyAndHoldAlgorithm
+from src.models.rate_search import RateSearch
+from src.models.retirement_backtest import (
+    calculate_safe_withdrawal_rate,
+    safe_withdrawal_search,
+)
+from src.research import optimal_withdrawal_rate
+
+
+class TestRateSearch:
+    """Searches over a cheap synthetic result."""
+
+    def test_max_rate(self):
+        search = RateSearch(lambda rate: rate)
+        rate = search.max_rate(lambda r: r <= 0.0437, 0.0, 0.20, tolerance=0.0005)
+        assert 0.0437 - 0.0005 <= rate <= 0.0437
+        assert len(search.results) <= 11  # Both ends plus ~9 bisection steps
+
+    def test_max_rate_widens_bracket(self):
+        search = RateSearch(lambda rate: rate)
+        assert search.max_rate(lambda r: r <= 0.55, 0.0, 0.20, tolerance=0.001) == pytest.approx(
+            0.55, abs=0.001
+        )
+        assert search.max_rate(lambda r: True, 0.0, 0.20, limit=1.0) == 1.0
+
+    def test_max_rate_none_passes(self):
+        assert RateSearch(lambda rate: rate).max_rate(lambda r: False, 0.0, 0.20) is None
+
+    def test_crossing(self):
+        search = RateSearch(lambda rate: 1000.0 * (0.061 - rate))
+        assert search.crossing(lambda v: v, 0.01, 0.20) == pytest.approx(0.061, abs=0.0005)
+        # No sign change: the end nearer zero
+        assert search.crossing(lambda v: v, 0.07, 0.20) == 0.07
+
+    def test_minimize(self):
+        search = RateSearch(lambda rate: (rate - 0.083) ** 2)
+        assert search.minimize(lambda v: v, 0.0, 0.20) == pytest.approx(0.083, abs=0.0005)
+
+    def test_minimize_infinite_scores_move_left(self):
+        search = RateSearch(lambda rate: abs(rate - 0.03) if rate < 0.1 else float("inf"))
+        assert search.minimize(lambda v: v, 0.0, 0.50) == pytest.approx(0.03, abs=0.0005)
+
+    def test_probes_are_reused(self):
+        calls = []
+        search = RateSearch(lambda rate: calls.append(rate) or rate)
+        search.max_rate(lambda r: r <= 0.05, 0.0, 0.20)
+        probes = len(calls)
+        search.max_rate(lambda r: r <= 0.05, 0.0, 0.20)
+        assert len(calls) == probes
+        assert len(set(calls)) == len(calls)
+
+
+class TestSafeWithdrawalRate:
+    """Safe withdrawal rate of a synthetic retirement scenario."""
+
+    @pytest.fixture
+    def df(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)  # run_algorithm_backtest writes a price cache
+        rng = np.random.default_rng(21)
+        close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.015, 400)))
+        return pd.DataFrame(
+            {"Open": close, "High": close, "Low": close, "Close": close},
+            index=pd.bdate_range("2020-01-01", periods=400),
+        )
+
+    def test_bisection_brackets_the_threshold(self, df):
+        args = (df, "TEST", 1000, date(2020, 1, 1), date(2021, 7, 1), BuyAndHoldAlgorithm())
+        search = safe_withdrawal_search(*args, cpi_adjust=False, simple_mode=True)
+        rate = calculate_safe_withdrawal_rate(
+            *args,
+            target_final_value_pct=0.5,
+            cpi_adjust=False,
+            simple_mode=True,
+            tolerance=0.005,
+            search=search,
+        )
+        target = df.iloc[0]["Close"] * 1000 * 0.5
+
+        def sustainable(summary):
+            return summary["portfolio_survived"] and summary["final_value"] >= target
+
+        assert 0.0 < rate < 1.0
+        assert sustainable(search(rate))
+        assert not sustainable(search(rate + 0.005))
+        assert len(search.results) <= 12
+
+    def test_flat_path_keeps_half_of_start_value(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        close = np.full(400, 100.0)
+        flat = pd.DataFrame(
+            {"Open": close, "High": close, "Low": close, "Close": close},
+            index=pd.bdate_range("2020-01-01", periods=400),
+        )
+        rate = calculate_safe_withdrawal_rate(
+            flat,
+            "TEST",
+            1000,
+            date(2020, 1, 1),
+            date(2021, 1, 1),
+            BuyAndHoldAlgorithm(),
+            target_final_value_pct=0.5,
+            cpi_adjust=False,
+            simple_mode=True,
+            tolerance=0.001,
+        )
+
+        # Twelve withdrawals of rate × 100,000 × 30/365.25 may total at most 50,000
+        threshold = 50_000.0 / (12 * 100_000.0 * 30 / 365.25)
+        assert threshold - 0.001 <= rate <= threshold
+
+
+class TestOptimalWithdrawalRate:
+    """Balanced withdrawal rate of a synthetic sd8 scenario."""
+
+    @pytest.fixture(autouse=True)
+    def prices(self, mock_prices, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)  # run_algorithm_backtest writes a price cache
+        mock_prices(seed=21, drift=0.001, days=400, start="2020-01-01")
+        monkeypatch.setattr(
+            optimal_withdrawal_rate, "HistoryFetcher", src.data.fetcher.HistoryFetcher
+        )
+
+    def _find(self, **kwargs):
+        return optimal_withdrawal_rate.find_optimal_withdrawal_rate(
+            "TEST", date(2020, 1, 1), date(2021, 7, 1), "sd8", initial_qty=1000, **kwargs
+        )
+
+    def test_bisection_ignores_truncated_mean_bank(self):
+        results = self._find(min_rate=0.1, max_rate=1.0, tolerance=0.005)
+
+        # 100% depletes; the crossing is bracketed by runs over the full horizon
+        assert [r.withdrawal_rate for r in results if r.depleted_on is not None] == [1.0]
+        sustained = [(r.withdrawal_rate, r.mean_bank) for r in results if r.depleted_on is None]
+        above = max(rate for rate, bank in sustained if bank > 0)
+        below = min(rate for rate, bank in sustained if bank <= 0)
+        assert 0 < below - above <= 0.005
+
+    def test_grid_prunes_rates_above_first_depleted(self):
+        results = self._find(min_rate=0.1, max_rate=1.0, step=0.1)
+
+        depleted = [r.withdrawal_rate for r in results if r.depleted_on is not None]
+        assert len(depleted) == 1
+        assert max(r.withdrawal_rate for r in results) == depleted[0] < 1.0
@@ -0,0 +1,163 @@
+"""Tests for the on-disk backtest result cache.
+
+Cached results are reused only when the data, algorithm and run options are
+unchanged; a rerun sweep computes only the jobs that are missing.
+"""
+
+from datetime import date
+
+import pandas as pd
+import pytest
+
+import src.models.parallel_runner as parallel_runner
+from src.models.market_bundle import MarketDataBundle
+from src.models.parallel_runner import BacktestJob, ParallelBacktestRunner
+from src.models.result_cache import ResultCache, algorithm_spec
+
+START, END = date(2021, 1, 1), date(2022, 11, 30)
+
+
+@pytest.fixture
+def prices(mock_prices, monkeypatch):
+    scale = {"AAA": 1.0, "BBB": 0.4}
+    df = mock_prices(seed=31, scale=scale)
+
+    def dividends(ticker, start_date, end_date):
+        days = df.index[[1, 100, 200, 300, 400]]
+        return pd.Series(0.3, index=days) if ticker == "AAA" else None
+
+    monkeypatch.setattr("src.models.simulation.fetch_dividend_series", dividends)
+    return scale
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResultCache(tmp_path / "results")
+
+
+@pytest.fixture
+def runs(monkeypatch):
+    """Jobs actually run (not read from the cache), by tag."""
+    ran = []
+    run_job = parallel_runner.run_job
+
+    def counting_run_job(job, bundle, keep_ledger=False):
+        ran.append(job.tag)
+        return run_job(job, bundle, keep_ledger)
+
+    monkeypatch.setattr(parallel_runner, "run_job", counting_run_job)
+    return ran
+
+
+JOBS = [
+    BacktestJob({"AAA": 1.0}, f"per-asset:sd{n}", START, END, initial_qty=100, tag=n)
+    for n in (4, 8, 12, 16)
+] + [BacktestJob({"AAA": 0.5, "BBB": 0.5}, "quarterly-rebalance", START, END, tag="qr")]
+
+
+class TestKeys:
+    """Keys change exactly when the inputs of a run change."""
+
+    def test_algorithm_spec_is_canonical(self):
+        allocations = {"AAA": 1.0}
+        assert algorithm_spec("per-asset:sd8", allocations) == algorithm_spec(
+            "per-asset:sd8,50", allocations
+        )
+        assert algorithm_spec("per-asset:sd8", allocations) != algorithm_spec(
+            "per-asset:sd8,75", allocations
+        )
+        assert algorithm_spec("quarterly-rebalance", {"A": 0.6, "B": 0.4}) != algorithm_spec(
+            "quarterly-rebalance", {"A": 0.5, "B": 0.5}
+        )
+
+    def test_key_is_stable(self):
+        parts = dict(data="abc", options={"b": 1, "a": [1.5, None]})
+        assert ResultCache.key(**parts) == ResultCache.key(**parts)
+        assert ResultCache.key(**parts) != ResultCache.key(data="abd", options=parts["options"])
+
+    def test_fingerprint_of_slice_matches_fresh_load(self, prices):
+        window = (date(2021, 6, 1), date(2022, 3, 31))
+        full = MarketDataBundle.load({"AAA": 1.0}, START, END)
+        assert full.between(*window).fingerprint() == (
+            MarketDataBundle.load({"AAA": 1.0}, *window).fingerprint()
+        )
+        assert full.between(*window).fingerprint() != full.fingerprint()
+
+    def test_fingerprint_changes_with_prices(self, prices):
+        before = MarketDataBundle.load({"AAA": 1.0}, START, END).fingerprint()
+        prices["AAA"] = 1.001
+        assert MarketDataBundle.load({"AAA": 1.0}, START, END).fingerprint() != before
+
+
+class TestCachedRuns:
+    """Runners read results from the cache instead of rerunning jobs."""
+
+    def test_rerun_is_served_from_cache(self, prices, cache, runs):
+        first = ParallelBacktestRunner(workers=1, cache=cache).run_all(JOBS)
+        second = ParallelBacktestRunner(workers=1, cache=cache).run_all(JOBS)
+        assert runs == [job.tag for job in JOBS]
+        assert len(cache) == len(JOBS)
+        assert [r.summary for r in second] == [r.summary for r in first]
+        assert all(r.cached for r in second) and not any(r.cached for r in first)
+
+    def test_hit_and_miss_on_linear_path(self, mock_prices, monkeypatch, cache, runs):
+        monkeypatch.setattr("src.models.simulation.fetch_dividend_series", lambda *args: None)
+        job = BacktestJob(
+            {"AAA": 1.0},
+            "per-asset:buy-and-hold",
+            date(2024, 1, 1),
+            date(2024, 1, 26),
+            initial_qty=100,
+            tag="bh",
+        )
+        path = [100.0 + day for day in range(20)]  # Closes at 119 on Jan 26
+
+        mock_prices(closes=path, start="2024-01-01")
+        first = ParallelBacktestRunner(workers=1, cache=cache).run_all([job])
+        again = ParallelBacktestRunner(workers=1, cache=cache).run_all([job])
+        mock_prices(closes=path[:-1] + [120.0], start="2024-01-01")
+        moved = ParallelBacktestRunner(workers=1, cache=cache).run_all([job])
+
+        assert runs == ["bh", "bh"]  # Only the changed last close misses the cache
+        assert again[0].cached and not moved[0].cached
+        values = [r[0].summary["total_final_value"] for r in (first, again, moved)]
+        assert values == [11_900.0, 11_900.0, 12_000.0]
+
+    def test_interrupted_sweep_resumes(self, prices, cache, runs):
+        results = ParallelBacktestRunner(workers=1, cache=cache).run(JOBS)
+        next(results), next(results)
+        results.close()  # Interrupted after two jobs
+        ParallelBacktestRunner(workers=1, cache=cache).run_all(JOBS)
+        assert sorted(runs, key=str) == sorted([job.tag for job in JOBS], key=str)
+
+    def test_changed_data_or_options_rerun(self, prices, cache, runs):
+        ParallelBacktestRunner(workers=1, cache=cache).run_all(JOBS[:2])
+        prices["AAA"] = 1.5
+        changed = [JOBS[0], BacktestJob({"AAA": 1.0}, "per-asset:sd8", START, END, tag="qty")]
+        ParallelBacktestRunner(workers=1, cache=cache).run_all(changed)
+        assert runs == [4, 8, 4, "qty"]
+
+    def test_pool_results_are_cached(self, prices, cache):
+        pooled = ParallelBacktestRunner(workers=2, cache=cache).run_all(JOBS)
+        serial = ParallelBacktestRunner(workers=1, cache=cache).run_all(JOBS)
+        assert all(r.cached for r in serial)
+        assert [r.summary for r in serial] == [r.summary for r in pooled]
+
+    def test_ledgers(self, prices, cache, runs):
+        ParallelBacktestRunner(workers=1, cache=cache).run_all(JOBS[:1])
+        first = ParallelBacktestRunner(workers=1, cache=cache, keep_ledgers=True).run_all(JOBS[:1])
+        again = ParallelBacktestRunner(workers=1, cache=cache, keep_ledgers=True).run_all(JOBS[:1])
+        assert runs == [4, 4]  # The entry without a ledger was rerun
+        assert first[0].transactions and again[0].cached
+        assert [t.to_string() for t in again[0].transactions] == [
+            t.to_string() for t in first[0].transactions
+        ]
+
+    def test_errors_and_corrupt_entries_are_not_reused(self, prices, cache, runs):
+        missing = BacktestJob({"AAA": 1.0}, "per-asset:no-such-algo", START, END, tag="bad")
+        ParallelBacktestRunner(workers=1, cache=cache).run_all([missing, JOBS[0]])
+        for path in cache.directory.glob("*/*.pkl"):
+            path.write_bytes(b"truncated")
+        results = ParallelBacktestRunner(workers=1, cache=cache).run_all([missing, JOBS[0]])
+        assert runs == ["bad", 4, "bad", 4]
+        assert results[0].error and results[1].summary
@@ -0,0 +1,115 @@
+"""Tests for the append-only columnar results store.
+
+Appends write new partitions, the latest row of a cell wins, and top-N and
+Pareto queries match brute-force answers.
+"""
+
+from datetime import date
+
+import numpy as np
+import pytest
+
+from src.models.results_store import ResultsStore
+
+
+def _rows(n, seed=5):
+    rng = np.random.default_rng(seed)
+    return [
+        {
+            "cell": f"c{i}",
+            "name": ["AAA", "BBB", "CCC"][i % 3],
+            "algorithm": f"sd{4 + i % 5}",
+            "start_date": date(2020 + i % 2, 1, 1),
+            "total_return": float(rng.normal(10, 20)),
+            "max_drawdown": float(rng.uniform(0.05, 0.6)),
+            "transaction_count": int(rng.integers(0, 50)),
+            "stop_reason": None,
+        }
+        for i in range(n)
+    ]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ResultsStore(tmp_path / "store")
+
+
+class TestAppend:
+    """Rows round-trip through partitions."""
+
+    def test_round_trip(self, store):
+        rows = _rows(20)
+        store.append(rows[:12])
+        store.append(rows[12:])
+        assert len(store.partitions()) == 2
+        frame = store.frame()
+        assert frame["cell"].tolist() == [row["cell"] for row in rows]
+        assert np.allclose(frame["total_return"], [row["total_return"] for row in rows])
+        assert frame["transaction_count"].dtype == np.int64
+        assert store.lookup("c3")["start_date"] == date(2021, 1, 1)
+        assert "stop_reason" not in frame  # None everywhere: not written
+        assert store.lookup("missing") is None
+
+    def test_latest_row_wins(self, store):
+        store.append(_rows(3))
+        store.append([{"cell": "c1", "total_return": 99.0, "error": ""}])
+        assert len(store) == 3
+        assert store.lookup("c1")["total_return"] == 99.0
+        assert store.frame(latest=False).shape[0] == 4
+        assert store.frame()["cell"].tolist() == ["c0", "c2", "c1"]
+
+    def test_missing_and_widened_columns(self, store):
+        store.append([{"cell": "a", "x": 1, "label": "one"}])
+        store.append([{"cell": "b", "x": 2.5, "when": date(2024, 1, 2)}])
+        columns = store.columns()
+        assert columns["x"].tolist() == [1.0, 2.5]
+        assert columns["label"].tolist() == ["one", ""]
+        assert np.isnat(columns["when"][0])
+
+    def test_completed_cells(self, store):
+        store.append([{"cell": "a", "error": ""}, {"cell": "b", "error": "boom"}])
+        assert store.cells() == {"a"}
+        assert store.cells(completed=False) == {"a", "b"}
+
+
+class TestQueries:
+    """Vectorized queries match brute force."""
+
+    def test_top_n_per_group(self, store):
+        rows = _rows(60)
+        store.append(rows)
+        best = store.top_n("total_return", n=2, by=("name",))
+        for name in ("AAA", "BBB", "CCC"):
+            expected = sorted((r["total_return"] for r in rows if r["name"] == name), reverse=True)[
+                :2
+            ]
+            assert best[best["name"] == name]["total_return"].tolist() == expected
+
+        smallest = store.top_n("max_drawdown", n=1, largest=False, where={"algorithm": "sd4"})
+        assert smallest["max_drawdown"].iloc[0] == min(
+            r["max_drawdown"] for r in rows if r["algorithm"] == "sd4"
+        )
+
+    def test_pareto(self, store):
+        rows = _rows(80)
+        store.append(rows)
+        front = store.pareto({"total_return": "max", "max_drawdown": "min"}, by=("name",))
+
+        def dominated(row):
+            return any(
+                other["name"] == row["name"]
+                and other["total_return"] >= row["total_return"]
+                and other["max_drawdown"] <= row["max_drawdown"]
+                and (
+                    other["total_return"] > row["total_return"]
+                    or other["max_drawdown"] < row["max_drawdown"]
+                )
+                for other in rows
+            )
+
+        assert front["cell"].tolist() == [r["cell"] for r in rows if not dominated(r)]
+
+    def test_empty_store(self, store):
+        assert len(store) == 0
+        assert store.top_n("total_return").empty
+        assert store.cells() == set()
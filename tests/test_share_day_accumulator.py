@@ -0,0 +1,91 @@
+"""Tests for the cumulative share-day accumulator used for dividend accrual.
+
+ShareDayAccumulator answers window averages from prefix sums and must agree
+with calculate_time_weighted_average_holdings() over the same history.
+"""
+
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.models.backtest_utils import (
+    ShareDayAccumulator,
+    calculate_time_weighted_average_holdings,
+)
+from src.models.simulation import build_dividend_events
+
+
+def _accumulate(history):
+    accumulator = ShareDayAccumulator()
+    for change_date, level in history:
+        accumulator.record(change_date, level)
+    return accumulator
+
+
+class TestShareDayAccumulator:
+    """Window averages from cumulative share-days."""
+
+    def test_docstring_example(self):
+        """100 shares for 60 days, then 150 for 31 days."""
+        history = _accumulate([(date(2024, 1, 1), 100), (date(2024, 3, 1), 150)])
+        expected = (100 * 60 + 150 * 31) / 91
+        assert history.average(date(2024, 1, 1), date(2024, 3, 31)) == pytest.approx(expected)
+
+    def test_matches_full_history_walk(self):
+        """Random histories and windows agree with the reference calculation."""
+        rng = np.random.default_rng(3)
+        for _ in range(300):
+            history = []
+            change_date = date(2020, 1, 1)
+            for _ in range(rng.integers(1, 25)):
+                change_date += timedelta(days=int(rng.choice([0, 1, 3, 10, 40])))
+                history.append((change_date, float(rng.choice([0.0, 50.0, rng.random() * 100]))))
+            accumulator = _accumulate(history)
+
+            start = date(2020, 1, 1) + timedelta(days=int(rng.integers(-50, 400)))
+            end = start + timedelta(days=int(rng.integers(0, 120)))
+            expected = calculate_time_weighted_average_holdings(history, start, end)
+            assert accumulator.average(start, end) == pytest.approx(expected, rel=1e-12)
+
+    def test_same_day_record_replaces_level(self):
+        """Several changes on one day leave only the last level for that day."""
+        history = _accumulate(
+            [(date(2024, 1, 1), 0.0), (date(2024, 1, 1), 10.0), (date(2024, 1, 3), 20.0)]
+        )
+        history.record(date(2024, 1, 3), 30.0)
+        assert history.share_days(date(2024, 1, 1), date(2024, 1, 4)) == 10 * 2 + 30 * 2
+
+    def test_days_before_first_record_count_as_zero(self):
+        """A window opening before the first record is pro-rated."""
+        history = _accumulate([(date(2024, 1, 11), 100.0)])
+        assert history.average(date(2024, 1, 1), date(2024, 1, 20)) == 50.0
+        assert history.average(date(2023, 12, 1), date(2023, 12, 31)) == 0.0
+
+    def test_empty(self):
+        assert ShareDayAccumulator().average(date(2024, 1, 1), date(2024, 3, 31)) == 0.0
+
+
+class TestDividendEventIndexing:
+    """Dividend dates are mapped to trading-day positions by binary search."""
+
+    calendar = [date(2024, 1, 2), date(2024, 1, 3), date(2024, 1, 5), date(2024, 1, 8)]
+
+    def test_positions(self):
+        dividends = pd.Series([0.5, 0.2], index=pd.to_datetime(["2024-01-08", "2024-01-03"]))
+        events = build_dividend_events({"A": dividends}, ["A"], self.calendar)
+
+        assert [(day, div_date) for day, _, div_date, _ in events] == [
+            (1, date(2024, 1, 3)),
+            (3, date(2024, 1, 8)),
+        ]
+
+    def test_out_of_range_dates_are_ignored(self):
+        dividends = pd.Series([0.5, 0.2], index=pd.to_datetime(["2023-12-29", "2024-01-09"]))
+        assert build_dividend_events({"A": dividends}, ["A"], self.calendar) == []
+
+    def test_non_trading_day_is_rejected(self):
+        dividends = pd.Series([0.5], index=pd.to_datetime(["2024-01-04"]))
+        with pytest.raises(ValueError, match="not a trading day"):
+            build_dividend_events({"A": dividends}, ["A"], self.calendar)
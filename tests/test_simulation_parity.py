@@ -3,6 +3,10 @@
 from datetime import date
 from typing import Any, Dict, List
 
+import numpy as np
+import pandas as pd
+import pytest
+
 from src.models.backtest import run_portfolio_backtest
 from src.models.model_types import Transaction
 from src.models.simulation import run_portfolio_simulation
@@ -303,3 +307,126 @@ class TestSimulationParity:
         # Compare results
         compare_summaries(summary_backtest, summary_sim)
         compare_transactions(txns_backtest, txns_sim)
+
+
+def _volatile_prices(start: str = "2024-01-01", periods: int = 260) -> pd.DataFrame:
+    """Deterministic oscillating OHLC data that triggers frequent SD fills."""
+    dates = pd.bdate_range(start=start, periods=periods)
+    close = 100.0 + 25.0 * np.sin(np.arange(periods) / 6.0) + np.arange(periods) * 0.1
+    return pd.DataFrame(
+        {"Open": close * 0.995, "High": close * 1.02, "Low": close * 0.98, "Close": close},
+        index=dates,
+    )
+
+
+class TestFastEngineParity:
+    """The fast day loop must reproduce the simpy engine exactly."""
+
+    @pytest.fixture
+    def prices(self, mock_prices):
+        """Serve the same synthetic frame for every ticker (including BIL and benchmarks)."""
+        return mock_prices(frame=_volatile_prices())
+
+    def _run_both(self, **kwargs):
+        results = {}
+        for engine in ("simpy", "fast"):
+            results[engine] = run_portfolio_simulation(
+                start_date=date(2024, 1, 1),
+                end_date=date(2024, 12, 31),
+                engine=engine,
+                **kwargs,
+            )
+        return results["simpy"], results["fast"]
+
+    def _assert_identical(self, simpy_result, fast_result):
+        txns_simpy, summary_simpy = simpy_result
+        txns_fast, summary_fast = fast_result
+        compare_summaries(summary_simpy, summary_fast, tolerance=1e-12)
+        compare_transactions(txns_simpy, txns_fast)
+        assert [tx.notes for tx in txns_simpy] == [tx.notes for tx in txns_fast]
+        assert summary_simpy["daily_bank_values"] == summary_fast["daily_bank_values"]
+        assert summary_simpy["daily_asset_values"] == summary_fast["daily_asset_values"]
+
+    def test_sd_with_withdrawals_strict_mode(self, prices):
+        """SD orders, forced withdrawal sales, and skipped buys match."""
+        simpy_result, fast_result = self._run_both(
+            allocations={"AAA": 0.6, "BBB": 0.4},
+            portfolio_algo="per-asset:sd8",
+            initial_investment=100_000.0,
+            allow_margin=False,
+            withdrawal_rate_pct=8.0,
+            dividend_data={},
+        )
+        self._assert_identical(simpy_result, fast_result)
+        assert simpy_result[1]["withdrawal_count"] > 0
+
+    def test_margin_with_reference_and_risk_free(self, prices):
+        """Opportunity cost and risk-free gains on a leveraged bank match."""
+        simpy_result, fast_result = self._run_both(
+            allocations={"AAA": 1.0},
+            portfolio_algo="per-asset:sd4",
+            initial_investment=50_000.0,
+            allow_margin=True,
+            reference_rate_ticker="REF",
+            risk_free_rate_ticker="RF",
+            dividend_data={},
+        )
+        self._assert_identical(simpy_result, fast_result)
+
+    @pytest.mark.parametrize(
+        "div_days",
+        [
+            [0, 1, 2, 40, 41, 120],  # consecutive run from day 0, then gaps
+            [0, 0, 3, 4],  # same-day dividends, then a gap
+            [5, 60, 61, 200],  # first dividend after a gap
+        ],
+    )
+    def test_dividend_ordering(self, prices, div_days):
+        """Dividends are paid before/after the market step exactly as simpy orders them."""
+        div_dates = [prices.index[i] for i in div_days]
+        dividends = pd.Series([0.5 + 0.01 * i for i in range(len(div_dates))], index=div_dates)
+        dividends = dividends.groupby(level=0).sum()
+        simpy_result, fast_result = self._run_both(
+            allocations={"AAA": 0.9, "CASH": 0.1},
+            portfolio_algo="per-asset:sd8",
+            initial_investment=100_000.0,
+            withdrawal_rate_pct=4.0,
+            dividend_data={"AAA": dividends, "CASH": dividends * 0.1},
+        )
+        self._assert_identical(simpy_result, fast_result)
+        assert simpy_result[1]["dividend_payment_count_by_asset"]["AAA"] == len(dividends)
+
+    def test_quarterly_rebalance(self, prices):
+        """Portfolio-level algorithms run identically under both engines."""
+        simpy_result, fast_result = self._run_both(
+            allocations={"AAA": 0.5, "BBB": 0.5},
+            portfolio_algo="quarterly-rebalance",
+            initial_investment=100_000.0,
+            dividend_data={},
+        )
+        self._assert_identical(simpy_result, fast_result)
+
+    def test_backtest_forwards_engine(self, prices):
+        """run_portfolio_backtest passes engine through to the simulation."""
+        kwargs = dict(
+            allocations={"AAA": 1.0},
+            start_date=date(2024, 1, 1),
+            end_date=date(2024, 12, 31),
+            portfolio_algo="per-asset:sd8",
+            dividend_data={},
+        )
+        self._assert_identical(
+            run_portfolio_backtest(engine="simpy", **kwargs),
+            run_portfolio_backtest(engine="fast", **kwargs),
+        )
+
+    def test_unknown_engine_rejected(self, prices):
+        """An unknown engine name raises ValueError."""
+        with pytest.raises(ValueError, match="Unknown engine"):
+            run_portfolio_simulation(
+                allocations={"AAA": 1.0},
+                start_date=date(2024, 1, 1),
+                end_date=date(2024, 12, 31),
+                portfolio_algo="per-asset:buy-and-hold",
+                engine="turbo",
+            )
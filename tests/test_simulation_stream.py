@@ -0,0 +1,101 @@
+"""Tests for the streaming simulation API.
+
+iter_portfolio_simulation yields one DayState per trading day as the engine
+advances; run_portfolio_simulation is the same run consumed to the end.
+"""
+
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from src.models.simulation import iter_portfolio_simulation, run_portfolio_simulation
+
+
+@pytest.fixture
+def prices(mock_prices):
+    return mock_prices(seed=9, drift=0.0005, days=300)
+
+
+def _kwargs(engine):
+    return dict(
+        allocations={"SPY": 0.6, "BND": 0.4},
+        start_date=date(2021, 1, 1),
+        end_date=date(2022, 2, 28),
+        portfolio_algo="per-asset:sd8",
+        initial_investment=100_000.0,
+        withdrawal_rate_pct=5.0,
+        cash_interest_rate_pct=3.0,
+        dividend_data={"SPY": pd.Series(0.5, index=pd.bdate_range("2021-03-01", periods=1))},
+        engine=engine,
+        detail="daily",
+    )
+
+
+@pytest.mark.parametrize("engine", ["simpy", "fast"])
+def test_days_match_daily_series(prices, engine):
+    simulation = iter_portfolio_simulation(**_kwargs(engine))
+    days = list(simulation)
+    transactions, summary = simulation.finish()
+    daily = summary["daily"]
+
+    assert [day.day_index for day in days] == list(range(summary["trading_days"]))
+    assert [day.current_date for day in days] == list(daily.dates)
+    assert [day.bank for day in days] == daily.bank.tolist()
+    assert [day.portfolio_value for day in days] == daily.portfolio.tolist()
+    assert days[-1].holdings == tuple(
+        summary["assets"][ticker]["final_holdings"] for ticker in ("SPY", "BND")
+    )
+
+    # Every transaction after the initial purchases is reported once, on its day
+    fills = [tx for day in days for tx in day.fills]
+    assert fills == transactions[2:]
+    for day in days:
+        assert all(tx.transaction_date == day.current_date for tx in day.fills)
+
+
+@pytest.mark.parametrize("engine", ["simpy", "fast"])
+def test_run_is_stream_consumed(prices, engine):
+    transactions, summary = run_portfolio_simulation(**_kwargs(engine))
+
+    simulation = iter_portfolio_simulation(**_kwargs(engine))
+    for day in simulation:
+        if day.day_index == 100:
+            break
+    streamed_transactions, streamed = simulation.finish()
+
+    assert [t.to_string() for t in streamed_transactions] == [t.to_string() for t in transactions]
+    assert streamed["total_final_value"] == summary["total_final_value"]
+    assert streamed["daily_values"] == summary["daily_values"]
+    assert streamed["metrics"] == summary["metrics"]
+
+
+@pytest.mark.parametrize("engine", ["simpy", "fast"])
+def test_days_on_step_path(mock_prices, engine):
+    # Every 10% step crosses the 9.05% sd8 trigger: sell on the way up, buy back down
+    mock_prices(closes=[100.0, 110.0, 121.0, 110.0, 100.0], start="2024-01-01")
+    days = list(
+        iter_portfolio_simulation(
+            allocations={"TEST": 1.0},
+            start_date=date(2024, 1, 1),
+            end_date=date(2024, 1, 5),
+            portfolio_algo="per-asset:sd8",
+            initial_investment=10_000.0,
+            dividend_data={},
+            engine=engine,
+        )
+    )
+
+    assert [[tx.action for tx in day.fills] for day in days] == [
+        [],
+        ["SELL"],
+        ["SELL"],
+        ["BUY"],
+        ["BUY"],
+    ]
+    assert days[0].holdings == (100.0,) and days[0].bank == 0.0
+    sale = days[1].fills[0]
+    assert days[1].bank == pytest.approx(sale.qty * 110.0)
+    assert days[1].holdings == pytest.approx((100.0 - sale.qty,))
+    for day, close in zip(days, [100.0, 110.0, 121.0, 110.0, 100.0]):
+        assert day.portfolio_value == pytest.approx(day.bank + day.holdings[0] * close)
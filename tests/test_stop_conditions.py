@@ -0,0 +1,127 @@
+"""Tests for early-exit stop predicates.
+
+A run given stop_when= ends on the first day a predicate holds, with the
+same results on both engines, and its summary covers the simulated days.
+"""
+
+from datetime import date
+
+import numpy as np
+import pytest
+
+from src.models.simulation import run_portfolio_simulation
+from src.models.stop_conditions import BankBelow, PortfolioBelow, StopCondition, stop_reason
+
+
+@pytest.fixture
+def prices(mock_prices):
+    return mock_prices(seed=13, drift=-0.001)
+
+
+def _run(engine, stop_when=None, algo="per-asset:sd8", interest=0.0, detail="daily"):
+    return run_portfolio_simulation(
+        allocations={"TEST": 1.0},
+        start_date=date(2021, 1, 1),
+        end_date=date(2022, 12, 30),
+        portfolio_algo=algo,
+        initial_investment=100_000.0,
+        withdrawal_rate_pct=40.0,
+        cash_interest_rate_pct=interest,
+        allow_margin=True,
+        engine=engine,
+        detail=detail,
+        stop_when=stop_when,
+    )
+
+
+class TestPredicates:
+    """Vectorized conditions and reasons."""
+
+    def test_first_day(self):
+        bank = np.array([10.0, -5.0, -20.0, 3.0])
+        portfolio = np.array([100.0, 50.0, 0.0, -1.0])
+        assert PortfolioBelow().first_day(bank, portfolio) == 2
+        assert PortfolioBelow(60.0).first_day(bank, portfolio) == 1
+        assert BankBelow(-10.0).first_day(bank, portfolio) == 2
+        assert BankBelow(-50.0).first_day(bank, portfolio) is None
+
+    def test_condition_without_first_day_fails_on_creation(self):
+        class Never(StopCondition):
+            reason = "never"
+
+        with pytest.raises(TypeError):
+            Never()
+
+    def test_reasons(self):
+        def margin_call(day):
+            return True
+
+        assert stop_reason(PortfolioBelow(), True) == "depleted"
+        assert stop_reason(margin_call, True) == "margin_call"
+        assert stop_reason(lambda day: True, True) == "stopped"
+        assert stop_reason(lambda day: "in debt", "in debt") == "in debt"
+
+
+class TestEngineStop:
+    """Runs end on the stop day."""
+
+    def test_no_stop(self, prices):
+        _, summary = _run("fast")
+        assert summary["stop_reason"] is None and summary["stop_date"] is None
+
+    @pytest.mark.parametrize("algo", ["per-asset:sd8", "per-asset:buy-and-hold"])
+    @pytest.mark.parametrize("interest", [0.0, 4.0])
+    def test_engines_agree(self, prices, algo, interest):
+        floor = [PortfolioBelow(50_000.0)]
+        _, full = _run("fast", algo=algo, interest=interest)
+        simpy_transactions, simpy = _run("simpy", floor, algo, interest)
+        fast_transactions, fast = _run("fast", floor, algo, interest)
+
+        stop_day = int(np.flatnonzero(full["daily"].portfolio <= 50_000.0)[0])
+        for summary in (simpy, fast):
+            assert summary["stop_reason"] == "depleted"
+            assert summary["stop_date"] == summary["end_date"] == full["daily"].dates[stop_day]
+            assert summary["trading_days"] == stop_day + 1
+            assert len(summary["daily"]) == stop_day + 1
+            assert summary["final_bank"] == full["daily"].bank[stop_day]
+            assert summary["total_final_value"] == pytest.approx(full["daily"].portfolio[stop_day])
+        assert [t.to_string() for t in fast_transactions] == [
+            t.to_string() for t in simpy_transactions
+        ]
+        assert fast["metrics"] == pytest.approx(simpy["metrics"], rel=1e-9)
+
+    @pytest.mark.parametrize("engine", ["simpy", "fast"])
+    def test_stop_day_on_linear_decline(self, mock_prices, engine):
+        # 100 shares falling $5 a day are worth 7,500 on the sixth day (close 75)
+        mock_prices(closes=np.arange(100.0, 40.0, -5.0), start="2024-01-01")
+        _, summary = run_portfolio_simulation(
+            allocations={"TEST": 1.0},
+            start_date=date(2024, 1, 1),
+            end_date=date(2024, 1, 16),
+            portfolio_algo="per-asset:buy-and-hold",
+            initial_investment=10_000.0,
+            dividend_data={},
+            engine=engine,
+            stop_when=[PortfolioBelow(7_500.0)],
+        )
+        assert summary["stop_reason"] == "depleted"
+        assert summary["stop_date"] == date(2024, 1, 8)
+        assert summary["trading_days"] == 6
+        assert summary["total_final_value"] == 7_500.0
+
+    def test_callable_predicate(self, prices):
+        _, summary = _run("fast", [lambda day: day.day_index == 100 and "day 100"])
+        assert summary["stop_reason"] == "day 100"
+        assert summary["trading_days"] == 101
+
+    def test_earliest_predicate_wins(self, prices):
+        shallow = lambda day: day.portfolio_value < 80_000.0 and "shallow"  # noqa: E731
+        _, summary = _run("fast", [PortfolioBelow(40_000.0), shallow])
+        assert summary["stop_reason"] == "shallow"
+
+    def test_summary_detail(self, prices):
+        _, daily = _run("fast", [BankBelow(-3_000.0)])
+        _, summary = _run("fast", [BankBelow(-3_000.0)], detail="summary")
+        assert daily["stop_reason"] == "bank_floor"
+        assert summary["stop_date"] == daily["stop_date"]
+        assert summary["daily_bank_stats"] == daily["daily"].bank_stats()
@@ -0,0 +1,164 @@
+"""Tests for declarative sweeps and the sweep CLI command.
+
+A spec expands to its grid, each ticker is fetched once, results land in the
+store, and rerunning a sweep only runs the cells that are missing.
+"""
+
+import json
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from src.models.results_store import ResultsStore
+from src.models.sweep import SweepSpec, cell_key, plan_sweep, run_sweep
+from src.synthetic_dividend_tool import main
+
+SPEC = {
+    "tickers": ["AAA", "BBB"],
+    "portfolios": {"mix": {"AAA": 0.5, "BBB": 0.5}},
+    "windows": [["2021-01-01", "2021-12-31"], ["2021-06-01", "2022-06-30"]],
+    "algorithms": ["buy-and-hold", "sd8", "quarterly-rebalance"],
+    "withdrawal_rates": [0, 4],
+    "reference_rate_ticker": "REF",
+}
+
+
+@pytest.fixture
+def fetches(mock_prices, monkeypatch):
+    """Price fetches made, as (ticker, start, end)."""
+    calls = []
+    mock_prices(seed=41, scale={"AAA": 1.0, "BBB": 0.4, "REF": 2.0}, calls=calls)
+    monkeypatch.setattr("src.models.simulation.fetch_dividend_series", lambda *args: None)
+    return calls
+
+
+class TestSpec:
+    """Specs expand to the product of their axes."""
+
+    def test_grid(self):
+        jobs = SweepSpec.from_dict(SPEC).jobs()
+        assert len(jobs) == 3 * 2 * 3 * 2
+        assert {job.portfolio_algo for job in jobs} == {
+            "per-asset:buy-and-hold",
+            "per-asset:sd8",
+            "quarterly-rebalance",
+        }
+        assert len({cell_key(job) for job in jobs}) == len(jobs)
+
+    def test_rolling_windows(self):
+        spec = SweepSpec.from_dict(
+            {"tickers": ["AAA"], "windows": {"start_year": 2015, "end_year": 2024, "years": 5}}
+        )
+        assert spec.windows[0] == (date(2015, 1, 1), date(2019, 12, 31))
+        assert spec.windows[-1] == (date(2020, 1, 1), date(2024, 12, 31))
+        assert len(spec.windows) == 6
+
+    def test_rejects_bad_specs(self):
+        with pytest.raises(ValueError):
+            SweepSpec.from_dict({**SPEC, "tickerz": ["AAA"]})
+        with pytest.raises(ValueError):
+            SweepSpec.from_dict({"tickers": ["AAA"], "windows": []})
+
+    def test_plan_covers_union_of_data(self):
+        plan = plan_sweep(SweepSpec.from_dict(SPEC))
+        assert plan.data_ranges == {
+            ticker: (date(2021, 1, 1), date(2022, 6, 30)) for ticker in ("AAA", "BBB", "REF")
+        }
+
+
+class TestRunSweep:
+    """Sweeps fill the store and resume from it."""
+
+    def test_runs_and_resumes(self, fetches, tmp_path):
+        spec = SweepSpec.from_dict(SPEC)
+        store = ResultsStore(tmp_path / "store")
+        run_sweep(spec, store, workers=1, flush_every=10)
+        assert len(store) == 36
+        assert len(store.partitions()) == 4
+        # Each ticker fetched once over the union of the windows
+        assert sorted(ticker for ticker, _, _ in fetches) == ["AAA", "BBB", "REF"]
+
+        frame = store.frame()
+        assert (frame["error"] == "").all()
+        assert set(frame["name"]) == {"AAA", "BBB", "mix"}
+        assert frame["metrics.max_drawdown"].notna().all()
+
+        # Drop the last partition, as if the sweep was interrupted
+        store.partitions()[-1].unlink()
+        plan = run_sweep(spec, ResultsStore(tmp_path / "store"), workers=1)
+        assert (len(plan.jobs), plan.skipped) == (6, 30)
+        assert len(ResultsStore(tmp_path / "store")) == 36
+
+    def test_cells_on_linear_path(self, mock_prices, monkeypatch, tmp_path):
+        # AAA rises $1 a day from 100 (110 on Jan 15, 119 on Jan 26); BBB is half of it
+        mock_prices(
+            closes=[100.0 + day for day in range(20)],
+            start="2024-01-01",
+            scale={"AAA": 1.0, "BBB": 0.5},
+        )
+        monkeypatch.setattr("src.models.simulation.fetch_dividend_series", lambda *args: None)
+        spec = SweepSpec.from_dict(
+            {
+                "tickers": ["AAA"],
+                "portfolios": {"mix": {"AAA": 0.5, "BBB": 0.5}},
+                "windows": [["2024-01-01", "2024-01-26"], ["2024-01-15", "2024-01-26"]],
+                "initial_investment": 10_000.0,
+            }
+        )
+        store = ResultsStore(tmp_path / "store")
+        run_sweep(spec, store, workers=1)
+
+        # From 110, 10,000 buys 90 whole shares (45 AAA and 90 BBB in the mix), leaving $100
+        frame = store.frame()
+        values = dict(
+            zip(zip(frame["name"], frame["start_date"].dt.day), frame["total_final_value"])
+        )
+        assert values == {
+            ("AAA", 1): 11_900.0,
+            ("AAA", 15): 90 * 119.0 + 100.0,
+            ("mix", 1): 11_900.0,
+            ("mix", 15): 90 * 119.0 + 100.0,
+        }
+
+    def test_missing_data_is_recorded_and_retried(self, fetches, tmp_path):
+        spec = SweepSpec.from_dict({**SPEC, "tickers": ["AAA", "NONE"], "portfolios": {}})
+        store = ResultsStore(tmp_path / "store")
+        run_sweep(spec, store, workers=1)
+        errors = store.frame().query("name == 'NONE'")["error"]
+        assert len(errors) == 12 and (errors != "").all()
+        assert len(plan_sweep(spec, store).jobs) == 12
+
+
+class TestSweepCommand:
+    """The sweep CLI runs specs and queries stores."""
+
+    def test_run_and_query(self, fetches, tmp_path, capsys):
+        spec_path = tmp_path / "grid.json"
+        spec_path.write_text(json.dumps(SPEC))
+        store_dir = str(tmp_path / "store")
+        assert main(["sweep", "run", str(spec_path), "--store", store_dir]) == 0
+
+        output = tmp_path / "best.csv"
+        argv = ["sweep", "query", "--store", store_dir, "--top", "1", "--by", "name,start_date"]
+        assert main(argv + ["--where", "withdrawal_rate_pct=0", "--output", str(output)]) == 0
+        best = pd.read_csv(output)
+        assert len(best) == 6
+        frame = ResultsStore(store_dir).frame()
+        expected = frame[frame["withdrawal_rate_pct"] == 0].groupby("name")["total_return"].max()
+        assert best.groupby("name")["total_return"].max().to_dict() == pytest.approx(
+            expected.to_dict()
+        )
+
+        capsys.readouterr()
+        pareto = ["--pareto", "total_return,-metrics.max_drawdown"]
+        assert main(["sweep", "query", "--store", store_dir] + pareto) == 0
+        assert "metrics.max_drawdown" in capsys.readouterr().out
+
+    def test_dry_run(self, fetches, tmp_path, capsys):
+        spec_path = tmp_path / "grid.json"
+        spec_path.write_text(json.dumps(SPEC))
+        argv = ["sweep", "run", str(spec_path), "--store", str(tmp_path / "s"), "--dry-run"]
+        assert main(argv) == 0
+        assert "36 cells to run, 0 already stored" in capsys.readouterr().out
+        assert fetches == []
@@ -1,8 +1,13 @@
 """Unit tests for synthetic dividend algorithm."""
 
+from datetime import date
+
+import pandas as pd
 import pytest
 
+from src.algorithms import SyntheticDividendAlgorithm
 from src.models.backtest import calculate_synthetic_dividend_orders
+from src.models.market import OrderAction
 
 
 class TestPlaceOrdersSymmetry:
@@ -154,3 +159,22 @@ class TestPlaceOrdersSymmetry:
         # Quantities should be positive
         assert orders["next_buy_qty"] > 0
         assert orders["next_sell_qty"] > 0
+
+
+class TestFillPriceAnchor:
+    """Orders are re-anchored at the exact fill price, not a cents-rounded copy."""
+
+    def test_next_orders_anchor_on_full_precision_fill(self):
+        algo = SyntheticDividendAlgorithm(rebalance_size=0.0905, profit_sharing=0.5)
+        algo.on_new_holdings(holdings=1000, current_price=100.0)
+        buy_limit = 100.0 / 1.0905  # 91.70105456...
+
+        prices = pd.Series({"Open": 95.0, "High": 96.0, "Low": 90.0, "Close": 91.0})
+        (fill,) = algo.on_day(date(2024, 1, 2), prices, holdings=1000, bank=0.0, history=None)
+
+        assert fill.price == buy_limit
+        assert algo.last_transaction_price == buy_limit
+        sell_limits = [
+            o.limit_price for o in algo.market.pending_orders if o.action == OrderAction.SELL
+        ]
+        assert sell_limits == [buy_limit * 1.0905]
@@ -0,0 +1,152 @@
+"""Tests for the columnar transaction ledger.
+
+TransactionLedger stores a run's transactions as parallel arrays so analysis
+tools can mask and group them instead of parsing Transaction.to_string().
+"""
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.models.ledger import TransactionLedger
+from src.models.model_types import Transaction
+from src.models.simulation import run_portfolio_simulation
+from src.research.strategy_comparison import calculate_yearly_cash_flow
+
+
+def _tx(day, action, qty, price, ticker, notes, limit_price=None, bank_after=None):
+    return Transaction(
+        action=action,
+        qty=qty,
+        notes=notes,
+        transaction_date=day,
+        price=price,
+        ticker=ticker,
+        limit_price=limit_price,
+        bank_after=bank_after,
+    )
+
+
+def _transactions():
+    return [
+        _tx(date(2023, 1, 3), "BUY", 100, 10.0, "NVDA", "Initial purchase", None, 0.0),
+        _tx(date(2023, 6, 1), "SELL", 10, 12.0, "NVDA", "Taking profits", 11.5, 120.0),
+        _tx(date(2023, 9, 1), "SKIP BUY", 5, 9.0, "NVDA", "Insufficient cash", 9.0),
+        _tx(date(2024, 2, 1), "BUY", 4, 11.0, "NVDA", "Buying back", 11.0, 76.0),
+        _tx(date(2024, 3, 1), "DIVIDEND", 94, 0.5, "NVDA", "Dividend", None, 123.0),
+        _tx(date(2024, 4, 1), "BUY", 20, 50.0, "VOO", "Rebalance", None, -877.0),
+    ]
+
+
+@pytest.fixture
+def ledger():
+    return TransactionLedger.from_transactions(_transactions())
+
+
+class TestTransactionLedger:
+    """Columns, masks and group-bys."""
+
+    def test_columns(self, ledger):
+        assert len(ledger) == 6
+        assert ledger.tickers == ["NVDA", "VOO"]
+        assert ledger.ticker_codes.tolist() == [0, 0, 0, 0, 0, 1]
+        assert [ledger.actions[code] for code in ledger.action_codes] == [
+            "BUY",
+            "SELL",
+            "SKIP BUY",
+            "BUY",
+            "DIVIDEND",
+            "BUY",
+        ]
+        assert ledger.dates[1] == np.datetime64("2023-06-01")
+        assert ledger.years.tolist() == [2023, 2023, 2023, 2024, 2024, 2024]
+        assert np.isnan(ledger.limit_price[0])
+        assert ledger.limit_price[1] == 11.5
+        assert np.isnan(ledger.bank_after[2])
+        assert ledger.bank_after[-1] == -877.0
+
+    def test_unknown_action_gets_new_code(self):
+        tx = _tx(date(2024, 1, 2), "SPLIT", 1, 0.0, "NVDA", "")
+        ledger = TransactionLedger.from_transactions([tx])
+        assert ledger.actions[ledger.action_codes[0]] == "SPLIT"
+        assert ledger.mask(action="SPLIT").tolist() == [True]
+
+    def test_mask(self, ledger):
+        assert ledger.mask(action="BUY").tolist() == [True, False, False, True, False, True]
+        assert ledger.mask(action="BUY", ticker="NVDA").sum() == 2
+        assert ledger.mask(action=("BUY", "SELL"), ticker="NVDA").sum() == 3
+        assert ledger.mask(action="WITHDRAWAL").sum() == 0
+        assert ledger.mask(ticker="AAPL").sum() == 0
+        assert ledger.mask().all()
+
+    def test_cash_flow(self, ledger):
+        assert ledger.cash_flow().tolist() == [-1000.0, 120.0, 0.0, -44.0, 0.0, -1000.0]
+
+    def test_sum_by_year(self, ledger):
+        assert ledger.sum_by_year(ledger.cash_flow()) == {2023: -880.0, 2024: -1044.0}
+        sells = ledger.mask(action="SELL")
+        assert ledger.sum_by_year(ledger.value, sells) == {2023: 120.0}
+        assert ledger.sum_by_year(ledger.value, np.zeros(len(ledger), dtype=bool)) == {}
+
+    def test_holdings_after(self, ledger):
+        dates, holdings = ledger.holdings_after("NVDA")
+        assert dates.tolist() == [date(2023, 1, 3), date(2023, 6, 1), date(2024, 2, 1)]
+        assert holdings.tolist() == [100.0, 90.0, 94.0]
+
+    def test_lines_are_transaction_strings(self, ledger):
+        transactions = _transactions()
+        assert len(ledger.lines) == len(transactions)
+        assert ledger.lines[1] == transactions[1].to_string()
+        assert ledger.lines[-2:] == [tx.to_string() for tx in transactions[-2:]]
+        assert ledger.to_string().splitlines() == [tx.to_string() for tx in transactions]
+
+    def test_to_frame(self, ledger):
+        frame = ledger.to_frame()
+        assert list(frame.columns) == [
+            "ticker",
+            "action",
+            "qty",
+            "price",
+            "limit_price",
+            "bank_after",
+        ]
+        assert frame.index[0] == pd.Timestamp("2023-01-03")
+        assert frame["action"].iloc[4] == "DIVIDEND"
+        assert frame.loc[frame["ticker"] == "VOO", "qty"].tolist() == [20.0]
+
+    def test_yearly_cash_flow_excludes_initial_purchase(self, ledger):
+        yearly = calculate_yearly_cash_flow(ledger, date(2022, 6, 1), date(2025, 1, 1))
+        assert yearly == {2022: 0.0, 2023: 120.0, 2024: -1044.0, 2025: 0.0}
+
+
+class TestEngineLedger:
+    """The simulation records bank balances and returns a ledger."""
+
+    @pytest.fixture
+    def prices(self, mock_prices):
+        return mock_prices(seed=5, drift=0.0005, days=300)
+
+    @pytest.mark.parametrize("engine", ["simpy", "fast"])
+    def test_bank_after_and_summary_ledger(self, prices, engine):
+        transactions, summary = run_portfolio_simulation(
+            allocations={"TEST": 1.0},
+            start_date=date(2021, 1, 1),
+            end_date=date(2022, 2, 28),
+            portfolio_algo="per-asset:sd8",
+            initial_investment=100_000.0,
+            withdrawal_rate_pct=4.0,
+            dividend_data={"TEST": pd.Series(0.5, index=prices.index[[20, 150]])},
+            engine=engine,
+        )
+
+        assert all(tx.bank_after is not None for tx in transactions)
+        assert transactions[-1].bank_after == pytest.approx(summary["final_bank"])
+
+        ledger = summary["ledger"]
+        assert len(ledger) == len(transactions)
+        assert ledger.mask(action="WITHDRAWAL").any()
+        assert ledger.mask(action="DIVIDEND").sum() == 2
+        _, holdings = ledger.holdings_after("TEST")
+        assert holdings[-1] == summary["assets"]["TEST"]["final_holdings"]
@@ -138,7 +138,6 @@ def test_drawdown_recovery_generates_alpha():
             start_date=start_date,
             end_date=end_date,
             algo_obj=algo,
-            transactions=txns,
         )
 
     # Extract key metrics
@@ -182,9 +181,10 @@ def test_drawdown_recovery_generates_alpha():
 
     # 3. Volatility alpha should be strongly POSITIVE
     # With a 51% drawdown followed by 155% recovery, SD8 captures significant alpha
-    # After multi-bracket gap fix: ~7% (was ~15-20% before fix due to overcounting)
+    # Recovery days gap through two brackets and now sell both rungs: ~4%
+    # (~12% when only one rung filled per day, as the extra shares rode the rally)
     assert (
-        5.0 <= volatility_alpha <= 15.0
+        3.0 <= volatility_alpha <= 15.0
     ), f"Expected significant positive alpha from drawdown-recovery, got {volatility_alpha:.2f}%"
 
     # 4. Volatility alpha should be POSITIVE (SD8 beats buy-and-hold)
@@ -166,7 +166,6 @@ class TestVolatilityAlphaWithSyntheticData(unittest.TestCase):
                 start_date=df.index[0],
                 end_date=df.index[-1],
                 algo_obj=None,  # Not needed for this test
-                transactions=transactions,
             )
 
         # Assertions
@@ -227,7 +226,6 @@ class TestVolatilityAlphaWithSyntheticData(unittest.TestCase):
                 start_date=df.index[0],
                 end_date=df.index[-1],
                 algo_obj=None,  # Not needed for this test
-                transactions=ath_txns,
             )
 
             # Enhanced
@@ -250,7 +248,6 @@ class TestVolatilityAlphaWithSyntheticData(unittest.TestCase):
                 start_date=df.index[0],
                 end_date=df.index[-1],
                 algo_obj=None,  # Not needed for this test
-                transactions=enhanced_txns,
             )
 
         # Assertions
@@ -339,7 +336,6 @@ class TestVolatilityAlphaWithSyntheticData(unittest.TestCase):
                 start_date=df.index[0],
                 end_date=df.index[-1],
                 algo_obj=portfolio_obj.strategies["SYNTHETIC"],  # Pass the individual algorithm
-                transactions=transactions,
             )
 
         # Should have positive return despite ending at same level as first peak
@@ -407,7 +403,6 @@ class TestVolatilityAlphaWithSyntheticData(unittest.TestCase):
                 start_date=gap_df.index[0],
                 end_date=gap_df.index[-1],
                 algo_obj=None,  # Not needed for this test
-                transactions=gap_txns,
             )
 
             # Volatile scenario
@@ -429,7 +424,6 @@ class TestVolatilityAlphaWithSyntheticData(unittest.TestCase):
                 start_date=volatile_df.index[0],
                 end_date=volatile_df.index[-1],
                 algo_obj=None,  # Not needed for this test
-                transactions=volatile_txns,
             )
 
         # Gap up should have fewer transactions
@@ -482,7 +476,6 @@ class TestVolatilityAlphaWithSyntheticData(unittest.TestCase):
                 start_date=df.index[0],
                 end_date=df.index[-1],
                 algo_obj=None,  # Not needed for this test
-                transactions=transactions,
             )
 
         # Each 20% step should trigger at least one sell
@@ -534,7 +527,6 @@ class TestVolatilityAlphaWithSyntheticData(unittest.TestCase):
                 start_date=df.index[0],
                 end_date=df.index[-1],
                 algo_obj=None,  # Not needed for this test
-                transactions=transactions,
             )
 
         # With 50% profit sharing, we sell moderately (less than 100%, more than 0%)
@@ -596,7 +588,6 @@ class TestVolatilityAlphaWithSyntheticData(unittest.TestCase):
                 start_date=df.index[0],
                 end_date=df.index[-1],
                 algo_obj=None,  # Not needed for this test
-                transactions=ath_txns,
             )
 
             # Enhanced
@@ -619,7 +610,6 @@ class TestVolatilityAlphaWithSyntheticData(unittest.TestCase):
                 start_date=df.index[0],
                 end_date=df.index[-1],
                 algo_obj=None,  # Not needed for this test
-                transactions=enhanced_txns,
             )
 
         # ATH-only should have few/no transactions during sideways period
@@ -678,7 +668,6 @@ class TestVolatilityAlphaWithSyntheticData(unittest.TestCase):
                 start_date=df.index[0],
                 end_date=df.index[-1],
                 algo_obj=None,  # Not needed for this test
-                transactions=ath_txns,
             )
 
             # Enhanced
@@ -701,7 +690,6 @@ class TestVolatilityAlphaWithSyntheticData(unittest.TestCase):
                 start_date=df.index[0],
                 end_date=df.index[-1],
                 algo_obj=None,  # Not needed, final_stack_size comes from portfolio_summary
-                transactions=enhanced_txns,
             )
 
         # Assertions
@@ -849,7 +837,6 @@ class TestProfitSharingSymmetry(unittest.TestCase):
                 start_date=df.index[0],
                 end_date=df.index[-1],
                 algo_obj=None,  # Not needed for this test
-                transactions=transactions,
             )
 
         # Should have only initial BUY transaction (never sells with 0% profit sharing)
@@ -908,7 +895,6 @@ class TestProfitSharingSymmetry(unittest.TestCase):
                 start_date=df.index[0],
                 end_date=df.index[-1],
                 algo_obj=None,  # Not needed for this test
-                transactions=transactions,
             )
 
         # Should have transactions (initial BUY + selling profits)
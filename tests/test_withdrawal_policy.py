@@ -92,7 +92,6 @@ def test_withdrawal_from_bank_balance():
             start_date=start_date,
             end_date=end_date,
             algo_obj=None,  # Not needed for this test
-            transactions=txns,
         )
 
     # Extract metrics
@@ -190,7 +189,6 @@ def test_withdrawal_forces_selling_for_buy_and_hold():
             start_date=start_date,
             end_date=end_date,
             algo_obj=None,  # Not needed for this test
-            transactions=txns,
         )
 
     # Extract metrics
@@ -281,7 +279,6 @@ def test_simple_mode_no_opportunity_cost():
             start_date=start_date,
             end_date=end_date,
             algo_obj=None,  # Not needed for this test
-            transactions=txns_simple,
         )
 
         # Test 2: WITHOUT simple_mode (normal mode with 10% opportunity cost)
@@ -303,7 +300,6 @@ def test_simple_mode_no_opportunity_cost():
             start_date=start_date,
             end_date=end_date,
             algo_obj=None,  # Not needed for this test
-            transactions=txns_normal,
         )
 
     print("\n=== Simple Mode Test ===")